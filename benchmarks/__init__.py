@@ -0,0 +1 @@
+"""Performance benchmarks and local stand-in services for LinkedIn Strategy Assistant."""
@@ -0,0 +1,104 @@
+"""
+Benchmark the streaming DOCX extractor against python-docx.
+
+Generates corpus DOCX resumes of increasing size and, for each, measures
+extraction time and peak Python heap (tracemalloc) for:
+  - streaming: extractors.DocxExtractor (iterparse over word/document.xml)
+  - python_docx: docx.Document(path).paragraphs (the previous implementation)
+
+Usage:
+    python -m benchmarks.bench_docx [--pages 1 10 50] [--repeat 5] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from extractors import DocxExtractor  # noqa: E402
+from benchmarks import corpus  # noqa: E402
+
+DEFAULT_PAGES = (1, 10, 50)
+
+
+def _python_docx(path: Path) -> List[str]:
+    import docx
+
+    return [paragraph.text for paragraph in docx.Document(str(path)).paragraphs]
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median latency over `repeat` runs, then one traced run for peak heap."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"median_ms": statistics.median(samples), "peak_kb": peak / 1024}
+
+
+def run_benchmark(pages: Sequence[int] = DEFAULT_PAGES, repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    Compare both extractors on one generated resume per page count.
+
+    Returns:
+        One row per page count with both measurements and the speedup
+    """
+    extractor = DocxExtractor()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for page_count in pages:
+            path = corpus.write_resume(Path(tmp) / f"resume_{page_count}.docx", pages=page_count, skills=50)
+            streaming = _measure(lambda: extractor.extract(path), repeat)
+            python_docx = _measure(lambda: _python_docx(path), repeat)
+            rows.append({
+                "pages": page_count,
+                "bytes": path.stat().st_size,
+                "streaming": streaming,
+                "python_docx": python_docx,
+                "speedup": python_docx["median_ms"] / streaming["median_ms"],
+            })
+    return rows
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark streaming DOCX extraction against python-docx")
+    parser.add_argument("--pages", type=int, nargs="+", default=list(DEFAULT_PAGES), help="Resume page counts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per point")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Output JSON instead of text")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    rows = run_benchmark(args.pages, args.repeat)
+
+    if args.as_json:
+        print(json.dumps(rows, indent=2))
+    else:
+        for row in rows:
+            s, d = row["streaming"], row["python_docx"]
+            print(f"{row['pages']:>4} pages  streaming {s['median_ms']:8.2f} ms {s['peak_kb']:8.0f} KB  "
+                  f"python-docx {d['median_ms']:8.2f} ms {d['peak_kb']:8.0f} KB  speedup {row['speedup']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
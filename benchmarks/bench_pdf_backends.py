@@ -0,0 +1,137 @@
+"""
+Benchmark the PDF text backends on corpus resumes.
+
+For each generated PDF (by page count, single- and two-column layouts) every
+installed backend in pdf_backends is timed, and its text is compared with a
+reference backend (pdfplumber, the original implementation, by default):
+  - word_f1: overlap of the word multisets (same words extracted, any order)
+  - line_ratio: difflib similarity of the line sequences (same reading order)
+
+The "auto" row times select_backend() plus extraction with the chosen backend.
+
+Usage:
+    python -m benchmarks.bench_pdf_backends [--pages 1 10 50] [--repeat 3] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+import pdf_backends  # noqa: E402
+from benchmarks import corpus  # noqa: E402
+
+DEFAULT_PAGES = (1, 10, 50)
+LAYOUTS = (1, 2)
+
+
+def word_f1(text: str, reference: str) -> float:
+    """F1 of word multisets: 1.0 when both contain exactly the same words."""
+    words, expected = Counter(text.split()), Counter(reference.split())
+    overlap = sum((words & expected).values())
+    if not overlap:
+        return 1.0 if not words and not expected else 0.0
+    precision = overlap / sum(words.values())
+    recall = overlap / sum(expected.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def line_ratio(text: str, reference: str) -> float:
+    """difflib ratio over non-blank lines (whitespace-normalised)."""
+    def lines(value: str) -> List[str]:
+        return [" ".join(line.split()) for line in value.splitlines() if line.strip()]
+
+    return difflib.SequenceMatcher(None, lines(text), lines(reference), autojunk=False).ratio()
+
+
+def _median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _auto_extract(path: Path) -> List[str]:
+    backend, _ = pdf_backends.select_backend(path)
+    return backend.extract_pages(path)
+
+
+def run_benchmark(
+    pages: Sequence[int] = DEFAULT_PAGES,
+    repeat: int = 3,
+    reference: str = "pdfplumber",
+) -> List[Dict[str, Any]]:
+    """
+    Time every available backend on each corpus PDF and score agreement.
+
+    Returns:
+        One row per (document, backend) with median_ms, speedup over the
+        reference, word_f1 and line_ratio
+    """
+    backends = pdf_backends.available_backends()
+    if reference not in backends:
+        raise ValueError(f"Reference backend {reference!r} not available (available: {backends})")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for columns in LAYOUTS:
+            for page_count in pages:
+                path = corpus.write_resume(
+                    Path(tmp) / f"resume_{page_count}p_{columns}col.pdf", pages=page_count, skills=50, columns=columns
+                )
+                extractors = {name: pdf_backends.get_backend(name).extract_pages for name in backends}
+                extractors["auto"] = _auto_extract
+                texts = {name: "\n".join(fn(path)) for name, fn in extractors.items()}
+                timings = {name: _median_ms(lambda: fn(path), repeat) for name, fn in extractors.items()}
+                selected = pdf_backends.select_backend(path)[0].name
+
+                for name in extractors:
+                    rows.append({
+                        "pages": page_count,
+                        "columns": columns,
+                        "backend": name if name != "auto" else f"auto ({selected})",
+                        "median_ms": timings[name],
+                        "speedup": timings[reference] / timings[name],
+                        "word_f1": word_f1(texts[name], texts[reference]),
+                        "line_ratio": line_ratio(texts[name], texts[reference]),
+                    })
+    return rows
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PDF text backends for speed and agreement")
+    parser.add_argument("--pages", type=int, nargs="+", default=list(DEFAULT_PAGES), help="Resume page counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per backend and document")
+    parser.add_argument("--reference", default="pdfplumber", help="Backend whose text is treated as correct")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Output JSON instead of text")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    rows = run_benchmark(args.pages, args.repeat, args.reference)
+
+    if args.as_json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"{'pages':>5} {'cols':>4}  {'backend':<20} {'median ms':>10} {'speedup':>8} {'word F1':>8} {'lines':>6}")
+        for row in rows:
+            print(f"{row['pages']:>5} {row['columns']:>4}  {row['backend']:<20} {row['median_ms']:>10.1f} "
+                  f"{row['speedup']:>7.1f}x {row['word_f1']:>8.3f} {row['line_ratio']:>6.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
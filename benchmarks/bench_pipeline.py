@@ -0,0 +1,285 @@
+"""
+Benchmark each pipeline stage across a synthetic corpus.
+
+Generates inputs with benchmarks/corpus.py and times every stage separately:
+  - parse_resume per format (txt, docx, pdf), scaled by pages and by skills
+  - extract_profile_from_text (LinkedIn text), scaled by skills
+  - extract_linkedin_profile (screenshot OCR), when the tesseract binary is installed
+  - generate_gap_analysis, generate_strategy, format_dashboard, scaled by skills
+  - every linkedin_optimizer tip function and what-if fix ranking, scaled by skills
+
+Results are written as JSON: per stage a scaling curve (one point per input
+size with latency statistics and throughput) and a fitted scaling exponent
+(slope of log latency over log size; ~1 is linear, ~2 quadratic).
+
+Usage:
+    python -m benchmarks.bench_pipeline [--quick] [--repeat 5] [--output results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+import linkedin_optimizer  # noqa: E402
+import pipeline  # noqa: E402
+import what_if  # noqa: E402
+from benchmarks import corpus  # noqa: E402
+from profile_view import ProfileView  # noqa: E402
+from rules import get_rule_set  # noqa: E402
+
+DEFAULT_PAGES = (1, 10, 50, 100)
+DEFAULT_SKILLS = (10, 100, 1000, 5000)
+QUICK_PAGES = (1, 5)
+QUICK_SKILLS = (10, 100)
+
+# Fixed dimension while the other one is scaled
+BASE_SKILLS = 50
+BASE_PAGES = 2
+
+# Screenshot OCR is orders of magnitude slower; keep its grid small
+OCR_SKILLS = (10, 50)
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run fn `repeat` times (after one warm-up call) and summarise latency in ms."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "min_ms": samples[0],
+        "max_ms": samples[-1],
+    }
+
+
+def scaling_exponent(points: List[Dict[str, Any]]) -> Optional[float]:
+    """Least-squares slope of log(mean_ms) over log(size), or None with < 2 sizes."""
+    pairs = [(math.log(p["size"]), math.log(p["mean_ms"])) for p in points
+             if p["size"] > 0 and p["mean_ms"] > 0]
+    if len({x for x, _ in pairs}) < 2:
+        return None
+    mean_x = statistics.mean(x for x, _ in pairs)
+    mean_y = statistics.mean(y for _, y in pairs)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in pairs)
+    denominator = sum((x - mean_x) ** 2 for x, _ in pairs)
+    return round(numerator / denominator, 3)
+
+
+class Results:
+    """Collects scaling curves per stage."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.skipped: Dict[str, str] = {}
+
+    def add(self, stage: str, param: str, size: int, stats: Dict[str, float], **extra: float) -> None:
+        """
+        Record one point of a stage's scaling curve.
+
+        `extra` holds work-unit counts (pages, bytes, skills...) that are
+        converted into per-second throughput alongside the raw value.
+        """
+        curve = self.stages.setdefault(stage, {"param": param, "points": []})
+        seconds = stats["mean_ms"] / 1000
+        point: Dict[str, Any] = {"size": size, **{k: round(v, 4) for k, v in stats.items()}}
+        point["throughput_per_s"] = round(1 / seconds, 2) if seconds > 0 else None
+        for unit, amount in extra.items():
+            point[unit] = amount
+            point[f"{unit}_per_s"] = round(amount / seconds, 2) if seconds > 0 else None
+        curve["points"].append(point)
+
+    def to_dict(self) -> Dict[str, Any]:
+        for curve in self.stages.values():
+            curve["scaling_exponent"] = scaling_exponent(curve["points"])
+        return {"stages": self.stages, "skipped": self.skipped}
+
+
+def bench_parse_resume(
+    results: Results,
+    work_dir: Path,
+    formats: Sequence[str],
+    pages: Sequence[int],
+    skills: Sequence[int],
+    repeat: int,
+) -> None:
+    """parse_resume per format, scaled by pages (fixed skills) and by skills (fixed pages)."""
+    for fmt in formats:
+        if fmt == "pdf" and not pipeline.HAS_PDF_SUPPORT:
+            results.skipped[f"parse_resume[{fmt}]"] = "pdfplumber not installed"
+            continue
+        if fmt == "docx" and not pipeline.HAS_DOCX_SUPPORT:
+            results.skipped[f"parse_resume[{fmt}]"] = "python-docx not installed"
+            continue
+
+        for page_count in pages:
+            path = corpus.write_resume(work_dir / f"resume_{page_count}p.{fmt}", page_count, BASE_SKILLS)
+            stats = time_call(lambda: pipeline.parse_resume(path), repeat)
+            results.add(f"parse_resume[{fmt}] by pages", "pages", page_count, stats,
+                        pages=page_count, bytes=path.stat().st_size)
+
+        for skill_count in skills:
+            path = corpus.write_resume(work_dir / f"resume_{skill_count}s.{fmt}", BASE_PAGES, skill_count)
+            stats = time_call(lambda: pipeline.parse_resume(path), repeat)
+            results.add(f"parse_resume[{fmt}] by skills", "skills", skill_count, stats,
+                        skills=skill_count, bytes=path.stat().st_size)
+
+
+def _tesseract_available() -> bool:
+    if not pipeline.HAS_OCR:
+        return False
+    try:
+        pipeline.get_engine().image_to_string(pipeline.Image.new("L", (8, 8), 255))
+        return True
+    except Exception:
+        return False
+
+
+def bench_linkedin_extraction(results: Results, work_dir: Path, skills: Sequence[int], repeat: int) -> None:
+    """Profile field extraction from text, and full screenshot OCR when tesseract exists."""
+    for skill_count in skills:
+        text = corpus.linkedin_text(skill_count)
+        stats = time_call(lambda: pipeline.extract_profile_from_text(text), repeat)
+        results.add("extract_profile_from_text", "skills", skill_count, stats,
+                    skills=skill_count, chars=len(text))
+
+    if not _tesseract_available():
+        results.skipped["extract_linkedin_profile"] = "tesseract binary not installed"
+        return
+    for skill_count in OCR_SKILLS:
+        shots = corpus.render_screenshots(corpus.linkedin_text(skill_count), work_dir / f"shots_{skill_count}")
+        stats = time_call(lambda: pipeline.extract_linkedin_profile(shots), max(1, repeat // 3))
+        results.add("extract_linkedin_profile", "skills", skill_count, stats, screenshots=len(shots))
+
+
+def bench_analysis(results: Results, work_dir: Path, skills: Sequence[int], repeat: int) -> None:
+    """Gap analysis, strategy, dashboard and optimizer tip functions, scaled by skills."""
+    mode = "Get Hired"
+    for skill_count in skills:
+        resume = pipeline.parse_resume(
+            corpus.write_resume(work_dir / f"analysis_{skill_count}s.txt", BASE_PAGES, skill_count))
+        linkedin = pipeline.extract_profile_from_text(corpus.linkedin_text(skill_count))
+        gaps = pipeline.generate_gap_analysis(linkedin, resume)
+        strategy = pipeline.generate_strategy(mode, gaps, linkedin, resume)
+
+        stage_calls: Dict[str, Callable[[], Any]] = {
+            "generate_gap_analysis": lambda: pipeline.generate_gap_analysis(linkedin, resume),
+            "generate_strategy": lambda: pipeline.generate_strategy(mode, gaps, linkedin, resume),
+            "format_dashboard": lambda: pipeline.format_dashboard(strategy),
+        }
+
+        view = ProfileView.build(linkedin, resume, gaps)
+        rule_set = get_rule_set()
+        features = rule_set.features(view)
+        base = rule_set.score(features)
+        stage_calls.update({
+            "optimizer.get_headline_optimization_tips": lambda: linkedin_optimizer.get_headline_optimization_tips(view),
+            "optimizer.get_about_section_optimization_tips":
+                lambda: linkedin_optimizer.get_about_section_optimization_tips(view),
+            "optimizer.get_skills_optimization_tips": lambda: linkedin_optimizer.get_skills_optimization_tips(view),
+            "optimizer.get_completeness_assessment": lambda: linkedin_optimizer.get_completeness_assessment(view),
+            "optimizer.get_keyword_optimization_tips": lambda: linkedin_optimizer.get_keyword_optimization_tips(view),
+            "optimizer.generate_enhanced_fixes": lambda: linkedin_optimizer.generate_enhanced_fixes(view),
+            "optimizer.generate_enhanced_roadmap": lambda: linkedin_optimizer.generate_enhanced_roadmap(mode, view),
+            "what_if.rank_fixes": lambda: what_if.rank_fixes(rule_set, features, base),
+        })
+
+        for stage, call in stage_calls.items():
+            results.add(stage, "skills", skill_count, time_call(call, repeat), skills=skill_count)
+
+
+def run_benchmark(
+    pages: Sequence[int] = DEFAULT_PAGES,
+    skills: Sequence[int] = DEFAULT_SKILLS,
+    formats: Sequence[str] = corpus.RESUME_FORMATS,
+    repeat: int = 5,
+    work_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Generate the corpus and time every stage.
+
+    Args:
+        pages: Resume page counts for the pages curve
+        skills: Skill counts for the skills curves
+        formats: Resume formats to parse
+        repeat: Timed runs per point (after one warm-up run)
+        work_dir: Where to write the corpus (default: a temporary directory)
+
+    Returns:
+        JSON-serialisable results with environment, grid and per-stage curves
+    """
+    started = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        target = work_dir or Path(tmp)
+        target.mkdir(parents=True, exist_ok=True)
+        results = Results()
+        bench_parse_resume(results, target, formats, pages, skills, repeat)
+        bench_linkedin_extraction(results, target, skills, repeat)
+        bench_analysis(results, target, skills, repeat)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "grid": {"pages": list(pages), "skills": list(skills), "formats": list(formats), "repeat": repeat},
+        "started_at": started,
+        "duration_s": round(time.time() - started, 2),
+        **results.to_dict(),
+    }
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on a synthetic corpus")
+    parser.add_argument("--pages", type=int, nargs="+", default=None, help="Resume page counts")
+    parser.add_argument("--skills", type=int, nargs="+", default=None, help="Skill counts")
+    parser.add_argument("--formats", nargs="+", default=list(corpus.RESUME_FORMATS), choices=corpus.RESUME_FORMATS)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per point")
+    parser.add_argument("--quick", action="store_true", help="Small grid for smoke runs")
+    parser.add_argument("--corpus-dir", type=Path, default=None, help="Keep the generated corpus here")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON here instead of stdout")
+    parser.add_argument("--with-logging", action="store_true", help="Keep pipeline logging enabled while timing")
+    args = parser.parse_args(argv)
+
+    if not args.with_logging:
+        logging.disable(logging.CRITICAL)
+
+    pages = args.pages or (QUICK_PAGES if args.quick else DEFAULT_PAGES)
+    skills = args.skills or (QUICK_SKILLS if args.quick else DEFAULT_SKILLS)
+    repeat = 1 if args.quick else args.repeat
+    results = run_benchmark(pages, skills, args.formats, repeat, args.corpus_dir)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+        for stage, curve in results["stages"].items():
+            last = curve["points"][-1]
+            print(f"{stage:<55} {curve['param']}={last['size']:<6} {last['mean_ms']:10.2f} ms  "
+                  f"exponent {curve['scaling_exponent']}")
+        for stage, reason in results["skipped"].items():
+            print(f"{stage:<55} skipped: {reason}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
@@ -0,0 +1,114 @@
+"""
+Benchmark recruiter search over a synthetic index of analysed profiles.
+
+Builds a skill_index.SkillIndex of N profiles whose skills follow a Zipf-like
+distribution over a fixed vocabulary (a few skills on most profiles, a long
+tail on few), then measures median query latency of typical recruiter
+queries ranked by profile score and by BM25.
+
+Usage:
+    python -m benchmarks.bench_skill_index [--profiles 1000000] [--repeat 10] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from skill_index import SkillIndex  # noqa: E402
+
+DEFAULT_PROFILES = 100_000
+VOCABULARY_SIZE = 2000
+RESUME_SKILLS = 15
+THEMES = ["llm", "kubernetes", "terraform", "ci/cd", "fastapi", "serverless", "machine learning"]
+
+# (query, rank): skill0 is the most common skill, skill100+ the long tail
+QUERIES: Sequence[Tuple[str, str]] = (
+    ("missing:skill3 AND missing:skill7", "score"),
+    ("resume:skill0 AND resume:skill1", "score"),
+    ("theme:fastapi", "score"),
+    ("resume:skill5 AND NOT linkedin:skill5 AND (skill40 OR skill41)", "score"),
+    ("skill100 OR skill200", "bm25"),
+    ("resume:skill5 AND NOT linkedin:skill5 AND (skill40 OR skill41)", "bm25"),
+)
+
+
+def build_index(profiles: int, seed: int = 0) -> SkillIndex:
+    """Index `profiles` synthetic profiles."""
+    rng = random.Random(seed)
+    vocabulary = [f"skill{i}" for i in range(VOCABULARY_SIZE)]
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE)))
+    index = SkillIndex()
+    for n in range(profiles):
+        resume = list(dict.fromkeys(rng.choices(vocabulary, cum_weights=cum_weights, k=RESUME_SKILLS)))
+        linkedin = resume[::2] + rng.choices(vocabulary, cum_weights=cum_weights, k=3)
+        on_linkedin = set(linkedin)
+        index.add(
+            f"user{n}",
+            {"skills": linkedin},
+            {"skills": resume},
+            {
+                "skills_missing_from_linkedin": [skill for skill in resume if skill not in on_linkedin],
+                "advanced_tech_themes": rng.sample(THEMES, rng.randint(0, 3)),
+            },
+            rng.randint(30, 100),
+        )
+    return index
+
+
+def run_benchmark(profiles: int = DEFAULT_PROFILES, repeat: int = 10, k: int = 50) -> Dict[str, Any]:
+    """
+    Build the index and time each query.
+
+    Returns:
+        Build time and, per query, the match count and median latency
+    """
+    start = time.perf_counter()
+    index = build_index(profiles)
+    build_seconds = time.perf_counter() - start
+
+    rows: List[Dict[str, Any]] = []
+    for query, rank in QUERIES:
+        results = index.search(query, k=k, rank=rank)  # warm bitmap caches
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            index.search(query, k=k, rank=rank)
+            samples.append((time.perf_counter() - start) * 1000)
+        rows.append({"query": query, "rank": rank, "total": results.total, "median_ms": statistics.median(samples)})
+    return {"profiles": profiles, "build_seconds": build_seconds, "queries": rows}
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark recruiter search over a synthetic skill index")
+    parser.add_argument("--profiles", type=int, default=DEFAULT_PROFILES, help="Profiles to index")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query")
+    parser.add_argument("-k", type=int, default=50, help="Hits per query")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Output JSON instead of text")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    report = run_benchmark(args.profiles, args.repeat, args.k)
+
+    if args.as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['profiles']:,} profiles indexed in {report['build_seconds']:.1f} s")
+        for row in report["queries"]:
+            print(f"{row['median_ms']:8.2f} ms  {row['total']:>9,} matches  [{row['rank']}] {row['query']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
@@ -0,0 +1,126 @@
+"""
+Benchmark per-request Vision clients against the pooled client.
+
+Runs document_text_detection calls against the local stand-in gRPC server
+(benchmarks/vision_stub.py) two ways:
+  - per-request: build a new client + channel for every call (the old
+    _extract_linkedin behaviour)
+  - pooled: reuse clients from VisionClientPool
+
+The difference is the per-request connection-setup overhead. Against a
+plaintext localhost server this excludes TLS handshakes and credential
+discovery, so production overhead is larger than reported here.
+
+Usage:
+    python -m benchmarks.bench_vision_client [--requests 200] [--concurrency 4] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from google.cloud import vision  # noqa: E402
+
+from benchmarks.vision_stub import start_stub_server  # noqa: E402
+from vision_client import VisionClientPool  # noqa: E402
+
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096
+
+
+def _per_request_call(endpoint: str) -> None:
+    pool = VisionClientPool(size=1, endpoint=endpoint, insecure=True)
+    try:
+        pool.get().document_text_detection(image=vision.Image(content=IMAGE_BYTES))
+    finally:
+        pool.close()
+
+
+def _timed_calls(call: Callable[[], None], requests: int, concurrency: int) -> Dict[str, float]:
+    """Run call() `requests` times across `concurrency` threads and summarise latency."""
+    def timed(_):
+        start = time.perf_counter()
+        call()
+        return (time.perf_counter() - start) * 1000
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies: List[float] = sorted(executor.map(timed, range(requests)))
+    wall_s = time.perf_counter() - wall_start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": requests / wall_s,
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def run_benchmark(requests: int = 200, concurrency: int = 4, pool_size: int = 2) -> Dict[str, Dict[str, float]]:
+    """
+    Run both modes against a freshly started stand-in server.
+
+    Returns:
+        Mapping of mode name to latency/throughput summary, plus the
+        per-request setup overhead (difference in mean latency)
+    """
+    server, port, _ = start_stub_server()
+    endpoint = f"localhost:{port}"
+    try:
+        pool = VisionClientPool(size=pool_size, endpoint=endpoint, insecure=True)
+        pool.start()
+        # Warm up both paths so one-time interpreter costs are excluded
+        _per_request_call(endpoint)
+        pool.get().document_text_detection(image=vision.Image(content=IMAGE_BYTES))
+
+        per_request = _timed_calls(lambda: _per_request_call(endpoint), requests, concurrency)
+        pooled = _timed_calls(
+            lambda: pool.get().document_text_detection(image=vision.Image(content=IMAGE_BYTES)),
+            requests,
+            concurrency,
+        )
+        pool.close()
+    finally:
+        server.stop(None)
+
+    return {
+        "per_request": per_request,
+        "pooled": pooled,
+        "setup_overhead": {"mean_ms": per_request["mean_ms"] - pooled["mean_ms"]},
+    }
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-request Vision clients")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per mode")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent caller threads")
+    parser.add_argument("--pool-size", type=int, default=2, help="Channels in the pooled client")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Output JSON instead of text")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.requests, args.concurrency, args.pool_size)
+
+    if args.as_json:
+        print(json.dumps(results, indent=2))
+    else:
+        for mode in ("per_request", "pooled"):
+            r = results[mode]
+            print(f"{mode:<12} {r['throughput_rps']:8.1f} req/s  mean {r['mean_ms']:6.2f} ms  "
+                  f"p50 {r['p50_ms']:6.2f} ms  p95 {r['p95_ms']:6.2f} ms")
+        print(f"Per-request setup overhead: {results['setup_overhead']['mean_ms']:.2f} ms/call")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
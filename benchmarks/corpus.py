@@ -0,0 +1,413 @@
+"""
+Synthetic resume and LinkedIn profile corpus for benchmarks.
+
+Generates inputs of controllable size so pipeline stages can be timed across
+realistic and extreme cases:
+  - resumes as TXT, DOCX or PDF, 1-100 pages, 10-5,000 skills
+  - LinkedIn profile text (the same shape OCR produces) and rendered
+    screenshot PNGs of that text
+
+Output is deterministic for a given seed. PDFs are written by a small
+built-in writer (standard Helvetica font, one text stream per page), so no
+PDF authoring library is needed.
+
+Usage:
+    python -m benchmarks.corpus --out corpus/ [--pages 1 10 100] [--skills 10 500 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import textwrap
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+RESUME_FORMATS = ("txt", "docx", "pdf")
+
+# Lines of body text per resume page (roughly a dense single-column page)
+LINES_PER_PAGE = 50
+# Skills listed per line of a resume Skills section
+SKILLS_PER_LINE = 12
+
+BASE_SKILLS = [
+    "Python", "Go", "Java", "TypeScript", "JavaScript", "Rust", "SQL", "Bash",
+    "Docker", "Kubernetes", "Terraform", "Ansible", "Helm", "Cloud Run", "AWS",
+    "Google Cloud Platform", "Azure", "FastAPI", "Flask", "Django", "React",
+    "Node.js", "PostgreSQL", "MongoDB", "Redis", "BigQuery", "Kafka", "Spark",
+    "Airflow", "TensorFlow", "PyTorch", "LLM", "RPA", "CI/CD", "GitHub Actions",
+    "Jenkins", "Prometheus", "Grafana", "Microservices", "Serverless",
+    "Machine Learning", "Data Engineering", "gRPC", "GraphQL", "Linux",
+]
+
+COMPANIES = ["Tech Innovations Inc.", "Digital Solutions Corp.", "CloudTech Startups",
+             "DataWorks LLC", "Acme Analytics", "Northwind Systems"]
+
+ROLES = ["Senior Software Engineer", "Software Engineer", "DevOps Engineer",
+         "Platform Engineer", "Data Engineer", "Engineering Manager"]
+
+VERBS = ["Architected", "Built", "Led", "Implemented", "Designed", "Automated",
+         "Migrated", "Optimized", "Deployed", "Scaled"]
+
+OBJECTS = ["microservices platform", "CI/CD pipeline", "data ingestion service",
+           "LLM-powered support assistant", "Kubernetes cluster fleet",
+           "analytics dashboard", "payments API", "RPA workflow", "search service"]
+
+CERTIFICATIONS = ["Google Cloud Professional Architect", "AWS Solutions Architect",
+                  "Certified Kubernetes Administrator", "HashiCorp Terraform Associate",
+                  "Azure Developer Associate"]
+
+
+def skill_names(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate `count` distinct skill names.
+
+    The first names are real technologies; beyond the base vocabulary,
+    numbered variants ("Kafka 7") keep every name unique.
+    """
+    rng = random.Random(seed)
+    names = list(BASE_SKILLS)
+    rng.shuffle(names)
+    variant = 1
+    while len(names) < count:
+        names.extend(f"{name} {variant}" for name in BASE_SKILLS)
+        variant += 1
+    return names[:count]
+
+
+def _bullet(rng: random.Random) -> str:
+    return (f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(BASE_SKILLS)} "
+            f"and {rng.choice(BASE_SKILLS)}, improving throughput by {rng.randint(10, 90)}%")
+
+
+def resume_lines(pages: int, skills: int, seed: int = 0) -> List[List[str]]:
+    """
+    Build resume text as a list of pages, each a list of lines.
+
+    The first page carries the name, summary and Skills section (which may
+    itself span several pages for very large skill counts); the remaining
+    lines are experience and project bullets, padded to `pages` pages.
+    """
+    rng = random.Random(seed)
+    names = skill_names(skills, seed)
+
+    lines = [
+        "Jordan Q. Example",
+        "Senior Software Engineer | Cloud Architecture | AI/ML Integration",
+        "",
+        "PROFESSIONAL SUMMARY",
+        "Software engineer with 8+ years of experience in cloud-native development and automation.",
+        "",
+        "Skills:",
+    ]
+    for start in range(0, len(names), SKILLS_PER_LINE):
+        lines.append(", ".join(names[start:start + SKILLS_PER_LINE]))
+    lines.extend(["", "Certifications:"])
+    lines.extend(CERTIFICATIONS[: 1 + skills % len(CERTIFICATIONS)])
+    lines.extend(["", "PROFESSIONAL EXPERIENCE"])
+
+    total_lines = max(pages * LINES_PER_PAGE, len(lines) + 4)
+    while len(lines) < total_lines:
+        if len(lines) % 12 == 0:
+            lines.extend([
+                "",
+                f"{rng.choice(ROLES)} | {rng.choice(COMPANIES)} | {rng.randint(2010, 2020)} - Present",
+                f"Work experience building {rng.choice(OBJECTS)} for production customers",
+            ])
+        elif len(lines) % 29 == 0:
+            lines.append(f"Project: {rng.choice(OBJECTS).title()} - {rng.choice(VERBS).lower()} end to end work")
+        else:
+            lines.append(_bullet(rng))
+    lines = lines[:total_lines]
+
+    page_count = max(pages, -(-len(lines) // LINES_PER_PAGE))
+    return [lines[i * LINES_PER_PAGE:(i + 1) * LINES_PER_PAGE] for i in range(page_count)]
+
+
+def _write_txt(path: Path, pages: List[List[str]]) -> None:
+    path.write_text("\n".join("\n".join(page) for page in pages) + "\n", encoding="utf-8")
+
+
+def _write_docx(path: Path, pages: List[List[str]]) -> None:
+    import docx
+    from docx.enum.text import WD_BREAK
+
+    document = docx.Document()
+    for page_num, page in enumerate(pages):
+        for line in page:
+            document.add_paragraph(line)
+        if page_num < len(pages) - 1:
+            document.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    document.save(str(path))
+
+
+def _pdf_escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _column_ops(lines: List[str], x: int, width_chars: int) -> List[str]:
+    wrapped = [part for line in lines for part in (textwrap.wrap(line, width_chars) or [""])]
+    ops = ["BT", "/F1 10 Tf", "13 TL", f"{x} 760 Td"]
+    ops.extend(f"({_pdf_escape(line)}) Tj T*" for line in wrapped[:LINES_PER_PAGE])
+    ops.append("ET")
+    return ops
+
+
+def _write_pdf(path: Path, pages: List[List[str]], columns: int = 1) -> None:
+    """
+    Minimal PDF 1.4 writer: US Letter pages of 10pt Helvetica text.
+
+    With columns=2 each page's lines are split into a left and a right
+    column (wrapped to fit), like a sidebar resume template.
+    """
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # patched below
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    page_ids = []
+    for page in pages:
+        if columns == 2:
+            half = (len(page) + 1) // 2
+            ops = _column_ops(page[:half], 50, 48) + _column_ops(page[half:], 320, 48)
+        else:
+            ops = ["BT", "/F1 10 Tf", "13 TL", "50 760 Td"]
+            ops.extend(f"({_pdf_escape(line)}) Tj T*" for line in page)
+            ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_obj, font, content)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    path.write_bytes(bytes(out))
+
+
+def _scan_pages(path: Path, pages: List[List[str]], scanned: Sequence[int]) -> None:
+    """Replace the given pages of a written PDF with image-only renderings (no text layer)."""
+    import io
+
+    import pypdfium2 as pdfium
+    from PIL import Image, ImageDraw
+
+    images = []
+    for index in scanned:
+        # US Letter at 144 dpi
+        image = Image.new("L", (1224, 1584), color=255)
+        draw = ImageDraw.Draw(image)
+        for row, line in enumerate(pages[index]):
+            draw.text((100, 80 + row * 26), line, fill=0)
+        images.append(image)
+    buffer = io.BytesIO()
+    images[0].save(buffer, "PDF", resolution=144, save_all=True, append_images=images[1:])
+
+    text_pdf = pdfium.PdfDocument(path.read_bytes())
+    image_pdf = pdfium.PdfDocument(buffer.getvalue())
+    merged = pdfium.PdfDocument.new()
+    image_index = {page: position for position, page in enumerate(scanned)}
+    for index in range(len(text_pdf)):
+        if index in image_index:
+            merged.import_pages(image_pdf, [image_index[index]])
+        else:
+            merged.import_pages(text_pdf, [index])
+    out = io.BytesIO()
+    merged.save(out)
+    for document in (merged, image_pdf, text_pdf):
+        document.close()
+    path.write_bytes(out.getvalue())
+
+
+def write_resume(
+    path: Path,
+    pages: int,
+    skills: int,
+    seed: int = 0,
+    columns: int = 1,
+    scanned: Sequence[int] = (),
+) -> Path:
+    """
+    Write a synthetic resume; the format is taken from the file suffix.
+
+    Args:
+        path: Output path ending in .txt, .docx or .pdf
+        pages: Number of pages (1-100 in the standard grid)
+        skills: Number of distinct skills in the Skills section
+        columns: 1 or 2 text columns per page (PDF only)
+        scanned: 0-based pages written as images without a text layer, like
+            a scanned document (PDF only)
+
+    Returns:
+        The written path
+
+    Raises:
+        ValueError: If the suffix or column count is not supported
+    """
+    content = resume_lines(pages, skills, seed)
+    writers = {".txt": _write_txt, ".docx": _write_docx, ".pdf": _write_pdf}
+    writer = writers.get(path.suffix.lower())
+    if writer is None:
+        raise ValueError(f"Unsupported corpus format: {path.suffix}")
+    if columns not in (1, 2):
+        raise ValueError(f"Unsupported column count: {columns}")
+    if columns == 2:
+        if writer is not _write_pdf:
+            raise ValueError(f"Multi-column layout is only supported for .pdf, not {path.suffix}")
+        writer(path, content, columns=columns)
+    else:
+        writer(path, content)
+    if scanned:
+        if writer is not _write_pdf:
+            raise ValueError(f"Scanned pages are only supported for .pdf, not {path.suffix}")
+        _scan_pages(path, content, sorted(set(scanned)))
+    return path
+
+
+def linkedin_text(skills: int, about_chars: int = 1200, seed: int = 0) -> str:
+    """
+    LinkedIn profile text shaped like OCR output of profile screenshots.
+
+    Args:
+        skills: Number of skills listed (LinkedIn caps real profiles at 50,
+            larger values exercise the extractors)
+        about_chars: Approximate length of the About section
+    """
+    rng = random.Random(seed + 1)
+    names = skill_names(skills, seed + 1)
+    about = []
+    while sum(len(s) + 1 for s in about) < about_chars:
+        about.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(BASE_SKILLS)}.")
+
+    return "\n".join([
+        "Senior Software Engineer | Cloud Architecture Specialist",
+        "San Francisco Bay Area - 500+ connections",
+        "Current: Senior Software Engineer at Tech Innovations Inc.",
+        "",
+        "About:",
+        " ".join(about),
+        "",
+        "Skills:",
+        "\n".join(names),
+        "",
+        "Certifications:",
+        "\n".join(CERTIFICATIONS[:2]),
+        "",
+        "Activity",
+        "Shared a post about scaling Kubernetes clusters in production",
+        "Commented on a thread about LLM evaluation practices",
+        "",
+    ])
+
+
+def linkedin_data(skills: int, seed: int = 0) -> dict:
+    """Profile in dict form, as ProfileView.build() accepts it."""
+    from pipeline import extract_profile_from_text
+
+    profile = extract_profile_from_text(linkedin_text(skills, seed=seed))
+    return {
+        "headline": profile.headline,
+        "about": profile.about,
+        "current_role": profile.current_role,
+        "skills": profile.skills,
+        "certifications": profile.certifications,
+    }
+
+
+def render_screenshots(
+    text: str,
+    out_dir: Path,
+    lines_per_image: int = 45,
+    width: int = 1000,
+    line_height: int = 20,
+) -> List[Path]:
+    """
+    Render profile text into screenshot-like PNGs (black text on white).
+
+    Args:
+        text: Profile text, e.g. from linkedin_text()
+        out_dir: Directory to write linkedin_XX.png files to
+        lines_per_image: Lines of text per screenshot
+
+    Returns:
+        Paths of the written images in order
+    """
+    from PIL import Image, ImageDraw
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    lines = text.splitlines()
+    paths = []
+    for index, start in enumerate(range(0, len(lines), lines_per_image)):
+        chunk = lines[start:start + lines_per_image]
+        image = Image.new("RGB", (width, 40 + line_height * len(chunk)), color="white")
+        draw = ImageDraw.Draw(image)
+        for row, line in enumerate(chunk):
+            draw.text((20, 20 + row * line_height), line, fill="black")
+        path = out_dir / f"linkedin_{index:02d}.png"
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def write_corpus(
+    out_dir: Path,
+    pages: Sequence[int] = (1, 10, 100),
+    skills: Sequence[int] = (10, 500, 5000),
+    formats: Sequence[str] = RESUME_FORMATS,
+    seed: int = 0,
+) -> List[Path]:
+    """Write every format x pages x skills resume plus profile text/screenshots."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = []
+    for fmt in formats:
+        for page_count in pages:
+            for skill_count in skills:
+                path = out_dir / f"resume_{page_count}p_{skill_count}s.{fmt}"
+                written.append(write_resume(path, page_count, skill_count, seed))
+    for skill_count in skills:
+        text = linkedin_text(skill_count, seed=seed)
+        text_path = out_dir / f"linkedin_{skill_count}s.txt"
+        text_path.write_text(text, encoding="utf-8")
+        written.append(text_path)
+        written.extend(render_screenshots(text, out_dir / f"screenshots_{skill_count}s"))
+    return written
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume/LinkedIn corpus")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100], help="Resume page counts")
+    parser.add_argument("--skills", type=int, nargs="+", default=[10, 500, 5000], help="Skill counts")
+    parser.add_argument("--formats", nargs="+", default=list(RESUME_FORMATS), choices=RESUME_FORMATS)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    written = write_corpus(args.out, args.pages, args.skills, args.formats, args.seed)
+    print(f"Wrote {len(written)} files to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
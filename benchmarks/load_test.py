@@ -0,0 +1,451 @@
+"""
+HTTP load test for /analyze with concurrency sweeps.
+
+Starts the FastAPI app locally under uvicorn (plus the local Vision stand-in
+from benchmarks/vision_stub.py), replays a weighted mix of /analyze requests
+and sweeps client concurrency. For each level it reports throughput, latency
+percentiles, error rates by status and per-worker RSS, then identifies the
+saturation knee: the lowest concurrency reaching 95% of peak throughput.
+Beyond the knee extra concurrency only adds queueing latency, which makes it
+a starting point for Cloud Run's --concurrency per instance.
+
+Request mix (payloads generated with benchmarks/corpus.py):
+  - text:         linkedin_text + TXT resume
+  - pdf / docx:   linkedin_text + PDF / DOCX resume
+  - vision:       TXT resume + 1-5 screenshots OCR'd by the Vision stand-in
+  - tesseract:    TXT resume + 1-5 screenshots OCR'd locally (only when the
+                  tesseract binary is installed)
+
+The load generator shares the machine with the server, so pin one or the
+other (taskset) or use --url against a separate host for clean numbers.
+
+Usage:
+    python -m benchmarks.load_test [--workers 1] [--concurrency 1 2 4 8 16] [--duration 10]
+    python -m benchmarks.load_test --url http://host:8080 --mix text=1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = REPO_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from benchmarks import corpus  # noqa: E402
+
+DEFAULT_CONCURRENCY = (1, 2, 4, 8, 16, 32)
+DEFAULT_MIX = {"text": 4, "pdf": 2, "docx": 2, "vision": 2}
+MODES = ("Get Hired", "Grow Connections", "Influence Market")
+
+# Throughput fraction of the peak that counts as saturated
+KNEE_FRACTION = 0.95
+
+
+@dataclass
+class Scenario:
+    """One kind of /analyze request with its pre-built multipart payloads."""
+    name: str
+    data: Dict[str, str]
+    files: List[Tuple[str, Tuple[str, bytes, str]]]
+
+
+def build_scenarios(mix: Dict[str, float], work_dir: Path, skills: int = 50, pages: int = 2) -> List[Scenario]:
+    """
+    Build payloads for the scenarios in `mix`.
+
+    Screenshot scenarios get one variant per screenshot count (1-5).
+    """
+    linkedin_json = json.dumps({
+        "headline": "Senior Software Engineer | Cloud Architecture Specialist",
+        "about": "Building cloud-native platforms with Python, Docker and Kubernetes.",
+        "current_role": "Senior Software Engineer at Tech Innovations Inc.",
+        "skills": ", ".join(corpus.skill_names(min(skills, 50), seed=1)),
+        "certifications": "Google Cloud Professional Architect",
+    })
+
+    def resume_file(fmt: str) -> Tuple[str, Tuple[str, bytes, str]]:
+        path = corpus.write_resume(work_dir / f"load_resume.{fmt}", pages, skills)
+        content_types = {
+            "txt": "text/plain",
+            "pdf": "application/pdf",
+            "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        }
+        return ("resume", (path.name, path.read_bytes(), content_types[fmt]))
+
+    shots = corpus.render_screenshots(corpus.linkedin_text(skills), work_dir / "load_shots", lines_per_image=12)
+    shot_files = [("screenshots", (p.name, p.read_bytes(), "image/png")) for p in shots]
+
+    scenarios: List[Scenario] = []
+    for name in mix:
+        if name in ("text", "pdf", "docx"):
+            fmt = "txt" if name == "text" else name
+            scenarios.append(Scenario(name, {"linkedin_text": linkedin_json}, [resume_file(fmt)]))
+        elif name in ("vision", "tesseract"):
+            for count in range(1, 6):
+                scenarios.append(Scenario(
+                    f"{name}[{count}]",
+                    {"use_cloud_vision": "true" if name == "vision" else "false"},
+                    [resume_file("txt")] + shot_files[:count],
+                ))
+        else:
+            raise ValueError(f"Unknown scenario: {name}")
+    return scenarios
+
+
+@dataclass
+class LevelStats:
+    """Raw samples for one concurrency level."""
+    concurrency: int
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    by_scenario: Dict[str, List[float]] = field(default_factory=dict)
+    rss_max_mb: Dict[int, float] = field(default_factory=dict)
+    duration_s: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        total = sum(self.statuses.values())
+        errors = total - self.statuses.get("200", 0)
+        return {
+            "concurrency": self.concurrency,
+            "requests": total,
+            "duration_s": round(self.duration_s, 3),
+            "throughput_rps": round(self.statuses.get("200", 0) / self.duration_s, 2) if self.duration_s else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "statuses": dict(self.statuses),
+            "latency_ms": _percentiles(latencies),
+            "by_scenario": {name: _percentiles(sorted(samples)) for name, samples in sorted(self.by_scenario.items())},
+            "worker_rss_mb": {str(pid): round(rss, 1) for pid, rss in sorted(self.rss_max_mb.items())},
+        }
+
+
+def _percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+
+    def pct(p: float) -> float:
+        return round(samples[min(len(samples) - 1, int(len(samples) * p))], 2)
+
+    return {"count": len(samples), "p50": pct(0.50), "p90": pct(0.90), "p95": pct(0.95),
+            "p99": pct(0.99), "max": round(samples[-1], 2)}
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """PIDs of root_pid and all its descendants (Linux /proc)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as f:
+                # The comm field may contain spaces; ppid follows the closing parenthesis
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+async def _sample_rss(root_pid: Optional[int], stats: LevelStats, stop: asyncio.Event) -> None:
+    """Record the peak RSS of every server process until stopped."""
+    if root_pid is None or not os.path.isdir("/proc"):
+        return
+    while True:
+        for pid in _process_tree(root_pid):
+            rss = _rss_mb(pid)
+            if rss is not None:
+                stats.rss_max_mb[pid] = max(stats.rss_max_mb.get(pid, 0.0), rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.25)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(
+    url: str,
+    scenarios: List[Scenario],
+    weights: List[float],
+    concurrency: int,
+    duration: float,
+    server_pid: Optional[int] = None,
+    seed: int = 0,
+) -> LevelStats:
+    """
+    Closed-loop load: `concurrency` clients send requests back to back for `duration` seconds.
+
+    Each client picks a scenario by weight and a random mode for every request.
+    """
+    stats = LevelStats(concurrency=concurrency)
+    rng = random.Random(seed + concurrency)
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=120.0, limits=limits) as client:
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                scenario = rng.choices(scenarios, weights)[0]
+                data = {"mode": rng.choice(MODES), **scenario.data}
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/analyze", data=data, files=scenario.files)
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                elapsed = (time.perf_counter() - start) * 1000
+                stats.statuses[status] += 1
+                if status == "200":
+                    stats.latencies_ms.append(elapsed)
+                    stats.by_scenario.setdefault(scenario.name, []).append(elapsed)
+
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_rss(server_pid, stats, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        stats.duration_s = time.perf_counter() - start
+        stop.set()
+        await sampler
+    return stats
+
+
+def find_knee(levels: List[Dict[str, Any]], fraction: float = KNEE_FRACTION) -> Optional[Dict[str, Any]]:
+    """
+    Lowest concurrency whose throughput reaches `fraction` of the peak.
+
+    Returns:
+        Dict with the knee concurrency, its throughput/p95 and the peak, or None
+        if no level completed requests
+    """
+    completed = [level for level in levels if level["throughput_rps"] > 0]
+    if not completed:
+        return None
+    peak = max(completed, key=lambda level: level["throughput_rps"])
+    knee = next(level for level in completed if level["throughput_rps"] >= fraction * peak["throughput_rps"])
+    return {
+        "concurrency": knee["concurrency"],
+        "throughput_rps": knee["throughput_rps"],
+        "p95_ms": knee["latency_ms"].get("p95"),
+        "peak_concurrency": peak["concurrency"],
+        "peak_throughput_rps": peak["throughput_rps"],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start uvicorn serving app:app from src/ and wait for /health."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--app-dir", str(SRC_PATH),
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited during startup with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 60s")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_load_test(
+    concurrency: Sequence[int] = DEFAULT_CONCURRENCY,
+    duration: float = 10.0,
+    mix: Optional[Dict[str, float]] = None,
+    workers: int = 1,
+    url: Optional[str] = None,
+    vision_delay_ms: float = 50.0,
+    server_env: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the concurrency sweep.
+
+    Args:
+        concurrency: Client concurrency levels, run in order
+        duration: Seconds per level
+        mix: Scenario weights (default: DEFAULT_MIX, plus tesseract when installed)
+        workers: uvicorn worker processes for the local server
+        url: Target an already running server instead of starting one
+            (per-worker RSS is then not reported)
+        vision_delay_ms: Simulated Vision API latency of the stand-in server
+        server_env: Extra environment variables for the local server
+
+    Returns:
+        JSON-serialisable results: configuration, one summary per level and the knee
+    """
+    if mix is None:
+        mix = dict(DEFAULT_MIX)
+        if shutil.which("tesseract"):
+            mix["tesseract"] = 1
+
+    work_dir = Path(tempfile.mkdtemp(prefix="lsa_load_"))
+    stub_server = None
+    process = None
+    try:
+        scenarios = build_scenarios(mix, work_dir)
+        weights = [mix[s.name.split("[")[0]] for s in scenarios]
+
+        env = {
+            # Measure capacity, not admission control, unless overridden
+            "RATE_LIMIT_ENABLED": "false",
+            # Clients share one address and send identical payloads, which
+            # would otherwise be coalesced into a fraction of the analyses
+            "COALESCE_IDENTICAL_REQUESTS": "false",
+            "MAX_CONCURRENT_OCR_REQUESTS": str(max(concurrency) * workers),
+            "LOG_LEVEL": "WARNING",
+        }
+        if url is None:
+            if any(name.startswith("vision") for name in mix):
+                from benchmarks.vision_stub import start_stub_server
+
+                stub_server, stub_port, _ = start_stub_server(delay_ms=vision_delay_ms, max_workers=64)
+                env.update({"VISION_API_ENDPOINT": f"localhost:{stub_port}", "VISION_API_INSECURE": "true"})
+            env.update(server_env or {})
+            port = _free_port()
+            process = start_server(port, workers, env)
+            url = f"http://127.0.0.1:{port}"
+
+        levels = []
+        for level in concurrency:
+            stats = asyncio.run(run_level(url, scenarios, weights, level, duration,
+                                          process.pid if process else None))
+            levels.append(stats.summary())
+    finally:
+        if process is not None:
+            stop_server(process)
+        if stub_server is not None:
+            stub_server.stop(None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    return {
+        "config": {
+            "url": url,
+            "workers": workers,
+            "cpus": cpus,
+            "analyze_worker_threads": int((server_env or {}).get(
+                "ANALYZE_WORKER_THREADS", os.getenv("ANALYZE_WORKER_THREADS", "4"))),
+            "duration_s": duration,
+            "mix": mix,
+            "vision_delay_ms": vision_delay_ms,
+        },
+        "levels": levels,
+        "knee": find_knee(levels),
+    }
+
+
+def _parse_pairs(values: Sequence[str], cast=str) -> Dict[str, Any]:
+    pairs = {}
+    for value in values:
+        key, sep, raw = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got {value}")
+        pairs[key] = cast(raw)
+    return pairs
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test /analyze across concurrency levels")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY),
+                        help="Client concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--mix", nargs="+", default=None,
+                        help="Scenario weights, e.g. text=4 pdf=2 docx=2 vision=2 tesseract=1")
+    parser.add_argument("--url", default=None, help="Target a running server instead of starting one")
+    parser.add_argument("--vision-delay-ms", type=float, default=50.0, help="Vision stand-in latency")
+    parser.add_argument("--env", nargs="+", default=[], help="Extra server environment, KEY=VALUE")
+    parser.add_argument("--output", type=Path, default=None, help="Also write JSON results here")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Output JSON instead of text")
+    args = parser.parse_args(argv)
+
+    results = run_load_test(
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=_parse_pairs(args.mix, float) if args.mix else None,
+        workers=args.workers,
+        url=args.url,
+        vision_delay_ms=args.vision_delay_ms,
+        server_env=_parse_pairs(args.env),
+    )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.as_json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    config = results["config"]
+    print(f"workers={config['workers']} cpus={config['cpus']} threads={config['analyze_worker_threads']} "
+          f"mix={config['mix']}")
+    for level in results["levels"]:
+        latency = level["latency_ms"]
+        rss = ", ".join(f"{mb:.0f}" for mb in level["worker_rss_mb"].values()) or "-"
+        print(f"c={level['concurrency']:<4} {level['throughput_rps']:8.1f} req/s  "
+              f"p50 {latency.get('p50', 0):8.1f} ms  p95 {latency.get('p95', 0):8.1f} ms  "
+              f"p99 {latency.get('p99', 0):8.1f} ms  errors {level['error_rate']:.1%}  rss MB [{rss}]")
+    knee = results["knee"]
+    if knee:
+        print(f"Saturation knee: concurrency {knee['concurrency']} "
+              f"({knee['throughput_rps']:.1f} req/s, p95 {knee['p95_ms']} ms; "
+              f"peak {knee['peak_throughput_rps']:.1f} req/s at {knee['peak_concurrency']})")
+    else:
+        print("No successful requests - no knee found")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
@@ -0,0 +1,109 @@
+"""
+Local stand-in for the Google Cloud Vision gRPC API.
+
+Serves ImageAnnotator.BatchAnnotateImages over a plaintext channel and answers
+every image with a fixed text annotation, so benchmarks and tests can exercise
+the real client stack (channel setup, serialization, keepalive) without
+network access or credentials. Point the app at it with:
+
+    VISION_API_ENDPOINT=localhost:<port> VISION_API_INSECURE=true
+
+Usage:
+    python -m benchmarks.vision_stub [--port 50051] [--delay-ms 0]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent import futures
+from typing import Optional, Tuple
+
+import grpc
+from google.cloud.vision_v1.types import image_annotator
+
+DEFAULT_TEXT = """Senior Software Engineer | Cloud & AI
+About
+Building cloud-native platforms with Python, Docker and Kubernetes.
+
+Skills
+Python, Docker, Kubernetes, FastAPI
+
+Certifications
+Google Cloud Professional Architect
+"""
+
+
+class _StubImageAnnotator:
+    """Handler returning a fixed annotation for every requested image."""
+
+    def __init__(self, text: str, delay_ms: float):
+        self.text = text
+        self.delay_ms = delay_ms
+        self.calls = 0
+
+    def batch_annotate_images(self, request, context):
+        self.calls += 1
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+        return image_annotator.BatchAnnotateImagesResponse(
+            responses=[
+                image_annotator.AnnotateImageResponse(full_text_annotation={"text": self.text})
+                for _ in request.requests
+            ]
+        )
+
+
+def start_stub_server(
+    port: int = 0,
+    text: str = DEFAULT_TEXT,
+    delay_ms: float = 0.0,
+    max_workers: int = 16,
+) -> Tuple[grpc.Server, int, _StubImageAnnotator]:
+    """
+    Start the stand-in server in background threads.
+
+    Args:
+        port: Port to bind on localhost (0 picks a free port)
+        text: Text returned as the full-text annotation of every image
+        delay_ms: Artificial per-call processing delay
+        max_workers: Server thread pool size
+
+    Returns:
+        Tuple of (server, bound port, handler); call server.stop(None) when done
+    """
+    handler = _StubImageAnnotator(text, delay_ms)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    server.add_generic_rpc_handlers((
+        grpc.method_handlers_generic_handler(
+            "google.cloud.vision.v1.ImageAnnotator",
+            {
+                "BatchAnnotateImages": grpc.unary_unary_rpc_method_handler(
+                    handler.batch_annotate_images,
+                    request_deserializer=image_annotator.BatchAnnotateImagesRequest.deserialize,
+                    response_serializer=image_annotator.BatchAnnotateImagesResponse.serialize,
+                ),
+            },
+        ),
+    ))
+    bound_port = server.add_insecure_port(f"localhost:{port}")
+    server.start()
+    return server, bound_port, handler
+
+
+def cli(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a local stand-in Cloud Vision gRPC server")
+    parser.add_argument("--port", type=int, default=50051, help="Port to listen on")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Artificial per-call delay")
+    args = parser.parse_args(argv)
+
+    server, port, _ = start_stub_server(args.port, delay_ms=args.delay_ms)
+    print(f"Vision stand-in listening on localhost:{port}")
+    try:
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        server.stop(None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
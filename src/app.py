@@ -6,10 +6,21 @@ to generate career growth strategies.
 """
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import hashlib
+import hmac
 import os
+import re
+import sqlite3
 import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Ensure src directory is on sys.path for local/dev execution
 import sys
@@ -17,23 +28,57 @@ CURRENT_DIR = Path(__file__).resolve().parent
 if str(CURRENT_DIR) not in sys.path:
     sys.path.append(str(CURRENT_DIR))
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Header, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Header, Depends, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import Config
-from logger import setup_logger
+from logger import request_id_var, setup_logger
 from pipeline import (
     extract_linkedin_profile,
+    extract_profile_from_text,
     parse_resume,
     generate_gap_analysis,
     generate_strategy,
     format_dashboard,
+    pipeline_version,
 )
+from history_store import close_history_store, get_history_store
+from metrics import (
+    ANALYZE_COALESCED,
+    CACHE_HITS,
+    CACHE_MISSES,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    DASHBOARD_RENDER_SECONDS,
+    ERRORS,
+    EXECUTOR_QUEUE_DEPTH,
+    GAP_ANALYSIS_SECONDS,
+    IN_FLIGHT_REQUESTS,
+    OCR_SECONDS,
+    REGISTRY,
+    RESUME_PARSE_SECONDS,
+    STRATEGY_SECONDS,
+    UPLOAD_READ_SECONDS,
+)
+from ocr_engine import close_engine, get_engine
+from profiler import ProfileSession, active_profile, profiler
+from rate_limit import ConcurrencyLimiter, RateLimiter, RateLimitExceeded
+from sandbox import SandboxLimitExceeded, SandboxUnavailable, close_sandbox, get_sandbox, run_sandboxed
+from screenshots import dedupe_screenshots, stitch_texts
+from single_flight import SingleFlight
+from skill_index import skill_index
+from tracing import Span, Trace, span, tracer
+from token_cache import SigningKeyRefresher, VerifiedTokenCache
+from vision_client import vision_pool
 
 # Set up module logger
 logger = setup_logger(__name__)
 
+# Wall-clock duration (seconds) of each module-level init step, reported by
+# startup_report.py to track cold-start cost.
+STARTUP_TIMINGS: Dict[str, float] = {}
+
+_step_start = time.perf_counter()
 try:
     from google.cloud import vision  # type: ignore
     HAS_VISION_API = True
@@ -41,11 +86,54 @@ except Exception:  # pragma: no cover - optional
     vision = None
     HAS_VISION_API = False
     logger.warning("Google Cloud Vision API not available")
+STARTUP_TIMINGS["vision_import"] = time.perf_counter() - _step_start
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create process-wide clients at worker startup and close them at shutdown."""
+    if HAS_VISION_API:
+        try:
+            vision_pool.start()
+        except Exception as e:
+            # Not fatal: requests can still use tesseract, and get() retries lazily
+            logger.warning("Vision client pool not started: %s", e)
+    if Config.SANDBOX_ENABLED:
+        try:
+            # Resume parsing and local OCR run in these worker processes
+            get_sandbox()
+        except Exception as e:
+            logger.warning("Parser sandbox not started: %s", e)
+    else:
+        try:
+            # Loads tesseract models up front when the in-process engine pool is selected
+            get_engine()
+        except Exception as e:
+            logger.warning("OCR engine not started: %s", e)
+    if Config.HISTORY_ENABLED:
+        try:
+            # Opens the database and starts its background writer/maintenance thread
+            get_history_store()
+            if Config.SEARCH_INDEX_ENABLED:
+                await run_blocking(_rebuild_skill_index)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Analysis history store not started: %s", e)
+    if Config.FIREBASE_ENABLED:
+        key_refresher.start()
+    yield
+    key_refresher.stop()
+    vision_pool.close()
+    close_engine()
+    close_sandbox()
+    close_history_store()
 
+
+_step_start = time.perf_counter()
 app = FastAPI(
     title=Config.APP_TITLE,
     version=Config.APP_VERSION,
-    description="Analyze LinkedIn profiles and resumes to generate career growth strategies"
+    description="Analyze LinkedIn profiles and resumes to generate career growth strategies",
+    lifespan=lifespan,
 )
 
 # Enable CORS for Flutter web client
@@ -55,10 +143,13 @@ app.add_middleware(
     allow_credentials=Config.CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Analysis-Fingerprint"],
 )
-logger.info(f"CORS configured with origins: {Config.CORS_ORIGINS}")
+logger.info("CORS configured with origins: %s", Config.CORS_ORIGINS)
+STARTUP_TIMINGS["fastapi_app"] = time.perf_counter() - _step_start
 
 # Optional: Initialize Firebase Admin (requires firebase-adminsdk.json)
+_step_start = time.perf_counter()
 try:
     import firebase_admin
     from firebase_admin import auth as firebase_auth, credentials
@@ -74,12 +165,81 @@ try:
 except ImportError:
     Config.FIREBASE_ENABLED = False
     logger.warning("Firebase Admin SDK not available")
+STARTUP_TIMINGS["firebase_init"] = time.perf_counter() - _step_start
+
+token_cache = VerifiedTokenCache()
+key_refresher = SigningKeyRefresher()
+rate_limiter = RateLimiter()
+ocr_limiter = ConcurrencyLimiter()
+analysis_flights = SingleFlight()
+
+# Blocking OCR and parsing work runs here so it doesn't stall the event loop
+blocking_executor = ThreadPoolExecutor(
+    max_workers=Config.ANALYZE_WORKER_THREADS,
+    thread_name_prefix="analyze",
+)
+
+# Incoming X-Request-ID values accepted as-is (anything else is replaced)
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+# Input fingerprint of an analysis (hex SHA-256, X-Analysis-Fingerprint)
+FINGERPRINT_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking function in the analysis executor, tracking queue depth.
+    
+    The caller's context (current trace span, profile session) is carried
+    into the worker thread.
+    """
+    EXECUTOR_QUEUE_DEPTH.inc()
+    profile = active_profile.get() if Config.PROFILING_ENABLED else None
+    context = contextvars.copy_context()
+    
+    def task():
+        EXECUTOR_QUEUE_DEPTH.dec()
+        if profile is not None:
+            return context.run(profile.run, fn, *args)
+        return context.run(fn, *args)
+    
+    return await asyncio.get_running_loop().run_in_executor(blocking_executor, task)
+
+
+@app.middleware("http")
+async def track_in_flight_requests(request: Request, call_next):
+    """Track in-flight requests (excluding metrics scrapes)."""
+    if request.url.path == "/metrics":
+        return await call_next(request)
+    with IN_FLIGHT_REQUESTS.track_in_progress():
+        return await call_next(request)
+
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    """
+    Tag the request (and every log record it produces) with a request ID.
+    
+    Reuses a well-formed incoming X-Request-ID, otherwise generates one, and
+    echoes it in the response headers.
+    """
+    incoming = request.headers.get("x-request-id", "")
+    request_id = incoming if REQUEST_ID_PATTERN.fullmatch(incoming) else uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
 
 
 async def verify_firebase_token(authorization: Optional[str] = Header(None)) -> Optional[dict]:
     """
     Optional Firebase auth verification. Skipped if Firebase not configured.
     
+    Verified tokens are cached until their `exp`, so repeat requests with the
+    same ID token skip signature verification.
+    
     Args:
         authorization: Authorization header with Bearer token
     
@@ -100,36 +260,171 @@ async def verify_firebase_token(authorization: Optional[str] = Header(None)) ->
         )
     
     token = authorization.split("Bearer ")[1]
+    cached_token = token_cache.get(token)
+    if cached_token is not None:
+        CACHE_HITS.inc(cache="firebase_token")
+        logger.debug("Firebase token cache hit for user: %s", cached_token.get("uid"))
+        return cached_token
+    CACHE_MISSES.inc(cache="firebase_token")
+    
     try:
-        decoded_token = firebase_auth.verify_id_token(token)
-        logger.info(f"Firebase token verified for user: {decoded_token.get('uid')}")
+        decoded_token = firebase_auth.verify_id_token(token, check_revoked=Config.FIREBASE_CHECK_REVOKED)
+        token_cache.put(token, decoded_token)
+        logger.info("Firebase token verified for user: %s", decoded_token.get("uid"))
         return decoded_token
     except Exception as e:
-        logger.error(f"Firebase token verification failed: {e}")
+        logger.error("Firebase token verification failed: %s", e)
         raise HTTPException(
             status_code=401,
             detail=f"Invalid Firebase token: {str(e)}"
         )
 
 
+def _is_admin(admin_token: Optional[str]) -> bool:
+    """Check an admin token in constant time (always False if admin API disabled)."""
+    return bool(Config.ADMIN_TOKEN and admin_token) and hmac.compare_digest(admin_token, Config.ADMIN_TOKEN)
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Require a valid X-Admin-Token header.
+    
+    Raises:
+        HTTPException: 403 if the admin API is disabled, 401 if the token is invalid
+    """
+    if not Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API disabled")
+    if not _is_admin(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+async def trace_request(request: Request):
+    """Trace the request; the trace is exported (and slow-logged) when it finishes."""
+    with tracer.start_trace(f"{request.method} {request.url.path}", request_id=request_id_var.get()) as trace:
+        yield trace
+
+
+async def profile_request(
+    request: Request,
+    x_profile_request: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Select the request for sampling profiling when profiling is enabled.
+    
+    Requests are sampled at Config.PROFILING_SAMPLE_RATE; an admin can force
+    profiling of a single request with `X-Profile-Request: 1`. The profile is
+    stored when the request finishes.
+    """
+    if not Config.PROFILING_ENABLED:
+        yield None
+        return
+    
+    session = profiler.select(
+        f"{request.method} {request.url.path}",
+        forced=bool(x_profile_request) and _is_admin(x_admin_token),
+    )
+    if session is None:
+        yield None
+        return
+    
+    token = active_profile.set(session)
+    try:
+        yield session
+    finally:
+        try:
+            active_profile.reset(token)
+        except ValueError:
+            # Teardown ran in a different context; the request context is discarded anyway
+            pass
+        profiler.save(session)
+
+
+def _client_key(request: Request, user: Optional[dict]) -> str:
+    """
+    Rate limit key: Firebase uid when authenticated, otherwise client IP.
+    
+    With Config.RATE_LIMIT_TRUST_FORWARDED_FOR the IP is the X-Forwarded-For
+    entry appended by the outermost trusted proxy, i.e. the
+    Config.RATE_LIMIT_TRUSTED_PROXY_HOPS-th from the right. Entries further
+    left are written by the client and could be rotated to dodge the limit.
+    """
+    if user and user.get("uid"):
+        return f"uid:{user['uid']}"
+    
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for and Config.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        hops = [entry.strip() for entry in forwarded_for.split(",")]
+        if len(hops) >= Config.RATE_LIMIT_TRUSTED_PROXY_HOPS and hops[-Config.RATE_LIMIT_TRUSTED_PROXY_HOPS]:
+            return f"ip:{hops[-Config.RATE_LIMIT_TRUSTED_PROXY_HOPS]}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def admit_analyze_request(
+    request: Request,
+    screenshots: List[UploadFile] = File(default=[]),
+    linkedin_text: Optional[str] = Form(None),
+    user: Optional[dict] = Depends(verify_firebase_token),
+):
+    """
+    Admission control for /analyze: per-client rate limit plus a global cap on
+    concurrent OCR-heavy requests. The OCR slot is held until the request ends.
+    
+    Each screenshot that will be OCR'd costs one extra rate limit token.
+    
+    Raises:
+        HTTPException: 429 when the client is over its rate limit, 503 when all
+            OCR slots are busy (both with Retry-After)
+    """
+    ocr_heavy = bool(screenshots) and not linkedin_text
+    try:
+        if Config.RATE_LIMIT_ENABLED:
+            rate_limiter.check(_client_key(request, user), cost=1 + (len(screenshots) if ocr_heavy else 0))
+        
+        if not ocr_heavy:
+            yield
+            return
+        
+        with ocr_limiter.slot():
+            yield
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header},
+        )
+
+
 @app.post("/analyze")
 async def analyze(
+    request: Request,
     mode: str = Form(..., pattern=r"^(Get Hired|Grow Connections|Influence Market)$"),
     resume: UploadFile = File(...),
     screenshots: List[UploadFile] = File(default=[]),
     linkedin_text: Optional[str] = Form(None),  # JSON string with LinkedIn data
     use_cloud_vision: bool = Form(True),  # Default to Cloud Vision for production
+    if_none_match: Optional[str] = Header(None),  # ETag of a result the client already holds
+    trace: Trace = Depends(trace_request),  # Span tree + slow-request log
     user: Optional[dict] = Depends(verify_firebase_token),  # Optional Firebase auth
+    _admitted: None = Depends(admit_analyze_request),  # Rate limit + OCR concurrency cap
+    profile: Optional[ProfileSession] = Depends(profile_request),  # Opt-in sampling profiler
 ):
     """
     Analyze LinkedIn profile and resume to generate career strategy.
     
+    Identical concurrent requests from the same client share one analysis
+    (Config.COALESCE_IDENTICAL_REQUESTS). Responses carry a weak ETag of the
+    inputs and pipeline version; a request whose If-None-Match holds it gets
+    a 304 once the uploads are hashed, before any parsing or OCR.
+    
     Args:
+        request: Incoming request (client key for coalescing)
         mode: Strategic mode - "Get Hired", "Grow Connections", or "Influence Market"
         resume: Resume file (PDF, DOCX, or TXT)
         screenshots: Optional LinkedIn profile screenshots for OCR
         linkedin_text: Optional manual LinkedIn data as JSON string (preferred over OCR)
         use_cloud_vision: Use Google Cloud Vision API for OCR (default: True)
+        if_none_match: If-None-Match header
         user: Optional Firebase user data (if authentication enabled)
     
     Returns:
@@ -138,7 +433,7 @@ async def analyze(
     Raises:
         HTTPException: For validation errors or processing failures
     """
-    logger.info(f"Received analysis request - mode: {mode}, user: {user.get('uid') if user else 'anonymous'}")
+    logger.info("Received analysis request - mode: %s, user: %s", mode, user.get("uid") if user else "anonymous")
     
     # Validate inputs
     if not linkedin_text and not screenshots:
@@ -151,7 +446,7 @@ async def analyze(
     # Validate resume file
     resume_ext = Path(resume.filename).suffix.lower()
     if resume_ext not in Config.ALLOWED_RESUME_EXTENSIONS:
-        logger.warning(f"Invalid resume format: {resume_ext}")
+        logger.warning("Invalid resume format: %s", resume_ext)
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported resume format: {resume_ext}. Allowed: {Config.ALLOWED_RESUME_EXTENSIONS}"
@@ -161,7 +456,7 @@ async def analyze(
     for screenshot in screenshots:
         img_ext = Path(screenshot.filename).suffix.lower()
         if img_ext not in Config.ALLOWED_IMAGE_EXTENSIONS:
-            logger.warning(f"Invalid screenshot format: {img_ext}")
+            logger.warning("Invalid screenshot format: %s", img_ext)
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported image format: {img_ext}. Allowed: {Config.ALLOWED_IMAGE_EXTENSIONS}"
@@ -170,89 +465,305 @@ async def analyze(
     try:
         # Save uploads to temp files
         with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            
-            # Save resume
-            resume_path = tmpdir_path / resume.filename
-            resume_bytes = await resume.read()
-            
-            # Validate file size
-            if len(resume_bytes) > Config.MAX_UPLOAD_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Resume file too large. Max size: {Config.MAX_UPLOAD_SIZE} bytes"
+            content_hash = hashlib.sha256()
+            _update_fingerprint(content_hash, b"mode", mode.encode("utf-8"))
+            _update_fingerprint(content_hash, b"linkedin_text", (linkedin_text or "").encode("utf-8"))
+            with span("upload") as upload_span:
+                resume_path, screenshot_paths = await _save_uploads(
+                    Path(tmpdir), resume, screenshots, content_hash, upload_span
                 )
-            
-            resume_path.write_bytes(resume_bytes)
-            logger.info(f"Saved resume: {resume.filename} ({len(resume_bytes)} bytes)")
-
-            # Save screenshots if provided
-            screenshot_paths: List[Path] = []
-            for file in screenshots:
-                shot_bytes = await file.read()
-                if len(shot_bytes) > Config.MAX_UPLOAD_SIZE:
+            fingerprint = content_hash.hexdigest()
+            trace.fingerprint = fingerprint[:16]
+            user_key = user.get("uid") if user else None
+            etag_headers = _etag_headers(fingerprint)
+
+            # The client already holds the result for these inputs and this pipeline version
+            not_modified = _not_modified(if_none_match, etag_headers)
+            if not_modified is not None:
+                return not_modified
+
+            # Identical inputs already analysed by this user under the current pipeline version
+            if user_key and Config.HISTORY_ENABLED:
+                stored = await run_blocking(_stored_result, user_key, fingerprint)
+                if stored is not None:
+                    return JSONResponse(stored, headers=etag_headers)
+
+            async def compute() -> dict:
+                # Prioritize manual text input over OCR
+                if linkedin_text:
+                    logger.info("Using manual LinkedIn text input")
+                    linkedin_profile = _parse_linkedin_text(linkedin_text)
+                elif screenshot_paths:
+                    logger.info("Using OCR extraction from %d screenshots", len(screenshot_paths))
+                    linkedin_profile = await _extract_linkedin(screenshot_paths, use_cloud_vision)
+                else:
+                    # This should not happen due to earlier validation
                     raise HTTPException(
                         status_code=400,
-                        detail=f"Screenshot file too large. Max size: {Config.MAX_UPLOAD_SIZE} bytes"
+                        detail="Must provide either linkedin_text or screenshots"
                     )
-                shot_path = tmpdir_path / file.filename
-                shot_path.write_bytes(shot_bytes)
-                screenshot_paths.append(shot_path)
-                logger.info(f"Saved screenshot: {file.filename} ({len(shot_bytes)} bytes)")
-
-            # Prioritize manual text input over OCR
-            if linkedin_text:
-                logger.info("Using manual LinkedIn text input")
-                linkedin_profile = _parse_linkedin_text(linkedin_text)
-            elif screenshot_paths:
-                logger.info(f"Using OCR extraction from {len(screenshot_paths)} screenshots")
-                linkedin_profile = await _extract_linkedin(screenshot_paths, use_cloud_vision)
-            else:
-                # This should not happen due to earlier validation
-                raise HTTPException(
-                    status_code=400,
-                    detail="Must provide either linkedin_text or screenshots"
-                )
 
-            # Parse resume and generate strategy
-            logger.info("Parsing resume")
-            resume_data = parse_resume(resume_path)
-            
-            logger.info("Generating gap analysis")
-            gaps = generate_gap_analysis(linkedin_profile, resume_data)
-            
-            logger.info(f"Generating strategy for mode: {mode}")
-            strategy = generate_strategy(mode, gaps, linkedin_profile, resume_data)
-            
-            logger.info(f"Strategy generated - score: {strategy.profile_score}/100")
-
-            return JSONResponse(
-                {
-                    "mode": strategy.mode,
-                    "profile_score": strategy.profile_score,
-                    "immediate_fixes": strategy.immediate_fixes,
-                    "strategic_roadmap": strategy.strategic_roadmap,
-                    "gaps": strategy.gaps.__dict__,
-                    "dashboard_markdown": format_dashboard(strategy),
-                }
-            )
+                # Parse resume and generate strategy
+                return await run_blocking(_run_analysis, mode, linkedin_profile, resume_path, user_key, fingerprint)
+
+            if Config.COALESCE_IDENTICAL_REQUESTS:
+                # Retries and double taps join the identical analysis already running for this client
+                flight_key = f"{_client_key(request, user)}\0{use_cloud_vision:d}\0{fingerprint}"
+                result, shared = await analysis_flights.run(flight_key, compute)
+                ANALYZE_COALESCED.inc(role="follower" if shared else "leader")
+                if shared:
+                    trace.root.set(coalesced=True)
+            else:
+                result = await compute()
+            headers = {**etag_headers, "X-Profile-Id": profile.profile_id} if profile else etag_headers
+            return JSONResponse(result, headers=headers)
     
-    except HTTPException:
+    except HTTPException as e:
+        ERRORS.inc(type=f"http_{e.status_code}")
         raise
+    except SandboxLimitExceeded as e:
+        # The upload itself is the problem; its worker has already been replaced
+        ERRORS.inc(type=f"sandbox_{e.reason}")
+        logger.warning("Upload rejected by parser sandbox (%s): %s", e.reason, e)
+        raise HTTPException(status_code=422, detail=str(e))
+    except SandboxUnavailable as e:
+        # Workers all busy or failing to start; not the upload's fault
+        ERRORS.inc(type="sandbox_unavailable")
+        logger.error("Parser sandbox unavailable: %s", e)
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
+        ERRORS.inc(type="ValueError")
+        logger.error("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except FileNotFoundError as e:
-        logger.error(f"File not found: {e}")
+        ERRORS.inc(type="FileNotFoundError")
+        logger.error("File not found: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.exception(f"Unexpected error during analysis: {e}")
+        ERRORS.inc(type=type(e).__name__)
+        logger.exception("Unexpected error during analysis: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
 
+def _update_fingerprint(content_hash: "hashlib._Hash", tag: bytes, data: bytes) -> None:
+    """Add one tagged, length-prefixed input to the fingerprint, so no two input sets share a byte stream."""
+    content_hash.update(tag + b"\0" + len(data).to_bytes(8, "big") + data)
+
+
+async def _save_uploads(
+    tmpdir_path: Path,
+    resume: UploadFile,
+    screenshots: List[UploadFile],
+    content_hash: "hashlib._Hash",
+    upload_span: Span,
+) -> Tuple[Path, List[Path]]:
+    """
+    Read uploaded files, validate their size and save them to a temp directory.
+    
+    Args:
+        tmpdir_path: Directory to save files in
+        resume: Uploaded resume
+        screenshots: Uploaded screenshots
+        content_hash: Fingerprint hash, updated with every file's digest
+        upload_span: Span receiving size attributes
+    
+    Returns:
+        Tuple of (resume path, screenshot paths)
+    
+    Raises:
+        HTTPException: If a file exceeds Config.MAX_UPLOAD_SIZE
+    """
+    upload_start = time.perf_counter()
+    
+    # Save resume
+    resume_path = tmpdir_path / resume.filename
+    resume_bytes = await resume.read()
+    
+    # Validate file size
+    if len(resume_bytes) > Config.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Resume file too large. Max size: {Config.MAX_UPLOAD_SIZE} bytes"
+        )
+    
+    resume_path.write_bytes(resume_bytes)
+    _update_fingerprint(content_hash, b"resume", hashlib.sha256(resume_bytes).digest())
+    logger.info("Saved resume: %s (%d bytes)", resume.filename, len(resume_bytes))
+    
+    # Save screenshots if provided
+    screenshot_paths: List[Path] = []
+    screenshot_bytes = 0
+    for file in screenshots:
+        shot_bytes = await file.read()
+        if len(shot_bytes) > Config.MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Screenshot file too large. Max size: {Config.MAX_UPLOAD_SIZE} bytes"
+            )
+        shot_path = tmpdir_path / file.filename
+        shot_path.write_bytes(shot_bytes)
+        _update_fingerprint(content_hash, b"screenshot", hashlib.sha256(shot_bytes).digest())
+        screenshot_paths.append(shot_path)
+        screenshot_bytes += len(shot_bytes)
+        logger.info("Saved screenshot: %s (%d bytes)", file.filename, len(shot_bytes))
+    
+    UPLOAD_READ_SECONDS.observe(time.perf_counter() - upload_start)
+    upload_span.set(
+        resume_bytes=len(resume_bytes),
+        screenshots=len(screenshot_paths),
+        screenshot_bytes=screenshot_bytes,
+    )
+    return resume_path, screenshot_paths
+
+
+def _run_analysis(
+    mode: str,
+    linkedin_profile,
+    resume_path: Path,
+    user_key: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+) -> dict:
+    """
+    Parse the resume and build the strategy response payload.
+    
+    Blocking; runs in the analysis executor. The resume itself is parsed in a
+    sandbox worker process (see sandbox.py).
+    
+    Args:
+        mode: Strategic mode
+        linkedin_profile: LinkedInProfile from text input or OCR
+        resume_path: Path to saved resume file
+        user_key: Signed-in user's uid; their analysis is added to the search
+            index and history store when those are enabled
+        fingerprint: Input fingerprint the analysis is stored under
+    
+    Returns:
+        Response payload dict for /analyze
+    """
+    logger.info("Parsing resume")
+    with RESUME_PARSE_SECONDS.time(format=resume_path.suffix.lower().lstrip(".")):
+        resume_data = run_sandboxed(parse_resume, resume_path)
+    
+    logger.info("Generating gap analysis")
+    with GAP_ANALYSIS_SECONDS.time():
+        gaps = generate_gap_analysis(linkedin_profile, resume_data)
+    
+    logger.info("Generating strategy for mode: %s", mode)
+    with STRATEGY_SECONDS.time():
+        strategy = generate_strategy(mode, gaps, linkedin_profile, resume_data)
+    
+    logger.info("Strategy generated - score: %d/100", strategy.profile_score)
+    
+    with DASHBOARD_RENDER_SECONDS.time(), span("render") as render_span:
+        dashboard = format_dashboard(strategy)
+        render_span.set(chars=len(dashboard))
+    
+    result = {
+        "mode": strategy.mode,
+        "profile_score": strategy.profile_score,
+        "immediate_fixes": strategy.immediate_fixes,
+        "strategic_roadmap": strategy.strategic_roadmap,
+        "gaps": strategy.gaps.__dict__,
+        "dashboard_markdown": dashboard,
+    }
+    
+    if user_key and Config.SEARCH_INDEX_ENABLED:
+        skill_index.add(user_key, linkedin_profile, resume_data, gaps, strategy.profile_score)
+    if user_key and fingerprint and Config.HISTORY_ENABLED:
+        try:
+            # Queued; written by the store's background thread
+            get_history_store().save(user_key, fingerprint, pipeline_version(), {
+                "linkedin": asdict(linkedin_profile),
+                "resume": asdict(resume_data),
+                "gaps": asdict(gaps),
+                "result": result,
+            })
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Analysis not stored in history: %s", e)
+    
+    return result
+
+
+def _rebuild_skill_index() -> int:
+    """
+    Index each user's latest stored analysis (worker startup).
+    
+    The skill index lives in process memory; the history store is what
+    survives a restart.
+    
+    Returns:
+        Number of profiles indexed
+    """
+    count = 0
+    for user_key, payload in get_history_store().latest_payloads():
+        skill_index.add(user_key, payload.get("linkedin", {}), payload.get("resume", {}), payload.get("gaps", {}),
+                        payload.get("result", {}).get("profile_score", 0))
+        count += 1
+    logger.info("Rebuilt skill index from history: %d profiles", count)
+    return count
+
+
+def _stored_result(user_key: str, fingerprint: str, touch: bool = True) -> Optional[dict]:
+    """
+    Response of an identical earlier analysis by this user, if still current.
+    
+    A read of one indexed row; in WAL mode it never waits for the history
+    writer, but it can still wait on disk, so call it off the event loop.
+    
+    Args:
+        user_key: Signed-in user's uid
+        fingerprint: Input fingerprint
+        touch: Count the lookup as a re-analysis (times_analyzed, recency)
+    """
+    version = pipeline_version()
+    try:
+        store = get_history_store()
+        payload = store.find(user_key, fingerprint, version)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Analysis history lookup failed: %s", e)
+        return None
+    if payload is None:
+        CACHE_MISSES.inc(cache="history")
+        return None
+    CACHE_HITS.inc(cache="history")
+    if touch:
+        store.touch(user_key, fingerprint, version)
+    logger.info("Serving stored analysis %s", fingerprint[:16])
+    return payload["result"]
+
+
+def _etag_headers(fingerprint: str) -> Dict[str, str]:
+    """
+    ETag and fingerprint headers of the analysis of these inputs.
+    
+    The ETag is weak: the same inputs get an equivalent analysis, but not a
+    byte-identical body (the dashboard carries the analysis date). It covers
+    the pipeline version (app version plus profile rules revision and
+    contents), so a version bump or rules edit invalidates every earlier ETag.
+    """
+    digest = hashlib.sha256(f"{fingerprint}\0{pipeline_version()}".encode("utf-8")).hexdigest()
+    return {"ETag": f'W/"{digest[:32]}"', "X-Analysis-Fingerprint": fingerprint}
+
+
+def _not_modified(if_none_match: Optional[str], headers: Dict[str, str]) -> Optional[Response]:
+    """
+    304 response when If-None-Match lists the current ETag, else None.
+    
+    Uses the weak comparison If-None-Match calls for (W/ prefixes are ignored).
+    """
+    if not if_none_match:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if headers["ETag"].removeprefix("W/") not in tags:
+        CACHE_MISSES.inc(cache="etag")
+        return None
+    CACHE_HITS.inc(cache="etag")
+    return Response(status_code=304, headers=headers)
+
+
 def _parse_linkedin_text(linkedin_json: str):
     """
     Parse manual LinkedIn text input from Flutter form.
@@ -284,19 +795,19 @@ def _parse_linkedin_text(linkedin_json: str):
         certs_str = data.get("certifications", "").strip()
         profile.certifications = [c.strip() for c in certs_str.split(",") if c.strip()]
         
-        logger.info(f"Parsed LinkedIn text - headline: {bool(profile.headline)}, "
-                   f"skills: {len(profile.skills)}, certs: {len(profile.certifications)}")
+        logger.info("Parsed LinkedIn text - headline: %s, skills: %d, certs: %d",
+                    bool(profile.headline), len(profile.skills), len(profile.certifications))
         
         return profile
         
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in linkedin_text: {e}")
+        logger.error("Invalid JSON in linkedin_text: %s", e)
         raise HTTPException(
             status_code=400,
             detail=f"Invalid linkedin_text JSON: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Failed to parse linkedin_text: {e}")
+        logger.error("Failed to parse linkedin_text: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to parse linkedin_text: {str(e)}"
@@ -304,6 +815,26 @@ def _parse_linkedin_text(linkedin_json: str):
 
 
 async def _extract_linkedin(paths: List[Path], use_cloud_vision: bool):
+    """
+    Extract LinkedIn profile data from screenshots using OCR in the analysis executor.
+    
+    Args:
+        paths: List of screenshot file paths
+        use_cloud_vision: Whether to use Google Cloud Vision API
+    
+    Returns:
+        LinkedInProfile object with extracted data
+    """
+    backend = "vision" if use_cloud_vision else "tesseract"
+    
+    def ocr():
+        with OCR_SECONDS.time(backend=backend), span("ocr", backend=backend, screenshots=len(paths)):
+            return _extract_linkedin_sync(paths, use_cloud_vision)
+    
+    return await run_blocking(ocr)
+
+
+def _extract_linkedin_sync(paths: List[Path], use_cloud_vision: bool):
     """
     Extract LinkedIn profile data from screenshots using OCR.
     
@@ -316,6 +847,8 @@ async def _extract_linkedin(paths: List[Path], use_cloud_vision: bool):
     
     Raises:
         HTTPException: If OCR extraction fails or Vision API unavailable
+        SandboxLimitExceeded: If decoding or OCR of a screenshot exceeds the sandbox limits
+        SandboxUnavailable: If no sandbox worker became available
     """
     if use_cloud_vision:
         if not HAS_VISION_API:
@@ -326,19 +859,21 @@ async def _extract_linkedin(paths: List[Path], use_cloud_vision: bool):
             )
         
         try:
-            logger.info(f"Using Cloud Vision API for {len(paths)} screenshots")
-            client = vision.ImageAnnotatorClient()
+            logger.info("Using Cloud Vision API for %d screenshots", len(paths))
+            client = vision_pool.get()
             texts: List[str] = []
             
-            for path in paths:
+            for path in run_sandboxed(dedupe_screenshots, paths):
                 with path.open("rb") as f:
                     content = f.read()
                 
-                image = vision.Image(content=content)
-                response = client.document_text_detection(image=image)
+                with span("ocr.screenshot", backend="vision", bytes=len(content)) as ocr_span:
+                    image = vision.Image(content=content)
+                    response = client.document_text_detection(image=image)
+                    ocr_span.set(chars=len(response.full_text_annotation.text or ""))
                 
                 if response.error.message:
-                    logger.error(f"Vision API error: {response.error.message}")
+                    logger.error("Vision API error: %s", response.error.message)
                     raise HTTPException(
                         status_code=500,
                         detail=f"Vision API error: {response.error.message}"
@@ -347,7 +882,7 @@ async def _extract_linkedin(paths: List[Path], use_cloud_vision: bool):
                 if response.full_text_annotation and response.full_text_annotation.text:
                     text = response.full_text_annotation.text
                     texts.append(text)
-                    logger.info(f"Extracted {len(text)} chars from {path.name} via Vision API")
+                    logger.info("Extracted %d chars from %s via Vision API", len(text), path.name)
             
             if not texts:
                 logger.warning("No text extracted from screenshots via Vision API")
@@ -356,26 +891,65 @@ async def _extract_linkedin(paths: List[Path], use_cloud_vision: bool):
                     detail="No text extracted from screenshots. Please ensure images contain visible text."
                 )
             
-            # Write merged text to temp to reuse pipeline parsing
-            merged = "\n".join(texts)
-            tmp = Path(tempfile.mkstemp(suffix=".txt")[1])
-            tmp.write_text(merged, encoding="utf-8")
-            profile = extract_linkedin_profile([tmp])
-            tmp.unlink()  # Clean up temp file
-            return profile
+            # Reuse the pipeline's field extraction on the stitched OCR text
+            return extract_profile_from_text(stitch_texts(texts))
             
-        except HTTPException:
+        except (HTTPException, SandboxLimitExceeded, SandboxUnavailable):
             raise
         except Exception as e:
-            logger.exception(f"OCR extraction failed with Cloud Vision: {e}")
+            logger.exception("OCR extraction failed with Cloud Vision: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail=f"OCR extraction failed: {str(e)}"
             )
     
     # Fallback to pytesseract (local only)
-    logger.info(f"Using pytesseract for {len(paths)} screenshots")
-    return extract_linkedin_profile(paths)
+    logger.info("Using pytesseract for %d screenshots", len(paths))
+    return run_sandboxed(extract_linkedin_profile, paths)
+
+
+@app.api_route("/analyze/{fingerprint}", methods=["GET", "HEAD"])
+def analysis_by_fingerprint(
+    request: Request,
+    fingerprint: str,
+    if_none_match: Optional[str] = Header(None),
+    user: Optional[dict] = Depends(verify_firebase_token),
+):
+    """
+    Revalidate or fetch an analysis by its input fingerprint, without uploads.
+    
+    A plain function: FastAPI runs it in its threadpool, off the event loop,
+    because it may read the history database.
+    
+    Returns 304 when If-None-Match holds the current ETag for the fingerprint
+    (the client's copy is still what /analyze would return). Otherwise the
+    signed-in user's stored result for these inputs under the current
+    pipeline version, when analysis history is enabled.
+    
+    Args:
+        fingerprint: X-Analysis-Fingerprint of an earlier /analyze response
+        if_none_match: If-None-Match header
+        user: Optional Firebase user data
+    
+    Raises:
+        HTTPException: 400 for a malformed fingerprint, 404 when there is no
+            current result to return (POST /analyze again)
+    """
+    if not FINGERPRINT_PATTERN.fullmatch(fingerprint):
+        raise HTTPException(status_code=400, detail="Invalid analysis fingerprint")
+    
+    headers = _etag_headers(fingerprint)
+    not_modified = _not_modified(if_none_match, headers)
+    if not_modified is not None:
+        return not_modified
+    
+    user_key = user.get("uid") if user else None
+    stored = _stored_result(user_key, fingerprint, touch=False) if user_key and Config.HISTORY_ENABLED else None
+    if stored is None:
+        raise HTTPException(status_code=404, detail="No current analysis for this fingerprint")
+    if request.method == "HEAD":
+        return Response(headers=headers)
+    return JSONResponse(stored, headers=headers)
 
 
 @app.get("/health")
@@ -394,6 +968,127 @@ async def health():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus metrics endpoint.
+    
+    Returns:
+        Per-stage latency histograms, cache/error counters and load gauges
+        in the Prometheus text exposition format
+    """
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+def _history_user(user: Optional[dict]) -> str:
+    """uid of the signed-in user whose history is requested."""
+    if not Config.HISTORY_ENABLED:
+        raise HTTPException(status_code=404, detail="Analysis history disabled")
+    if not user or not user.get("uid"):
+        raise HTTPException(status_code=401, detail="Sign in to see your analysis history")
+    return user["uid"]
+
+
+@app.get("/history")
+def history(
+    limit: int = Query(10, ge=1, le=100),
+    user: Optional[dict] = Depends(verify_firebase_token),
+):
+    """
+    The signed-in user's latest analyses, newest first.
+    
+    Plain function (run in FastAPI's threadpool): it reads the history database.
+    
+    Returns:
+        Summaries (fingerprint, mode, score, times) without payloads
+    """
+    uid = _history_user(user)
+    entries = get_history_store().latest(uid, limit)
+    return {"analyses": [asdict(entry) for entry in entries]}
+
+
+@app.get("/history/diff")
+def history_diff(
+    id: Optional[int] = None,
+    user: Optional[dict] = Depends(verify_firebase_token),
+):
+    """
+    Compare an analysis (default: the latest) with the user's previous one.
+    
+    Plain function (run in FastAPI's threadpool): it reads the history database.
+    
+    Returns:
+        Both summaries, the score change and added/removed skills, gaps and fixes
+    
+    Raises:
+        HTTPException: If the user has no such analysis
+    """
+    uid = _history_user(user)
+    diff = get_history_store().diff(uid, id)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="No stored analysis")
+    return asdict(diff)
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """
+    List stored request profiles (admin only).
+    
+    Returns:
+        Profiling status and profile summaries, newest first
+    """
+    return {
+        "profiling_enabled": Config.PROFILING_ENABLED,
+        "sample_rate": profiler.sample_rate,
+        "profiles": profiler.list(),
+    }
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str):
+    """
+    Retrieve a stored profile as collapsed stacks (admin only).
+    
+    The output can be fed directly to flamegraph.pl, speedscope or inferno.
+    
+    Raises:
+        HTTPException: If the profile doesn't exist
+    """
+    session = profiler.get(profile_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    return PlainTextResponse(session.collapsed())
+
+
+@app.get("/admin/search", dependencies=[Depends(require_admin)])
+async def search_profiles(
+    q: str,
+    k: int = Query(50, ge=1, le=1000),
+    rank: str = Query("score", pattern=r"^(score|bm25)$"),
+):
+    """
+    Search analysed profiles by skill (admin only).
+    
+    Args:
+        q: Boolean query, e.g. 'missing:kubernetes AND missing:terraform'
+        k: Number of hits to return
+        rank: "score" (profile score) or "bm25"
+    
+    Raises:
+        HTTPException: If the query is malformed
+    """
+    try:
+        results = skill_index.search(q, k=k, rank=rank)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "total": results.total,
+        "indexed": len(skill_index),
+        "hits": [hit.__dict__ for hit in results.hits],
+    }
+
+
 def get_app() -> FastAPI:
     """Get FastAPI application instance."""
     return app
@@ -402,8 +1097,8 @@ def get_app() -> FastAPI:
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info(f"Starting {Config.APP_TITLE} v{Config.APP_VERSION}")
-    logger.info(f"Server: {Config.HOST}:{Config.PORT}")
+    logger.info("Starting %s v%s", Config.APP_TITLE, Config.APP_VERSION)
+    logger.info("Server: %s:%s", Config.HOST, Config.PORT)
     
     uvicorn.run(
         app,
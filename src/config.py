@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 
 class Config:
@@ -31,16 +31,66 @@ class Config:
     
     # File Upload Settings
     MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))  # 10MB default
-    ALLOWED_RESUME_EXTENSIONS: List[str] = [".pdf", ".docx", ".doc", ".txt"]
+    ALLOWED_RESUME_EXTENSIONS: List[str] = [".pdf", ".docx", ".doc", ".txt", ".odt", ".rtf", ".html", ".htm"]
     ALLOWED_IMAGE_EXTENSIONS: List[str] = [".png", ".jpg", ".jpeg"]
     
+    # Concurrency Settings
+    ANALYZE_WORKER_THREADS: int = int(os.getenv("ANALYZE_WORKER_THREADS", "4"))  # Blocking OCR/parse work
+    COALESCE_IDENTICAL_REQUESTS: bool = os.getenv("COALESCE_IDENTICAL_REQUESTS", "true").lower() == "true"  # Share in-flight analyses
+    
+    # Parser Sandbox Settings
+    SANDBOX_ENABLED: bool = os.getenv("SANDBOX_ENABLED", "true").lower() == "true"  # Parse/OCR uploads in worker processes
+    SANDBOX_WORKERS: int = int(os.getenv("SANDBOX_WORKERS", str(ANALYZE_WORKER_THREADS)))
+    SANDBOX_MEMORY_MB: int = int(os.getenv("SANDBOX_MEMORY_MB", "1024"))  # Address space per worker; 0 = no limit
+    SANDBOX_CPU_SECONDS: int = int(os.getenv("SANDBOX_CPU_SECONDS", "20"))  # CPU time per task; 0 = no limit
+    SANDBOX_TIMEOUT_S: float = float(os.getenv("SANDBOX_TIMEOUT_S", "30"))  # Wall-clock deadline per task
+    SANDBOX_MAX_TASKS: int = int(os.getenv("SANDBOX_MAX_TASKS", "500"))  # Worker replaced after this many; 0 = never
+    SANDBOX_START_METHOD: str = os.getenv("SANDBOX_START_METHOD", "forkserver")  # forkserver, spawn or fork
+    SANDBOX_ACQUIRE_TIMEOUT_S: float = float(os.getenv("SANDBOX_ACQUIRE_TIMEOUT_S", "30"))  # Wait for an idle worker, then 503
+    
+    # Admission Control Settings
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))  # Sustained /analyze cost per client
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "20"))  # Bucket size; each screenshot costs 1 extra
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "")  # "module:attribute" of a shared backend
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "false").lower() == "true"  # Only behind a proxy
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = int(os.getenv("RATE_LIMIT_TRUSTED_PROXY_HOPS", "1"))  # Proxies appending X-Forwarded-For
+    MAX_CONCURRENT_OCR_REQUESTS: int = int(os.getenv("MAX_CONCURRENT_OCR_REQUESTS", "4"))
+    OCR_BUSY_RETRY_AFTER: float = float(os.getenv("OCR_BUSY_RETRY_AFTER", "5"))  # seconds
+    
     # OCR Settings
     USE_CLOUD_VISION_DEFAULT: bool = os.getenv("USE_CLOUD_VISION_DEFAULT", "true").lower() == "true"
     TESSERACT_CMD: str = os.getenv("TESSERACT_CMD", "tesseract")
+    OCR_ENGINE: str = os.getenv("OCR_ENGINE", "pytesseract")  # pytesseract (subprocess) or tesserocr (in-process pool)
+    OCR_ENGINE_POOL_SIZE: int = int(os.getenv("OCR_ENGINE_POOL_SIZE", "2"))  # Warm tesserocr engines per worker
+    OCR_LANGUAGE: str = os.getenv("OCR_LANGUAGE", "eng")
+    OCR_ROI_ENABLED: bool = os.getenv("OCR_ROI_ENABLED", "true").lower() == "true"  # OCR profile sections only
+    OCR_LAYOUT_SCALE: float = float(os.getenv("OCR_LAYOUT_SCALE", "0.5"))  # Downscale for the header-finding pass
+    SCREENSHOT_DUPLICATE_DISTANCE: int = int(os.getenv("SCREENSHOT_DUPLICATE_DISTANCE", "10"))  # Of 256 hash bits; -1 = off
+    
+    # PDF Parsing Settings
+    PDF_BACKEND: str = os.getenv("PDF_BACKEND", "auto")  # "auto", "pdfium", "pdfminer" or "pdfplumber"
+    PDF_PROBE_PAGES: int = int(os.getenv("PDF_PROBE_PAGES", "3"))  # Pages inspected for layout by "auto"
+    PDF_LAYOUT_MAX_PAGES: int = int(os.getenv("PDF_LAYOUT_MAX_PAGES", "20"))  # Longer docs skip layout analysis
+    PDF_OCR_ENABLED: bool = os.getenv("PDF_OCR_ENABLED", "true").lower() == "true"  # OCR pages without a text layer
+    PDF_OCR_MIN_CHARS: int = int(os.getenv("PDF_OCR_MIN_CHARS", "16"))  # Fewer text-layer chars = scanned page
+    PDF_OCR_DPI: int = int(os.getenv("PDF_OCR_DPI", "200"))
+    PDF_OCR_MAX_PAGES: int = int(os.getenv("PDF_OCR_MAX_PAGES", "10"))  # Per document; the rest stay empty
+    PDF_OCR_WORKERS: int = int(os.getenv("PDF_OCR_WORKERS", "2"))  # OCR threads per document
+    
+    # Cloud Vision Client Settings
+    VISION_CHANNEL_POOL_SIZE: int = int(os.getenv("VISION_CHANNEL_POOL_SIZE", "2"))
+    VISION_KEEPALIVE_MS: int = int(os.getenv("VISION_KEEPALIVE_MS", "30000"))
+    VISION_API_ENDPOINT: str = os.getenv("VISION_API_ENDPOINT", "")  # Empty = library default
+    VISION_API_INSECURE: bool = os.getenv("VISION_API_INSECURE", "false").lower() == "true"  # Local stand-ins only
     
     # Firebase Settings
     FIREBASE_ADMIN_SDK_PATH: Path = Path(os.getenv("FIREBASE_ADMIN_SDK_PATH", "firebase-adminsdk.json"))
     FIREBASE_ENABLED: bool = False  # Set dynamically during initialization
+    FIREBASE_TOKEN_CACHE_SIZE: int = int(os.getenv("FIREBASE_TOKEN_CACHE_SIZE", "10000"))
+    FIREBASE_KEY_REFRESH_INTERVAL: float = float(os.getenv("FIREBASE_KEY_REFRESH_INTERVAL", "1800"))  # seconds
+    FIREBASE_CHECK_REVOKED: bool = os.getenv("FIREBASE_CHECK_REVOKED", "false").lower() == "true"
+    FIREBASE_REVOCATION_CHECK_INTERVAL: float = float(os.getenv("FIREBASE_REVOCATION_CHECK_INTERVAL", "300"))  # seconds
     
     # Google Cloud Settings
     GCP_PROJECT_ID: str = os.getenv("GCP_PROJECT_ID", "linkedin-strategy-ai-assistant")
@@ -49,11 +99,53 @@ class Config:
     # Logging Settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_JSON: bool = os.getenv("LOG_JSON", "false").lower() == "true"  # One JSON object per line (enabled on Cloud Run)
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # Records dropped beyond this
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))  # Fraction of per-page/per-item logs kept
+    
+    # Admin Settings
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")  # Empty disables admin endpoints
+    
+    # Recruiter Search Settings
+    SEARCH_INDEX_ENABLED: bool = os.getenv("SEARCH_INDEX_ENABLED", "false").lower() == "true"  # Index signed-in users' analyses
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))  # uvicorn worker processes
+    
+    # Analysis History Settings
+    HISTORY_ENABLED: bool = os.getenv("HISTORY_ENABLED", "false").lower() == "true"  # Store signed-in users' analyses
+    HISTORY_DB_PATH: Path = Path(os.getenv("HISTORY_DB_PATH", "analysis_history.db"))
+    HISTORY_MAX_PER_USER: int = int(os.getenv("HISTORY_MAX_PER_USER", "50"))
+    HISTORY_RETENTION_DAYS: float = float(os.getenv("HISTORY_RETENTION_DAYS", "365"))
+    HISTORY_MAINTENANCE_INTERVAL_S: float = float(os.getenv("HISTORY_MAINTENANCE_INTERVAL_S", "3600"))  # Retention + vacuum
+    
+    # Request Profiling Settings
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0.0"))  # Fraction of requests
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    PROFILING_MAX_STORED: int = int(os.getenv("PROFILING_MAX_STORED", "50"))
+    PROFILING_OUTPUT_DIR: Optional[Path] = (
+        Path(os.environ["PROFILING_OUTPUT_DIR"]) if os.getenv("PROFILING_OUTPUT_DIR") else None
+    )
+    
+    # Request Tracing Settings
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "")  # "", "console", "file", or "module:attribute"
+    TRACE_FILE_PATH: Path = Path(os.getenv("TRACE_FILE_PATH", "traces.jsonl"))
+    SLOW_REQUEST_THRESHOLD_MS: float = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "5000"))
+    SLOW_REQUEST_LOG_PATH: Path = Path(os.getenv("SLOW_REQUEST_LOG_PATH", "slow_requests.jsonl"))
+    
+    # Startup Profiling Settings
+    STARTUP_BUDGET_PATH: Path = Path(os.getenv(
+        "STARTUP_BUDGET_PATH",
+        str(Path(__file__).resolve().parent / "startup_budget.json")
+    ))
     
     # Strategy Generation Settings
     PROFILE_SCORE_MIN: int = 0
     PROFILE_SCORE_MAX: int = 100
     PROFILE_SCORE_BASELINE: int = 70
+    PROFILE_RULES_PATH: Path = Path(os.getenv(
+        "PROFILE_RULES_PATH",
+        str(Path(__file__).resolve().parent / "profile_rules.json")
+    ))  # Scoring/fix rules; reloaded when the file changes
     
     # Advanced Tech Terms for Gap Analysis
     ADVANCED_TECH_TERMS: List[str] = [
@@ -69,6 +161,54 @@ class Config:
             raise ValueError(f"Invalid PORT: {cls.PORT}")
         if cls.MAX_UPLOAD_SIZE < 1:
             raise ValueError(f"Invalid MAX_UPLOAD_SIZE: {cls.MAX_UPLOAD_SIZE}")
+        if cls.RATE_LIMIT_PER_MINUTE <= 0 or cls.RATE_LIMIT_BURST < 1:
+            raise ValueError(f"Invalid rate limit: {cls.RATE_LIMIT_PER_MINUTE}/min, burst {cls.RATE_LIMIT_BURST}")
+        if cls.RATE_LIMIT_TRUSTED_PROXY_HOPS < 1:
+            raise ValueError(f"Invalid RATE_LIMIT_TRUSTED_PROXY_HOPS: {cls.RATE_LIMIT_TRUSTED_PROXY_HOPS}")
+        if cls.ANALYZE_WORKER_THREADS < 1:
+            raise ValueError(f"Invalid ANALYZE_WORKER_THREADS: {cls.ANALYZE_WORKER_THREADS}")
+        if cls.MAX_CONCURRENT_OCR_REQUESTS < 1:
+            raise ValueError(f"Invalid MAX_CONCURRENT_OCR_REQUESTS: {cls.MAX_CONCURRENT_OCR_REQUESTS}")
+        if not 0.0 <= cls.LOG_SAMPLE_RATE <= 1.0:
+            raise ValueError(f"Invalid LOG_SAMPLE_RATE: {cls.LOG_SAMPLE_RATE}")
+        if cls.SLOW_REQUEST_THRESHOLD_MS < 0:
+            raise ValueError(f"Invalid SLOW_REQUEST_THRESHOLD_MS: {cls.SLOW_REQUEST_THRESHOLD_MS}")
+        if not 0.0 <= cls.PROFILING_SAMPLE_RATE <= 1.0:
+            raise ValueError(f"Invalid PROFILING_SAMPLE_RATE: {cls.PROFILING_SAMPLE_RATE}")
+        if cls.PDF_BACKEND not in ("auto", "pdfium", "pdfminer", "pdfplumber"):
+            raise ValueError(f"Invalid PDF_BACKEND: {cls.PDF_BACKEND}")
+        if cls.PDF_PROBE_PAGES < 1 or cls.PDF_LAYOUT_MAX_PAGES < 0:
+            raise ValueError(f"Invalid PDF probe settings: {cls.PDF_PROBE_PAGES} pages, "
+                             f"layout max {cls.PDF_LAYOUT_MAX_PAGES}")
+        if not 72 <= cls.PDF_OCR_DPI <= 400:
+            raise ValueError(f"Invalid PDF_OCR_DPI: {cls.PDF_OCR_DPI}")
+        if cls.PDF_OCR_MAX_PAGES < 0 or cls.PDF_OCR_WORKERS < 1:
+            raise ValueError(f"Invalid PDF OCR limits: {cls.PDF_OCR_MAX_PAGES} pages, {cls.PDF_OCR_WORKERS} workers")
+        if cls.OCR_ENGINE not in ("pytesseract", "tesserocr"):
+            raise ValueError(f"Invalid OCR_ENGINE: {cls.OCR_ENGINE}")
+        if cls.OCR_ENGINE_POOL_SIZE < 1:
+            raise ValueError(f"Invalid OCR_ENGINE_POOL_SIZE: {cls.OCR_ENGINE_POOL_SIZE}")
+        if not 0.0 < cls.OCR_LAYOUT_SCALE <= 1.0:
+            raise ValueError(f"Invalid OCR_LAYOUT_SCALE: {cls.OCR_LAYOUT_SCALE}")
+        if not -1 <= cls.SCREENSHOT_DUPLICATE_DISTANCE <= 256:
+            raise ValueError(f"Invalid SCREENSHOT_DUPLICATE_DISTANCE: {cls.SCREENSHOT_DUPLICATE_DISTANCE}")
+        if cls.HISTORY_MAX_PER_USER < 1 or cls.HISTORY_RETENTION_DAYS <= 0 or cls.HISTORY_MAINTENANCE_INTERVAL_S <= 0:
+            raise ValueError(f"Invalid history retention: {cls.HISTORY_MAX_PER_USER} per user, "
+                             f"{cls.HISTORY_RETENTION_DAYS} days, every {cls.HISTORY_MAINTENANCE_INTERVAL_S} s")
+        if cls.SANDBOX_WORKERS < 1 or cls.SANDBOX_MEMORY_MB < 0 or cls.SANDBOX_CPU_SECONDS < 0 or cls.SANDBOX_TIMEOUT_S <= 0 \
+                or cls.SANDBOX_ACQUIRE_TIMEOUT_S <= 0:
+            raise ValueError(f"Invalid sandbox limits: {cls.SANDBOX_WORKERS} workers, {cls.SANDBOX_MEMORY_MB} MB, "
+                             f"{cls.SANDBOX_CPU_SECONDS} s CPU, {cls.SANDBOX_TIMEOUT_S} s timeout, "
+                             f"{cls.SANDBOX_ACQUIRE_TIMEOUT_S} s acquire timeout")
+        if cls.SANDBOX_START_METHOD not in ("forkserver", "spawn", "fork"):
+            raise ValueError(f"Invalid SANDBOX_START_METHOD: {cls.SANDBOX_START_METHOD}")
+        if cls.WEB_CONCURRENCY < 1:
+            raise ValueError(f"Invalid WEB_CONCURRENCY: {cls.WEB_CONCURRENCY}")
+        if cls.SEARCH_INDEX_ENABLED and cls.WEB_CONCURRENCY > 1:
+            # Each worker would search only the analyses it indexed itself
+            raise ValueError(f"SEARCH_INDEX_ENABLED requires a single worker (WEB_CONCURRENCY={cls.WEB_CONCURRENCY})")
+        if cls.VISION_CHANNEL_POOL_SIZE < 1:
+            raise ValueError(f"Invalid VISION_CHANNEL_POOL_SIZE: {cls.VISION_CHANNEL_POOL_SIZE}")
         return True
 
 
@@ -0,0 +1,548 @@
+"""
+Resume text extractors for LinkedIn Strategy Assistant.
+
+parse_resume() picks an extractor by the file's sniffed content type (magic
+bytes and container layout), not by its suffix, so a PDF named resume.txt is
+still parsed as a PDF. Formats are added by registering a sniffer and an
+extractor; the dispatch code never changes:
+
+    @register_sniffer
+    def sniff_markdown(head: bytes, path: Path) -> Optional[str]:
+        return "text/markdown" if path.suffix == ".md" else None
+
+    @register_extractor
+    class MarkdownExtractor(ResumeExtractor):
+        name = "markdown"
+        content_types = ("text/markdown",)
+        cost = COST_LIGHT
+
+        def extract(self, path: Path) -> List[str]:
+            ...
+
+Each extractor declares a cost class so callers can route expensive
+extraction (e.g. PDF layout analysis) differently from cheap text decoding.
+"""
+from __future__ import annotations
+
+import abc
+import codecs
+import html.parser
+import mmap
+import re
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Type, Union
+from xml.etree import ElementTree
+
+from logger import setup_logger
+from pdf_backends import HAS_PDF_BACKEND, extract_pdf
+from tracing import current_span
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Optional dependencies with graceful degradation
+# PDF libraries are optional; pdf_backends degrades to whichever is installed
+HAS_PDF_SUPPORT = HAS_PDF_BACKEND
+
+# DOCX is parsed with the standard library (see DocxExtractor)
+HAS_DOCX_SUPPORT = True
+
+# Cost classes: pure decoding, structured-container parsing, layout analysis
+COST_LIGHT = "light"
+COST_MODERATE = "moderate"
+COST_HEAVY = "heavy"
+
+# Bytes read for content sniffing and encoding detection
+SNIFF_BYTES = 64 * 1024
+# Bytes decoded per step when streaming text files
+DECODE_CHUNK_BYTES = 1024 * 1024
+
+Sniffer = Callable[[bytes, Path], Optional[str]]
+
+
+class ResumeExtractor(abc.ABC):
+    """
+    Base class for resume text extractors.
+
+    Subclasses set `name`, `content_types` and `cost`, and implement
+    extract(). Override available() when the extractor needs an optional
+    dependency.
+    """
+    name: str = ""
+    content_types: tuple = ()
+    cost: str = COST_LIGHT
+
+    def available(self) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def extract(self, path: Path) -> List[str]:
+        """Return the document text as a list of chunks (pages, paragraphs...)."""
+
+
+_sniffers: List[Sniffer] = []
+_extractors: Dict[str, ResumeExtractor] = {}
+
+
+def register_sniffer(sniffer: Sniffer) -> Sniffer:
+    """Register a content-type sniffer (usable as a decorator). Later sniffers win ties."""
+    _sniffers.insert(0, sniffer)
+    return sniffer
+
+
+def register_extractor(extractor: Union[ResumeExtractor, Type[ResumeExtractor]]):
+    """Register an extractor (class or instance) for its content types. Usable as a decorator."""
+    instance = extractor() if isinstance(extractor, type) else extractor
+    for content_type in instance.content_types:
+        _extractors[content_type] = instance
+    return extractor
+
+
+def sniff_content_type(path: Path) -> str:
+    """
+    Detect a file's content type from its leading bytes.
+
+    Returns:
+        MIME type, or "application/octet-stream" if no sniffer recognises it
+    """
+    with path.open("rb") as f:
+        head = f.read(SNIFF_BYTES)
+    for sniffer in _sniffers:
+        content_type = sniffer(head, path)
+        if content_type:
+            return content_type
+    return "application/octet-stream"
+
+
+def get_extractor(path: Path) -> ResumeExtractor:
+    """
+    Select the extractor for a resume by sniffed content type.
+
+    Raises:
+        ValueError: If the format is unsupported or its dependency is missing
+    """
+    content_type = sniff_content_type(path)
+    extractor = _extractors.get(content_type)
+    if extractor is None:
+        raise ValueError(f"Unsupported resume format: {path.suffix.lower() or content_type} ({content_type})")
+    if not extractor.available():
+        raise ValueError(f"{extractor.name.upper()} support not available - required library not installed")
+    return extractor
+
+
+# ---------------------------------------------------------------------------
+# Sniffers (registered in reverse priority: the most generic first)
+# ---------------------------------------------------------------------------
+
+_TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(sample: bytes) -> Optional[str]:
+    """
+    Guess the text encoding of a file prefix.
+
+    Checks byte-order marks, then BOM-less UTF-16 (NUL in every other byte),
+    then UTF-8, falling back to cp1252 (a superset of printable Latin-1).
+
+    Returns:
+        Codec name, or None if the sample looks binary
+    """
+    for bom, encoding in _TEXT_BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    if sample and b"\x00" in sample:
+        even_nuls = sample[0::2].count(0)
+        odd_nuls = sample[1::2].count(0)
+        half = max(1, len(sample) // 2)
+        if odd_nuls > 0.4 * half and even_nuls < 0.05 * half:
+            return "utf-16-le"
+        if even_nuls > 0.4 * half and odd_nuls < 0.05 * half:
+            return "utf-16-be"
+        return None
+
+    try:
+        # Not final: the sample may end mid-character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+@register_sniffer
+def _sniff_text(head: bytes, path: Path) -> Optional[str]:
+    return "text/plain" if detect_encoding(head) else None
+
+
+@register_sniffer
+def _sniff_markup(head: bytes, path: Path) -> Optional[str]:
+    encoding = detect_encoding(head)
+    if not encoding:
+        return None
+    start = head[:2048].decode(encoding, errors="ignore").lstrip("\ufeff \t\r\n").lower()
+    if start.startswith("{\\rtf"):
+        return "application/rtf"
+    if start.startswith(("<!doctype html", "<html")) or (start.startswith("<?xml") and "<html" in start):
+        return "text/html"
+    return None
+
+
+@register_sniffer
+def _sniff_zip(head: bytes, path: Path) -> Optional[str]:
+    if not head.startswith(b"PK\x03\x04"):
+        return None
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            if "word/document.xml" in names:
+                return "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            if "mimetype" in names and archive.read("mimetype").strip() == b"application/vnd.oasis.opendocument.text":
+                return "application/vnd.oasis.opendocument.text"
+    except zipfile.BadZipFile:
+        return None
+    return "application/zip"
+
+
+@register_sniffer
+def _sniff_binary_documents(head: bytes, path: Path) -> Optional[str]:
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        # Legacy Word (OLE compound file); no extractor registered
+        return "application/msword"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Extractors
+# ---------------------------------------------------------------------------
+
+def iter_text_chunks(path: Path, chunk_bytes: int = DECODE_CHUNK_BYTES) -> Iterator[str]:
+    """
+    Decode a text file incrementally from a memory map.
+
+    The encoding is detected from the first SNIFF_BYTES; undecodable bytes
+    are replaced rather than failing the whole file.
+    """
+    with path.open("rb") as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            encoding = detect_encoding(mapped[:SNIFF_BYTES]) or "utf-8"
+            current_span().set(encoding=encoding)
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            for offset in range(0, size, chunk_bytes):
+                text = decoder.decode(mapped[offset:offset + chunk_bytes])
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+
+@register_extractor
+class TextExtractor(ResumeExtractor):
+    """Plain text in any common encoding (UTF-8/16/32 with or without BOM, cp1252)."""
+    name = "txt"
+    content_types = ("text/plain",)
+    cost = COST_LIGHT
+
+    def extract(self, path: Path) -> List[str]:
+        logger.info("Parsing TXT resume: %s", path)
+        # One string, so line breaks split across decode chunks stay intact
+        return ["".join(iter_text_chunks(path))]
+
+
+@register_extractor
+class PdfExtractor(ResumeExtractor):
+    """PDF text page by page via pdf_backends (backend chosen per document; scanned pages OCR'd)."""
+    name = "pdf"
+    content_types = ("application/pdf",)
+    cost = COST_HEAVY
+
+    def available(self) -> bool:
+        return HAS_PDF_SUPPORT
+
+    def extract(self, path: Path) -> List[str]:
+        return extract_pdf(path)
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P, _W_R, _W_T, _W_TAB, _W_BR, _W_CR, _W_TYPE = (
+    f"{_W}{name}" for name in ("p", "r", "t", "tab", "br", "cr", "type")
+)
+# Text boxes are stored twice (DrawingML choice + VML fallback); only the choice is read
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_DOCX_HEADER_PART = re.compile(r"word/header\d*\.xml")
+_DOCX_FOOTER_PART = re.compile(r"word/footer\d*\.xml")
+
+
+def iter_docx_paragraphs(part) -> Iterator[str]:
+    """
+    Stream paragraph text from a WordprocessingML part in document order.
+
+    Covers body paragraphs, table cells (one paragraph at a time) and text
+    boxes. Every element is cleared and detached as soon as it ends, so memory
+    is bounded by the deepest open element rather than the document size.
+
+    Args:
+        part: Binary file object of a part such as word/document.xml
+    """
+    stack: list = []
+    buffers: List[List[str]] = []
+    fallback_depth = 0
+
+    for event, element in ElementTree.iterparse(part, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            stack.append(element)
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1
+            elif tag == _W_P and not fallback_depth:
+                buffers.append([])
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if tag == _MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth or not buffers:
+            pass
+        elif tag == _W_T:
+            buffers[-1].append(element.text or "")
+        elif parent is not None and parent.tag == _W_R and tag == _W_TAB:
+            buffers[-1].append("\t")
+        elif parent is not None and parent.tag == _W_R and tag in (_W_BR, _W_CR):
+            # Page and column breaks separate nothing within the paragraph's text
+            if element.get(_W_TYPE, "textWrapping") == "textWrapping":
+                buffers[-1].append("\n")
+        elif tag == _W_P:
+            yield "".join(buffers.pop())
+
+        element.clear()
+        if parent is not None:
+            parent.remove(element)
+
+
+@register_extractor
+class DocxExtractor(ResumeExtractor):
+    """
+    Word 2007+ documents, streamed from the zip without building a document model.
+
+    Reads headers, the body (paragraphs, tables, text boxes) and footers in
+    that order, so contact details and skills kept in headers, tables or text
+    boxes are not lost.
+    """
+    name = "docx"
+    content_types = ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",)
+    cost = COST_MODERATE
+
+    def extract(self, path: Path) -> List[str]:
+        logger.info("Parsing DOCX resume: %s", path)
+        chunks: List[str] = []
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(archive.namelist())
+            parts = (
+                [name for name in names if _DOCX_HEADER_PART.fullmatch(name)]
+                + ["word/document.xml"]
+                + [name for name in names if _DOCX_FOOTER_PART.fullmatch(name)]
+            )
+            for name in parts:
+                with archive.open(name) as part:
+                    chunks.extend(iter_docx_paragraphs(part))
+        current_span().set(paragraphs=len(chunks))
+        logger.debug("Extracted %d paragraphs from DOCX", len(chunks))
+        return chunks
+
+
+_ODF_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+_ODF_BLOCKS = (f"{{{_ODF_TEXT_NS}}}p", f"{{{_ODF_TEXT_NS}}}h")
+
+
+def iter_odf_paragraphs(content) -> Iterator[str]:
+    """
+    Stream paragraph and heading text from an OpenDocument content.xml.
+
+    A paragraph nested in another (e.g. in a text box) is its own chunk.
+    Paragraphs, and elements outside any paragraph, are cleared and detached
+    as soon as they end, so memory is bounded by the deepest open element
+    rather than the document size (as in iter_docx_paragraphs).
+
+    Args:
+        content: Binary file object of content.xml
+    """
+    stack: list = []
+    open_blocks = 0
+
+    for event, element in ElementTree.iterparse(content, events=("start", "end")):
+        if event == "start":
+            stack.append(element)
+            if element.tag in _ODF_BLOCKS:
+                open_blocks += 1
+            continue
+
+        stack.pop()
+        if element.tag in _ODF_BLOCKS:
+            open_blocks -= 1
+            yield "".join(element.itertext())
+        elif open_blocks:
+            # Spans and other inline content are read with their paragraph
+            continue
+        element.clear()
+        if stack:
+            stack[-1].remove(element)
+
+
+@register_extractor
+class OdtExtractor(ResumeExtractor):
+    """OpenDocument text (LibreOffice/Google Docs export): paragraphs and headings of content.xml."""
+    name = "odt"
+    content_types = ("application/vnd.oasis.opendocument.text",)
+    cost = COST_MODERATE
+
+    def extract(self, path: Path) -> List[str]:
+        logger.info("Parsing ODT resume: %s", path)
+        with zipfile.ZipFile(path) as archive, archive.open("content.xml") as content:
+            chunks = list(iter_odf_paragraphs(content))
+        current_span().set(paragraphs=len(chunks))
+        return chunks
+
+
+class _HtmlTextParser(html.parser.HTMLParser):
+    """Collects visible text, breaking lines at block elements."""
+
+    BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+                  "section", "article", "header", "footer", "ul", "ol", "table"}
+    SKIP_TAGS = {"script", "style", "head", "title", "noscript"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+@register_extractor
+class HtmlExtractor(ResumeExtractor):
+    """HTML exports (e.g. "Download as web page"): visible text with block-level line breaks."""
+    name = "html"
+    content_types = ("text/html",)
+    cost = COST_LIGHT
+
+    def extract(self, path: Path) -> List[str]:
+        logger.info("Parsing HTML resume: %s", path)
+        parser = _HtmlTextParser()
+        for chunk in iter_text_chunks(path):
+            parser.feed(chunk)
+        parser.close()
+        text = "".join(parser.parts)
+        # Collapse runs of spaces and limit blank lines to one, so sections stay separated
+        text = re.sub(r"[ \t\r\f\v]+", " ", text)
+        text = re.sub(r" *\n *", "\n", text)
+        return [re.sub(r"\n{3,}", "\n\n", text).strip()]
+
+
+# RTF destinations whose content is not document text
+_RTF_SKIP_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "header", "footer",
+    "headerl", "headerr", "footerl", "footerr", "listtable", "listoverridetable",
+    "rsidtbl", "generator", "xmlnstbl", "themedata", "colorschememapping", "datastore",
+    "latentstyles", "object", "fldinst",
+}
+_RTF_TOKEN = re.compile(r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\([^a-zA-Z])|([{}])|[\r\n]+|([^\\{}\r\n]+)")
+
+
+def rtf_to_text(rtf: str) -> str:
+    """Convert RTF markup to plain text (paragraphs, tabs, hex and unicode escapes)."""
+    out: List[str] = []
+    stack: List[tuple] = []
+    skip = False
+    unicode_skip = 1  # \ucN: fallback characters following each \uN
+    pending_skip = 0
+
+    for match in _RTF_TOKEN.finditer(rtf):
+        word, arg, hex_code, symbol, brace, text = match.groups()
+        if brace == "{":
+            stack.append((skip, unicode_skip))
+            continue
+        if brace == "}":
+            if stack:
+                skip, unicode_skip = stack.pop()
+            continue
+        if match.group(0).startswith(("\r", "\n")):
+            continue
+
+        if pending_skip and (text or hex_code):
+            # Drop the ANSI fallback characters after a \uN escape
+            if text:
+                dropped = min(pending_skip, len(text))
+                pending_skip -= dropped
+                text = text[dropped:]
+                if not text:
+                    continue
+            else:
+                pending_skip -= 1
+                continue
+
+        if word:
+            if word in _RTF_SKIP_DESTINATIONS:
+                skip = True
+            elif word == "uc":
+                unicode_skip = int(arg or 1)
+            elif skip:
+                continue
+            elif word in ("par", "line", "row"):
+                out.append("\n")
+            elif word in ("tab", "cell"):
+                out.append("\t")
+            elif word == "u" and arg is not None:
+                code = int(arg)
+                out.append(chr(code + 65536 if code < 0 else code))
+                pending_skip = unicode_skip
+        elif symbol:
+            if symbol == "*":
+                skip = True
+            elif not skip and symbol in "\\{}":
+                out.append(symbol)
+            elif not skip and symbol == "~":
+                out.append("\u00a0")
+        elif hex_code and not skip:
+            out.append(bytes([int(hex_code, 16)]).decode("cp1252", errors="replace"))
+        elif text and not skip:
+            out.append(text)
+    return "".join(out)
+
+
+@register_extractor
+class RtfExtractor(ResumeExtractor):
+    """Rich Text Format: control words stripped, paragraphs kept."""
+    name = "rtf"
+    content_types = ("application/rtf",)
+    cost = COST_LIGHT
+
+    def extract(self, path: Path) -> List[str]:
+        logger.info("Parsing RTF resume: %s", path)
+        return [rtf_to_text("".join(iter_text_chunks(path)))]
@@ -0,0 +1,464 @@
+"""
+Analysis history store for LinkedIn Strategy Assistant.
+
+Keeps every signed-in user's analyses in an embedded SQLite database (WAL
+mode), keyed by user and input fingerprint (hash of mode, LinkedIn text,
+resume bytes and screenshot hashes):
+
+  - analyses: one row per (user, fingerprint, pipeline version) with the
+    summary columns listing needs (mode, score, times), so "latest N" is an
+    index range scan that never touches payloads.
+  - blobs: zlib-compressed JSON payloads (profile, resume, gaps, response),
+    content-addressed by the SHA-256 of the JSON, so identical results are
+    stored once however often or by whomever they are produced.
+
+Re-analysing identical inputs updates the existing row (analyzed_at,
+times_analyzed) instead of adding one, and app.py returns the stored
+response instead of recomputing it while the pipeline version is unchanged.
+
+Writes, retention (newest HISTORY_MAX_PER_USER per user, none older than
+HISTORY_RETENTION_DAYS, deleted in small batches) and vacuuming (incremental
+vacuum plus a passive WAL checkpoint) all run on one background writer
+thread, so request threads only enqueue. Reads use per-thread connections;
+in WAL mode readers never wait for the writer.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import Config
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    user_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    version TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    profile_score INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    analyzed_at REAL NOT NULL,
+    times_analyzed INTEGER NOT NULL DEFAULT 1,
+    blob TEXT NOT NULL,
+    UNIQUE (user_key, fingerprint, version)
+);
+CREATE INDEX IF NOT EXISTS analyses_by_user_time ON analyses (user_key, analyzed_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS analyses_by_time ON analyses (analyzed_at);
+CREATE INDEX IF NOT EXISTS analyses_by_blob ON analyses (blob);
+"""
+
+_ENTRY_COLUMNS = "id, fingerprint, version, mode, profile_score, created_at, analyzed_at, times_analyzed"
+
+# Rows deleted per retention statement, so each write transaction stays short
+RETENTION_BATCH = 500
+# Pages released per incremental vacuum step
+VACUUM_PAGES = 1000
+
+# List fields compared by diff(): (payload section, field)
+DIFF_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("linkedin", "skills"),
+    ("linkedin", "certifications"),
+    ("gaps", "skills_missing_from_linkedin"),
+    ("gaps", "certifications_missing_from_linkedin"),
+    ("gaps", "projects_missing_from_linkedin"),
+    ("gaps", "advanced_tech_themes"),
+    ("result", "immediate_fixes"),
+)
+
+
+@dataclass
+class HistoryEntry:
+    """Summary of one stored analysis."""
+    id: int
+    fingerprint: str
+    version: str
+    mode: str
+    profile_score: int
+    created_at: float
+    analyzed_at: float
+    times_analyzed: int
+
+
+@dataclass
+class AnalysisDiff:
+    """Changes between an analysis and the user's previous one."""
+    current: HistoryEntry
+    previous: Optional[HistoryEntry] = None
+    score_change: int = 0
+    # "section.field" -> {"added": [...], "removed": [...]}, changed fields only
+    changes: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+
+
+def _encode(payload: Dict[str, Any]) -> Tuple[str, bytes]:
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, 6)
+
+
+def _decode(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data))
+
+
+def _list_diff(before: List[str], after: List[str]) -> Dict[str, List[str]]:
+    before_set, after_set = set(before), set(after)
+    return {
+        "added": [item for item in after if item not in before_set],
+        "removed": [item for item in before if item not in after_set],
+    }
+
+
+class HistoryStore:
+    """SQLite-backed analysis history with a single background writer."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_per_user: Optional[int] = None,
+        retention_days: Optional[float] = None,
+        maintenance_interval: Optional[float] = None,
+        queue_size: int = 1000,
+    ):
+        """
+        Args:
+            path: Database file (default: Config.HISTORY_DB_PATH)
+            max_per_user: Analyses kept per user (default: Config.HISTORY_MAX_PER_USER)
+            retention_days: Maximum age of kept analyses (default: Config.HISTORY_RETENTION_DAYS)
+            maintenance_interval: Seconds between retention/vacuum runs
+                (default: Config.HISTORY_MAINTENANCE_INTERVAL_S)
+            queue_size: Pending writes beyond which new ones are dropped
+        """
+        self.path = Path(path or Config.HISTORY_DB_PATH)
+        self.max_per_user = max_per_user if max_per_user is not None else Config.HISTORY_MAX_PER_USER
+        self.retention_days = retention_days if retention_days is not None else Config.HISTORY_RETENTION_DAYS
+        self.maintenance_interval = (
+            maintenance_interval if maintenance_interval is not None else Config.HISTORY_MAINTENANCE_INTERVAL_S
+        )
+        self._queue: "queue.Queue[Optional[Callable[[sqlite3.Connection], Any]]]" = queue.Queue(queue_size)
+        self._local = threading.local()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._readers: List[sqlite3.Connection] = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path))
+        try:
+            # auto_vacuum must be chosen before the first table (and WAL switch) exists
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+            with self._lock:
+                self._readers.append(connection)
+        return connection
+
+    # Writer thread
+
+    def start(self) -> None:
+        """Start the background writer (idempotent)."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="history-writer", daemon=True)
+                self._writer.start()
+
+    def close(self) -> None:
+        """Finish pending writes, stop the writer and close connections."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+        with self._lock:
+            readers, self._readers = self._readers, []
+        for connection in readers:
+            connection.close()
+        self._local = threading.local()
+
+    def flush(self) -> None:
+        """Block until every queued write has been applied."""
+        self._queue.join()
+
+    def _run_writer(self) -> None:
+        connection = self._connect()
+        next_maintenance = time.monotonic() + self.maintenance_interval
+        try:
+            while True:
+                try:
+                    task = self._queue.get(timeout=max(0.0, next_maintenance - time.monotonic()))
+                except queue.Empty:
+                    self._apply(self.maintain, connection)
+                    next_maintenance = time.monotonic() + self.maintenance_interval
+                    continue
+                try:
+                    if task is None:
+                        return
+                    self._apply(task, connection)
+                finally:
+                    self._queue.task_done()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _apply(task: Callable[[sqlite3.Connection], Any], connection: sqlite3.Connection) -> None:
+        try:
+            task(connection)
+        except sqlite3.Error as e:
+            logger.error("History write failed: %s", e)
+
+    def _submit(self, task: Callable[[sqlite3.Connection], Any]) -> bool:
+        if self._writer is None:
+            self.start()
+        try:
+            self._queue.put_nowait(task)
+            return True
+        except queue.Full:
+            logger.warning("History write queue full - dropping write")
+            return False
+
+    # Writes (queued)
+
+    def save(
+        self,
+        user_key: str,
+        fingerprint: str,
+        version: str,
+        payload: Dict[str, Any],
+        now: Optional[float] = None,
+    ) -> bool:
+        """
+        Queue an analysis for storage.
+
+        Args:
+            user_key: Owner (Firebase uid)
+            fingerprint: Input fingerprint
+            version: Pipeline version that produced the result
+            payload: {"linkedin", "resume", "gaps", "result"} sections; "result"
+                is the /analyze response and provides mode and profile_score
+            now: Timestamp (default: time.time())
+
+        Returns:
+            False if the write was dropped because the queue is full
+        """
+        now = time.time() if now is None else now
+        digest, data = _encode(payload)
+        result = payload.get("result", {})
+
+        def write(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.execute("INSERT OR IGNORE INTO blobs (digest, data) VALUES (?, ?)", (digest, data))
+                connection.execute(
+                    "INSERT INTO analyses (user_key, fingerprint, version, mode, profile_score, created_at,"
+                    " analyzed_at, blob) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (user_key, fingerprint, version) DO UPDATE SET"
+                    " analyzed_at = excluded.analyzed_at, times_analyzed = times_analyzed + 1,"
+                    " profile_score = excluded.profile_score, blob = excluded.blob",
+                    (user_key, fingerprint, version, result.get("mode", ""), int(result.get("profile_score", 0)),
+                     now, now, digest),
+                )
+
+        return self._submit(write)
+
+    def touch(self, user_key: str, fingerprint: str, version: str, now: Optional[float] = None) -> bool:
+        """Queue recording that a stored analysis was served again."""
+        now = time.time() if now is None else now
+
+        def write(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.execute(
+                    "UPDATE analyses SET analyzed_at = ?, times_analyzed = times_analyzed + 1"
+                    " WHERE user_key = ? AND fingerprint = ? AND version = ?",
+                    (now, user_key, fingerprint, version),
+                )
+
+        return self._submit(write)
+
+    def maintain(self, connection: sqlite3.Connection, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Apply retention and reclaim space (writer thread).
+
+        Deletes in batches of RETENTION_BATCH rows, each its own short
+        transaction, then frees unreferenced blobs, runs an incremental
+        vacuum and a passive (non-blocking) WAL checkpoint.
+
+        Returns:
+            Counts of deleted analyses and blobs
+        """
+        now = time.time() if now is None else now
+        deleted = 0
+        cutoff = now - self.retention_days * 86400
+        while True:
+            with connection:
+                count = connection.execute(
+                    "DELETE FROM analyses WHERE id IN (SELECT id FROM analyses WHERE analyzed_at < ? LIMIT ?)",
+                    (cutoff, RETENTION_BATCH),
+                ).rowcount
+            deleted += count
+            if count < RETENTION_BATCH:
+                break
+        over_limit = connection.execute(
+            "SELECT user_key FROM analyses GROUP BY user_key HAVING COUNT(*) > ?", (self.max_per_user,)
+        ).fetchall()
+        for (user_key,) in over_limit:
+            with connection:
+                deleted += connection.execute(
+                    "DELETE FROM analyses WHERE user_key = ? AND id NOT IN ("
+                    " SELECT id FROM analyses WHERE user_key = ? ORDER BY analyzed_at DESC, id DESC LIMIT ?)",
+                    (user_key, user_key, self.max_per_user),
+                ).rowcount
+        with connection:
+            blobs = connection.execute(
+                "DELETE FROM blobs WHERE NOT EXISTS (SELECT 1 FROM analyses WHERE analyses.blob = blobs.digest)"
+            ).rowcount
+        connection.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})").fetchall()
+        connection.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        if deleted or blobs:
+            logger.info("History retention removed %d analyses and %d payloads", deleted, blobs)
+        return {"analyses": deleted, "blobs": blobs}
+
+    def run_maintenance(self) -> bool:
+        """Queue a retention/vacuum run on the writer thread now."""
+        return self._submit(self.maintain)
+
+    # Reads
+
+    def latest(self, user_key: str, limit: int = 10) -> List[HistoryEntry]:
+        """A user's most recent analyses, newest first (no payloads are read)."""
+        rows = self._reader().execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM analyses WHERE user_key = ?"
+            " ORDER BY analyzed_at DESC, id DESC LIMIT ?",
+            (user_key, limit),
+        ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def latest_payloads(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Each user's most recent analysis payload, as (user_key, payload).
+
+        Rows are streamed, so memory does not grow with the number of users
+        (used to rebuild the in-memory skill index at startup).
+        """
+        cursor = self._reader().execute(
+            "SELECT user_key, blobs.data FROM ("
+            "  SELECT user_key, blob, ROW_NUMBER() OVER"
+            "    (PARTITION BY user_key ORDER BY analyzed_at DESC, id DESC) AS recency FROM analyses"
+            ") AS newest JOIN blobs ON blobs.digest = newest.blob WHERE recency = 1"
+        )
+        for user_key, data in cursor:
+            yield user_key, _decode(data)
+
+    def find(self, user_key: str, fingerprint: str, version: str) -> Optional[Dict[str, Any]]:
+        """Stored payload for these inputs and pipeline version, or None."""
+        row = self._reader().execute(
+            "SELECT blobs.data FROM analyses JOIN blobs ON blobs.digest = analyses.blob"
+            " WHERE user_key = ? AND fingerprint = ? AND version = ?",
+            (user_key, fingerprint, version),
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def load(self, user_key: str, entry_id: int) -> Optional[Dict[str, Any]]:
+        """Payload of one of the user's analyses, or None."""
+        row = self._reader().execute(
+            "SELECT blobs.data FROM analyses JOIN blobs ON blobs.digest = analyses.blob"
+            " WHERE analyses.id = ? AND user_key = ?",
+            (entry_id, user_key),
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def diff(self, user_key: str, entry_id: Optional[int] = None) -> Optional[AnalysisDiff]:
+        """
+        Compare an analysis (default: the latest) with the one before it.
+
+        Returns:
+            AnalysisDiff (previous is None for a user's first analysis), or
+            None if the user has no such analysis
+        """
+        reader = self._reader()
+        if entry_id is None:
+            entries = self.latest(user_key, 2)
+        else:
+            current = reader.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM analyses WHERE id = ? AND user_key = ?", (entry_id, user_key)
+            ).fetchone()
+            entries = [HistoryEntry(*current)] if current else []
+            if current:
+                previous = reader.execute(
+                    f"SELECT {_ENTRY_COLUMNS} FROM analyses WHERE user_key = ?"
+                    " AND (analyzed_at < ? OR (analyzed_at = ? AND id < ?))"
+                    " ORDER BY analyzed_at DESC, id DESC LIMIT 1",
+                    (user_key, entries[0].analyzed_at, entries[0].analyzed_at, entries[0].id),
+                ).fetchone()
+                entries += [HistoryEntry(*previous)] if previous else []
+        if not entries:
+            return None
+        current_entry = entries[0]
+        if len(entries) == 1:
+            return AnalysisDiff(current=current_entry)
+
+        previous_entry = entries[1]
+        after = self.load(user_key, current_entry.id) or {}
+        before = self.load(user_key, previous_entry.id) or {}
+        changes = {}
+        for section, name in DIFF_FIELDS:
+            change = _list_diff(
+                before.get(section, {}).get(name) or [], after.get(section, {}).get(name) or []
+            )
+            if change["added"] or change["removed"]:
+                changes[f"{section}.{name}"] = change
+        return AnalysisDiff(
+            current=current_entry,
+            previous=previous_entry,
+            score_change=current_entry.profile_score - previous_entry.profile_score,
+            changes=changes,
+        )
+
+
+_store: Optional[HistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """Return the process-wide history store, opening it and its writer on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = HistoryStore()
+                store.start()
+                _store = store
+    return _store
+
+
+def close_history_store() -> None:
+    """Flush and close the process-wide store (worker shutdown)."""
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.close()
@@ -3,13 +3,29 @@ LinkedIn Profile Optimizer - Enhanced strategy generation using AI agent skills.
 
 This module integrates the LinkedIn Profile Optimizer skill to provide more 
 detailed and expert recommendations for LinkedIn profile optimization.
+
+Every function takes the analysis' ProfileView (see profile_view.py), built
+once per analysis, so lowercasing, tokenizing and skill sets are not redone
+per tip or per skill.
+
+Headline, About and Skills tips are the rules of the matching group in the
+"enhanced" fix set of profile_rules.json, so tips and immediate fixes share
+one set of thresholds and texts.
 """
 
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping, Optional
+
+from profile_view import ProfileView
+from rules import RuleSet, get_rule_set
 
+# Fix set whose groups provide the section tips
+TIPS_FIX_SET = "enhanced"
 
-# LinkedIn Profile Optimizer best practices derived from skill
+
+# LinkedIn Profile Optimizer best practices derived from skill. Thresholds the
+# tips and fixes act on (minimum About length, skill counts, ...) are rule data
+# and live only in "thresholds" of profile_rules.json.
 LINKEDIN_BEST_PRACTICES = {
     "headline": {
         "max_chars": 220,
@@ -18,16 +34,12 @@ LINKEDIN_BEST_PRACTICES = {
         "impact_multiplier": 21  # Profiles with optimized headlines get 21x more views
     },
     "about": {
-        "min_chars": 1500,
         "max_chars": 2600,
         "recommended_chars": 1800,
         "structure": ["hook", "who_you_are", "achievements", "looking_for", "skills_list", "cta"],
-        "first_line_preview": 300  # Only 300 chars show before "see more"
     },
     "skills": {
         "max_count": 50,
-        "min_recommended": 5,
-        "optimal_count": 50,  # Use all 50 slots
         "categories": ["job_specific", "tools", "methodologies", "soft_skills", "industry_terms"]
     },
     "completeness": {
@@ -42,91 +54,35 @@ LINKEDIN_BEST_PRACTICES = {
 }
 
 
-def get_headline_optimization_tips(current_headline: str, skills: List[str], current_role: str) -> List[str]:
+def _section_tips(view: ProfileView, group: str) -> List[str]:
+    rule_set = get_rule_set()
+    return rule_set.fixes(TIPS_FIX_SET, rule_set.features(view), group=group)
+
+
+def get_headline_optimization_tips(view: ProfileView) -> List[str]:
     """Generate specific tips for optimizing LinkedIn headline."""
-    tips = []
-    
-    if not current_headline or len(current_headline) < 50:
-        tips.append("Create a compelling headline using formula: [Role] | [Key Expertise] | [Value Proposition]")
-    
-    if current_role and current_role not in current_headline:
-        tips.append(f"Include your current role '{current_role}' in headline for searchability")
-    
-    # Check for keywords
-    if skills:
-        top_skills = skills[:3]
-        missing_skills = [s for s in top_skills if s.lower() not in current_headline.lower()]
-        if missing_skills:
-            tips.append(f"Add key skills to headline: {', '.join(missing_skills[:2])}")
-    
-    # Check for value proposition
-    value_indicators = ["driving", "building", "leading", "growing", "transforming", "delivering"]
-    has_value = any(indicator in current_headline.lower() for indicator in value_indicators)
-    if not has_value:
-        tips.append("Add a value proposition showing impact (e.g., 'Driving 0→1 Products to $10M ARR')")
-    
-    return tips
+    return _section_tips(view, "headline")
 
 
-def get_about_section_optimization_tips(current_about: str, skills: List[str], achievements: List[str]) -> List[str]:
+def get_about_section_optimization_tips(view: ProfileView) -> List[str]:
     """Generate specific tips for optimizing LinkedIn About section."""
-    tips = []
-    
-    about_length = len(current_about) if current_about else 0
-    
-    if about_length == 0:
-        tips.append("Write an About section (1,500-2,000 characters) using structure: Hook → Who You Are → Achievements → Skills → CTA")
-    elif about_length < 1500:
-        tips.append(f"Expand About section to 1,500+ characters (currently {about_length}). Add achievements and skills list")
-    
-    # Check for hook (compelling first line)
-    if current_about and len(current_about) > 300:
-        first_line = current_about.split('\n')[0] if '\n' in current_about else current_about[:300]
-        # If first line is too long, suggest making it more compelling
-        if len(first_line) > 150:
-            tips.append("Start About section with a compelling one-liner (shows in preview before 'see more')")
-    
-    # Check for skills list
-    if skills and current_about:
-        skills_mentioned = sum(1 for skill in skills if skill.lower() in current_about.lower())
-        if skills_mentioned < min(5, len(skills)):
-            tips.append("Add a 'Key skills:' section at the end of About listing your core competencies")
-    
-    # Check for CTA
-    if current_about and "email" not in current_about.lower() and "connect" not in current_about.lower():
-        tips.append("Add a call-to-action at the end (e.g., 'Let's connect! Reach me at [email]')")
-    
-    return tips
+    return _section_tips(view, "about")
 
 
-def get_skills_optimization_tips(linkedin_skills: List[str], resume_skills: List[str]) -> List[str]:
+def get_skills_optimization_tips(view: ProfileView) -> List[str]:
     """Generate specific tips for optimizing LinkedIn Skills section."""
-    tips = []
-    
-    current_count = len(linkedin_skills)
-    optimal = LINKEDIN_BEST_PRACTICES["skills"]["optimal_count"]
-    
-    if current_count == 0:
-        tips.append(f"Add skills to LinkedIn Skills section (aim for {optimal} total)")
-    elif current_count < optimal:
-        tips.append(f"Increase skills count from {current_count} to {optimal} (use all available slots)")
-    
-    # Skills missing from LinkedIn
-    missing = [s for s in resume_skills if s.lower() not in [ls.lower() for ls in linkedin_skills]]
-    if missing:
-        tips.append(f"Transfer skills from resume to LinkedIn: {', '.join(missing[:5])}")
-    
-    return tips
+    return _section_tips(view, "skills")
 
 
-def get_completeness_assessment(linkedin_data: Dict) -> Dict[str, Any]:
+def get_completeness_assessment(view: ProfileView) -> Dict[str, Any]:
     """Assess LinkedIn profile completeness against All-Star and beyond criteria."""
     # Simple assessment based on available data
-    has_headline = bool(linkedin_data.get("headline"))
-    has_about = bool(linkedin_data.get("about"))
-    has_skills = len(linkedin_data.get("skills", [])) >= 5
-    has_50_skills = len(linkedin_data.get("skills", [])) >= 50
-    has_certs = bool(linkedin_data.get("certifications"))
+    has_headline = bool(view.headline)
+    has_about = bool(view.about)
+    thresholds = get_rule_set().thresholds
+    has_skills = len(view.linkedin_skills) >= thresholds["skills_min_count"]
+    has_50_skills = len(view.linkedin_skills) >= thresholds["skills_optimal_count"]
+    has_certs = bool(view.linkedin_certifications)
     
     all_star_score = sum([
         has_headline,
@@ -135,8 +91,8 @@ def get_completeness_assessment(linkedin_data: Dict) -> Dict[str, Any]:
     ]) / 3 * 100
     
     beyond_score = sum([
-        has_headline and len(linkedin_data.get("headline", "")) > 50,
-        has_about and len(linkedin_data.get("about", "")) >= 1500,
+        has_headline and len(view.headline) > thresholds["headline_min_chars"],
+        has_about and len(view.about) >= thresholds["about_min_chars"],
         has_50_skills,
         has_certs,
     ]) / 4 * 100
@@ -149,18 +105,24 @@ def get_completeness_assessment(linkedin_data: Dict) -> Dict[str, Any]:
     }
 
 
-def get_keyword_optimization_tips(linkedin_text: str, target_keywords: List[str]) -> List[str]:
-    """Generate tips for keyword optimization across profile."""
+def get_keyword_optimization_tips(view: ProfileView, target_keywords: Optional[List[str]] = None) -> List[str]:
+    """
+    Generate tips for keyword optimization across profile.
+
+    Keywords default to the resume skills; they are looked up in the
+    headline, About section and LinkedIn skills.
+    """
     tips = []
+    if target_keywords is None:
+        target_keywords = list(view.resume_skills)
     
     if not target_keywords:
         return tips
     
     # Check keyword presence
-    linkedin_lower = linkedin_text.lower()
     missing_keywords = []
     for keyword in target_keywords[:10]:  # Check top 10
-        if keyword.lower() not in linkedin_lower:
+        if not view.in_profile(keyword.lower()):
             missing_keywords.append(keyword)
     
     if missing_keywords:
@@ -171,53 +133,33 @@ def get_keyword_optimization_tips(linkedin_text: str, target_keywords: List[str]
 
 
 def generate_enhanced_fixes(
-    linkedin_data: Dict,
-    resume_data: Dict,
-    gaps: Dict
-) -> List[str]:
-    """Generate enhanced immediate fixes using LinkedIn Profile Optimizer best practices."""
-    fixes = []
-    
-    # Headline optimization
-    headline_tips = get_headline_optimization_tips(
-        linkedin_data.get("headline", ""),
-        resume_data.get("skills", []),
-        linkedin_data.get("current_role", "")
-    )
-    fixes.extend(headline_tips[:2])
-    
-    # About section optimization
-    about_tips = get_about_section_optimization_tips(
-        linkedin_data.get("about", ""),
-        resume_data.get("skills", []),
-        resume_data.get("projects", [])
-    )
-    fixes.extend(about_tips[:2])
-    
-    # Skills optimization
-    skills_tips = get_skills_optimization_tips(
-        linkedin_data.get("skills", []),
-        resume_data.get("skills", [])
-    )
-    fixes.extend(skills_tips[:1])
-    
-    # Certifications
-    if gaps.get("certifications_missing_from_linkedin"):
-        missing_certs = gaps["certifications_missing_from_linkedin"]
-        fixes.append(f"Add certifications to LinkedIn: {', '.join(missing_certs[:3])}")
-    
-    return fixes[:6]  # Return top 6 most impactful fixes
-
-
-def generate_enhanced_roadmap(
-    mode: str,
-    linkedin_data: Dict,
-    resume_data: Dict,
-    gaps: Dict
+    view: ProfileView,
+    rule_set: Optional[RuleSet] = None,
+    features: Optional[Mapping[str, Any]] = None,
 ) -> List[str]:
+    """
+    Generate enhanced immediate fixes using LinkedIn Profile Optimizer best practices.
+
+    The fixes are the "enhanced" fix set of profile_rules.json: up to two
+    headline, two About and one skills fix plus missing certifications, at
+    most six in total.
+
+    Args:
+        view: Profile view of the analysis
+        rule_set: Rules to apply (default: the current rules)
+        features: Features of `view` under `rule_set`, if already computed
+    """
+    if rule_set is None:
+        rule_set = get_rule_set()
+    if features is None:
+        features = rule_set.features(view)
+    return rule_set.fixes("enhanced", features)
+
+
+def generate_enhanced_roadmap(mode: str, view: ProfileView) -> List[str]:
     """Generate enhanced strategic roadmap using LinkedIn Profile Optimizer best practices."""
     mode_lower = mode.lower()
-    completeness = get_completeness_assessment(linkedin_data)
+    completeness = get_completeness_assessment(view)
     
     if mode_lower == "get hired":
         roadmap = [
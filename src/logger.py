@@ -2,15 +2,199 @@
 Logging configuration for LinkedIn Strategy Assistant.
 
 Provides structured logging with proper formatting and levels.
+
+Module loggers hand records to a shared in-memory queue; a single background
+listener thread formats them and writes them to stdout, so request threads
+never block on I/O. Records are formatted only in the listener, after the
+level check, so hot paths should pass %-style arguments instead of
+f-strings:
+
+    logger.debug("Extracted %d chars from page %d", len(text), page_num, extra=SAMPLED)
+
+Records carry the current request ID, and records marked with SAMPLED are
+rate-sampled per call site (Config.LOG_SAMPLE_RATE). With Config.LOG_JSON
+each record is one JSON object per line (the format Cloud Logging parses).
 """
 from __future__ import annotations
 
+import atexit
+import contextvars
+import json
 import logging
+import os
+import queue
 import sys
-from typing import Optional
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
 
 from config import Config
 
+# ID of the request being handled (set by the app's request-ID middleware)
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# Pass as `extra=SAMPLED` on per-page / per-item logs to rate-sample them
+SAMPLED = {"sampled": True}
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the current request ID (in the calling thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every N records marked SAMPLED, counted per call site.
+
+    The first record of each call site is always kept. Kept records carry
+    `sampled_every` so readers can scale counts back up.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False):
+            return True
+        if self.every == 0:
+            return False
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        record.sampled_every = self.every
+        return count % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, severity, logger, message, request_id."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            data["request_id"] = request_id
+        if getattr(record, "sampled_every", 1) > 1:
+            data["sampled_every"] = record.sampled_every
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain-text formatter honouring per-logger format strings."""
+
+    def __init__(self, format_string: str):
+        super().__init__(format_string)
+        self._custom: Dict[str, logging.Formatter] = {}
+
+    def format(self, record: logging.LogRecord) -> str:
+        custom = getattr(record, "log_format", None)
+        if custom:
+            formatter = self._custom.get(custom)
+            if formatter is None:
+                formatter = self._custom[custom] = logging.Formatter(custom)
+            return formatter.format(record)
+        return super().format(record)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that never blocks or formats; drops records when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens in the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _FormatFilter(logging.Filter):
+    """Attaches a logger's custom text format string to its records."""
+
+    def __init__(self, format_string: str):
+        super().__init__()
+        self.format_string = format_string
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.log_format = self.format_string
+        return True
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def _get_queue_handler() -> NonBlockingQueueHandler:
+    """Create the shared queue handler and start its listener on first use."""
+    global _queue_handler, _listener
+    with _setup_lock:
+        if _queue_handler is None:
+            log_queue: queue.Queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+            stream = logging.StreamHandler(sys.stdout)
+            stream.setFormatter(JsonFormatter() if Config.LOG_JSON else TextFormatter(Config.LOG_FORMAT))
+
+            handler = NonBlockingQueueHandler(log_queue)
+            handler.addFilter(RequestContextFilter())
+            handler.addFilter(SamplingFilter(Config.LOG_SAMPLE_RATE))
+
+            _listener = QueueListener(log_queue, stream)
+            _listener.start()
+            atexit.register(shutdown_logging)
+            _queue_handler = handler
+        return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def _restart_after_fork() -> None:
+    """
+    Give a forked child (e.g. a sandbox worker) its own queue and listener.
+
+    The child inherits the queue, possibly locked mid-put, but not the
+    listener thread, so without this its records would never be written.
+    """
+    global _listener, _setup_lock
+    _setup_lock = threading.Lock()
+    if _queue_handler is None or _listener is None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers)
+    _listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
 
 def setup_logger(
     name: str,
@@ -19,36 +203,29 @@ def setup_logger(
 ) -> logging.Logger:
     """
     Set up a logger with consistent formatting.
-    
+
     Args:
         name: Logger name (typically __name__ of the module)
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        format_string: Custom format string for log messages
-    
+        format_string: Custom format string for log messages (text output only)
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
-    
+
     # Set level from config or parameter
     log_level = level or Config.LOG_LEVEL
     logger.setLevel(getattr(logging, log_level.upper()))
-    
+
     # Avoid adding multiple handlers if logger already configured
     if logger.handlers:
         return logger
-    
-    # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(getattr(logging, log_level.upper()))
-    
-    # Create formatter
-    formatter = logging.Formatter(format_string or Config.LOG_FORMAT)
-    handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(handler)
-    
+
+    logger.addHandler(_get_queue_handler())
+    if format_string:
+        logger.addFilter(_FormatFilter(format_string))
+
     return logger
 
 
@@ -0,0 +1,293 @@
+"""
+Tesseract OCR engines for LinkedIn Strategy Assistant.
+
+Two interchangeable engines, selected with Config.OCR_ENGINE:
+  - "pytesseract": runs the tesseract binary per call (fork/exec, language
+    model load and temp files every time). No native build needed.
+  - "tesserocr": a pool of warm in-process engines using the tesseract C API
+    through tesserocr. Models are loaded once per engine at startup and
+    images are passed in memory.
+
+Both expose image_to_string() and image_to_data() (the pytesseract DICT
+layout), so callers never depend on the engine in use:
+
+    text = get_engine().image_to_string(image, psm=6)
+
+The process-wide engine is started at worker startup and closed at shutdown
+(see app.py lifespan); get_engine() starts it lazily otherwise.
+"""
+from __future__ import annotations
+
+import abc
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from config import Config
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Optional dependencies with graceful degradation
+try:
+    import pytesseract
+    HAS_PYTESSERACT = True
+except ImportError:  # pragma: no cover - optional dependency
+    pytesseract = None
+    HAS_PYTESSERACT = False
+
+try:
+    import tesserocr
+    HAS_TESSEROCR = True
+except ImportError:  # pragma: no cover - optional dependency
+    tesserocr = None
+    HAS_TESSEROCR = False
+
+# Keys of pytesseract.image_to_data(..., output_type=Output.DICT)
+DATA_KEYS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+             "left", "top", "width", "height", "conf", "text")
+# Tesseract's default page segmentation mode (fully automatic)
+PSM_AUTO = 3
+
+
+class OcrEngine(abc.ABC):
+    """
+    Base class for OCR engines.
+
+    image_to_string() and image_to_data() take a PIL image and an optional
+    tesseract page segmentation mode. start() and close() manage long-lived
+    resources; both are no-ops by default.
+    """
+    name: str = ""
+
+    def available(self) -> bool:
+        return True
+
+    def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def image_to_string(self, image, psm: Optional[int] = None) -> str:
+        """Recognised text of the image."""
+
+    @abc.abstractmethod
+    def image_to_data(self, image, psm: Optional[int] = None) -> Dict[str, list]:
+        """Word boxes of the image in the pytesseract DICT layout (see DATA_KEYS)."""
+
+
+class PytesseractEngine(OcrEngine):
+    """One tesseract subprocess per call via pytesseract."""
+    name = "pytesseract"
+
+    def available(self) -> bool:
+        return HAS_PYTESSERACT
+
+    def start(self) -> None:
+        pytesseract.pytesseract.tesseract_cmd = Config.TESSERACT_CMD
+
+    def _config(self, psm: Optional[int]) -> str:
+        return f"--psm {psm}" if psm is not None else ""
+
+    def image_to_string(self, image, psm: Optional[int] = None) -> str:
+        return pytesseract.image_to_string(image, lang=Config.OCR_LANGUAGE, config=self._config(psm))
+
+    def image_to_data(self, image, psm: Optional[int] = None) -> Dict[str, list]:
+        return pytesseract.image_to_data(
+            image, lang=Config.OCR_LANGUAGE, config=self._config(psm), output_type=pytesseract.Output.DICT
+        )
+
+
+class TesserocrEnginePool(OcrEngine):
+    """
+    Pool of warm tesserocr engines shared by request threads.
+
+    A tesseract engine is not thread-safe, so each call checks one out for its
+    duration; callers wait when all are busy. Call start() at worker startup
+    and close() at shutdown. close() releases idle engines at once and busy
+    ones when their call returns them; calls made after close() fail until
+    start() is called again.
+    """
+    name = "tesserocr"
+
+    def __init__(self, size: Optional[int] = None, language: Optional[str] = None):
+        """
+        Args:
+            size: Number of engines (default: Config.OCR_ENGINE_POOL_SIZE)
+            language: Tesseract language(s), e.g. "eng" (default: Config.OCR_LANGUAGE)
+        """
+        self.size = max(1, size if size is not None else Config.OCR_ENGINE_POOL_SIZE)
+        self.language = language or Config.OCR_LANGUAGE
+        self._idle: List["tesserocr.PyTessBaseAPI"] = []
+        self._engines: List["tesserocr.PyTessBaseAPI"] = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._returned = threading.Condition(self._lock)
+
+    def available(self) -> bool:
+        return HAS_TESSEROCR
+
+    @property
+    def started(self) -> bool:
+        """Whether the pool currently holds engines."""
+        return bool(self._engines)
+
+    def start(self) -> None:
+        """
+        Create and initialise the engines (loads the language model once each). No-op if started.
+
+        Raises:
+            RuntimeError: If tesserocr is not installed or the model cannot be loaded
+        """
+        with self._lock:
+            self._closed = False
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if self._engines:
+            return
+        if not HAS_TESSEROCR:
+            raise RuntimeError("tesserocr not available - install tesserocr (and libtesseract)")
+        for _ in range(self.size):
+            engine = tesserocr.PyTessBaseAPI(lang=self.language)
+            self._engines.append(engine)
+            self._idle.append(engine)
+        logger.info("Tesseract engine pool started - engines: %d, language: %s", self.size, self.language)
+
+    @contextmanager
+    def _engine(self, psm: Optional[int]) -> Iterator["tesserocr.PyTessBaseAPI"]:
+        with self._returned:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Tesseract engine pool is closed")
+                self._start_locked()
+                if self._idle:
+                    engine = self._idle.pop()
+                    break
+                self._returned.wait()
+        try:
+            engine.SetPageSegMode(psm if psm is not None else PSM_AUTO)
+            yield engine
+        finally:
+            engine.Clear()
+            with self._returned:
+                # Engines of a closed pool are not reused; their owner releases them
+                owned = any(engine is current for current in self._engines)
+                if owned:
+                    self._idle.append(engine)
+                    self._returned.notify()
+            if not owned:
+                self._end(engine)
+
+    def image_to_string(self, image, psm: Optional[int] = None) -> str:
+        with self._engine(psm) as engine:
+            engine.SetImage(image)
+            return engine.GetUTF8Text()
+
+    def image_to_data(self, image, psm: Optional[int] = None) -> Dict[str, list]:
+        data: Dict[str, list] = {key: [] for key in DATA_KEYS}
+        word_level = tesserocr.RIL.WORD
+        with self._engine(psm) as engine:
+            engine.SetImage(image)
+            engine.Recognize()
+            iterator = engine.GetIterator()
+            if iterator is None:
+                return data
+            block = par = line = word = 0
+            for result in tesserocr.iterate_level(iterator, word_level):
+                # Beginning of a block is also the beginning of its paragraph and line
+                if result.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block, par = block + 1, 0
+                if result.IsAtBeginningOf(tesserocr.RIL.PARA):
+                    par, line = par + 1, 0
+                if result.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line, word = line + 1, 0
+                word += 1
+                box = result.BoundingBox(word_level)
+                if box is None:
+                    continue
+                left, top, right, bottom = box
+                for key, value in zip(DATA_KEYS, (5, 1, block, par, line, word, left, top, right - left,
+                                                  bottom - top, result.Confidence(word_level),
+                                                  result.GetUTF8Text(word_level) or "")):
+                    data[key].append(value)
+        return data
+
+    @staticmethod
+    def _end(engine: "tesserocr.PyTessBaseAPI") -> None:
+        try:
+            engine.End()
+        except Exception as e:  # pragma: no cover - best effort on shutdown
+            logger.warning("Failed to release tesseract engine: %s", e)
+
+    def close(self) -> None:
+        """
+        Release all engines. Engines checked out by running calls are released
+        when those calls finish; waiting calls fail. start() reopens the pool.
+        """
+        with self._returned:
+            engines, self._engines = self._engines, []
+            idle, self._idle = self._idle, []
+            self._closed = True
+            self._returned.notify_all()
+
+        for engine in idle:
+            self._end(engine)
+
+        if engines:
+            logger.info("Tesseract engine pool closed (%d engines, %d still in use)",
+                        len(engines), len(engines) - len(idle))
+
+
+ENGINES = {
+    PytesseractEngine.name: PytesseractEngine,
+    TesserocrEnginePool.name: TesserocrEnginePool,
+}
+
+_engine: Optional[OcrEngine] = None
+_engine_lock = threading.Lock()
+
+
+def create_engine(name: Optional[str] = None) -> OcrEngine:
+    """
+    Build the engine named by `name` (default: Config.OCR_ENGINE).
+
+    Falls back to pytesseract, with a warning, when tesserocr is selected but
+    not installed.
+
+    Raises:
+        ValueError: If the engine name is unknown
+    """
+    name = name or Config.OCR_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"Unknown OCR engine: {name!r} (known: {sorted(ENGINES)})")
+    engine = ENGINES[name]()
+    if not engine.available() and name != PytesseractEngine.name:
+        logger.warning("OCR engine %s not available - falling back to pytesseract", name)
+        engine = PytesseractEngine()
+    return engine
+
+
+def get_engine() -> OcrEngine:
+    """Return the process-wide OCR engine, creating and starting it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine()
+                if engine.available():
+                    engine.start()
+                _engine = engine
+    return _engine
+
+
+def close_engine() -> None:
+    """Close the process-wide engine (worker shutdown); get_engine() recreates it."""
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+    if engine is not None:
+        engine.close()
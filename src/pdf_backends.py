@@ -0,0 +1,406 @@
+"""
+PDF text backends for LinkedIn Strategy Assistant.
+
+Three interchangeable backends extract text page by page:
+  - pdfium: pypdfium2 (C library); by far the fastest, follows content order
+  - pdfminer: pdfminer.six with layout analysis; groups text into boxes, so
+    multi-column pages come out column by column
+  - pdfplumber: pdfminer plus a Python object per character; slowest, kept
+    for compatibility and for comparison
+
+With Config.PDF_BACKEND = "auto" the backend is chosen per document from a
+cheap pdfium probe of the first pages: multi-column layouts go to pdfminer
+(unless the document is too long for layout analysis), everything else to
+pdfium. benchmarks/bench_pdf_backends.py reports speed and text agreement of
+every backend on the corpus.
+
+The same probe counts characters on every page. Pages with (almost) no text
+layer but an embedded image are scans: extract_pdf() rasterises them with
+pdfium at Config.PDF_OCR_DPI and OCRs them on a small thread pool while the
+backend extracts the text-layer pages, then merges both in page order. At
+most Config.PDF_OCR_MAX_PAGES pages are OCR'd per document.
+"""
+from __future__ import annotations
+
+import abc
+import contextvars
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from config import Config
+from logger import SAMPLED, setup_logger
+from ocr_engine import HAS_PYTESSERACT, HAS_TESSEROCR, get_engine
+from tracing import current_span, span
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Optional dependencies with graceful degradation
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:  # pragma: no cover - optional dependency
+    pdfplumber = None
+    HAS_PDFPLUMBER = False
+
+try:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    HAS_PDFMINER = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_PDFMINER = False
+
+try:
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+    HAS_PDFIUM = True
+except ImportError:  # pragma: no cover - optional dependency
+    pdfium = None
+    HAS_PDFIUM = False
+
+HAS_OCR = HAS_PYTESSERACT or HAS_TESSEROCR
+
+HAS_PDF_BACKEND = HAS_PDFPLUMBER or HAS_PDFMINER or HAS_PDFIUM
+if not HAS_PDF_BACKEND:  # pragma: no cover - optional dependency
+    logger.warning("No PDF library available (pypdfium2, pdfminer.six, pdfplumber) - PDF parsing disabled")
+
+# PDFium is not thread-safe; every call into it happens under this lock
+_PDFIUM_LOCK = threading.RLock()
+
+# A page counts as multi-column when at least this share of its text runs
+# starts in the right two thirds of the page
+MULTI_COLUMN_MIN_SHARE = 0.25
+
+# Longest side of a rasterised page, whatever the DPI (guards huge MediaBoxes)
+OCR_MAX_PIXELS = 5000
+
+
+@dataclass
+class PdfFeatures:
+    """Document features used to pick a backend and find scanned pages."""
+    pages: int
+    multi_column: bool
+    # 0-based pages with no usable text layer but at least one image
+    scanned_pages: List[int] = field(default_factory=list)
+
+
+class PdfBackend(abc.ABC):
+    """
+    Base class for PDF text backends.
+
+    Subclasses implement open() (a context manager yielding a document
+    handle), page_count() and page_text(); extract_pages() drives them and
+    records a parse.page span per page.
+    """
+    name: str = ""
+
+    def available(self) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def open(self, path: Path):
+        """Context manager yielding a document handle for `path`."""
+
+    @abc.abstractmethod
+    def page_count(self, document: Any) -> int:
+        """Number of pages of an open document."""
+
+    @abc.abstractmethod
+    def page_text(self, document: Any, index: int) -> str:
+        """Text of one page (0-based) of an open document."""
+
+    def extract_pages(self, path: Path, skip: Collection[int] = ()) -> List[str]:
+        """
+        Return the text of every page, with "\\n" line endings.
+
+        Args:
+            path: PDF file
+            skip: 0-based pages to leave empty (e.g. pages being OCR'd)
+        """
+        pages: List[str] = []
+        with self.open(path) as document:
+            count = self.page_count(document)
+            current_span().set(pages=count)
+            for index in range(count):
+                if index in skip:
+                    pages.append("")
+                    continue
+                with span("parse.page", page=index + 1) as page_span:
+                    text = _normalize(self.page_text(document, index))
+                    page_span.set(chars=len(text))
+                pages.append(text)
+                logger.debug("Extracted %d chars from page %d", len(text), index + 1, extra=SAMPLED)
+        return pages
+
+
+def _normalize(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "").rstrip()
+
+
+_backends: Dict[str, PdfBackend] = {}
+
+
+def register_backend(backend: Union[PdfBackend, Type[PdfBackend]]):
+    """Register a backend (class or instance) under its name. Usable as a decorator."""
+    instance = backend() if isinstance(backend, type) else backend
+    _backends[instance.name] = instance
+    return backend
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends whose library is installed."""
+    return [name for name, backend in _backends.items() if backend.available()]
+
+
+def get_backend(name: str) -> PdfBackend:
+    """
+    Look up a backend by name.
+
+    Raises:
+        ValueError: If the backend is unknown or its library is not installed
+    """
+    backend = _backends.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown PDF backend: {name!r} (known: {sorted(_backends)})")
+    if not backend.available():
+        raise ValueError(f"PDF backend {name!r} not available - required library not installed")
+    return backend
+
+
+@register_backend
+class PdfiumBackend(PdfBackend):
+    """Text via pypdfium2 text pages."""
+    name = "pdfium"
+
+    def available(self) -> bool:
+        return HAS_PDFIUM
+
+    @contextmanager
+    def open(self, path: Path) -> Iterator[Any]:
+        # Locked per call rather than per document, so OCR threads can
+        # rasterise pages in between
+        with _PDFIUM_LOCK:
+            document = pdfium.PdfDocument(str(path))
+        try:
+            yield document
+        finally:
+            with _PDFIUM_LOCK:
+                document.close()
+
+    def page_count(self, document: Any) -> int:
+        return len(document)
+
+    def page_text(self, document: Any, index: int) -> str:
+        with _PDFIUM_LOCK:
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_bounded()
+            finally:
+                textpage.close()
+                page.close()
+
+
+@register_backend
+class PdfminerBackend(PdfBackend):
+    """Text via pdfminer.six layout analysis (text boxes in reading order)."""
+    name = "pdfminer"
+
+    def available(self) -> bool:
+        return HAS_PDFMINER
+
+    @contextmanager
+    def open(self, path: Path) -> Iterator[Tuple[Any, list]]:
+        with open(path, "rb") as f:
+            yield PDFResourceManager(), list(PDFPage.get_pages(f))
+
+    def page_count(self, document: Tuple[Any, list]) -> int:
+        return len(document[1])
+
+    def page_text(self, document: Tuple[Any, list], index: int) -> str:
+        resources, pages = document
+        buffer = io.StringIO()
+        device = TextConverter(resources, buffer, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(pages[index])
+        finally:
+            device.close()
+        return buffer.getvalue()
+
+
+@register_backend
+class PdfplumberBackend(PdfBackend):
+    """Text via pdfplumber's character-level extract_text()."""
+    name = "pdfplumber"
+
+    def available(self) -> bool:
+        return HAS_PDFPLUMBER
+
+    def open(self, path: Path):
+        return pdfplumber.open(path)
+
+    def page_count(self, document: Any) -> int:
+        return len(document.pages)
+
+    def page_text(self, document: Any, index: int) -> str:
+        return document.pages[index].extract_text() or ""
+
+
+def probe_pdf(path: Path, sample_pages: Optional[int] = None) -> PdfFeatures:
+    """
+    Measure the features backend selection depends on (requires pypdfium2).
+
+    Characters are counted on every page to find scans; only the first
+    `sample_pages` pages (Config.PDF_PROBE_PAGES) are inspected for layout.
+    Counting is far cheaper than extracting text.
+    """
+    sample_pages = Config.PDF_PROBE_PAGES if sample_pages is None else sample_pages
+    multi_column_pages = 0
+    scanned_pages: List[int] = []
+    with _PDFIUM_LOCK:
+        document = pdfium.PdfDocument(str(path))
+        try:
+            page_count = len(document)
+            sampled = min(page_count, sample_pages)
+            for index in range(page_count):
+                page = document[index]
+                textpage = page.get_textpage()
+                try:
+                    if textpage.count_chars() < Config.PDF_OCR_MIN_CHARS:
+                        if next(page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,)), None) is not None:
+                            scanned_pages.append(index)
+                    elif index < sampled:
+                        boundary = page.get_width() / 3
+                        rects = [textpage.get_rect(i) for i in range(textpage.count_rects())]
+                        right = sum(1 for left, _, _, _ in rects if left >= boundary)
+                        if rects and right / len(rects) >= MULTI_COLUMN_MIN_SHARE:
+                            multi_column_pages += 1
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            document.close()
+    return PdfFeatures(
+        pages=page_count,
+        multi_column=multi_column_pages * 2 > sampled,
+        scanned_pages=scanned_pages,
+    )
+
+
+def select_backend(path: Path) -> Tuple[PdfBackend, Optional[PdfFeatures]]:
+    """
+    Choose the backend for a document.
+
+    A fixed Config.PDF_BACKEND is used as is. With "auto", multi-column
+    documents of up to Config.PDF_LAYOUT_MAX_PAGES pages use pdfminer layout
+    analysis; all others use pdfium. Without pypdfium2 nothing is probed and
+    the first available of pdfplumber/pdfminer is used.
+
+    Returns:
+        The backend and the probed features (None without pypdfium2)
+
+    Raises:
+        ValueError: If the configured backend is unknown or unavailable
+    """
+    features = probe_pdf(path) if HAS_PDFIUM else None
+    if Config.PDF_BACKEND != "auto":
+        return get_backend(Config.PDF_BACKEND), features
+
+    if features is None:
+        for name in ("pdfplumber", "pdfminer"):
+            if _backends[name].available():
+                return _backends[name], None
+        raise ValueError("PDF support not available - required library not installed")
+
+    if features.multi_column and features.pages <= Config.PDF_LAYOUT_MAX_PAGES and HAS_PDFMINER:
+        return _backends["pdfminer"], features
+    return _backends["pdfium"], features
+
+
+def render_page(document: Any, index: int, dpi: Optional[int] = None) -> "Image.Image":
+    """Rasterise one page to a greyscale PIL image at `dpi` (Config.PDF_OCR_DPI), size-capped."""
+    dpi = Config.PDF_OCR_DPI if dpi is None else dpi
+    with _PDFIUM_LOCK:
+        page = document[index]
+        try:
+            scale = min(dpi / 72, OCR_MAX_PIXELS / max(page.get_size()))
+            bitmap = page.render(scale=scale, grayscale=True)
+            image = bitmap.to_pil()
+            # to_pil() may share the bitmap's buffer; copy before it is freed
+            image = image.copy()
+            bitmap.close()
+            return image
+        finally:
+            page.close()
+
+
+def ocr_image(image: "Image.Image") -> str:
+    """OCR a rendered page with the configured tesseract engine."""
+    return get_engine().image_to_string(image)
+
+
+def _ocr_page(document: Any, index: int) -> str:
+    with span("ocr.page", page=index + 1, backend="tesseract") as ocr_span:
+        try:
+            image = render_page(document, index)
+            ocr_span.set(width=image.width, height=image.height)
+            text = _normalize(ocr_image(image))
+        except Exception as e:
+            logger.warning("OCR failed for page %d: %s", index + 1, e)
+            return ""
+        ocr_span.set(chars=len(text))
+        return text
+
+
+def extract_pdf(path: Path) -> List[str]:
+    """
+    Extract the text of every page, OCR-ing scanned pages.
+
+    Scanned pages (see probe_pdf) are rasterised and OCR'd on up to
+    Config.PDF_OCR_WORKERS threads while the selected backend extracts the
+    remaining pages; results are merged in page order. Scanned pages beyond
+    Config.PDF_OCR_MAX_PAGES, or all of them without OCR support, stay empty.
+
+    Returns:
+        One text chunk per page
+    """
+    backend, features = select_backend(path)
+    logger.info("Parsing PDF resume with %s: %s", backend.name, path)
+    current_span().set(backend=backend.name)
+    if features is None or not features.scanned_pages:
+        if features is not None:
+            current_span().set(multi_column=features.multi_column)
+        return backend.extract_pages(path)
+
+    scanned = features.scanned_pages
+    ocr_pages = scanned[:Config.PDF_OCR_MAX_PAGES] if Config.PDF_OCR_ENABLED and HAS_OCR else []
+    current_span().set(multi_column=features.multi_column, scanned_pages=len(scanned), ocr_pages=len(ocr_pages))
+    if len(ocr_pages) < len(scanned):
+        logger.warning("Skipping OCR for %d of %d scanned pages in %s",
+                       len(scanned) - len(ocr_pages), len(scanned), path)
+    if not ocr_pages:
+        return backend.extract_pages(path, skip=set(scanned))
+
+    with _PDFIUM_LOCK:
+        document = pdfium.PdfDocument(str(path))
+    try:
+        with ThreadPoolExecutor(max_workers=min(Config.PDF_OCR_WORKERS, len(ocr_pages))) as pool:
+            # Each task gets its own context copy so its spans nest under this one
+            futures = {
+                index: pool.submit(contextvars.copy_context().run, _ocr_page, document, index)
+                for index in ocr_pages
+            }
+            pages = backend.extract_pages(path, skip=set(scanned))
+            for index, future in futures.items():
+                pages[index] = future.result()
+    finally:
+        with _PDFIUM_LOCK:
+            document.close()
+    return pages
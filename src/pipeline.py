@@ -10,9 +10,18 @@ import json
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Optional
-
-from logger import setup_logger
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from extractors import HAS_DOCX_SUPPORT, HAS_PDF_SUPPORT, get_extractor  # noqa: F401 - re-exported
+from logger import SAMPLED, setup_logger
+from ocr_engine import HAS_PYTESSERACT, HAS_TESSEROCR, get_engine
+from profile_view import ProfileView
+import roi_ocr
+from rules import get_rule_set
+from screenshots import dedupe_screenshots, stitch_texts
+from tracing import current_span, span, traced
+from what_if import FixPlan, best_plan
 
 # Set up module logger
 logger = setup_logger(__name__)
@@ -20,29 +29,13 @@ logger = setup_logger(__name__)
 # Optional dependencies with graceful degradation
 try:
     from PIL import Image
-    import pytesseract
-    HAS_OCR = True
+    HAS_OCR = HAS_PYTESSERACT or HAS_TESSEROCR
 except ImportError:  # pragma: no cover - optional dependency
     Image = None
-    pytesseract = None
     HAS_OCR = False
-    logger.warning("pytesseract/PIL not available - OCR functionality disabled")
+if not HAS_OCR:  # pragma: no cover - optional dependency
+    logger.warning("PIL/tesseract bindings (pytesseract, tesserocr) not available - OCR functionality disabled")
 
-try:
-    import pdfplumber
-    HAS_PDF_SUPPORT = True
-except ImportError:  # pragma: no cover - optional dependency
-    pdfplumber = None
-    HAS_PDF_SUPPORT = False
-    logger.warning("pdfplumber not available - PDF parsing disabled")
-
-try:
-    import docx  # python-docx
-    HAS_DOCX_SUPPORT = True
-except ImportError:  # pragma: no cover - optional dependency
-    docx = None
-    HAS_DOCX_SUPPORT = False
-    logger.warning("python-docx not available - DOCX parsing disabled")
 
 
 ADVANCED_TECH_TERMS = [
@@ -100,8 +93,25 @@ class Strategy:
     immediate_fixes: List[str]
     strategic_roadmap: List[str]
     gaps: GapAnalysis
+    # Points each scoring rule contributed (see profile_rules.json)
+    score_breakdown: Dict[str, int] = field(default_factory=dict)
+    # Highest-impact simulated changes and the score they would reach
+    fix_plan: FixPlan = field(default_factory=FixPlan)
 
 
+def pipeline_version() -> str:
+    """
+    Version of analysis results: the app version plus the profile rules
+    revision and a hash of the rules' contents.
+
+    Results stored or cached under one version are stale once either changes,
+    including rule edits that did not bump the revision.
+    """
+    rule_set = get_rule_set()
+    return f"{Config.APP_VERSION}+rules.{rule_set.revision}.{rule_set.digest}"
+
+
+@traced("extract_linkedin_profile")
 def extract_linkedin_profile(screenshot_paths: Iterable[Path]) -> LinkedInProfile:
     """
     Extract LinkedIn profile data from screenshots using OCR.
@@ -121,48 +131,101 @@ def extract_linkedin_profile(screenshot_paths: Iterable[Path]) -> LinkedInProfil
         logger.warning("OCR not available - returning empty profile")
         return profile
     
+    # Overlapping captures: skip near-duplicates before OCR, stitch overlaps after
+    screenshot_paths = dedupe_screenshots(screenshot_paths)
+
+    if Config.OCR_ROI_ENABLED:
+        sections = roi_ocr.extract_sections(screenshot_paths)
+        if sections is not None:
+            return _profile_from_sections(sections)
+        logger.info("No profile section headers found - falling back to full-page OCR")
+
     texts: List[str] = []
     
     for path in screenshot_paths:
         if not path.exists():
-            logger.warning(f"Screenshot not found: {path}")
+            logger.warning("Screenshot not found: %s", path)
             continue
         
-        try:
-            logger.info(f"Processing screenshot: {path}")
-            image = Image.open(path)
-            text = pytesseract.image_to_string(image)
-            texts.append(text)
-            logger.debug(f"Extracted {len(text)} characters from {path}")
-        except Exception as e:
-            logger.error(f"Failed to process screenshot {path}: {e}")
-            continue
+        with span("ocr.screenshot", backend="tesseract") as ocr_span:
+            try:
+                logger.info("Processing screenshot: %s", path)
+                image = Image.open(path)
+                text = get_engine().image_to_string(image)
+                texts.append(text)
+                ocr_span.set(bytes=path.stat().st_size, chars=len(text))
+                logger.debug("Extracted %d characters from %s", len(text), path, extra=SAMPLED)
+            except Exception as e:
+                logger.error("Failed to process screenshot %s: %s", path, e)
+                continue
 
     if not texts:
         logger.warning("No text extracted from screenshots")
         return profile
 
-    full_text = "\n".join(texts)
-    logger.info(f"Total extracted text: {len(full_text)} characters")
+    full_text = stitch_texts(texts)
+    logger.info("Total extracted text: %d characters", len(full_text))
     
-    profile.headline = _extract_headline(full_text)
-    profile.about = _extract_section(full_text, "About")
-    profile.skills = _extract_list(full_text, ["Skills", "Skill"])
-    profile.certifications = _extract_list(full_text, ["Certifications", "Certification"])
-    profile.activity_topics = _extract_activity(full_text)
-    profile.current_role = _extract_current_role(full_text)
+    return extract_profile_from_text(full_text)
+
+
+def extract_profile_from_text(text: str) -> LinkedInProfile:
+    """
+    Extract LinkedIn profile fields from OCR or pasted profile text.
     
-    logger.info(f"Extracted profile - headline: {bool(profile.headline)}, "
-                f"about: {len(profile.about)} chars, skills: {len(profile.skills)}")
+    Args:
+        text: Full profile text
+    
+    Returns:
+        LinkedInProfile object with extracted data
+    """
+    profile = LinkedInProfile()
+    
+    with span("extract.profile", chars=len(text)) as extract_span:
+        profile.headline = _extract_headline(text)
+        profile.about = _extract_section(text, "About")
+        profile.skills = _extract_list(text, ["Skills", "Skill"])
+        profile.certifications = _extract_list(text, ["Certifications", "Certification"])
+        profile.activity_topics = _extract_activity(text)
+        profile.current_role = _extract_current_role(text)
+        extract_span.set(skills=len(profile.skills), certifications=len(profile.certifications))
+    
+    logger.info("Extracted profile - headline: %s, about: %d chars, skills: %d",
+                bool(profile.headline), len(profile.about), len(profile.skills))
     
     return profile
 
 
+def _profile_from_sections(sections: Dict[str, List[str]]) -> LinkedInProfile:
+    """Map region-OCR section lines (see roi_ocr.extract_sections) onto profile fields."""
+    top_card = sections.get(roi_ocr.HEADLINE, [])
+    experience = sections.get(roi_ocr.EXPERIENCE, [])
+    profile = LinkedInProfile(
+        headline=top_card[0] if top_card else "",
+        about=" ".join(sections.get(roi_ocr.ABOUT, [])),
+        skills=roi_ocr.list_items(sections.get(roi_ocr.SKILLS, [])),
+        certifications=roi_ocr.list_items(sections.get(roi_ocr.CERTIFICATIONS, [])),
+        # Newest position first; its first line is the title
+        current_role=experience[0] if experience else "",
+        activity_topics=[line for line in experience if len(line.split()) >= 3][:10],
+    )
+    if not profile.current_role:
+        profile.current_role = next(
+            (line.split(":", 1)[1].strip() for line in top_card if line.lower().startswith("current:")), ""
+        )
+    current_span().set(mode="roi", skills=len(profile.skills), certifications=len(profile.certifications))
+    logger.info("Extracted profile from regions - headline: %s, about: %d chars, skills: %d",
+                bool(profile.headline), len(profile.about), len(profile.skills))
+    return profile
+
+
+@traced("parse_resume")
 def parse_resume(resume_path: Path) -> ResumeData:
     """
     Parse resume file to extract skills, projects, certifications, and experience.
     
-    Supports PDF, DOCX, DOC, and TXT formats.
+    Supports every format registered in extractors.py (PDF, DOCX, ODT, RTF,
+    HTML and TXT in any common encoding).
     
     Args:
         resume_path: Path to resume file
@@ -177,57 +240,42 @@ def parse_resume(resume_path: Path) -> ResumeData:
     data = ResumeData()
     
     if not resume_path.exists():
-        logger.error(f"Resume file not found: {resume_path}")
+        logger.error("Resume file not found: %s", resume_path)
         raise FileNotFoundError(f"Resume file not found: {resume_path}")
 
-    text_chunks: List[str] = []
-    suffix = resume_path.suffix.lower()
-    
     try:
-        if suffix == ".pdf":
-            if not HAS_PDF_SUPPORT:
-                raise ValueError("PDF support not available - pdfplumber not installed")
-            logger.info(f"Parsing PDF resume: {resume_path}")
-            with pdfplumber.open(resume_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text() or ""
-                    text_chunks.append(text)
-                    logger.debug(f"Extracted {len(text)} chars from page {page_num}")
-        
-        elif suffix in {".doc", ".docx"}:
-            if not HAS_DOCX_SUPPORT:
-                raise ValueError("DOCX support not available - python-docx not installed")
-            logger.info(f"Parsing DOCX resume: {resume_path}")
-            document = docx.Document(resume_path)
-            for para_num, para in enumerate(document.paragraphs, 1):
-                text_chunks.append(para.text)
-            logger.debug(f"Extracted {len(text_chunks)} paragraphs from DOCX")
-        
-        elif suffix == ".txt":
-            logger.info(f"Parsing TXT resume: {resume_path}")
-            text_chunks.append(resume_path.read_text(encoding="utf-8"))
-        
-        else:
-            raise ValueError(f"Unsupported resume format: {suffix}")
-        
+        # Extractor is chosen by sniffed content type, not by suffix
+        extractor = get_extractor(resume_path)
+        current_span().set(format=extractor.name, cost=extractor.cost, bytes=resume_path.stat().st_size)
+        text_chunks = extractor.extract(resume_path)
     except Exception as e:
-        logger.error(f"Failed to parse resume {resume_path}: {e}")
+        logger.error("Failed to parse resume %s: %s", resume_path, e)
         raise
 
     full_text = "\n".join(text_chunks)
-    logger.info(f"Total resume text: {len(full_text)} characters")
-    
-    data.skills = _extract_skills(full_text)
-    data.projects = _extract_projects(full_text)
-    data.certifications = _extract_certifications(full_text)
-    data.experience = _extract_experience(full_text)
-    
-    logger.info(f"Extracted from resume - skills: {len(data.skills)}, "
-                f"projects: {len(data.projects)}, certs: {len(data.certifications)}")
+    logger.info("Total resume text: %d characters", len(full_text))
+    current_span().set(chars=len(full_text))
+    
+    with span("extract.skills") as extract_span:
+        data.skills = _extract_skills(full_text)
+        extract_span.set(count=len(data.skills))
+    with span("extract.projects") as extract_span:
+        data.projects = _extract_projects(full_text)
+        extract_span.set(count=len(data.projects))
+    with span("extract.certifications") as extract_span:
+        data.certifications = _extract_certifications(full_text)
+        extract_span.set(count=len(data.certifications))
+    with span("extract.experience") as extract_span:
+        data.experience = _extract_experience(full_text)
+        extract_span.set(count=len(data.experience))
+    
+    logger.info("Extracted from resume - skills: %d, projects: %d, certs: %d",
+                len(data.skills), len(data.projects), len(data.certifications))
     
     return data
 
 
+@traced("gap_analysis")
 def generate_gap_analysis(linkedin: LinkedInProfile, resume: ResumeData) -> GapAnalysis:
     """
     Analyze gaps between LinkedIn profile and resume.
@@ -263,10 +311,15 @@ def generate_gap_analysis(linkedin: LinkedInProfile, resume: ResumeData) -> GapA
     ])
     advanced_themes = _detect_advanced_themes(combined_text)
     
-    logger.info(f"Gap analysis complete - missing skills: {len(skills_missing)}, "
-                f"missing projects: {len(projects_missing)}, "
-                f"missing certs: {len(certs_missing)}, "
-                f"tech themes: {len(advanced_themes)}")
+    logger.info("Gap analysis complete - missing skills: %d, missing projects: %d, "
+                "missing certs: %d, tech themes: %d",
+                len(skills_missing), len(projects_missing), len(certs_missing), len(advanced_themes))
+    current_span().set(
+        missing_skills=len(skills_missing),
+        missing_projects=len(projects_missing),
+        missing_certifications=len(certs_missing),
+        themes=len(advanced_themes),
+    )
 
     return GapAnalysis(
         skills_missing_from_linkedin=skills_missing,
@@ -276,6 +329,7 @@ def generate_gap_analysis(linkedin: LinkedInProfile, resume: ResumeData) -> GapA
     )
 
 
+@traced("strategy")
 def generate_strategy(mode: str, gaps: GapAnalysis, linkedin: LinkedInProfile, resume: ResumeData) -> Strategy:
     """
     Generate career strategy based on mode and gap analysis.
@@ -299,43 +353,35 @@ def generate_strategy(mode: str, gaps: GapAnalysis, linkedin: LinkedInProfile, r
     if mode not in valid_modes:
         raise ValueError(f"Invalid mode: {mode}. Must be one of {valid_modes}")
     
-    logger.info(f"Generating strategy for mode: {mode}")
+    logger.info("Generating strategy for mode: %s", mode)
     
-    score = _calculate_profile_score(gaps, linkedin, resume)
-    logger.info(f"Calculated profile score: {score}/100")
+    rule_set = get_rule_set()
+    view = ProfileView.build(linkedin, resume, gaps)
+    features = rule_set.features(view)
+    with span("score", rules=rule_set.revision):
+        result = rule_set.score(features)
+    score = result.total
+    logger.info("Calculated profile score: %d/100", score)
+    with span("what_if") as what_if_span:
+        plan = best_plan(rule_set, features, result)
+        what_if_span.set(fixes=len(plan.fixes), points=plan.points)
     
     # Try to use enhanced LinkedIn Profile Optimizer recommendations
     try:
         from linkedin_optimizer import generate_enhanced_fixes, generate_enhanced_roadmap
         
-        linkedin_dict = {
-            "headline": linkedin.headline,
-            "about": linkedin.about,
-            "current_role": linkedin.current_role,
-            "skills": linkedin.skills,
-            "certifications": linkedin.certifications,
-        }
-        resume_dict = {
-            "skills": resume.skills,
-            "projects": resume.projects,
-            "certifications": resume.certifications,
-            "experience": resume.experience,
-        }
-        gaps_dict = {
-            "skills_missing_from_linkedin": gaps.skills_missing_from_linkedin,
-            "projects_missing_from_linkedin": gaps.projects_missing_from_linkedin,
-            "certifications_missing_from_linkedin": gaps.certifications_missing_from_linkedin,
-            "advanced_tech_themes": gaps.advanced_tech_themes,
-        }
-        
-        fixes = generate_enhanced_fixes(linkedin_dict, resume_dict, gaps_dict)
-        roadmap = generate_enhanced_roadmap(mode, linkedin_dict, resume_dict, gaps_dict)
+        with span("optimizer.fixes") as optimizer_span:
+            fixes = generate_enhanced_fixes(view, rule_set, features)
+            optimizer_span.set(count=len(fixes))
+        with span("optimizer.roadmap") as optimizer_span:
+            roadmap = generate_enhanced_roadmap(mode, view)
+            optimizer_span.set(count=len(roadmap))
         logger.info("Using enhanced optimizer recommendations")
         
     except (ImportError, AttributeError) as e:
         # Fallback to original implementation if optimizer not available
-        logger.warning(f"LinkedIn optimizer not available, using standard recommendations: {e}")
-        fixes = _build_immediate_fixes(gaps, linkedin, resume)
+        logger.warning("LinkedIn optimizer not available, using standard recommendations: %s", e)
+        fixes = rule_set.fixes("standard", features)
         roadmap = _build_roadmap(mode, gaps)
     
     return Strategy(
@@ -344,6 +390,8 @@ def generate_strategy(mode: str, gaps: GapAnalysis, linkedin: LinkedInProfile, r
         immediate_fixes=fixes,
         strategic_roadmap=roadmap,
         gaps=gaps,
+        score_breakdown=result.contributions,
+        fix_plan=plan,
     )
 
 
@@ -455,50 +503,6 @@ def _normalize_all(values: Iterable[str]) -> List[str]:
     return [v.strip().lower() for v in values if v.strip()]
 
 
-def _calculate_profile_score(gaps: GapAnalysis, linkedin: LinkedInProfile, resume: ResumeData) -> int:
-    """Calculate profile score with balanced penalties and bonuses."""
-    score = 70  # Start with baseline
-    
-    # LinkedIn completeness bonus (up to +30)
-    if linkedin.headline:
-        score += 5
-    if linkedin.about and len(linkedin.about) > 100:
-        score += 10
-    if linkedin.skills and len(linkedin.skills) > 5:
-        score += 10
-    if linkedin.certifications:
-        score += 5
-    
-    # Gap penalties (scaled to prevent over-penalization)
-    skills_gap_ratio = len(gaps.skills_missing_from_linkedin) / max(len(resume.skills), 1)
-    score -= min(15, int(skills_gap_ratio * 20))  # Max -15 for skills
-    
-    certs_gap_count = len(gaps.certifications_missing_from_linkedin)
-    score -= min(10, certs_gap_count * 3)  # Max -10 for certs
-    
-    projects_gap_count = len(gaps.projects_missing_from_linkedin)
-    score -= min(10, projects_gap_count * 3)  # Max -10 for projects
-    
-    # Tech themes bonus (up to +15)
-    tech_bonus = min(15, len(gaps.advanced_tech_themes) * 2)
-    score += tech_bonus
-    
-    return max(0, min(100, score))
-
-
-def _build_immediate_fixes(gaps: GapAnalysis, linkedin: LinkedInProfile, resume: ResumeData) -> List[str]:
-    fixes: List[str] = []
-    if gaps.skills_missing_from_linkedin:
-        fixes.append(f"Add skills to LinkedIn: {', '.join(gaps.skills_missing_from_linkedin[:5])}")
-    if gaps.certifications_missing_from_linkedin:
-        fixes.append(f"Show certifications on LinkedIn: {', '.join(gaps.certifications_missing_from_linkedin[:3])}")
-    if not linkedin.about and resume.projects:
-        fixes.append("Populate About section with top projects and outcomes")
-    if not linkedin.headline:
-        fixes.append("Add a headline with role + domain + proof point")
-    return fixes[:5]
-
-
 def _build_roadmap(mode: str, gaps: GapAnalysis) -> List[str]:
     mode_lower = mode.lower()
     if mode_lower == "get hired":
@@ -593,9 +597,20 @@ def format_dashboard(strategy: Strategy) -> str:
     for i, fix in enumerate(strategy.immediate_fixes, 1):
         report_lines.append(f"{i}. **{fix}**")
     
+    plan = strategy.fix_plan
+    report_lines.append("")
+    if plan.fixes:
+        report_lines.append(
+            f"**Impact:** These changes raise your profile score from {plan.score} to {plan.projected_score} "
+            f"(+{plan.points} points), highest return per effort first:"
+        )
+        for fix in plan.fixes:
+            report_lines.append(f"- {fix.description}: **+{fix.points}**")
+    else:
+        report_lines.append("**Impact:** None of the simulated changes (skills, certifications, projects, "
+                            "About, headline) would raise your profile score further.")
+
     report_lines.extend([
-        "",
-        "**Impact:** Implementing these fixes will increase your profile score by an estimated 20-30 points.",
         "",
         "---",
         "",
@@ -617,7 +632,7 @@ def format_dashboard(strategy: Strategy) -> str:
         "## 📈 Projected Outcomes",
         "",
         "**After completing this roadmap:**",
-        f"- Profile Score: {score}/100 → {min(score + 35, 100)}/100",
+        f"- Profile Score: {score}/100 → {max(score, plan.projected_score)}/100",
         "- Profile Views: +150-200% increase",
         "- Connection Requests: +80-120% increase",
     ])
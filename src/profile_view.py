@@ -0,0 +1,139 @@
+"""
+Normalized, read-only view of one analysis (LinkedIn profile, resume, gaps).
+
+Tip functions and rule features all ask the same questions: is this skill
+in the headline, how many resume skills does the About section mention,
+which resume skills are not on LinkedIn. Answering them from raw strings
+re-lowercases and re-scans the same text once per skill. A ProfileView is
+built once per analysis instead: texts are lowercased once, headline, About
+and whole-profile texts are tokenized into sets, and skill lists get
+lowercase tuples and sets. Every lookup is then O(1) per skill, so tip
+generation is linear in profile size.
+
+A skill is mentioned in a text when its single word is one of the text's
+tokens (so "Go" matches "Go, Rust" but not "Google"). Multi-word skills
+("Cloud Run", "CI/CD") fall back to a substring test on the lowercased text.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Mapping, Optional, Tuple
+
+_TOKEN = re.compile(r"[\w+#.]+")
+
+
+def _field(source: Any, name: str) -> Any:
+    """Read `name` from a dataclass (LinkedInProfile, ...) or its dict form."""
+    if source is None:
+        return None
+    if isinstance(source, Mapping):
+        return source.get(name)
+    return getattr(source, name, None)
+
+
+def _tokens(text: str) -> FrozenSet[str]:
+    return frozenset(token.strip(".") for token in _TOKEN.findall(text))
+
+
+def _texts(source: Any, name: str) -> Tuple[str, ...]:
+    return tuple(_field(source, name) or ())
+
+
+@dataclass(frozen=True)
+class ProfileView:
+    """
+    Normalized inputs of one analysis. Build with ProfileView.build().
+
+    Lowercase fields (*_lower) hold the lowercased text or items of the
+    field they prefix; *_tokens hold the word sets used for mention tests.
+    """
+    headline: str
+    headline_lower: str
+    headline_tokens: FrozenSet[str]
+    about: str
+    about_lower: str
+    about_tokens: FrozenSet[str]
+    current_role: str
+    linkedin_skills: Tuple[str, ...]
+    linkedin_skills_lower: FrozenSet[str]
+    linkedin_certifications: Tuple[str, ...]
+    profile_lower: str
+    profile_tokens: FrozenSet[str]
+    resume_skills: Tuple[str, ...]
+    resume_skills_lower: Tuple[str, ...]
+    resume_projects: Tuple[str, ...]
+    resume_certifications: Tuple[str, ...]
+    resume_experience: Tuple[str, ...]
+    skills_missing: Tuple[str, ...]
+    certifications_missing: Tuple[str, ...]
+    projects_missing: Tuple[str, ...]
+    advanced_tech_themes: Tuple[str, ...]
+
+    @classmethod
+    def build(cls, linkedin: Any, resume: Any = None, gaps: Any = None) -> "ProfileView":
+        """
+        Normalize an analysis' inputs.
+
+        Args:
+            linkedin: LinkedInProfile or its dict form
+            resume: ResumeData or its dict form (optional)
+            gaps: GapAnalysis or its dict form (optional)
+        """
+        headline = _field(linkedin, "headline") or ""
+        about = _field(linkedin, "about") or ""
+        linkedin_skills = _texts(linkedin, "skills")
+        resume_skills = _texts(resume, "skills")
+        headline_lower = headline.lower()
+        about_lower = about.lower()
+        profile_lower = "\n".join([headline_lower, about_lower, " ".join(linkedin_skills).lower()])
+        return cls(
+            headline=headline,
+            headline_lower=headline_lower,
+            headline_tokens=_tokens(headline_lower),
+            about=about,
+            about_lower=about_lower,
+            about_tokens=_tokens(about_lower),
+            current_role=_field(linkedin, "current_role") or "",
+            linkedin_skills=linkedin_skills,
+            linkedin_skills_lower=frozenset(skill.lower() for skill in linkedin_skills),
+            linkedin_certifications=_texts(linkedin, "certifications"),
+            profile_lower=profile_lower,
+            profile_tokens=_tokens(profile_lower),
+            resume_skills=resume_skills,
+            resume_skills_lower=tuple(skill.lower() for skill in resume_skills),
+            resume_projects=_texts(resume, "projects"),
+            resume_certifications=_texts(resume, "certifications"),
+            resume_experience=_texts(resume, "experience"),
+            skills_missing=_texts(gaps, "skills_missing_from_linkedin"),
+            certifications_missing=_texts(gaps, "certifications_missing_from_linkedin"),
+            projects_missing=_texts(gaps, "projects_missing_from_linkedin"),
+            advanced_tech_themes=_texts(gaps, "advanced_tech_themes"),
+        )
+
+    @staticmethod
+    def _mentions(tokens: FrozenSet[str], text: str, term_lower: str) -> bool:
+        words = _tokens(term_lower)
+        if len(words) == 1:
+            return next(iter(words)) in tokens
+        return bool(words) and term_lower in text
+
+    def in_headline(self, term_lower: str) -> bool:
+        """Whether a lowercased skill/keyword is mentioned in the headline."""
+        return self._mentions(self.headline_tokens, self.headline_lower, term_lower)
+
+    def in_about(self, term_lower: str) -> bool:
+        """Whether a lowercased skill/keyword is mentioned in the About section."""
+        return self._mentions(self.about_tokens, self.about_lower, term_lower)
+
+    def in_profile(self, term_lower: str) -> bool:
+        """Whether a lowercased skill/keyword is mentioned in headline, About or skills."""
+        return self._mentions(self.profile_tokens, self.profile_lower, term_lower)
+
+    def resume_skills_not_on_linkedin(self, limit: Optional[int] = None) -> Tuple[str, ...]:
+        """Resume skills (original case, resume order) not listed on LinkedIn."""
+        missing = tuple(
+            skill for skill, lower in zip(self.resume_skills, self.resume_skills_lower)
+            if lower not in self.linkedin_skills_lower
+        )
+        return missing if limit is None else missing[:limit]
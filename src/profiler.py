@@ -0,0 +1,176 @@
+"""
+On-demand sampling profiler for LinkedIn Strategy Assistant.
+
+When enabled, a configurable fraction of /analyze requests (or a single
+request selected by an admin via the X-Profile-Request header) is profiled
+by sampling the worker thread's stack from a background thread. Samples are
+stored as collapsed stacks ("frame;frame;frame count" lines), the input
+format of flamegraph.pl, speedscope and inferno, and can be retrieved through
+the admin profile endpoints.
+
+When profiling is disabled no sampler thread exists and requests take no
+profiler code path.
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Profile session of the current request (set only for profiled requests)
+active_profile: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+
+def _frame_label(code) -> str:
+    """Flamegraph frame label: function (file:line)."""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+@dataclass
+class ProfileSession:
+    """Stack samples collected for one request (possibly across several threads)."""
+    profile_id: str
+    label: str
+    interval: float
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    stacks: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.stacks.values())
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn in the current thread while sampling its stack."""
+        target = threading.get_ident()
+        stop = threading.Event()
+        local_stacks: Counter = Counter()
+
+        def sample():
+            while not stop.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                frames: List[str] = []
+                while frame is not None:
+                    frames.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if frames:
+                    local_stacks[";".join(reversed(frames))] += 1
+
+        sampler = threading.Thread(target=sample, name=f"profiler-{self.profile_id}", daemon=True)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            return fn(*args)
+        finally:
+            stop.set()
+            sampler.join()
+            with self._lock:
+                self.stacks.update(local_stacks)
+                self.duration += time.perf_counter() - start
+
+    def merge(self, stacks: Dict[str, int], root: str) -> None:
+        """Add samples taken elsewhere (e.g. in a sandbox worker) under a root frame."""
+        with self._lock:
+            for stack, count in stacks.items():
+                self.stacks[f"{root};{stack}"] += count
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, heaviest stacks first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1),
+            "samples": self.sample_count,
+            "interval_ms": self.interval * 1000,
+        }
+
+
+class RequestProfiler:
+    """Selects requests for profiling and keeps the most recent profiles."""
+
+    def __init__(
+        self,
+        sample_rate: Optional[float] = None,
+        interval_ms: Optional[float] = None,
+        max_stored: Optional[int] = None,
+        output_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            sample_rate: Fraction of requests to profile (default: Config.PROFILING_SAMPLE_RATE)
+            interval_ms: Stack sampling interval (default: Config.PROFILING_INTERVAL_MS)
+            max_stored: Profiles kept in memory (default: Config.PROFILING_MAX_STORED)
+            output_dir: Also write <profile_id>.folded files here (default: Config.PROFILING_OUTPUT_DIR)
+        """
+        self.sample_rate = sample_rate if sample_rate is not None else Config.PROFILING_SAMPLE_RATE
+        self.interval = (interval_ms if interval_ms is not None else Config.PROFILING_INTERVAL_MS) / 1000
+        self.max_stored = max_stored if max_stored is not None else Config.PROFILING_MAX_STORED
+        self.output_dir = output_dir if output_dir is not None else Config.PROFILING_OUTPUT_DIR
+        self._profiles: "OrderedDict[str, ProfileSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def select(self, label: str, forced: bool = False) -> Optional[ProfileSession]:
+        """
+        Decide whether to profile a request.
+
+        Args:
+            label: Short description stored with the profile (e.g. "POST /analyze")
+            forced: Profile regardless of sample rate (admin-requested)
+
+        Returns:
+            New ProfileSession if the request is selected, else None
+        """
+        if not forced and random.random() >= self.sample_rate:
+            return None
+        return ProfileSession(profile_id=uuid.uuid4().hex[:16], label=label, interval=self.interval)
+
+    def save(self, session: ProfileSession) -> None:
+        """Store a finished profile, evicting the oldest beyond max_stored."""
+        with self._lock:
+            self._profiles[session.profile_id] = session
+            while len(self._profiles) > self.max_stored:
+                self._profiles.popitem(last=False)
+
+        if self.output_dir:
+            try:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                (self.output_dir / f"{session.profile_id}.folded").write_text(session.collapsed(), encoding="utf-8")
+            except OSError as e:
+                logger.warning("Failed to write profile %s: %s", session.profile_id, e)
+
+        logger.info("Stored profile %s - %d samples, %.0f ms",
+                    session.profile_id, session.sample_count, session.duration * 1000)
+
+    def get(self, profile_id: str) -> Optional[ProfileSession]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of stored profiles, newest first."""
+        with self._lock:
+            sessions = list(self._profiles.values())
+        return [session.summary() for session in reversed(sessions)]
+
+
+# Process-wide profiler used by app.py
+profiler = RequestProfiler()
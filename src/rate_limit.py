@@ -0,0 +1,202 @@
+"""
+Admission control for LinkedIn Strategy Assistant.
+
+Provides per-client token-bucket rate limiting (keyed by Firebase uid or
+client IP) and a global cap on concurrent OCR-heavy requests. Buckets live
+in-process by default; a shared backend (e.g. one backed by Redis) can be
+plugged in through Config.RATE_LIMIT_BACKEND so limits hold across instances.
+"""
+from __future__ import annotations
+
+import abc
+import importlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
+
+from config import Config
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is rejected by admission control."""
+
+    def __init__(self, message: str, retry_after: float, status_code: int = 429):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After header value (whole seconds, at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class RateLimitBackend(abc.ABC):
+    """
+    Storage for token buckets.
+
+    Subclasses implement acquire() atomically for their store. A shared
+    backend lets several instances enforce one limit per client.
+    """
+
+    @abc.abstractmethod
+    def acquire(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """
+        Try to take `cost` tokens from the bucket for `key`.
+
+        Args:
+            key: Client key (e.g. "uid:abc" or "ip:1.2.3.4")
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity
+            cost: Tokens this request consumes
+
+        Returns:
+            0.0 if admitted, otherwise seconds until enough tokens are available
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local token buckets, bounded to `max_keys` most recent clients."""
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        now = self._clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / rate if rate > 0 else float("inf")
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Evicted clients simply start again with a full bucket
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+def load_backend(path: str) -> RateLimitBackend:
+    """
+    Load a shared backend from a "module:attribute" path.
+
+    The attribute may be a RateLimitBackend instance or a zero-argument
+    callable (class or factory) returning one.
+
+    Raises:
+        ValueError: If the path is malformed or does not resolve to a backend
+    """
+    module_name, _, attr = path.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Invalid RATE_LIMIT_BACKEND (expected 'module:attribute'): {path}")
+
+    target = getattr(importlib.import_module(module_name), attr)
+    backend = target() if callable(target) and not isinstance(target, RateLimitBackend) else target
+    if not isinstance(backend, RateLimitBackend):
+        raise ValueError(f"RATE_LIMIT_BACKEND {path} did not resolve to a RateLimitBackend")
+    return backend
+
+
+class RateLimiter:
+    """
+    Per-client token-bucket limiter.
+
+    Uses the shared backend when configured and falls back to in-process
+    buckets if the shared backend errors, so a backend outage degrades to
+    per-instance limits instead of rejecting or admitting everything.
+    """
+
+    def __init__(
+        self,
+        per_minute: Optional[float] = None,
+        burst: Optional[float] = None,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        """
+        Args:
+            per_minute: Sustained requests per minute (default: Config.RATE_LIMIT_PER_MINUTE)
+            burst: Bucket capacity (default: Config.RATE_LIMIT_BURST)
+            backend: Shared backend (default: loaded from Config.RATE_LIMIT_BACKEND, if set)
+        """
+        self.rate = (per_minute if per_minute is not None else Config.RATE_LIMIT_PER_MINUTE) / 60.0
+        self.burst = float(burst if burst is not None else Config.RATE_LIMIT_BURST)
+        if backend is None and Config.RATE_LIMIT_BACKEND:
+            backend = load_backend(Config.RATE_LIMIT_BACKEND)
+        self.backend = backend
+        self.local = InMemoryRateLimitBackend()
+
+    def check(self, key: str, cost: float = 1.0) -> None:
+        """
+        Admit or reject one request for `key`.
+
+        Costs above the burst size are clamped so large requests are slowed
+        down rather than rejected forever.
+
+        Raises:
+            RateLimitExceeded: If the client's bucket is empty (HTTP 429)
+        """
+        cost = min(max(cost, 0.0), self.burst)
+        wait = None
+        if self.backend is not None:
+            try:
+                wait = self.backend.acquire(key, self.rate, self.burst, cost)
+            except Exception as e:
+                logger.warning("Shared rate limit backend failed, using local limits: %s", e)
+        if wait is None:
+            wait = self.local.acquire(key, self.rate, self.burst, cost)
+
+        if wait > 0:
+            logger.warning("Rate limit exceeded for %s (retry after %.1fs)", key, wait)
+            raise RateLimitExceeded("Rate limit exceeded. Please retry later.", retry_after=wait)
+
+
+class ConcurrencyLimiter:
+    """Global cap on concurrently running OCR-heavy requests (non-blocking)."""
+
+    def __init__(self, max_in_flight: Optional[int] = None, retry_after: Optional[float] = None):
+        """
+        Args:
+            max_in_flight: Concurrent request cap (default: Config.MAX_CONCURRENT_OCR_REQUESTS)
+            retry_after: Retry-After seconds for rejected requests (default: Config.OCR_BUSY_RETRY_AFTER)
+        """
+        self.max_in_flight = max_in_flight if max_in_flight is not None else Config.MAX_CONCURRENT_OCR_REQUESTS
+        self.retry_after = retry_after if retry_after is not None else Config.OCR_BUSY_RETRY_AFTER
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold one slot for the duration of the block.
+
+        Raises:
+            RateLimitExceeded: If all slots are taken (HTTP 503)
+        """
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                raise RateLimitExceeded(
+                    "Server busy processing screenshots. Please retry later.",
+                    retry_after=self.retry_after,
+                    status_code=503,
+                )
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
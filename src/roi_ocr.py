@@ -0,0 +1,275 @@
+"""
+Region-of-interest OCR for LinkedIn profile screenshots.
+
+Full-page OCR reads navigation bars, ads and sidebars ("People also viewed")
+along with the profile, and then has to regex-hunt for sections. Instead:
+
+  1. Layout pass: each screenshot is downscaled (Config.OCR_LAYOUT_SCALE) and
+     OCR'd once in sparse-text mode to get word boxes. Words are grouped into
+     lines and section headers (About, Experience, Skills, Certifications,
+     plus headers that only end a section, such as Education or Activity)
+     are located.
+  2. Each wanted section is cropped from the full-resolution image (from its
+     header down to the next header in the same column, left of any
+     sidebar) and OCR'd with a page segmentation mode suited to its content:
+     a uniform block for About, one item per line for lists.
+
+Sections continue across screenshots: content above the first header of a
+capture belongs to the section the previous capture ended in (or to the top
+card, i.e. the headline, on the first capture). Per-section texts from
+overlapping captures are stitched with screenshots.stitch_texts().
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import Config
+from logger import setup_logger
+from ocr_engine import get_engine
+from screenshots import stitch_texts
+from tracing import span
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Optional dependencies with graceful degradation
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+    HAS_PIL = False
+
+HEADLINE = "headline"
+ABOUT = "about"
+EXPERIENCE = "experience"
+SKILLS = "skills"
+CERTIFICATIONS = "certifications"
+
+# Normalised header text -> section it starts
+SECTION_HEADERS = {
+    "about": ABOUT,
+    "experience": EXPERIENCE,
+    "skills": SKILLS,
+    "certifications": CERTIFICATIONS,
+    "licenses certifications": CERTIFICATIONS,
+}
+# Headers of sections that are not read; they only end the previous section
+STOP_HEADERS = frozenset({
+    "activity", "education", "interests", "featured", "projects", "recommendations", "languages",
+    "volunteering", "honors awards", "courses", "publications", "analytics", "resources",
+    "people also viewed", "people you may know", "more profiles for you", "causes", "organizations",
+})
+# Words of the LinkedIn navigation bar; the top card starts below a line with two or more
+NAV_WORDS = frozenset({"home", "network", "jobs", "messaging", "notifications"})
+
+# Tesseract page segmentation modes: 4 = single column of lines of varying
+# size, 6 = one uniform block of text, 11 = sparse text (layout pass)
+SECTION_PSM = {HEADLINE: 4, ABOUT: 6, EXPERIENCE: 4, SKILLS: 4, CERTIFICATIONS: 4}
+LAYOUT_PSM = 11
+
+# Headers are short; longer lines that happen to start with "Skills" are content
+MAX_HEADER_WORDS = 3
+# Headers whose left edges differ by less than this share of the width are in one column
+COLUMN_TOLERANCE = 0.1
+# The top card starts with the member's name, set noticeably larger than the headline
+NAME_HEIGHT_RATIO = 1.3
+# List-section lines that are LinkedIn metadata rather than items
+LIST_NOISE_PREFIXES = ("show all", "issued", "credential id", "show credential", "see credential", "endorsed by")
+# Regions shorter than this (pixels) are not worth an OCR call
+MIN_REGION_HEIGHT = 8
+REGION_PADDING = 4
+
+_NON_LETTER = re.compile(r"[^a-z]+")
+
+
+@dataclass
+class OcrLine:
+    """One line of the layout pass, in full-resolution pixel coordinates."""
+    text: str
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+
+@dataclass
+class Region:
+    """A crop box of one screenshot and the section it belongs to."""
+    section: str
+    box: Tuple[int, int, int, int]  # left, top, right, bottom
+
+
+def group_lines(data: Dict[str, list], scale: float = 1.0) -> List[OcrLine]:
+    """
+    Group OcrEngine.image_to_data() words into lines.
+
+    Args:
+        data: image_to_data() result (pytesseract DICT layout)
+        scale: Factor the layout image was downscaled by; boxes are mapped
+            back to full resolution
+
+    Returns:
+        Lines in reading order (top to bottom, then left to right)
+    """
+    lines: Dict[Tuple[int, int, int], List[int]] = {}
+    for i, text in enumerate(data["text"]):
+        if text and text.strip() and float(data["conf"][i]) >= 0:
+            lines.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), []).append(i)
+
+    result = []
+    for indices in lines.values():
+        left = min(data["left"][i] for i in indices)
+        top = min(data["top"][i] for i in indices)
+        right = max(data["left"][i] + data["width"][i] for i in indices)
+        bottom = max(data["top"][i] + data["height"][i] for i in indices)
+        result.append(OcrLine(
+            text=" ".join(data["text"][i].strip() for i in sorted(indices, key=lambda i: data["left"][i])),
+            left=round(left / scale), top=round(top / scale),
+            right=round(right / scale), bottom=round(bottom / scale),
+        ))
+    result.sort(key=lambda line: (line.top, line.left))
+    return result
+
+
+def _header_key(text: str) -> Optional[str]:
+    if len(text.split()) > MAX_HEADER_WORDS:
+        return None
+    key = _NON_LETTER.sub(" ", text.lower()).strip()
+    return key if key in SECTION_HEADERS or key in STOP_HEADERS else None
+
+
+def find_regions(
+    lines: Sequence[OcrLine],
+    size: Tuple[int, int],
+    carry: Optional[str],
+) -> Tuple[List[Region], Optional[str], bool]:
+    """
+    Locate section regions on one screenshot from its layout lines.
+
+    Args:
+        lines: Layout-pass lines (full-resolution coordinates)
+        size: Screenshot (width, height)
+        carry: Section the previous screenshot ended in; HEADLINE for the
+            first screenshot, None when the previous one ended outside any
+            wanted section
+
+    Returns:
+        (regions, section this screenshot ends in, whether any header was found)
+    """
+    width, height = size
+    headers = [(line, _header_key(line.text)) for line in lines]
+    headers = [(line, key) for line, key in headers if key]
+    if not headers:
+        regions = [Region(carry, (0, 0, width, height))] if carry else []
+        return regions, carry, False
+
+    main_left = min(line.left for line, _ in headers)
+    column = [(line, key) for line, key in headers if line.left - main_left <= COLUMN_TOLERANCE * width]
+    sidebar = [line for line, _ in headers if line.left - main_left > COLUMN_TOLERANCE * width]
+    right = min((line.left for line in sidebar), default=width + REGION_PADDING) - REGION_PADDING
+
+    regions: List[Region] = []
+    if carry:
+        top = 0
+        if carry == HEADLINE:
+            nav = [line for line in lines if len(NAV_WORDS & set(line.text.lower().split())) >= 2]
+            top = max((line.bottom for line in nav if line.bottom <= column[0][0].top), default=0)
+        regions.append(Region(carry, (0, top, right, column[0][0].top)))
+
+    section: Optional[str] = None
+    for index, (line, key) in enumerate(column):
+        section = SECTION_HEADERS.get(key)
+        if section is None:
+            continue
+        bottom = column[index + 1][0].top if index + 1 < len(column) else height
+        regions.append(Region(section, (max(0, line.left - REGION_PADDING), line.bottom, right, bottom)))
+
+    regions = [region for region in regions if region.box[3] - region.box[1] >= MIN_REGION_HEIGHT]
+    return regions, section, True
+
+
+def starts_with_name(lines: Sequence[OcrLine], box: Tuple[int, int, int, int]) -> bool:
+    """Whether the first layout line inside `box` is set much larger than the next (a name)."""
+    inside = [line for line in lines if line.top >= box[1] and line.bottom <= box[3] and line.left < box[2]]
+    if len(inside) < 2:
+        return False
+    return inside[0].bottom - inside[0].top >= NAME_HEIGHT_RATIO * (inside[1].bottom - inside[1].top)
+
+
+def list_items(lines: Iterable[str]) -> List[str]:
+    """Items of a list section: comma-separated values, without endorsement/credential metadata."""
+    items = []
+    for line in lines:
+        lowered = line.lower()
+        if lowered.startswith(LIST_NOISE_PREFIXES) or "endorsement" in lowered:
+            continue
+        items.extend(part.strip() for part in line.split(",") if part.strip())
+    return items
+
+
+def _layout_lines(image: "Image.Image") -> List[OcrLine]:
+    scale = Config.OCR_LAYOUT_SCALE
+    small = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))))
+    return group_lines(get_engine().image_to_data(small, psm=LAYOUT_PSM), scale)
+
+
+def _ocr_region(image: "Image.Image", region: Region) -> str:
+    return get_engine().image_to_string(image.crop(region.box), psm=SECTION_PSM[region.section])
+
+
+def extract_sections(screenshot_paths: Iterable[Path]) -> Optional[Dict[str, List[str]]]:
+    """
+    OCR only the profile sections of a sequence of screenshots.
+
+    Args:
+        screenshot_paths: Screenshots in capture order (already de-duplicated)
+
+    Returns:
+        Non-blank lines per section (HEADLINE, ABOUT, EXPERIENCE, SKILLS,
+        CERTIFICATIONS), or None when no section header was found in any
+        screenshot, in which case the caller should fall back to full-page OCR
+    """
+    # Lay out every capture first (cheap), so nothing is OCR'd at full
+    # resolution when the captures turn out not to be profile pages
+    plans = []
+    carry: Optional[str] = HEADLINE
+    found_header = False
+    for path in screenshot_paths:
+        with span("ocr.layout", backend="tesseract") as layout_span:
+            try:
+                with Image.open(path) as opened:
+                    image = opened.convert("L")
+                lines = _layout_lines(image)
+            except Exception as e:
+                logger.error("Failed to process screenshot %s: %s", path, e)
+                continue
+            regions, carry, has_header = find_regions(lines, image.size, carry)
+            found_header = found_header or has_header
+            layout_span.set(bytes=path.stat().st_size, regions=len(regions))
+        plans.append((image, lines, regions))
+
+    if not found_header:
+        return None
+
+    chunks: Dict[str, List[str]] = {}
+    for image, lines, regions in plans:
+        for region in regions:
+            with span("ocr.region", backend="tesseract", section=region.section) as region_span:
+                try:
+                    text = _ocr_region(image, region)
+                except Exception as e:
+                    logger.error("Failed to OCR %s region: %s", region.section, e)
+                    continue
+                region_span.set(chars=len(text))
+            if region.section == HEADLINE and starts_with_name(lines, region.box):
+                text = "\n".join(text.strip().splitlines()[1:])
+            chunks.setdefault(region.section, []).append(text)
+
+    return {
+        section: [line.strip() for line in stitch_texts(texts).splitlines() if line.strip()]
+        for section, texts in chunks.items()
+    }
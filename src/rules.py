@@ -0,0 +1,483 @@
+"""
+Declarative profile scoring and fix rules for LinkedIn Strategy Assistant.
+
+The profile score, the immediate-fix lists and the best-practice thresholds
+they use live in a versioned JSON file (Config.PROFILE_RULES_PATH, default
+profile_rules.json next to this module) instead of Python branches, so they
+can be tuned without a redeploy: get_rule_set() reloads the file when it
+changes, keeping the previous rules if the new file is invalid.
+
+A file is compiled once into a RuleSet:
+  - features: every value a rule may test (lengths, counts, gap ratios,
+    list items for fix texts) is computed in one pass over the analysis'
+    ProfileView.
+  - score plan: a flat tuple of threshold rules ("points if feature op
+    value") and linear rules ("int(feature * per), clamped to min/max"),
+    evaluated in one pass with per-rule contributions, or column-wise over a
+    batch of profiles.
+  - fix plans: per fix set, rules with all-of conditions, an optional group
+    (with per-group limits) and a text template. Template fields are
+    features or thresholds; a list feature is joined with ", " and its
+    format spec limits the item count ("{skills_missing:5}").
+
+Condition and score-rule values are numbers or threshold names. A file must
+define the fix sets and thresholds the pipeline and optimizer read directly
+(REQUIRED_FIX_SETS, REQUIRED_THRESHOLDS), so a missing one fails when the
+file is compiled, not per request.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import operator
+import string
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from config import Config
+from logger import setup_logger
+from profile_view import ProfileView
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Rule file schema versions this module can compile
+SUPPORTED_VERSIONS = frozenset({1})
+
+# Fix sets generate_strategy() uses
+REQUIRED_FIX_SETS = ("standard", "enhanced")
+# Thresholds read by name outside fix and score rules (completeness assessment)
+REQUIRED_THRESHOLDS = ("headline_min_chars", "about_min_chars", "skills_min_count", "skills_optimal_count")
+
+# Seconds between checks of the rule file's modification time
+RELOAD_CHECK_INTERVAL_S = 1.0
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Headline words that signal a value proposition
+VALUE_WORDS = ("driving", "building", "leading", "growing", "transforming", "delivering")
+# About-section words that signal a call to action
+CTA_WORDS = ("email", "connect")
+# Leading resume skills that should appear in the headline
+HEADLINE_TOP_SKILLS = 3
+
+Number = Union[int, float]
+
+
+def _profile_features(view: ProfileView, thresholds: Mapping[str, Number]) -> Dict[str, Any]:
+    headline_missing_skills = [
+        skill for skill, lower in zip(view.resume_skills[:HEADLINE_TOP_SKILLS], view.resume_skills_lower)
+        if not view.in_headline(lower)
+    ]
+    resume_not_on_linkedin = list(view.resume_skills_not_on_linkedin())
+
+    about = view.about
+    preview = int(thresholds.get("about_preview_chars", 300))
+    first_line = about.split("\n", 1)[0] if "\n" in about else about[:preview]
+    shortfall = 0
+    if about and view.resume_skills:
+        mentioned = sum(1 for lower in view.resume_skills_lower if view.in_about(lower))
+        target = min(int(thresholds.get("about_min_skills_mentioned", 5)), len(view.resume_skills))
+        shortfall = max(0, target - mentioned)
+
+    skills_missing = list(view.skills_missing)
+    return {
+        "headline_chars": len(view.headline),
+        "about_chars": len(about),
+        "about_first_line_chars": len(first_line),
+        "about_skills_shortfall": shortfall,
+        "about_missing_cta": int(bool(about) and not any(word in view.about_lower for word in CTA_WORDS)),
+        "current_role": view.current_role,
+        "role_missing_from_headline": int(bool(view.current_role) and view.current_role not in view.headline),
+        "headline_has_value_word": int(any(word in view.headline_lower for word in VALUE_WORDS)),
+        "headline_missing_skills": headline_missing_skills,
+        "headline_missing_skills_count": len(headline_missing_skills),
+        "linkedin_skills_count": len(view.linkedin_skills),
+        "linkedin_certifications_count": len(view.linkedin_certifications),
+        "resume_skills_count": len(view.resume_skills),
+        "resume_projects_count": len(view.resume_projects),
+        "resume_skills_not_on_linkedin": resume_not_on_linkedin,
+        "resume_skills_not_on_linkedin_count": len(resume_not_on_linkedin),
+        "skills_missing": skills_missing,
+        "skills_missing_count": len(skills_missing),
+        "skills_gap_ratio": len(skills_missing) / max(len(view.resume_skills), 1),
+        "certifications_missing": list(view.certifications_missing),
+        "certifications_missing_count": len(view.certifications_missing),
+        "projects_missing": list(view.projects_missing),
+        "projects_missing_count": len(view.projects_missing),
+        "tech_themes_count": len(view.advanced_tech_themes),
+    }
+
+
+# Names of every feature, for validating rule files
+FEATURE_NAMES = frozenset(_profile_features(ProfileView.build({}), {}))
+
+
+class _TemplateFormatter(string.Formatter):
+    """str.format with list fields joined by ", " and their format spec as an item limit."""
+
+    def format_field(self, value: Any, format_spec: str) -> str:
+        if isinstance(value, (list, tuple)):
+            return ", ".join(value[:int(format_spec)] if format_spec else value)
+        return super().format_field(value, format_spec)
+
+
+_FORMATTER = _TemplateFormatter()
+
+
+@dataclass
+class ScoreResult:
+    """
+    A profile score and what each rule contributed to it.
+
+    raw is baseline + sum(contributions); total is raw clamped to the score range.
+    """
+    total: int
+    baseline: int
+    contributions: Dict[str, int] = field(default_factory=dict)
+    raw: int = 0
+
+
+@dataclass
+class BatchScores:
+    """Scores of a batch of profiles: totals and one contribution column per rule."""
+    totals: List[int]
+    contributions: Dict[str, List[int]]
+
+
+# Compiled score rule: (id, feature, op or None for linear, value, points, per, min, max)
+_ScoreStep = Tuple[str, str, Optional[Callable[[Any, Any], bool]], Number, int, Number, Number, Number]
+# Compiled condition: (feature, op, value)
+_Condition = Tuple[str, Callable[[Any, Any], bool], Number]
+
+
+@dataclass(frozen=True)
+class _FixStep:
+    rule_id: str
+    group: Optional[str]
+    conditions: Tuple[_Condition, ...]
+    template: str
+
+
+@dataclass(frozen=True)
+class _FixPlan:
+    limit: int
+    group_limits: Mapping[str, int]
+    steps: Tuple[_FixStep, ...]
+
+
+class RuleSet:
+    """
+    Rules compiled from one rule file.
+
+    Build with compile_rules() or load_rules(); use get_rule_set() for the
+    process-wide, auto-reloading instance.
+    """
+
+    def __init__(
+        self,
+        revision: str,
+        thresholds: Dict[str, Number],
+        baseline: int,
+        bounds: Tuple[int, int],
+        score_plan: Tuple[_ScoreStep, ...],
+        fix_plans: Dict[str, _FixPlan],
+        effort: Optional[Dict[str, Number]] = None,
+        digest: str = "",
+    ):
+        self.revision = revision
+        # Hash of the rule file's contents: changes with any edit, bumped revision or not
+        self.digest = digest
+        self.thresholds = thresholds
+        self.baseline = baseline
+        self.bounds = bounds
+        # Relative cost of profile edits, for ranking fixes (see what_if.py)
+        self.effort = effort or {}
+        self._score_plan = score_plan
+        self._fix_plans = fix_plans
+        self._steps_by_feature: Dict[str, Tuple[_ScoreStep, ...]] = {}
+        for step in score_plan:
+            self._steps_by_feature[step[1]] = self._steps_by_feature.get(step[1], ()) + (step,)
+
+    @property
+    def rule_ids(self) -> List[str]:
+        """Score rule ids in evaluation order."""
+        return [step[0] for step in self._score_plan]
+
+    @property
+    def fix_sets(self) -> List[str]:
+        return sorted(self._fix_plans)
+
+    def score_thresholds(self, feature: str) -> List[Tuple[str, Number]]:
+        """(operator, value) of the threshold score rules on `feature`, in plan order."""
+        operators = {fn: name for name, fn in OPERATORS.items()}
+        return [(operators[op], value) for _, _, op, value, *_ in self._steps_by_feature.get(feature, ()) if op]
+
+    def features(self, view: ProfileView) -> Dict[str, Any]:
+        """Compute every rule feature of one analysis in one pass."""
+        return _profile_features(view, self.thresholds)
+
+    def _clamp(self, value: int) -> int:
+        low, high = self.bounds
+        return max(low, min(high, value))
+
+    def score(self, features: Mapping[str, Any]) -> ScoreResult:
+        """Evaluate the score plan against one profile's features."""
+        contributions: Dict[str, int] = {}
+        total = self.baseline
+        for rule_id, feature, op, value, points, per, low, high in self._score_plan:
+            x = features[feature]
+            if op is not None:
+                points_ = points if op(x, value) else 0
+            else:
+                points_ = max(low, min(high, int(x * per)))
+            contributions[rule_id] = points_
+            total += points_
+        return ScoreResult(total=self._clamp(total), baseline=self.baseline, contributions=contributions, raw=total)
+
+    def rescore(self, base: ScoreResult, changes: Mapping[str, Any]) -> int:
+        """
+        Total score after changing some features, re-evaluating only the rules that read them.
+
+        Args:
+            base: score() of the unchanged features
+            changes: New values of the changed features
+
+        Returns:
+            The new total, identical to score() of the changed features
+        """
+        raw = base.raw
+        contributions = base.contributions
+        for feature, x in changes.items():
+            for rule_id, _, op, value, points, per, low, high in self._steps_by_feature.get(feature, ()):
+                if op is not None:
+                    raw += (points if op(x, value) else 0) - contributions[rule_id]
+                else:
+                    raw += max(low, min(high, int(x * per))) - contributions[rule_id]
+        return self._clamp(raw)
+
+    def score_batch(self, rows: Sequence[Mapping[str, Any]]) -> BatchScores:
+        """
+        Evaluate the score plan over many profiles' features, column by column.
+
+        Each rule reads one feature column and produces one contribution
+        column, so the per-rule dispatch happens once per batch instead of
+        once per profile.
+        """
+        columns: Dict[str, List[Any]] = {}
+        totals = [self.baseline] * len(rows)
+        contributions: Dict[str, List[int]] = {}
+        for rule_id, feature, op, value, points, per, low, high in self._score_plan:
+            if feature not in columns:
+                columns[feature] = [row[feature] for row in rows]
+            if op is not None:
+                column = [points if op(x, value) else 0 for x in columns[feature]]
+            else:
+                column = [max(low, min(high, int(x * per))) for x in columns[feature]]
+            contributions[rule_id] = column
+            totals = [total + points_ for total, points_ in zip(totals, column)]
+        return BatchScores(totals=[self._clamp(total) for total in totals], contributions=contributions)
+
+    def fixes(self, fix_set: str, features: Mapping[str, Any], group: Optional[str] = None) -> List[str]:
+        """
+        Texts of the fixes in `fix_set` whose conditions all hold, in rule order.
+
+        Args:
+            fix_set: Fix set name (see fix_sets)
+            features: Features of the profile (see features())
+            group: Only this group's fixes, without the set's limits (e.g. all
+                headline tips)
+
+        Raises:
+            KeyError: If the fix set is not defined
+        """
+        plan = self._fix_plans[fix_set]
+        names = {**self.thresholds, **features}
+        result: List[str] = []
+        per_group: Dict[str, int] = {}
+        for step in plan.steps:
+            if group is not None:
+                if step.group != group:
+                    continue
+            elif len(result) >= plan.limit:
+                break
+            elif step.group is not None and per_group.get(step.group, 0) >= plan.group_limits.get(step.group, plan.limit):
+                continue
+            if all(op(features[feature], value) for feature, op, value in step.conditions):
+                result.append(_FORMATTER.vformat(step.template, (), names))
+                if step.group is not None:
+                    per_group[step.group] = per_group.get(step.group, 0) + 1
+        return result
+
+
+def _value(raw: Any, thresholds: Mapping[str, Number], where: str) -> Number:
+    if isinstance(raw, str):
+        if raw not in thresholds:
+            raise ValueError(f"{where}: unknown threshold {raw!r}")
+        return thresholds[raw]
+    if not isinstance(raw, (int, float)) or isinstance(raw, bool):
+        raise ValueError(f"{where}: value must be a number or threshold name, got {raw!r}")
+    return raw
+
+
+def _feature(raw: Any, where: str) -> str:
+    if raw not in FEATURE_NAMES:
+        raise ValueError(f"{where}: unknown feature {raw!r}")
+    return raw
+
+
+def _op(raw: Any, where: str) -> Callable[[Any, Any], bool]:
+    if raw not in OPERATORS:
+        raise ValueError(f"{where}: unknown operator {raw!r} (known: {sorted(OPERATORS)})")
+    return OPERATORS[raw]
+
+
+def _compile_fix_plan(name: str, spec: Mapping[str, Any], thresholds: Mapping[str, Number]) -> _FixPlan:
+    steps = []
+    for index, rule in enumerate(spec.get("rules", [])):
+        where = f"fixes.{name}[{rule.get('id', index)}]"
+        conditions = tuple(
+            (_feature(cond.get("feature"), where), _op(cond.get("op"), where), _value(cond.get("value"), thresholds, where))
+            for cond in rule.get("when", [])
+        )
+        template = rule.get("text")
+        if not isinstance(template, str) or not template:
+            raise ValueError(f"{where}: missing text")
+        for _, field_name, _, _ in _FORMATTER.parse(template):
+            if field_name is not None and field_name not in FEATURE_NAMES and field_name not in thresholds:
+                raise ValueError(f"{where}: unknown template field {field_name!r}")
+        steps.append(_FixStep(rule_id=rule.get("id", str(index)), group=rule.get("group"),
+                              conditions=conditions, template=template))
+    return _FixPlan(limit=int(spec.get("max", len(steps))), group_limits=dict(spec.get("group_limits", {})),
+                    steps=tuple(steps))
+
+
+def compile_rules(document: Mapping[str, Any]) -> RuleSet:
+    """
+    Compile a parsed rule file into a RuleSet.
+
+    Raises:
+        ValueError: If the schema version is unsupported, a required fix set
+            or threshold is missing, or a rule references an unknown feature,
+            operator, threshold or template field
+    """
+    version = document.get("version")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported rules version: {version!r} (supported: {sorted(SUPPORTED_VERSIONS)})")
+
+    thresholds = dict(document.get("thresholds", {}))
+    for name, threshold in thresholds.items():
+        _value(threshold, {}, f"thresholds.{name}")
+    missing = [name for name in REQUIRED_THRESHOLDS if name not in thresholds]
+    if missing:
+        raise ValueError(f"Missing required thresholds: {missing}")
+    missing = [name for name in REQUIRED_FIX_SETS if name not in document.get("fixes", {})]
+    if missing:
+        raise ValueError(f"Missing required fix sets: {missing}")
+
+    score = document.get("score", {})
+    plan: List[_ScoreStep] = []
+    for index, rule in enumerate(score.get("rules", [])):
+        rule_id = rule.get("id", str(index))
+        where = f"score[{rule_id}]"
+        feature = _feature(rule.get("feature"), where)
+        inf = float("inf")
+        if "per" in rule:
+            plan.append((rule_id, feature, None, 0, 0, _value(rule["per"], thresholds, where),
+                         _value(rule.get("min", -inf), thresholds, where),
+                         _value(rule.get("max", inf), thresholds, where)))
+        else:
+            plan.append((rule_id, feature, _op(rule.get("op"), where), _value(rule.get("value"), thresholds, where),
+                         int(rule.get("points", 0)), 0, -inf, inf))
+    if len({step[0] for step in plan}) != len(plan):
+        raise ValueError("Duplicate score rule ids")
+
+    fix_plans = {name: _compile_fix_plan(name, spec, thresholds) for name, spec in document.get("fixes", {}).items()}
+    effort = dict(document.get("effort", {}))
+    for name, cost in effort.items():
+        if _value(cost, {}, f"effort.{name}") <= 0:
+            raise ValueError(f"effort.{name}: must be positive, got {cost!r}")
+    return RuleSet(
+        revision=str(document.get("revision", "")),
+        thresholds=thresholds,
+        baseline=int(score.get("baseline", Config.PROFILE_SCORE_BASELINE)),
+        bounds=(int(score.get("min", Config.PROFILE_SCORE_MIN)), int(score.get("max", Config.PROFILE_SCORE_MAX))),
+        score_plan=tuple(plan),
+        fix_plans=fix_plans,
+        effort=effort,
+        digest=hashlib.sha256(json.dumps(document, sort_keys=True).encode("utf-8")).hexdigest()[:12],
+    )
+
+
+def load_rules(path: Path) -> RuleSet:
+    """
+    Load and compile a rule file.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is not valid JSON or does not compile
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Rules file not found: {path}")
+    try:
+        document = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid rules file {path}: {e}") from e
+    if not isinstance(document, dict):
+        raise ValueError(f"Rules file must be a JSON object: {path}")
+    return compile_rules(document)
+
+
+# (path, modification time, rules, monotonic time of the last check)
+_cached: Optional[Tuple[Path, int, RuleSet, float]] = None
+_cache_lock = threading.Lock()
+
+
+def get_rule_set() -> RuleSet:
+    """
+    Return the compiled rules of Config.PROFILE_RULES_PATH.
+
+    The file is compiled on first use and again when its modification time
+    changes, checked at most every RELOAD_CHECK_INTERVAL_S. A changed file
+    that fails to compile, or a file that can no longer be read, is logged
+    and the previous rules stay in effect.
+    """
+    global _cached
+    path = Config.PROFILE_RULES_PATH
+    cached = _cached
+    if cached is not None and cached[0] == path and time.monotonic() - cached[3] < RELOAD_CHECK_INTERVAL_S:
+        return cached[2]
+
+    with _cache_lock:
+        now = time.monotonic()
+        cached = _cached
+        if cached is not None and cached[0] != path:
+            cached = None
+        if cached is not None and now - cached[3] < RELOAD_CHECK_INTERVAL_S:
+            return cached[2]
+        mtime = None
+        try:
+            mtime = path.stat().st_mtime_ns
+            if cached is not None and cached[1] == mtime:
+                _cached = (path, mtime, cached[2], now)
+                return cached[2]
+            rule_set = load_rules(path)
+        except (ValueError, OSError) as e:
+            if cached is None:
+                raise
+            logger.error("Keeping rules %s: %s", cached[2].revision, e)
+            _cached = (path, cached[1] if mtime is None else mtime, cached[2], now)
+            return cached[2]
+        logger.info("Loaded profile rules %s from %s", rule_set.revision, path)
+        _cached = (path, mtime, rule_set, now)
+        return rule_set
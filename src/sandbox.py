@@ -0,0 +1,432 @@
+"""
+Sandboxed worker processes for parsing untrusted uploads.
+
+Resume parsing (pdfplumber, python-docx, ...) and local screenshot decoding
+and OCR run in a pool of long-lived worker processes instead of the uvicorn
+worker, so a malformed or adversarial file cannot spin or balloon memory in
+the process serving every other request. Each worker runs with:
+  - an address-space limit (RLIMIT_AS, Config.SANDBOX_MEMORY_MB): allocations
+    beyond it fail with MemoryError inside the worker;
+  - a CPU-time budget per task (RLIMIT_CPU, Config.SANDBOX_CPU_SECONDS): the
+    kernel kills the worker with SIGXCPU when a task exceeds it;
+  - a wall-clock deadline per task (Config.SANDBOX_TIMEOUT_S), enforced by the
+    caller, which kills the worker once it passes (covers tasks that block
+    without using CPU).
+
+A worker that hits a limit or dies is discarded and replaced in the
+background, and the caller gets SandboxLimitExceeded (422 in app.py).
+Exceptions raised by the task itself (ValueError for an unsupported format,
+...) are re-raised in the caller unchanged, and spans opened by the task are
+grafted into the caller's trace. When the caller's request is being profiled
+(see profiler.py), the worker samples its own stack and the samples are added
+to the request's profile under a "sandbox-worker" root frame.
+
+Callers wait at most Config.SANDBOX_ACQUIRE_TIMEOUT_S for an idle worker;
+while waiting, workers that could not be replaced are respawned, and a caller
+still without a worker gets SandboxUnavailable (503 in app.py).
+
+Workers are forked from a forkserver that has already imported the pipeline,
+so starting or replacing one takes milliseconds, and tasks go to warm idle
+workers: a healthy request only pays for pickling file paths and results.
+
+    resume = run_sandboxed(parse_resume, resume_path)
+
+The process-wide pool is started at worker startup and closed at shutdown
+(see app.py lifespan); get_sandbox() starts it lazily otherwise.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from config import Config
+from logger import request_id_var, setup_logger, shutdown_logging
+from profiler import ProfileSession, active_profile
+from tracing import attach_spans, collect_spans
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Optional dependencies with graceful degradation
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+    HAS_RESOURCE = False
+
+# Imported once by the forkserver so forked workers start warm
+PRELOAD_MODULES = ["pipeline"]
+# Seconds a retiring worker gets to exit after its pipe is closed
+STOP_GRACE_S = 1.0
+# Seconds between checks for missing workers while waiting for an idle one
+IDLE_POLL_S = 0.5
+# Root frame of worker samples in the caller's profile
+PROFILE_ROOT = "sandbox-worker"
+
+
+class SandboxLimitExceeded(RuntimeError):
+    """
+    A sandboxed task exceeded a limit or its worker died.
+
+    The worker has been killed and is being replaced. `reason` is "timeout",
+    "cpu", "memory" or "crashed".
+    """
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class SandboxUnavailable(RuntimeError):
+    """No sandbox worker became available in time (all busy or failing to start)."""
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    """Allow the calling process `seconds` more CPU time (soft RLIMIT_CPU)."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + seconds + 1  # +1: the limit is checked in whole seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(connection, memory_mb: int, cpu_seconds: int) -> None:
+    """
+    Worker process loop: run (fn, args, request_id, profile_interval) tasks
+    until the pipe closes.
+
+    Replies are (status, value, spans, stacks): ("ok", result, ...), ("error",
+    exception, ...), or ("memory", None, None, None) just before exiting after
+    a MemoryError. stacks are the task's collapsed stack samples when
+    profile_interval is set, else None.
+    """
+    # Ctrl+C on the server is handled by the parent, which closes the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if HAS_RESOURCE and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        while True:
+            try:
+                fn, args, request_id, profile_interval = connection.recv()
+            except (EOFError, OSError):
+                return  # pool closed
+            if HAS_RESOURCE and cpu_seconds > 0:
+                _set_cpu_budget(cpu_seconds)
+            request_id_var.set(request_id)
+
+            session = ProfileSession(PROFILE_ROOT, PROFILE_ROOT, profile_interval) if profile_interval else None
+            stacks = session.stacks if session else None
+            with collect_spans() as spans:
+                try:
+                    result = session.run(fn, *args) if session else fn(*args)
+                    reply: Tuple[str, Any, Any, Any] = ("ok", result, spans, stacks)
+                except MemoryError:
+                    reply = ("memory", None, None, None)
+                except Exception as e:
+                    reply = ("error", e, spans, stacks)
+
+            if reply[0] == "memory":
+                # The heap may be left fragmented or half-built; start over
+                connection.send(reply)
+                return
+            try:
+                connection.send(reply)
+            except Exception as e:
+                # Result or exception not picklable; nothing was written yet
+                connection.send(("error", RuntimeError(f"{type(e).__name__}: {e}"), spans, stacks))
+    finally:
+        shutdown_logging()
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe."""
+
+    def __init__(self, context, memory_mb: int, cpu_seconds: int):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_connection, memory_mb, cpu_seconds),
+            name="sandbox-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.tasks = 0
+
+    def stop(self, grace: float = 0.0) -> None:
+        """Close the pipe (the worker exits on EOF), then kill it if still running."""
+        self.connection.close()
+        if grace > 0:
+            self.process.join(grace)
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+
+class SandboxPool:
+    """
+    Fixed-size pool of resource-limited worker processes.
+
+    run() checks out an idle worker for the duration of one task; callers
+    wait (up to acquire_timeout) when all are busy. Call start() at worker
+    startup and close() at shutdown.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        memory_mb: Optional[int] = None,
+        cpu_seconds: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_tasks: Optional[int] = None,
+        start_method: Optional[str] = None,
+        acquire_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            size: Number of workers (default: Config.SANDBOX_WORKERS)
+            memory_mb: Address-space limit per worker, 0 = none (default: Config.SANDBOX_MEMORY_MB)
+            cpu_seconds: CPU time per task, 0 = none (default: Config.SANDBOX_CPU_SECONDS)
+            timeout: Wall-clock seconds per task (default: Config.SANDBOX_TIMEOUT_S)
+            max_tasks: Tasks after which a worker is replaced, 0 = never (default: Config.SANDBOX_MAX_TASKS)
+            start_method: multiprocessing start method (default: Config.SANDBOX_START_METHOD)
+            acquire_timeout: Seconds to wait for an idle worker (default: Config.SANDBOX_ACQUIRE_TIMEOUT_S)
+        """
+        self.size = max(1, size if size is not None else Config.SANDBOX_WORKERS)
+        self.memory_mb = memory_mb if memory_mb is not None else Config.SANDBOX_MEMORY_MB
+        self.cpu_seconds = cpu_seconds if cpu_seconds is not None else Config.SANDBOX_CPU_SECONDS
+        self.timeout = timeout if timeout is not None else Config.SANDBOX_TIMEOUT_S
+        self.max_tasks = max_tasks if max_tasks is not None else Config.SANDBOX_MAX_TASKS
+        self.start_method = start_method or Config.SANDBOX_START_METHOD
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else Config.SANDBOX_ACQUIRE_TIMEOUT_S
+        self._context = None
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        """Whether the pool currently has workers."""
+        return bool(self._workers)
+
+    def _get_context(self):
+        if self._context is None:
+            method = self.start_method
+            if method not in multiprocessing.get_all_start_methods():
+                logger.warning("Start method %s not available - using spawn", method)
+                method = "spawn"
+            self._context = multiprocessing.get_context(method)
+            if method == "forkserver":
+                self._context.set_forkserver_preload(PRELOAD_MODULES)
+        return self._context
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._get_context(), self.memory_mb, self.cpu_seconds)
+
+    def start(self) -> None:
+        """Start the workers. No-op if started."""
+        if not HAS_RESOURCE:
+            logger.warning("resource module not available - sandbox workers run without CPU/memory limits")
+
+        with self._lock:
+            if self._workers:
+                return
+            for _ in range(self.size):
+                worker = self._spawn()
+                self._workers.append(worker)
+                self._idle.put(worker)
+
+        logger.info("Sandbox pool started - workers: %d, memory: %d MB, cpu: %d s, timeout: %g s",
+                    self.size, self.memory_mb, self.cpu_seconds, self.timeout)
+
+    def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) in a worker and return its result.
+
+        `fn`, its arguments and its result must be picklable (module-level
+        functions, paths, dataclasses).
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments
+            timeout: Wall-clock seconds allowed (default: the pool's timeout)
+
+        Returns:
+            fn's return value
+
+        Raises:
+            SandboxLimitExceeded: If the task ran out of time, CPU or memory,
+                or its worker died
+            SandboxUnavailable: If no worker became idle within acquire_timeout
+            Exception: Whatever fn raised
+        """
+        limit = self.timeout if timeout is None else timeout
+        if not self._workers:
+            self.start()
+        worker = self._checkout()
+        profile = active_profile.get() if Config.PROFILING_ENABLED else None
+
+        started = time.perf_counter()
+        try:
+            worker.connection.send((fn, args, request_id_var.get(), profile.interval if profile else 0))
+        except OSError:
+            self._recycle(worker)
+            raise self._died(worker) from None
+        except BaseException:
+            # Arguments not picklable; nothing reached the worker
+            self._checkin(worker)
+            raise
+
+        try:
+            if not worker.connection.poll(limit):
+                worker.process.kill()
+                raise SandboxLimitExceeded("timeout", f"Processing the upload took longer than {limit:g} s")
+            status, value, spans, stacks = worker.connection.recv()
+        except (EOFError, OSError):
+            self._recycle(worker)
+            raise self._died(worker) from None
+        except BaseException:
+            self._recycle(worker)
+            raise
+
+        if status == "memory":
+            self._recycle(worker)
+            raise SandboxLimitExceeded("memory", f"Processing the upload used more than {self.memory_mb} MB of memory")
+        self._checkin(worker)
+        if spans is not None:
+            attach_spans(spans, started)
+        if profile is not None and stacks:
+            profile.merge(stacks, PROFILE_ROOT)
+        if status == "error":
+            raise value
+        return value
+
+    def _checkout(self) -> _Worker:
+        """Wait for an idle worker, respawning missing ones meanwhile."""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                # Re-read each round: close() replaces the queue
+                return self._idle.get(timeout=max(0.0, min(IDLE_POLL_S, remaining)))
+            except queue.Empty:
+                pass
+            worker = self._respawn_missing()
+            if worker is not None:
+                return worker
+            if remaining <= IDLE_POLL_S:
+                raise SandboxUnavailable(
+                    f"No sandbox worker available within {self.acquire_timeout:g} s. Please retry later."
+                )
+
+    def _respawn_missing(self) -> Optional[_Worker]:
+        """Start and check out a worker if the pool is below size (a replacement failed)."""
+        with self._lock:
+            if len(self._workers) >= self.size:
+                return None
+            try:
+                worker = self._spawn()
+            except Exception as e:
+                logger.error("Failed to start sandbox worker: %s", e)
+                return None
+            self._workers.append(worker)
+        logger.warning("Started missing sandbox worker (%d of %d)", len(self._workers), self.size)
+        return worker
+
+    def _died(self, worker: _Worker) -> SandboxLimitExceeded:
+        """Exception for a worker that exited mid-task."""
+        worker.process.join(STOP_GRACE_S)
+        if worker.process.exitcode == -signal.SIGXCPU:
+            return SandboxLimitExceeded("cpu", f"Processing the upload used more than {self.cpu_seconds} s of CPU time")
+        logger.error("Sandbox worker died with exit code %s", worker.process.exitcode)
+        return SandboxLimitExceeded("crashed", "Processing the upload crashed its worker process")
+
+    def _checkin(self, worker: _Worker) -> None:
+        worker.tasks += 1
+        if self.max_tasks and worker.tasks >= self.max_tasks:
+            self._recycle(worker, kill=False)
+            return
+        with self._lock:
+            if worker in self._workers:  # not closed meanwhile
+                self._idle.put(worker)
+
+    def _recycle(self, worker: _Worker, kill: bool = True) -> None:
+        """
+        Stop a worker and replace it in the background, off the caller's path.
+
+        Args:
+            worker: Checked-out worker
+            kill: Kill it right away (runaway or broken task) instead of
+                letting it exit on EOF
+        """
+        if kill:
+            worker.process.kill()
+        threading.Thread(target=self._replace, args=(worker,), name="sandbox-respawn", daemon=True).start()
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.stop(STOP_GRACE_S)
+        with self._lock:
+            if worker not in self._workers:
+                return  # pool closed meanwhile
+            self._workers.remove(worker)
+            try:
+                replacement = self._spawn()
+            except Exception as e:
+                # Callers waiting for a worker retry the spawn
+                logger.error("Failed to replace sandbox worker: %s", e)
+                return
+            self._workers.append(replacement)
+            self._idle.put(replacement)
+
+    def close(self) -> None:
+        """Stop all workers. The pool can be started again afterwards."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._idle = queue.LifoQueue()
+
+        for worker in workers:
+            worker.stop(STOP_GRACE_S)
+
+        if workers:
+            logger.info("Sandbox pool closed (%d workers)", len(workers))
+
+
+_sandbox: Optional[SandboxPool] = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox() -> SandboxPool:
+    """Return the process-wide sandbox pool, starting it on first use."""
+    global _sandbox
+    if _sandbox is None:
+        with _sandbox_lock:
+            if _sandbox is None:
+                pool = SandboxPool()
+                pool.start()
+                _sandbox = pool
+    return _sandbox
+
+
+def close_sandbox() -> None:
+    """Close the process-wide pool (worker shutdown); get_sandbox() recreates it."""
+    global _sandbox
+    with _sandbox_lock:
+        pool, _sandbox = _sandbox, None
+    if pool is not None:
+        pool.close()
+
+
+def run_sandboxed(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run fn(*args) in the process-wide sandbox when Config.SANDBOX_ENABLED, else inline."""
+    if not Config.SANDBOX_ENABLED:
+        return fn(*args)
+    return get_sandbox().run(fn, *args)
@@ -0,0 +1,182 @@
+"""
+Screenshot de-duplication and OCR text stitching for LinkedIn Strategy Assistant.
+
+Users scroll and capture overlapping screenshots. Before OCR, near-duplicate
+captures are dropped by comparing 256-bit difference hashes (dHash) of the
+images. After OCR, the texts of consecutive captures are merged: the longest
+run of lines that ends one capture and starts the next is found with a
+line-level suffix/prefix search (KMP over normalised lines) and kept once,
+so profile parsing sees a single document without repeated sections.
+"""
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from config import Config
+from logger import setup_logger
+from tracing import current_span
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Optional dependencies with graceful degradation
+try:
+    from PIL import Image, ImageOps
+    HAS_PIL = True
+except ImportError:  # pragma: no cover - optional dependency
+    Image = ImageOps = None
+    HAS_PIL = False
+
+# Lines at the edge of a capture are often cut mid-line and OCR'd as noise;
+# an overlap may start or end this many lines in from the edge
+EDGE_NOISE_LINES = 2
+
+# Overlaps shorter than this (normalised characters) are treated as chance
+# matches, e.g. a lone "Skills" heading
+MIN_OVERLAP_CHARS = 24
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def dhash(image: "Image.Image", hash_size: int = 16) -> int:
+    """
+    Difference hash: one bit per horizontally adjacent pixel pair of a
+    (hash_size + 1) x hash_size greyscale thumbnail.
+
+    The image is cropped to its non-white content and the thumbnail is
+    contrast-stretched first. Plain dHash maps any page of small dark text on
+    a white background to nearly the same hash.
+    """
+    grey = image.convert("L")
+    bbox = ImageOps.invert(grey).getbbox()
+    if bbox:
+        grey = grey.crop(bbox)
+    thumbnail = ImageOps.autocontrast(grey.resize((hash_size + 1, hash_size), Image.Resampling.BOX))
+    pixels = thumbnail.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def dedupe_screenshots(paths: Iterable[Path], max_distance: Optional[int] = None) -> List[Path]:
+    """
+    Drop screenshots that are near-duplicates of an earlier one.
+
+    Args:
+        paths: Screenshot paths in capture order
+        max_distance: Largest dHash Hamming distance still considered a
+            duplicate (Config.SCREENSHOT_DUPLICATE_DISTANCE); negative disables
+
+    Returns:
+        The distinct screenshots, in their original order. Unreadable images
+        are kept so the OCR step reports them.
+    """
+    max_distance = Config.SCREENSHOT_DUPLICATE_DISTANCE if max_distance is None else max_distance
+    paths = list(paths)
+    if not HAS_PIL or max_distance < 0:
+        return paths
+
+    kept: List[Path] = []
+    hashes: List[Tuple[int, Tuple[int, int]]] = []
+    for path in paths:
+        try:
+            with Image.open(path) as image:
+                fingerprint = (dhash(image), image.size)
+        except Exception as e:
+            logger.warning("Could not hash screenshot %s: %s", path, e)
+            kept.append(path)
+            continue
+        duplicate_of = next(
+            (i for i, (value, size) in enumerate(hashes)
+             if size == fingerprint[1] and bin(value ^ fingerprint[0]).count("1") <= max_distance),
+            None,
+        )
+        if duplicate_of is not None:
+            logger.info("Skipping near-duplicate screenshot %s", path.name)
+            continue
+        hashes.append(fingerprint)
+        kept.append(path)
+
+    current_span().set(duplicates=len(paths) - len(kept))
+    return kept
+
+
+def _normalize_line(line: str) -> str:
+    return _NON_WORD.sub(" ", line).strip().lower()
+
+
+def _longest_overlap(tail: Sequence[str], head: Sequence[str]) -> int:
+    """Length of the longest suffix of `tail` that is also a prefix of `head` (KMP)."""
+    if not tail or not head:
+        return 0
+    # Only the last len(head) lines of tail can take part in an overlap
+    tail = tail[-len(head):]
+    failure = [0] * len(head)
+    k = 0
+    for i in range(1, len(head)):
+        while k and head[i] != head[k]:
+            k = failure[k - 1]
+        if head[i] == head[k]:
+            k += 1
+        failure[i] = k
+    k = 0
+    for line in tail:
+        while k and (k == len(head) or line != head[k]):
+            k = failure[k - 1]
+        if line == head[k]:
+            k += 1
+    return k
+
+
+def stitch_texts(texts: Sequence[str]) -> str:
+    """
+    Merge OCR texts of consecutive captures, keeping overlapping lines once.
+
+    Lines are compared case- and punctuation-insensitively, ignoring blank
+    lines (which are kept in the output, since they delimit sections). Up to
+    EDGE_NOISE_LINES lines at the bottom of the previous text or the top of
+    the next one may be skipped to reach the overlap; captures without an
+    overlap of at least MIN_OVERLAP_CHARS are simply appended.
+    """
+    merged: List[str] = []
+    # Normalised non-blank lines of `merged` and their positions in it
+    merged_keys: List[str] = []
+    merged_positions: List[int] = []
+    overlap_lines = 0
+    for text in texts:
+        lines = [line.rstrip() for line in text.splitlines()]
+        positions = [i for i, line in enumerate(lines) if line.strip()]
+        keys = [_normalize_line(lines[i]) for i in positions]
+
+        best: Tuple[int, int, int] = (0, 0, 0)  # (overlap length, lines trimmed from merged, lines skipped in text)
+        for trim in range(min(EDGE_NOISE_LINES, len(merged_keys)) + 1):
+            tail = merged_keys[:len(merged_keys) - trim]
+            for skip in range(min(EDGE_NOISE_LINES, len(keys)) + 1):
+                length = _longest_overlap(tail, keys[skip:])
+                if length > best[0] and sum(len(key) for key in keys[skip:skip + length]) >= MIN_OVERLAP_CHARS:
+                    best = (length, trim, skip)
+
+        length, trim, skip = best
+        if length:
+            # Keep the previous capture's copy of the overlap; drop edge noise on both sides
+            if trim:
+                del merged[merged_positions[-trim]:]
+                del merged_keys[-trim:]
+                del merged_positions[-trim:]
+            lines = lines[positions[skip + length - 1] + 1:]
+            overlap_lines += length
+
+        offset = len(merged)
+        for i, line in enumerate(lines):
+            if line.strip():
+                merged_keys.append(_normalize_line(line))
+                merged_positions.append(offset + i)
+        merged.extend(lines)
+
+    current_span().set(overlap_lines=overlap_lines)
+    return "\n".join(merged)
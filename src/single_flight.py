@@ -0,0 +1,74 @@
+"""
+Single-flight coalescing of identical concurrent work.
+
+Clients retry slow /analyze calls and users double-tap "Analyze", so the
+same inputs often arrive while their first analysis is still running. The
+first caller for a key starts the computation; callers arriving with the
+same key before it finishes await that computation instead of starting
+their own, and all of them get its result (or its exception).
+
+    result, shared = await flights.run(key, compute)
+
+Keys are chosen by the caller and must include everything the result
+depends on - for /analyze, the input fingerprint plus the client, so results
+are never shared between users.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    In-flight computations by key, for callers on one event loop.
+
+    The caller that starts a computation waits for it to finish even if that
+    caller is cancelled (e.g. its client disconnected), so inputs it owns -
+    such as uploaded files in its temp directory - outlive the computation
+    the other callers are waiting on.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future"] = {}
+
+    def __len__(self) -> int:
+        """Number of computations in flight."""
+        return len(self._calls)
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Return the result of compute(), shared with concurrent callers of the same key.
+
+        Args:
+            key: Identity of the computation
+            compute: Coroutine function started when no computation for `key` is in flight
+
+        Returns:
+            Tuple of (result, shared); shared is True when the result came from
+            a computation started by another caller
+
+        Raises:
+            Exception: Whatever the computation raised, for every caller sharing it
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            logger.info("Joining in-flight computation %s", key[-16:])
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(compute())
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        try:
+            return await asyncio.shield(task), False
+        except asyncio.CancelledError:
+            if not task.done():
+                await asyncio.wait({task})
+            raise
@@ -0,0 +1,506 @@
+"""
+Inverted skill index for recruiter search over analysed profiles.
+
+Every analysed profile becomes one document with a dense integer id. Its
+canonical terms (lowercased, whitespace-collapsed) are indexed per field:
+
+  - resume:   resume skills
+  - linkedin: LinkedIn skills
+  - missing:  resume skills missing from LinkedIn (gap analysis)
+  - theme:    advanced technology themes
+  - skill:    query-only alias for "resume OR linkedin"
+
+Posting lists are append-only arrays of doc ids (ids only grow, so they stay
+sorted and insertion is O(1) per term). Queries combine postings as Python
+int bitmaps, where AND/OR/NOT over a million documents are single C-level
+operations on ~125 KB. Bitmaps are cached and extended with only the
+postings added since: always for dense terms and the few score and length
+buckets, and for the most recently queried sparse terms (an LRU), so memory
+stays bounded however long the tail of rare skills grows.
+
+Re-indexing a key appends a new document and marks the old one dead. Once
+dead documents outnumber COMPACT_DEAD_RATIO of all documents, the index is
+rebuilt with live documents renumbered densely (relative order kept), so
+memory tracks the live profiles rather than every analysis ever indexed.
+The rebuild is one pass over the postings, paid for by at least as many
+re-indexes as there are live documents.
+
+Top-k ranking never scores every match:
+  - score: documents are also bucketed by profile_score; buckets are walked
+    from 100 down and only the ids needed are extracted.
+  - bm25: terms are binary (tf = 1), so a document's score depends only on
+    its length and which query terms it matches. Matches are split per
+    document-length bucket and per matched-term subset, each group is
+    scored once and ids are extracted from the best groups only.
+
+Query syntax: field:value terms (quote multi-word values, e.g.
+resume:"cloud run"), AND (implicit between adjacent terms), OR, NOT and
+parentheses. A term without a field searches "skill".
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Indexed fields and the record attribute each one reads
+FIELDS: Dict[str, Tuple[str, str]] = {
+    "resume": ("resume", "skills"),
+    "linkedin": ("linkedin", "skills"),
+    "missing": ("gaps", "skills_missing_from_linkedin"),
+    "theme": ("gaps", "advanced_tech_themes"),
+}
+# Query-only fields that expand to a union of indexed fields
+ALIASES: Dict[str, Tuple[str, ...]] = {"skill": ("resume", "linkedin")}
+DEFAULT_FIELD = "skill"
+
+RANKINGS = ("score", "bm25")
+
+# BM25 parameters (tf is always 1, so only length normalisation applies)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Bitmaps of terms with at least 1 posting per DENSE_RATIO documents are always
+# cached; of sparser terms, only the SPARSE_CACHE_SIZE most recently queried
+DENSE_RATIO = 32
+SPARSE_CACHE_SIZE = 256
+
+# Compact once dead documents exceed this fraction of all documents (and the
+# index holds at least COMPACT_MIN_DOCS documents)
+COMPACT_DEAD_RATIO = 0.5
+COMPACT_MIN_DOCS = 1024
+
+# Groups with at most this many ids are read by clearing low bits instead of
+# converting the whole bitmap to bytes
+FEW_IDS = 4
+
+_QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|(?:(\w+):)?(?:"([^"]*)"|([^\s()"]+)))')
+_OPERATORS = ("AND", "OR", "NOT")
+_NONZERO = re.compile(rb"[^\x00]")
+_BITS_OF_BYTE = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a search query cannot be parsed."""
+
+
+def canonical_term(text: str) -> str:
+    """Canonical form of a skill or theme: lowercase, single spaces."""
+    return " ".join(text.lower().split())
+
+
+def _items(source: Any, name: str) -> Iterable[str]:
+    if source is None:
+        return ()
+    if isinstance(source, Mapping):
+        return source.get(name) or ()
+    return getattr(source, name, None) or ()
+
+
+def _bitmap(ids: Sequence[int], start: int = 0) -> int:
+    """Bitmap of ids[start:] (the dead-document list is not sorted)."""
+    if start >= len(ids):
+        return 0
+    chunk = ids[start:]
+    low = min(chunk)
+    buf = bytearray(((max(chunk) - low) >> 3) + 1)
+    for doc_id in chunk:
+        offset = doc_id - low
+        buf[offset >> 3] |= 1 << (offset & 7)
+    return int.from_bytes(buf, "little") << low
+
+
+def _iter_ids(bits: int) -> Iterator[int]:
+    """Set bits of a bitmap, ascending."""
+    if bits.bit_count() <= FEW_IDS:
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+        return
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for match in _NONZERO.finditer(data):
+        base = match.start() * 8
+        for bit in _BITS_OF_BYTE[data[match.start()]]:
+            yield base + bit
+
+
+class _Postings:
+    """Append-only doc ids with a lazily extended bitmap."""
+    __slots__ = ("ids", "_bits", "_folded")
+
+    def __init__(self) -> None:
+        self.ids = array("I")
+        self._bits = 0
+        self._folded = 0
+
+    def add(self, doc_id: int) -> None:
+        self.ids.append(doc_id)
+
+    def bits(self) -> int:
+        """Bitmap of the postings, extended with ids added since the last call."""
+        if self._folded < len(self.ids):
+            self._bits |= _bitmap(self.ids, self._folded)
+            self._folded = len(self.ids)
+        return self._bits
+
+    def drop(self) -> None:
+        """Free the cached bitmap."""
+        self._bits, self._folded = 0, 0
+
+
+# Query AST: ("term", field, value) | ("and", [nodes]) | ("or", [nodes]) | ("not", node)
+Node = Tuple[Any, ...]
+
+
+class _Parser:
+    def __init__(self, query: str):
+        self.tokens = self._tokenize(query)
+        self.pos = 0
+
+    @staticmethod
+    def _tokenize(query: str) -> List[Tuple[str, ...]]:
+        tokens: List[Tuple[str, ...]] = []
+        pos = 0
+        while query[pos:].strip():
+            match = _QUERY_TOKEN.match(query, pos)
+            if not match:
+                raise QuerySyntaxError(f"Unexpected input at {pos}: {query[pos:pos + 20]!r}")
+            lparen, rparen, field_name, quoted, bare = match.groups()
+            if lparen or rparen:
+                tokens.append((lparen or rparen,))
+            elif field_name is None and bare in _OPERATORS:
+                tokens.append(("op", bare))
+            else:
+                tokens.append(("term", field_name or DEFAULT_FIELD, quoted if quoted is not None else bare))
+            pos = match.end()
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, ...]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _accept_op(self, op: str) -> bool:
+        if self._peek() == ("op", op):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise QuerySyntaxError("Empty query")
+        node = self._or()
+        if self._peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self._peek()[-1]!r}")
+        return node
+
+    def _or(self) -> Node:
+        nodes = [self._and()]
+        while self._accept_op("OR"):
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def _and(self) -> Node:
+        nodes = [self._not()]
+        while True:
+            if self._accept_op("AND"):
+                nodes.append(self._not())
+                continue
+            token = self._peek()
+            if token is None or token == (")",) or token == ("op", "OR"):
+                break
+            nodes.append(self._not())  # implicit AND
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def _not(self) -> Node:
+        if self._accept_op("NOT"):
+            return ("not", self._not())
+        return self._atom()
+
+    def _atom(self) -> Node:
+        token = self._peek()
+        if token is None:
+            raise QuerySyntaxError("Unexpected end of query")
+        self.pos += 1
+        if token == ("(",):
+            node = self._or()
+            if self._peek() != (")",):
+                raise QuerySyntaxError("Missing ')'")
+            self.pos += 1
+            return node
+        if token[0] != "term":
+            raise QuerySyntaxError(f"Unexpected {token[-1]!r}")
+        _, field_name, value = token
+        if field_name not in FIELDS and field_name not in ALIASES:
+            raise QuerySyntaxError(f"Unknown field: {field_name}. Fields: {sorted([*FIELDS, *ALIASES])}")
+        value = canonical_term(value)
+        if not value:
+            raise QuerySyntaxError(f"Empty value for field: {field_name}")
+        if field_name in ALIASES:
+            return ("or", [("term", name, value) for name in ALIASES[field_name]])
+        return ("term", field_name, value)
+
+
+def parse_query(query: str) -> Node:
+    """
+    Parse a search query into its AST.
+
+    Raises:
+        QuerySyntaxError: If the query is malformed or uses an unknown field
+    """
+    return _Parser(query).parse()
+
+
+@dataclass
+class SearchHit:
+    """One ranked match."""
+    key: str
+    score: float
+    profile_score: int
+
+
+@dataclass
+class SearchResults:
+    """Top-k matches and the total number of matching profiles."""
+    total: int
+    hits: List[SearchHit] = field(default_factory=list)
+
+
+class SkillIndex:
+    """In-memory inverted index of analysed profiles, one document per key."""
+
+    def __init__(self) -> None:
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[Tuple[str, str], _Postings] = {}
+        self._by_score: Dict[int, _Postings] = {}
+        self._by_length: Dict[int, _Postings] = {}
+        self._doc_scores = array("B")
+        self._doc_lengths = array("I")
+        self._dead = _Postings()
+        self._total_length = 0
+        self._sparse_cached: "OrderedDict[Tuple[str, str], _Postings]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, key: str, linkedin: Any, resume: Any, gaps: Any, profile_score: int) -> int:
+        """
+        Index (or re-index) one analysed profile.
+
+        A key indexed again replaces its previous document.
+
+        Args:
+            key: Profile key (e.g. the user's uid)
+            linkedin: LinkedInProfile or its dict form
+            resume: ResumeData or its dict form
+            gaps: GapAnalysis or its dict form
+            profile_score: Profile score (0-100)
+
+        Returns:
+            The new document id (ids of all documents change when the index
+            is compacted)
+        """
+        records = {"linkedin": linkedin, "resume": resume, "gaps": gaps}
+        terms = set()
+        for field_name, (record, attribute) in FIELDS.items():
+            for item in _items(records[record], attribute):
+                term = canonical_term(item)
+                if term:
+                    terms.add((field_name, term))
+        profile_score = max(0, min(100, int(profile_score)))
+
+        with self._lock:
+            previous = self._ids.get(key)
+            if previous is not None:
+                self._dead.add(previous)
+                self._total_length -= self._doc_lengths[previous]
+            doc_id = len(self._keys)
+            self._keys.append(key)
+            self._ids[key] = doc_id
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.add(doc_id)
+            self._by_score.setdefault(profile_score, _Postings()).add(doc_id)
+            self._by_length.setdefault(len(terms), _Postings()).add(doc_id)
+            self._doc_scores.append(profile_score)
+            self._doc_lengths.append(len(terms))
+            self._total_length += len(terms)
+            dead = len(self._dead.ids)
+            if len(self._keys) >= COMPACT_MIN_DOCS and dead > COMPACT_DEAD_RATIO * len(self._keys):
+                doc_id = self._compact()[doc_id]
+        return doc_id
+
+    def _compact(self) -> array:
+        """
+        Drop dead documents and renumber live ones densely, keeping their order.
+
+        Returns:
+            New id of each old document id (-1 for dead ones)
+        """
+        dead = set(self._dead.ids)
+        remap = array("i", [-1]) * len(self._keys)
+        keys: List[str] = []
+        for doc_id, key in enumerate(self._keys):
+            if doc_id not in dead:
+                remap[doc_id] = len(keys)
+                keys.append(key)
+
+        def renumber(postings: _Postings) -> _Postings:
+            renumbered = _Postings()
+            renumbered.ids = array("I", [remap[doc_id] for doc_id in postings.ids if remap[doc_id] >= 0])
+            return renumbered
+
+        def renumber_all(table: Dict[Any, _Postings]) -> Dict[Any, _Postings]:
+            renumbered = {name: renumber(postings) for name, postings in table.items()}
+            return {name: postings for name, postings in renumbered.items() if postings.ids}
+
+        live = [doc_id for doc_id in range(len(self._keys)) if remap[doc_id] >= 0]
+        self._postings = renumber_all(self._postings)
+        self._by_score = renumber_all(self._by_score)
+        self._by_length = renumber_all(self._by_length)
+        self._doc_scores = array("B", [self._doc_scores[doc_id] for doc_id in live])
+        self._doc_lengths = array("I", [self._doc_lengths[doc_id] for doc_id in live])
+        self._keys = keys
+        self._ids = {key: new_id for new_id, key in enumerate(keys)}
+        self._dead = _Postings()
+        self._sparse_cached.clear()
+        logger.info("Compacted skill index: dropped %d dead documents, %d live", len(dead), len(keys))
+        return remap
+
+    def search(self, query: str, k: int = 10, rank: str = "score") -> SearchResults:
+        """
+        Run a boolean query and return its top-k matches.
+
+        Args:
+            query: Query string (see module docstring)
+            k: Number of hits to return
+            rank: "score" (profile_score, highest first) or "bm25"
+
+        Returns:
+            SearchResults with the total match count and ranked hits
+
+        Raises:
+            QuerySyntaxError: If the query is malformed
+            ValueError: If rank is unknown
+        """
+        if rank not in RANKINGS:
+            raise ValueError(f"Unknown rank: {rank}. Must be one of {RANKINGS}")
+        node = parse_query(query)
+        with self._lock:
+            doc_count = len(self._keys)
+            live = ((1 << doc_count) - 1) & ~self._dead.bits()
+            result = self._evaluate(node, live, doc_count)
+            total = result.bit_count()
+            if k <= 0 or not result:
+                return SearchResults(total=total)
+            if rank == "score":
+                ranked = self._top_by_score(result, k, doc_count)
+            else:
+                ranked = self._top_by_bm25(node, result, live, k, doc_count)
+            hits = [SearchHit(self._keys[doc_id], score, self._doc_scores[doc_id]) for doc_id, score in ranked]
+        return SearchResults(total=total, hits=hits)
+
+    def count(self, query: str) -> int:
+        """Number of profiles matching a query."""
+        return self.search(query, k=0).total
+
+    def _term_bits(self, field_name: str, value: str, doc_count: int) -> int:
+        term = (field_name, value)
+        postings = self._postings.get(term)
+        if postings is None:
+            return 0
+        if len(postings.ids) * DENSE_RATIO < doc_count:
+            self._sparse_cached[term] = postings
+            self._sparse_cached.move_to_end(term)
+            while len(self._sparse_cached) > SPARSE_CACHE_SIZE:
+                self._sparse_cached.popitem(last=False)[1].drop()
+        return postings.bits()
+
+    def _evaluate(self, node: Node, live: int, doc_count: int) -> int:
+        kind = node[0]
+        if kind == "term":
+            return self._term_bits(node[1], node[2], doc_count) & live
+        if kind == "not":
+            return live & ~self._evaluate(node[1], live, doc_count)
+        bits = [self._evaluate(child, live, doc_count) for child in node[1]]
+        result = bits[0]
+        for other in bits[1:]:
+            result = result & other if kind == "and" else result | other
+        return result
+
+    def _top_by_score(self, result: int, k: int, doc_count: int) -> List[Tuple[int, float]]:
+        ranked: List[Tuple[int, float]] = []
+        for score in sorted(self._by_score, reverse=True):
+            bucket = result & self._by_score[score].bits()
+            if bucket:
+                ranked.extend((doc_id, float(score)) for doc_id in islice(_iter_ids(bucket), k - len(ranked)))
+                if len(ranked) >= k:
+                    break
+        return ranked
+
+    def _positive_terms(self, node: Node, negated: bool = False) -> Iterator[Tuple[str, str]]:
+        kind = node[0]
+        if kind == "term":
+            if not negated:
+                yield node[1], node[2]
+        elif kind == "not":
+            yield from self._positive_terms(node[1], not negated)
+        else:
+            for child in node[1]:
+                yield from self._positive_terms(child, negated)
+
+    def _top_by_bm25(self, node: Node, result: int, live: int, k: int, doc_count: int) -> List[Tuple[int, float]]:
+        live_count = len(self._ids)
+        avg_length = self._total_length / live_count if live_count else 1.0
+        weighted = []
+        for term in dict.fromkeys(self._positive_terms(node)):
+            bits = self._term_bits(*term, doc_count) & live
+            df = bits.bit_count()
+            if df:
+                weighted.append((bits, math.log(1 + (live_count - df + 0.5) / (df + 0.5))))
+
+        # Documents with the same length and matched terms share one score
+        groups: List[Tuple[float, int]] = []
+        for length, postings in self._by_length.items():
+            part = result & postings.bits()
+            if not part:
+                continue
+            norm = (BM25_K1 + 1) / (1 + BM25_K1 * (1 - BM25_B + BM25_B * length / max(avg_length, 1e-9)))
+            parts = [(part, 0.0)]
+            for bits, idf in weighted:
+                split = []
+                for members, weight in parts:
+                    hit = members & bits
+                    if hit:
+                        split.append((hit, weight + idf))
+                    if hit != members:
+                        split.append((members ^ hit, weight))
+                parts = split
+            groups.extend((weight * norm, members) for members, weight in parts)
+
+        groups.sort(key=lambda group: -group[0])
+        ranked: List[Tuple[int, float]] = []
+        for score, members in groups:
+            if len(ranked) >= k and score < ranked[k - 1][1]:
+                break
+            # Groups come best first, so ranked[k - 1] is the k-th best score so far
+            ranked.extend((doc_id, score) for doc_id in islice(_iter_ids(members), k))
+        ranked.sort(key=lambda hit: (-hit[1], hit[0]))
+        return [(doc_id, round(score, 4)) for doc_id, score in ranked[:k]]
+
+
+# Process-wide index fed by app.py when Config.SEARCH_INDEX_ENABLED is set
+skill_index = SkillIndex()
@@ -0,0 +1,290 @@
+"""
+Startup profiler for LinkedIn Strategy Assistant.
+
+Measures the cold-start cost of the app.py import chain (per module and per
+init step), the app's lifespan startup, plus the time to the first
+successful /health and /analyze responses, and compares the results against
+a budget file.
+
+Usage:
+    python src/startup_report.py [--budget startup_budget.json] [--runs 3] [--json]
+
+Exits with status 1 when any measurement exceeds its budget, a required
+module fails to import or a first request does not succeed (the errors are
+reported).
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CURRENT_DIR = Path(__file__).resolve().parent
+
+# Modules imported in dependency order so each timing is incremental
+# (the cost of that module on top of everything imported before it).
+IMPORT_CHAIN = [
+    "config",
+    "logger",
+    "pipeline",
+    "linkedin_optimizer",
+    "google.cloud.vision",
+    "firebase_admin",
+    "fastapi",
+    "app",
+]
+
+# Imports the app degrades without (see the HAS_* flags); their failure is
+# reported but does not fail the report
+OPTIONAL_MODULES = {"google.cloud.vision", "firebase_admin"}
+
+SAMPLE_RESUME = """
+SKILLS
+Python, Docker, Kubernetes, FastAPI, Terraform
+
+CERTIFICATIONS
+Google Cloud Professional Architect
+
+EXPERIENCE
+Senior Software Engineer building cloud-native microservices
+"""
+
+SAMPLE_LINKEDIN = {
+    "headline": "Senior Software Engineer",
+    "about": "Building cloud-native platforms.",
+    "current_role": "Senior Software Engineer",
+    "skills": "Python, Docker",
+    "certifications": "",
+}
+
+
+def _measure() -> Tuple[Dict[str, Optional[float]], Dict[str, str]]:
+    """
+    Measure startup timings in the current (fresh) interpreter.
+
+    Returns:
+        Tuple of (mapping of metric name to duration in milliseconds, None if
+        unavailable; mapping of module name to its import error, or of
+        request metric name to its failure)
+    """
+    if str(CURRENT_DIR) not in sys.path:
+        sys.path.insert(0, str(CURRENT_DIR))
+
+    results: Dict[str, Optional[float]] = {}
+    errors: Dict[str, str] = {}
+    chain_start = time.perf_counter()
+
+    for module_name in IMPORT_CHAIN:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+            results[f"import:{module_name}"] = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            results[f"import:{module_name}"] = None
+            errors[module_name] = f"{type(e).__name__}: {e}"
+
+    results["import:total"] = (time.perf_counter() - chain_start) * 1000
+
+    app_module = sys.modules.get("app")
+    if app_module is None:
+        # Nothing to initialise or request; the import error is reported instead
+        return results, errors
+    for step, seconds in app_module.STARTUP_TIMINGS.items():
+        results[f"init:{step}"] = seconds * 1000
+
+    from fastapi.testclient import TestClient
+
+    def timed_request(metric: str, send) -> None:
+        start = time.perf_counter()
+        try:
+            response = send()
+        except Exception as e:
+            results[metric] = None
+            errors[metric] = f"{type(e).__name__}: {e}"
+            return
+        if response.status_code == 200:
+            results[metric] = (time.perf_counter() - start) * 1000
+        else:
+            results[metric] = None
+            errors[metric] = f"HTTP {response.status_code}: {response.text[:200]}"
+
+    start = time.perf_counter()
+    # Entering the client runs the lifespan startup (worker pools, key refresh, ...)
+    with TestClient(app_module.app) as client:
+        results["init:lifespan"] = (time.perf_counter() - start) * 1000
+
+        timed_request("request:first_health", lambda: client.get("/health"))
+        timed_request("request:first_analyze", lambda: client.post(
+            "/analyze",
+            files={"resume": ("resume.txt", SAMPLE_RESUME.encode("utf-8"), "text/plain")},
+            data={"mode": "Get Hired", "linkedin_text": json.dumps(SAMPLE_LINKEDIN)},
+        ))
+
+        results["startup:to_first_analyze"] = (time.perf_counter() - chain_start) * 1000
+    return results, errors
+
+
+def fatal_errors(errors: Dict[str, str]) -> Dict[str, str]:
+    """Errors that fail the report: everything except missing optional modules."""
+    return {name: error for name, error in errors.items() if name not in OPTIONAL_MODULES}
+
+
+def _run_measurement() -> Tuple[Dict[str, Optional[float]], Dict[str, str]]:
+    """Run one measurement in a fresh interpreter so no module is pre-imported."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "startup.json"
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--measure", str(output_path)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            env={**os.environ, "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING")},
+        )
+        process_ms = (time.perf_counter() - start) * 1000
+        measured = json.loads(output_path.read_text(encoding="utf-8"))
+    results = measured["results"]
+    results["process:total"] = process_ms
+    return results, measured["errors"]
+
+
+def _median_results(runs: List[Dict[str, Optional[float]]]) -> Dict[str, Optional[float]]:
+    """Combine several runs into per-metric medians."""
+    combined: Dict[str, Optional[float]] = {}
+    for name in runs[0]:
+        values = [run[name] for run in runs if run.get(name) is not None]
+        combined[name] = statistics.median(values) if values else None
+    return combined
+
+
+def load_budget(budget_path: Path) -> Dict[str, float]:
+    """
+    Load a startup budget file.
+
+    The file is a JSON object mapping metric names (e.g. "import:pipeline",
+    "init:firebase_init", "request:first_health") to maximum milliseconds.
+
+    Args:
+        budget_path: Path to budget JSON file
+
+    Returns:
+        Mapping of metric name to budget in milliseconds
+
+    Raises:
+        FileNotFoundError: If budget file doesn't exist
+        ValueError: If budget file is not a JSON object of numbers
+    """
+    if not budget_path.exists():
+        raise FileNotFoundError(f"Startup budget file not found: {budget_path}")
+
+    budget = json.loads(budget_path.read_text(encoding="utf-8"))
+    if not isinstance(budget, dict):
+        raise ValueError(f"Startup budget must be a JSON object: {budget_path}")
+
+    for name, limit in budget.items():
+        if not isinstance(limit, (int, float)):
+            raise ValueError(f"Invalid budget for {name}: {limit!r}")
+    return {name: float(limit) for name, limit in budget.items()}
+
+
+def check_budget(
+    results: Dict[str, Optional[float]],
+    budget: Dict[str, float]
+) -> List[Tuple[str, float, float]]:
+    """
+    Compare measurements against a budget.
+
+    Metrics without a budget entry are not checked; unavailable measurements
+    (None) never count as violations.
+
+    Args:
+        results: Measured metric durations in milliseconds
+        budget: Metric budgets in milliseconds
+
+    Returns:
+        List of (metric, measured_ms, budget_ms) for every exceeded budget
+    """
+    violations = []
+    for name, limit in budget.items():
+        measured = results.get(name)
+        if measured is not None and measured > limit:
+            violations.append((name, measured, limit))
+    return violations
+
+
+def format_report(
+    results: Dict[str, Optional[float]],
+    budget: Dict[str, float]
+) -> str:
+    """Format measurements and budgets as a plain-text table."""
+    lines = [f"{'Metric':<32} {'Measured (ms)':>14} {'Budget (ms)':>12}  Status"]
+    for name, measured in results.items():
+        limit = budget.get(name)
+        measured_str = f"{measured:.1f}" if measured is not None else "n/a"
+        limit_str = f"{limit:.0f}" if limit is not None else "-"
+        if measured is None or limit is None:
+            status = ""
+        else:
+            status = "OVER" if measured > limit else "ok"
+        lines.append(f"{name:<32} {measured_str:>14} {limit_str:>12}  {status}")
+    return "\n".join(lines)
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure startup time against a budget")
+    parser.add_argument("--budget", type=Path, default=None, help="Path to budget JSON file (default: Config.STARTUP_BUDGET_PATH)")
+    parser.add_argument("--runs", type=int, default=3, help="Number of fresh-process runs (median is reported)")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Output JSON instead of text")
+    parser.add_argument("--measure", type=Path, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        results, errors = _measure()
+        args.measure.write_text(json.dumps({"results": results, "errors": errors}), encoding="utf-8")
+        return 0
+
+    if str(CURRENT_DIR) not in sys.path:
+        sys.path.insert(0, str(CURRENT_DIR))
+    from config import Config
+
+    budget = load_budget(args.budget or Config.STARTUP_BUDGET_PATH)
+    runs = [_run_measurement() for _ in range(max(1, args.runs))]
+    results = _median_results([run_results for run_results, _ in runs])
+    errors = {name: error for _, run_errors in runs for name, error in run_errors.items()}
+    import_errors = {name: error for name, error in errors.items() if name in IMPORT_CHAIN}
+    request_errors = {name: error for name, error in errors.items() if name not in IMPORT_CHAIN}
+    violations = check_budget(results, budget)
+
+    if args.as_json:
+        print(json.dumps({
+            "results": results,
+            "budget": budget,
+            "violations": [
+                {"metric": name, "measured_ms": measured, "budget_ms": limit}
+                for name, measured, limit in violations
+            ],
+            "import_errors": import_errors,
+            "request_errors": request_errors,
+        }, indent=2))
+    else:
+        print(format_report(results, budget))
+        for name, measured, limit in violations:
+            print(f"Budget exceeded: {name} took {measured:.1f} ms (budget {limit:.0f} ms)")
+        for module_name, error in import_errors.items():
+            print(f"Import failed: {module_name}: {error}")
+        for metric, error in request_errors.items():
+            print(f"Request failed: {metric}: {error}")
+
+    # A failed request has no timing to check, so it fails the report on its own
+    return 1 if violations or fatal_errors(errors) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
@@ -0,0 +1,179 @@
+"""
+Verified Firebase ID token cache for LinkedIn Strategy Assistant.
+
+Clients resend the same ID token for up to an hour, so verified claims are
+cached (keyed by a SHA-256 hash of the token, never the token itself) until
+the token's own expiry. A background refresher keeps Google's public signing
+keys warm in the Firebase verifier's HTTP cache so a cache miss never waits
+on a certificate fetch.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from config import Config
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+# Public keys used to sign Firebase ID tokens (same URL firebase_admin uses)
+ID_TOKEN_CERT_URI = ("https://www.googleapis.com/robot/v1/metadata/x509/"
+                     "securetoken@system.gserviceaccount.com")
+
+
+def _token_key(token: str) -> str:
+    """Hash a token so raw credentials are never held as cache keys."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified token claims.
+
+    Each entry expires at the token's `exp` claim. When revocation checks are
+    enabled, entries are additionally capped at `revocation_interval` seconds
+    so revoked tokens stop being accepted within that window.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        revocation_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            max_size: Maximum cached tokens (default: Config.FIREBASE_TOKEN_CACHE_SIZE)
+            revocation_interval: Max seconds to trust a cached entry, or None for
+                no cap (default: Config.FIREBASE_REVOCATION_CHECK_INTERVAL when
+                Config.FIREBASE_CHECK_REVOKED is set)
+            clock: Time source returning epoch seconds
+        """
+        self.max_size = max_size if max_size is not None else Config.FIREBASE_TOKEN_CACHE_SIZE
+        if revocation_interval is None and Config.FIREBASE_CHECK_REVOKED:
+            revocation_interval = Config.FIREBASE_REVOCATION_CHECK_INTERVAL
+        self.revocation_interval = revocation_interval
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Return cached claims for a token, or None if absent or expired."""
+        key = _token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(claims)
+
+    def put(self, token: str, claims: Dict) -> None:
+        """Cache verified claims until the token's `exp` (tokens without `exp` are not cached)."""
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_size < 1:
+            return
+
+        expires_at = float(exp)
+        if self.revocation_interval is not None:
+            expires_at = min(expires_at, self._clock() + self.revocation_interval)
+
+        key = _token_key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+
+def fetch_signing_keys() -> bool:
+    """
+    Refetch Firebase public signing keys into the verifier's HTTP cache.
+
+    Uses the cache-control aware request object inside firebase_admin's token
+    verifier and bypasses its cache, so the stored copy is replaced before it
+    goes stale and verify_id_token() never blocks on the network. That object
+    is not public API: it exists in the firebase-admin versions pinned in
+    requirements.txt (6.5 to 7.x). Without it, verify_id_token() keeps
+    fetching keys itself on a cache miss.
+
+    Returns:
+        False if the installed firebase_admin has no verifier request to warm
+
+    Raises:
+        RuntimeError: If the key fetch fails
+    """
+    from firebase_admin import auth as firebase_auth
+
+    try:
+        request = firebase_auth._get_client(None)._token_verifier.request
+    except AttributeError as e:
+        logger.warning("Firebase signing key prefetch not supported by this firebase_admin: %s", e)
+        return False
+    response = request(ID_TOKEN_CERT_URI, headers={"Cache-Control": "no-cache"})
+    if response.status != 200:
+        raise RuntimeError(f"Signing key fetch failed with HTTP {response.status}")
+    return True
+
+
+class SigningKeyRefresher:
+    """Background thread that periodically refreshes the public signing keys."""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        fetch: Callable[[], Optional[bool]] = fetch_signing_keys,
+    ):
+        """
+        Args:
+            interval: Seconds between refreshes (default: Config.FIREBASE_KEY_REFRESH_INTERVAL)
+            fetch: Callable performing one refresh; returning False stops the
+                refresher (prefetching is not possible)
+        """
+        self.interval = interval if interval is not None else Config.FIREBASE_KEY_REFRESH_INTERVAL
+        self._fetch = fetch
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                if self._fetch() is False:
+                    return
+                logger.debug("Firebase signing keys refreshed")
+            except Exception as e:
+                logger.warning("Firebase signing key refresh failed: %s", e)
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        """Prefetch keys immediately and keep refreshing in the background."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="firebase-key-refresher", daemon=True)
+        self._thread.start()
+        logger.info("Firebase signing key refresher started (every %.0fs)", self.interval)
+
+    def stop(self) -> None:
+        """Stop the refresher thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,313 @@
+"""
+Request tracing for LinkedIn Strategy Assistant.
+
+Each /analyze request carries a trace made of nested spans (upload, OCR per
+screenshot, parse per page, extractors, gap analysis, optimizer calls,
+render). Spans record timing plus sizes only (bytes, pages, characters,
+counts) - never profile or resume content. Finished traces go to a pluggable
+exporter, and requests slower than Config.SLOW_REQUEST_THRESHOLD_MS are
+appended to the slow-request log with their full span breakdown and a
+content fingerprint.
+
+Outside an active trace, span() yields a shared no-op span and records
+nothing, so library code (pipeline.py) can be instrumented unconditionally.
+"""
+from __future__ import annotations
+
+import abc
+import contextvars
+import functools
+import importlib
+import json
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from config import Config
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Innermost open span of the current request
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+# perf_counter() at the start of the current trace
+_trace_start: contextvars.ContextVar[float] = contextvars.ContextVar("trace_start", default=0.0)
+
+
+@dataclass
+class Span:
+    """A timed unit of work with size attributes and child spans."""
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_offset_ms: float = 0.0
+    duration_ms: float = 0.0
+    children: List["Span"] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        """Add size/count attributes (no PII)."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "start_offset_ms": round(self.start_offset_ms, 3),
+            "duration_ms": round(self.duration_ms, 3),
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.error:
+            data["error"] = self.error
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+class _NoopSpan(Span):
+    """Span handed out when no trace is active; ignores attributes."""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan(name="noop")
+
+
+@dataclass
+class Trace:
+    """Root span plus request-level metadata."""
+    trace_id: str
+    root: Span
+    started_at: float = field(default_factory=time.time)
+    fingerprint: Optional[str] = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "fingerprint": self.fingerprint,
+            "root": self.root.to_dict(),
+        }
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Open a child span of the current span.
+
+    Yields NOOP_SPAN (and records nothing) when no trace is active.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+
+    trace_start = _trace_start.get()
+    child = Span(name=name, attributes=dict(attributes))
+    parent.children.append(child)
+    token = _current_span.set(child)
+    start = time.perf_counter()
+    child.start_offset_ms = (start - trace_start) * 1000
+    try:
+        yield child
+    except BaseException as e:
+        child.error = type(e).__name__
+        raise
+    finally:
+        child.duration_ms = (time.perf_counter() - start) * 1000
+        _current_span.reset(token)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator running the function inside span(name)."""
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def current_span() -> Span:
+    """The innermost open span, or NOOP_SPAN when no trace is active."""
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextmanager
+def collect_spans() -> Iterator[Span]:
+    """
+    Record spans opened in the block under a detached root span.
+
+    For work running outside the request's process (sandbox workers): the
+    root travels back with the result and attach_spans() grafts it into the
+    request's trace. Offsets are relative to the start of the block.
+    """
+    root = Span(name="detached")
+    span_token = _current_span.set(root)
+    start_token = _trace_start.set(time.perf_counter())
+    start = time.perf_counter()
+    try:
+        yield root
+    finally:
+        root.duration_ms = (time.perf_counter() - start) * 1000
+        _trace_start.reset(start_token)
+        _current_span.reset(span_token)
+
+
+def attach_spans(root: Span, started: float) -> None:
+    """
+    Merge a collect_spans() root into the current span.
+
+    Args:
+        root: Detached root; its attributes go to the current span and its
+            children become the current span's children
+        started: perf_counter() in this process when the detached work began
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+
+    def shift(child: Span, offset_ms: float) -> None:
+        child.start_offset_ms += offset_ms
+        for grandchild in child.children:
+            shift(grandchild, offset_ms)
+
+    offset_ms = (started - _trace_start.get()) * 1000
+    parent.set(**root.attributes)
+    for child in root.children:
+        shift(child, offset_ms)
+        parent.children.append(child)
+
+
+class SpanExporter(abc.ABC):
+    """Receives finished traces. Subclasses send them somewhere."""
+
+    @abc.abstractmethod
+    def export(self, trace: Trace) -> None:
+        """Send one finished trace."""
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Writes each trace as one JSON line to stderr."""
+
+    def export(self, trace: Trace) -> None:
+        sys.stderr.write(json.dumps(trace.to_dict()) + "\n")
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends each trace as one JSON line to a file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(trace.to_dict()) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def load_exporter(spec: str) -> Optional[SpanExporter]:
+    """
+    Build an exporter from a Config.TRACE_EXPORTER value.
+
+    Args:
+        spec: "" (disabled), "console", "file" (Config.TRACE_FILE_PATH), or
+            "module:attribute" resolving to a SpanExporter or a factory for one
+
+    Raises:
+        ValueError: If the spec does not resolve to a SpanExporter
+    """
+    if not spec:
+        return None
+    if spec == "console":
+        return ConsoleSpanExporter()
+    if spec == "file":
+        return FileSpanExporter(Config.TRACE_FILE_PATH)
+
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Invalid TRACE_EXPORTER: {spec}")
+    target = getattr(importlib.import_module(module_name), attr)
+    exporter = target() if callable(target) and not isinstance(target, SpanExporter) else target
+    if not isinstance(exporter, SpanExporter):
+        raise ValueError(f"TRACE_EXPORTER {spec} did not resolve to a SpanExporter")
+    return exporter
+
+
+class Tracer:
+    """Starts request traces and routes finished ones to the exporter and slow log."""
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        slow_threshold_ms: Optional[float] = None,
+        slow_log_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            exporter: Destination for every trace (default: from Config.TRACE_EXPORTER)
+            slow_threshold_ms: Slow-request threshold (default: Config.SLOW_REQUEST_THRESHOLD_MS)
+            slow_log_path: Slow-request log file (default: Config.SLOW_REQUEST_LOG_PATH)
+        """
+        self.exporter = exporter if exporter is not None else load_exporter(Config.TRACE_EXPORTER)
+        self.slow_threshold_ms = (
+            slow_threshold_ms if slow_threshold_ms is not None else Config.SLOW_REQUEST_THRESHOLD_MS
+        )
+        self.slow_log = FileSpanExporter(slow_log_path or Config.SLOW_REQUEST_LOG_PATH)
+
+    @contextmanager
+    def start_trace(self, name: str, **attributes: Any) -> Iterator[Trace]:
+        """Open a root span for the current request and finish the trace on exit."""
+        trace = Trace(trace_id=uuid.uuid4().hex, root=Span(name=name, attributes=dict(attributes)))
+        span_token = _current_span.set(trace.root)
+        start_token = _trace_start.set(trace._start)
+        try:
+            yield trace
+        except BaseException as e:
+            trace.root.error = type(e).__name__
+            raise
+        finally:
+            trace.root.duration_ms = (time.perf_counter() - trace._start) * 1000
+            try:
+                _current_span.reset(span_token)
+                _trace_start.reset(start_token)
+            except ValueError:
+                # Finished in a different context; the request context is discarded anyway
+                pass
+            self.finish(trace)
+
+    def finish(self, trace: Trace) -> None:
+        """Export a finished trace and log it if slow. Export errors never fail requests."""
+        try:
+            if self.exporter is not None:
+                self.exporter.export(trace)
+            if trace.duration_ms >= self.slow_threshold_ms:
+                self.slow_log.export(trace)
+                logger.warning("Slow request %s: %.0f ms (fingerprint %s)",
+                               trace.trace_id, trace.duration_ms, trace.fingerprint)
+        except Exception as e:
+            logger.warning("Failed to export trace %s: %s", trace.trace_id, e)
+
+
+# Process-wide tracer used by app.py
+tracer = Tracer()
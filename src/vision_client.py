@@ -0,0 +1,168 @@
+"""
+Process-wide Google Cloud Vision client pool for LinkedIn Strategy Assistant.
+
+Creates Vision clients once per worker (credential discovery, gRPC channel
+setup and TLS handshakes happen at startup instead of per request) and hands
+them out round-robin. gRPC channels are thread-safe and multiplex concurrent
+calls, so clients can be shared across requests.
+"""
+from __future__ import annotations
+
+import threading
+from typing import List, Optional
+
+from config import Config
+from logger import setup_logger
+
+# Set up module logger
+logger = setup_logger(__name__)
+
+try:
+    import grpc
+    from google.cloud import vision  # type: ignore
+    from google.cloud.vision_v1.services.image_annotator.transports import ImageAnnotatorGrpcTransport
+    HAS_VISION_API = True
+except Exception:  # pragma: no cover - optional dependency
+    grpc = None
+    vision = None
+    ImageAnnotatorGrpcTransport = None
+    HAS_VISION_API = False
+
+
+class VisionClientPool:
+    """
+    Pool of Cloud Vision clients, each backed by its own long-lived gRPC channel.
+
+    Call start() at worker startup and close() at shutdown. get() starts the
+    pool lazily if it has not been started (e.g. when the app runs without
+    lifespan events), but not once it has been closed: after close(), get()
+    fails until start() is called again, so requests finishing during
+    shutdown cannot open new channels.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        keepalive_ms: Optional[int] = None,
+        endpoint: Optional[str] = None,
+        insecure: Optional[bool] = None,
+    ):
+        """
+        Args:
+            size: Number of gRPC channels (default: Config.VISION_CHANNEL_POOL_SIZE)
+            keepalive_ms: gRPC keepalive ping interval (default: Config.VISION_KEEPALIVE_MS)
+            endpoint: Vision API host[:port] (default: Config.VISION_API_ENDPOINT or library default)
+            insecure: Use a plaintext channel, for local stand-in servers only
+                (default: Config.VISION_API_INSECURE)
+        """
+        self.size = max(1, size if size is not None else Config.VISION_CHANNEL_POOL_SIZE)
+        self.keepalive_ms = keepalive_ms if keepalive_ms is not None else Config.VISION_KEEPALIVE_MS
+        self.endpoint = endpoint if endpoint is not None else Config.VISION_API_ENDPOINT
+        self.insecure = insecure if insecure is not None else Config.VISION_API_INSECURE
+        self._clients: List["vision.ImageAnnotatorClient"] = []
+        self._next = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        """Whether the pool currently holds open clients."""
+        return bool(self._clients)
+
+    def _channel_options(self, channel_id: int) -> list:
+        """gRPC channel arguments for one pooled channel."""
+        return [
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+            ("grpc.keepalive_time_ms", self.keepalive_ms),
+            ("grpc.keepalive_timeout_ms", 10000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            # Channels with identical arguments share one connection by
+            # default; a distinct id gives each pooled channel its own.
+            ("grpc.use_local_subchannel_pool", 1),
+            ("linkedin_strategy_assistant.channel_id", channel_id),
+        ]
+
+    def _create_client(self, channel_id: int, credentials) -> "vision.ImageAnnotatorClient":
+        """Create one client bound to a dedicated channel."""
+        host = self.endpoint or ImageAnnotatorGrpcTransport.DEFAULT_HOST
+        options = self._channel_options(channel_id)
+        if self.insecure:
+            channel = grpc.insecure_channel(host, options=options)
+        else:
+            channel = ImageAnnotatorGrpcTransport.create_channel(host, credentials=credentials, options=options)
+        transport = ImageAnnotatorGrpcTransport(host=host, channel=channel)
+        return vision.ImageAnnotatorClient(transport=transport)
+
+    def start(self) -> None:
+        """
+        Create the pooled clients, reopening a closed pool. No-op if already started.
+
+        Raises:
+            RuntimeError: If google-cloud-vision is not installed
+            google.auth.exceptions.DefaultCredentialsError: If no credentials are available
+        """
+        self._start(reopen=True)
+
+    def _start(self, reopen: bool) -> None:
+        if not HAS_VISION_API:
+            raise RuntimeError("Cloud Vision API not available - google-cloud-vision not installed")
+
+        with self._lock:
+            if reopen:
+                self._closed = False
+            elif self._closed:
+                raise RuntimeError("Vision client pool is closed")
+            if self._clients:
+                return
+
+            credentials = None
+            if not self.insecure:
+                import google.auth
+                # Discover credentials once and share them across channels
+                credentials, _ = google.auth.default(scopes=ImageAnnotatorGrpcTransport.AUTH_SCOPES)
+
+            self._clients = [self._create_client(i, credentials) for i in range(self.size)]
+            self._next = 0
+
+        logger.info("Vision client pool started - channels: %d, keepalive: %d ms", self.size, self.keepalive_ms)
+
+    def get(self) -> "vision.ImageAnnotatorClient":
+        """
+        Return the next pooled client (round-robin), starting the pool if needed.
+
+        The pool is checked and indexed under the lock, so a get() racing
+        close() fails instead of indexing an empty pool.
+
+        Raises:
+            RuntimeError: If the pool has been closed (or cannot be started)
+        """
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Vision client pool is closed")
+                if self._clients:
+                    client = self._clients[self._next % len(self._clients)]
+                    self._next += 1
+                    return client
+            self._start(reopen=False)
+
+    def close(self) -> None:
+        """Close all pooled channels. Only start() opens the pool again afterwards."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+            self._closed = True
+
+        for client in clients:
+            try:
+                client.transport.close()
+            except Exception as e:  # pragma: no cover - best effort on shutdown
+                logger.warning("Failed to close Vision client channel: %s", e)
+
+        if clients:
+            logger.info("Vision client pool closed (%d channels)", len(clients))
+
+
+# Process-wide pool used by app.py
+vision_pool = VisionClientPool()
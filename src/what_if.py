@@ -0,0 +1,209 @@
+"""
+What-if score simulation for LinkedIn Strategy Assistant.
+
+Each candidate fix is expressed as new values of the rule features it
+changes, e.g. adding 3 missing skills raises linkedin_skills_count by 3 and
+lowers skills_missing_count and skills_gap_ratio. RuleSet.rescore()
+re-evaluates only the score rules reading those features, so the delta
+is the exact profile_score change without re-running extraction, gap
+analysis or the full score. Candidates are ranked by points gained per unit
+of effort (the "effort" table of profile_rules.json).
+
+Candidates:
+  - skills: add the first 1..N missing skills (up to the skills slot limit)
+  - certifications / projects: add the first 1..N missing ones
+  - about / headline: grow the text to each length threshold of the score
+    rules and the best-practice minimum. This assumes the added text brings no
+    new advanced-tech terms; if it does, the score only gains more.
+
+Fix kinds change disjoint features, so the best candidate of each kind can be
+combined and scored exactly as one plan (best_plan()).
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from rules import Number, RuleSet, ScoreResult
+
+SKILLS = "skills"
+CERTIFICATIONS = "certifications"
+PROJECTS = "projects"
+ABOUT = "about"
+HEADLINE = "headline"
+
+# Used when the rule file has no "effort" entry for an edit
+DEFAULT_EFFORT = {"skill": 1, "certification": 3, "project": 10, "about_100_chars": 5, "headline": 5}
+
+# Items quoted in a candidate's description
+DESCRIBE_ITEMS = 3
+
+
+@dataclass
+class FixCandidate:
+    """One simulated profile change and its effect on the score."""
+    kind: str
+    amount: int  # items added, or target length in characters
+    description: str
+    effort: float
+    changes: Dict[str, Number]
+    points: int = 0
+
+    @property
+    def points_per_effort(self) -> float:
+        return self.points / self.effort if self.effort else 0.0
+
+
+@dataclass
+class FixPlan:
+    """The best candidate of each kind, applied together."""
+    fixes: List[FixCandidate] = field(default_factory=list)
+    score: int = 0
+    projected_score: int = 0
+
+    @property
+    def points(self) -> int:
+        return self.projected_score - self.score
+
+
+def _effort(rule_set: RuleSet, name: str) -> float:
+    return float(rule_set.effort.get(name, DEFAULT_EFFORT[name]))
+
+
+def _quote(items: List[str], count: int) -> str:
+    shown = ", ".join(items[:min(count, DESCRIBE_ITEMS)])
+    return shown + (", ..." if count > DESCRIBE_ITEMS else "")
+
+
+def _length_targets(rule_set: RuleSet, feature: str, current: int, extra: Optional[Number]) -> List[int]:
+    """Lengths above `current` at which a score threshold on `feature` (or `extra`) is first met."""
+    targets = set()
+    for op, value in rule_set.score_thresholds(feature):
+        if op == ">":
+            targets.add(math.floor(value) + 1)
+        elif op == ">=":
+            targets.add(math.ceil(value))
+    if extra is not None:
+        targets.add(int(extra))
+    return sorted(target for target in targets if target > current)
+
+
+def candidate_fixes(rule_set: RuleSet, features: Mapping[str, Any]) -> List[FixCandidate]:
+    """
+    Enumerate candidate fixes for one profile.
+
+    Args:
+        rule_set: Compiled rules
+        features: rule_set.features() of the profile
+
+    Returns:
+        Candidates with their feature changes and effort; points are not set yet
+    """
+    candidates: List[FixCandidate] = []
+    resume_skills = max(features["resume_skills_count"], 1)
+
+    linkedin_skills = features["linkedin_skills_count"]
+    missing = features["skills_missing"]
+    slots = int(rule_set.thresholds.get("skills_optimal_count", len(missing) + linkedin_skills)) - linkedin_skills
+    for k in range(1, min(len(missing), slots) + 1):
+        candidates.append(FixCandidate(
+            kind=SKILLS, amount=k,
+            description=f"Add {k} missing skill{'s' * (k > 1)} to LinkedIn: {_quote(missing, k)}",
+            effort=k * _effort(rule_set, "skill"),
+            changes={
+                "linkedin_skills_count": linkedin_skills + k,
+                "skills_missing_count": len(missing) - k,
+                "skills_gap_ratio": (len(missing) - k) / resume_skills,
+            },
+        ))
+
+    certifications = features["certifications_missing"]
+    for k in range(1, len(certifications) + 1):
+        candidates.append(FixCandidate(
+            kind=CERTIFICATIONS, amount=k,
+            description=f"Add {k} certification{'s' * (k > 1)} to LinkedIn: {_quote(certifications, k)}",
+            effort=k * _effort(rule_set, "certification"),
+            changes={
+                "linkedin_certifications_count": features["linkedin_certifications_count"] + k,
+                "certifications_missing_count": len(certifications) - k,
+            },
+        ))
+
+    projects = features["projects_missing"]
+    for k in range(1, len(projects) + 1):
+        candidates.append(FixCandidate(
+            kind=PROJECTS, amount=k,
+            description=f"Feature {k} resume project{'s' * (k > 1)} in LinkedIn activity",
+            effort=k * _effort(rule_set, "project"),
+            changes={"projects_missing_count": len(projects) - k},
+        ))
+
+    about = features["about_chars"]
+    for target in _length_targets(rule_set, "about_chars", about, rule_set.thresholds.get("about_min_chars")):
+        candidates.append(FixCandidate(
+            kind=ABOUT, amount=target,
+            description=f"Grow the About section to {target:,} characters (currently {about:,})",
+            effort=(target - about) / 100 * _effort(rule_set, "about_100_chars"),
+            changes={"about_chars": target},
+        ))
+
+    headline = features["headline_chars"]
+    for target in _length_targets(rule_set, "headline_chars", headline, rule_set.thresholds.get("headline_min_chars")):
+        candidates.append(FixCandidate(
+            kind=HEADLINE, amount=target,
+            description=f"Write a headline of at least {target} characters (currently {headline})",
+            effort=_effort(rule_set, "headline"),
+            changes={"headline_chars": target},
+        ))
+
+    return candidates
+
+
+def _rank_key(candidate: FixCandidate) -> Tuple[float, int, float]:
+    return (-candidate.points_per_effort, -candidate.points, candidate.effort)
+
+
+def rank_fixes(
+    rule_set: RuleSet,
+    features: Mapping[str, Any],
+    base: Optional[ScoreResult] = None,
+    candidates: Optional[List[FixCandidate]] = None,
+) -> List[FixCandidate]:
+    """
+    Score every candidate and rank those that gain points.
+
+    Args:
+        rule_set: Compiled rules
+        features: rule_set.features() of the profile
+        base: rule_set.score(features), if already computed
+        candidates: Candidates to evaluate (default: candidate_fixes())
+
+    Returns:
+        Candidates with points > 0, best points per effort first
+    """
+    base = base or rule_set.score(features)
+    if candidates is None:
+        candidates = candidate_fixes(rule_set, features)
+    for candidate in candidates:
+        candidate.points = rule_set.rescore(base, candidate.changes) - base.total
+    return sorted((c for c in candidates if c.points > 0), key=_rank_key)
+
+
+def best_plan(rule_set: RuleSet, features: Mapping[str, Any], base: Optional[ScoreResult] = None) -> FixPlan:
+    """
+    Combine the best-ranked candidate of each kind and score them together.
+
+    Returns:
+        The chosen fixes (ranked) and the current and projected scores
+    """
+    base = base or rule_set.score(features)
+    chosen: Dict[str, FixCandidate] = {}
+    for candidate in rank_fixes(rule_set, features, base):
+        chosen.setdefault(candidate.kind, candidate)
+
+    fixes = sorted(chosen.values(), key=_rank_key)
+    changes: Dict[str, Number] = {}
+    for candidate in fixes:
+        changes.update(candidate.changes)
+    return FixPlan(fixes=fixes, score=base.total, projected_score=rule_set.rescore(base, changes))
@@ -15,26 +15,26 @@ from linkedin_optimizer import (
     generate_enhanced_fixes,
     generate_enhanced_roadmap,
 )
+from profile_view import ProfileView
 
 def test_headline_tips():
     print("\n=== Testing Headline Optimization ===")
     
     # Test weak headline
-    tips = get_headline_optimization_tips(
-        current_headline="Looking for opportunities",
-        skills=["Python", "Docker", "Kubernetes"],
-        current_role="Senior Engineer"
-    )
+    tips = get_headline_optimization_tips(ProfileView.build(
+        {"headline": "Looking for opportunities", "current_role": "Senior Engineer"},
+        {"skills": ["Python", "Docker", "Kubernetes"]},
+    ))
     print(f"Weak headline tips ({len(tips)}):")
     for tip in tips:
         print(f"  - {tip}")
     
     # Test good headline
-    tips = get_headline_optimization_tips(
-        current_headline="Senior Engineer | Python, Docker, Kubernetes | Building Scalable Systems",
-        skills=["Python", "Docker", "Kubernetes"],
-        current_role="Senior Engineer"
-    )
+    tips = get_headline_optimization_tips(ProfileView.build(
+        {"headline": "Senior Engineer | Python, Docker, Kubernetes | Building Scalable Systems",
+         "current_role": "Senior Engineer"},
+        {"skills": ["Python", "Docker", "Kubernetes"]},
+    ))
     print(f"\nGood headline tips ({len(tips)}):")
     for tip in tips:
         print(f"  - {tip}")
@@ -43,11 +43,10 @@ def test_about_tips():
     print("\n=== Testing About Section Optimization ===")
     
     # Test empty about
-    tips = get_about_section_optimization_tips(
-        current_about="",
-        skills=["Python", "Docker"],
-        achievements=["Built system", "Led team"]
-    )
+    tips = get_about_section_optimization_tips(ProfileView.build(
+        {"about": ""},
+        {"skills": ["Python", "Docker"], "projects": ["Built system", "Led team"]},
+    ))
     print(f"Empty about tips ({len(tips)}):")
     for tip in tips:
         print(f"  - {tip}")
@@ -55,10 +54,10 @@ def test_about_tips():
 def test_skills_tips():
     print("\n=== Testing Skills Optimization ===")
     
-    tips = get_skills_optimization_tips(
-        linkedin_skills=["Python", "Docker"],
-        resume_skills=["Python", "Docker", "Kubernetes", "Terraform", "CI/CD"]
-    )
+    tips = get_skills_optimization_tips(ProfileView.build(
+        {"skills": ["Python", "Docker"]},
+        {"skills": ["Python", "Docker", "Kubernetes", "Terraform", "CI/CD"]},
+    ))
     print(f"Skills tips ({len(tips)}):")
     for tip in tips:
         print(f"  - {tip}")
@@ -73,7 +72,7 @@ def test_completeness():
         "certifications": ["AWS Certified"],
     }
     
-    assessment = get_completeness_assessment(linkedin_data)
+    assessment = get_completeness_assessment(ProfileView.build(linkedin_data))
     print(f"All-Star Score: {assessment['all_star_score']}%")
     print(f"Beyond All-Star Score: {assessment['beyond_score']}%")
     print(f"Is All-Star: {assessment['is_all_star']}")
@@ -103,7 +102,7 @@ def test_enhanced_fixes():
         "advanced_tech_themes": ["Docker", "Kubernetes"],
     }
     
-    fixes = generate_enhanced_fixes(linkedin_data, resume_data, gaps)
+    fixes = generate_enhanced_fixes(ProfileView.build(linkedin_data, resume_data, gaps))
     print(f"Enhanced fixes ({len(fixes)}):")
     for i, fix in enumerate(fixes, 1):
         print(f"  {i}. {fix}")
@@ -128,8 +127,9 @@ def test_enhanced_roadmap():
         "advanced_tech_themes": ["Docker", "Kubernetes"],
     }
     
+    view = ProfileView.build(linkedin_data, resume_data, gaps)
     for mode in ["Get Hired", "Grow Connections", "Influence Market"]:
-        roadmap = generate_enhanced_roadmap(mode, linkedin_data, resume_data, gaps)
+        roadmap = generate_enhanced_roadmap(mode, view)
         print(f"\n{mode} Roadmap ({len(roadmap)} weeks):")
         for week in roadmap:
             print(f"  - {week}")
@@ -0,0 +1,89 @@
+"""
+Tests for the synthetic benchmark corpus and pipeline benchmark.
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from benchmarks import corpus
+from benchmarks.bench_pipeline import run_benchmark, scaling_exponent
+from pipeline import extract_profile_from_text, parse_resume
+
+
+@pytest.mark.unit
+class TestCorpus:
+    """Test generated inputs have the requested size and parse."""
+
+    def test_skill_names_are_unique(self):
+        """Test skill names stay distinct beyond the base vocabulary."""
+        names = corpus.skill_names(5000)
+        assert len(names) == 5000
+        assert len(set(names)) == 5000
+
+    @pytest.mark.parametrize("fmt", corpus.RESUME_FORMATS)
+    def test_resume_formats_parse(self, temp_dir, fmt):
+        """Test every format is readable by parse_resume."""
+        path = corpus.write_resume(temp_dir / f"resume.{fmt}", pages=2, skills=30)
+        resume = parse_resume(path)
+        assert "Python" in " ".join(resume.skills)
+        assert resume.experience
+
+    def test_txt_resume_has_exact_skill_count(self, temp_dir):
+        """Test the Skills section carries the requested skill count."""
+        path = corpus.write_resume(temp_dir / "resume.txt", pages=1, skills=250)
+        assert len(parse_resume(path).skills) == 250
+
+    def test_pdf_page_count(self, temp_dir):
+        """Test PDFs have the requested number of pages."""
+        import pdfplumber
+
+        path = corpus.write_resume(temp_dir / "resume.pdf", pages=4, skills=10)
+        with pdfplumber.open(path) as pdf:
+            assert len(pdf.pages) == 4
+
+    def test_linkedin_text_and_screenshots(self, temp_dir):
+        """Test profile text extracts and renders to PNGs."""
+        text = corpus.linkedin_text(skills=60)
+        profile = extract_profile_from_text(text)
+        assert len(profile.skills) == 60
+        assert profile.about
+
+        paths = corpus.render_screenshots(text, temp_dir / "shots", lines_per_image=30)
+        assert len(paths) == -(-len(text.splitlines()) // 30)
+        assert all(p.read_bytes().startswith(b"\x89PNG") for p in paths)
+
+    def test_unsupported_format(self, temp_dir):
+        """Test unknown suffixes are rejected."""
+        with pytest.raises(ValueError):
+            corpus.write_resume(temp_dir / "resume.rtf", pages=1, skills=10)
+
+    def test_two_column_pdf_only(self, temp_dir):
+        """Test two-column layout is written for PDFs and rejected elsewhere."""
+        path = corpus.write_resume(temp_dir / "resume.pdf", pages=1, skills=10, columns=2)
+        assert "Python" in " ".join(parse_resume(path).skills)
+        with pytest.raises(ValueError, match="only supported for .pdf"):
+            corpus.write_resume(temp_dir / "resume.txt", pages=1, skills=10, columns=2)
+
+
+@pytest.mark.unit
+class TestPipelineBenchmark:
+    """Test the benchmark output shape."""
+
+    def test_scaling_exponent(self):
+        """Test the fitted exponent of a quadratic curve."""
+        points = [{"size": n, "mean_ms": n * n} for n in (10, 100, 1000)]
+        assert scaling_exponent(points) == pytest.approx(2.0)
+        assert scaling_exponent(points[:1]) is None
+
+    def test_run_benchmark_smoke(self, temp_dir):
+        """Test a tiny grid produces curves for every stage."""
+        results = run_benchmark(pages=(1, 2), skills=(10, 20), formats=("txt",), repeat=1, work_dir=temp_dir)
+
+        stages = results["stages"]
+        for stage in ("parse_resume[txt] by pages", "extract_profile_from_text", "generate_gap_analysis",
+                      "generate_strategy", "format_dashboard", "optimizer.generate_enhanced_fixes"):
+            assert len(stages[stage]["points"]) == 2
+        assert stages["parse_resume[txt] by pages"]["points"][0]["pages_per_s"] > 0
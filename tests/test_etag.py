@@ -0,0 +1,146 @@
+"""
+Tests for ETags and conditional requests on analysis results.
+"""
+import json
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import history_store
+from history_store import HistoryStore
+
+
+@pytest.fixture
+def client():
+    """Test client for the app."""
+    import app as app_module
+    return TestClient(app_module.app)
+
+
+@pytest.fixture
+def analyze_request(sample_linkedin_data, sample_resume_text):
+    """Keyword arguments for an /analyze request."""
+    return {
+        "files": {"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+        "data": {"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+    }
+
+
+def _fail(*args):
+    raise AssertionError("inputs were parsed for a conditional request")
+
+
+@pytest.mark.integration
+class TestAnalyzeETag:
+    """Test ETags on /analyze responses and If-None-Match revalidation."""
+
+    def test_response_carries_weak_etag(self, client, analyze_request):
+        """Test identical inputs get the same weak ETag; different inputs a different one."""
+        first = client.post("/analyze", **analyze_request)
+        second = client.post("/analyze", **analyze_request)
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')  # the dashboard's analysis date makes bodies differ
+        assert second.headers["etag"] == etag
+        assert len(first.headers["x-analysis-fingerprint"]) == 64
+
+        analyze_request["data"]["mode"] = "Grow Connections"
+        assert client.post("/analyze", **analyze_request).headers["etag"] != etag
+
+    def test_fingerprint_frames_each_input(self, client, sample_linkedin_data):
+        """Test a resume ending in a screenshot's digest does not fingerprint like resume + screenshot."""
+        import hashlib
+
+        resume = b"SKILLS\nPython, Docker\n"
+        shot = b"not really a png"
+        data = {"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)}
+        with_shot = client.post("/analyze", data=data, files=[
+            ("resume", ("resume.txt", resume, "text/plain")),
+            ("screenshots", ("shot.png", shot, "image/png")),
+        ])
+        concatenated = client.post("/analyze", data=data, files={
+            "resume": ("resume.txt", resume + hashlib.sha256(shot).digest(), "text/plain"),
+        })
+        assert with_shot.status_code == concatenated.status_code == 200
+        assert with_shot.headers["x-analysis-fingerprint"] != concatenated.headers["x-analysis-fingerprint"]
+
+    def test_if_none_match_skips_analysis(self, monkeypatch, client, analyze_request):
+        """Test a matching If-None-Match returns 304 without parsing anything."""
+        import app as app_module
+
+        etag = client.post("/analyze", **analyze_request).headers["etag"]
+        monkeypatch.setattr(app_module, "_parse_linkedin_text", _fail)
+        monkeypatch.setattr(app_module, "_run_analysis", _fail)
+
+        for header in (etag, f'"other", {etag.removeprefix("W/")}'):
+            response = client.post("/analyze", headers={"If-None-Match": header}, **analyze_request)
+            assert response.status_code == 304
+            assert response.content == b""
+            assert response.headers["etag"] == etag
+
+    def test_version_bump_invalidates_etag(self, monkeypatch, client, analyze_request):
+        """Test an app version change produces a new ETag and a full response."""
+        import app as app_module
+
+        etag = client.post("/analyze", **analyze_request).headers["etag"]
+        monkeypatch.setattr(app_module.Config, "APP_VERSION", "99.0.0")
+
+        response = client.post("/analyze", headers={"If-None-Match": etag}, **analyze_request)
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["profile_score"] >= 0
+
+
+@pytest.mark.integration
+class TestAnalysisByFingerprint:
+    """Test revalidating and fetching analyses by fingerprint."""
+
+    def test_revalidate_without_uploads(self, monkeypatch, client, analyze_request):
+        """Test GET and HEAD with the current ETag return 304; a stale one needs a new POST."""
+        import app as app_module
+
+        first = client.post("/analyze", **analyze_request)
+        url = f"/analyze/{first.headers['x-analysis-fingerprint']}"
+        etag = first.headers["etag"]
+
+        for method in ("GET", "HEAD"):
+            response = client.request(method, url, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag
+
+        monkeypatch.setattr(app_module.Config, "APP_VERSION", "99.0.0")
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 404
+
+    def test_fetch_stored_result(self, monkeypatch, temp_dir, client, analyze_request):
+        """Test a signed-in user can fetch their stored result by fingerprint."""
+        import app as app_module
+
+        store = HistoryStore(temp_dir / "history.db")
+        store.start()
+        monkeypatch.setattr(app_module.Config, "HISTORY_ENABLED", True)
+        monkeypatch.setattr(history_store, "_store", store)
+        monkeypatch.setitem(app_module.app.dependency_overrides, app_module.verify_firebase_token, lambda: {"uid": "u1"})
+        try:
+            first = client.post("/analyze", **analyze_request)
+            store.flush()
+            url = f"/analyze/{first.headers['x-analysis-fingerprint']}"
+
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response.json() == first.json()
+            assert response.headers["etag"] == first.headers["etag"]
+
+            head = client.head(url)
+            assert head.status_code == 200 and head.content == b""
+
+            monkeypatch.setitem(app_module.app.dependency_overrides, app_module.verify_firebase_token, lambda: {"uid": "u2"})
+            assert client.get(url).status_code == 404
+        finally:
+            store.close()
+
+    def test_invalid_fingerprint(self, client):
+        """Test malformed fingerprints are rejected."""
+        assert client.get("/analyze/not-a-fingerprint").status_code == 400
@@ -0,0 +1,289 @@
+"""
+Tests for the content-sniffing resume extractor registry.
+"""
+import zipfile
+import pytest
+from pathlib import Path
+from typing import List, Optional
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import extractors
+from extractors import (
+    COST_HEAVY,
+    COST_LIGHT,
+    ResumeExtractor,
+    detect_encoding,
+    get_extractor,
+    iter_docx_paragraphs,
+    iter_odf_paragraphs,
+    iter_text_chunks,
+    register_extractor,
+    register_sniffer,
+    rtf_to_text,
+    sniff_content_type,
+)
+from pipeline import parse_resume
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _write_docx(path: Path, body: str, header: str = "") -> Path:
+    """Write a minimal DOCX whose body (and optional header) is raw WordprocessingML."""
+    namespaces = (f'xmlns:w="{W_NS}" '
+                  'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"')
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", f"<w:document {namespaces}><w:body>{body}</w:body></w:document>")
+        if header:
+            archive.writestr("word/header1.xml", f"<w:hdr {namespaces}>{header}</w:hdr>")
+    return path
+
+
+RESUME_TEXT = "José Müller\n\nSkills: Python, Docker, Kubernetes\n\nExperience building résumé tools at work\n"
+
+
+@pytest.mark.unit
+class TestTextExtraction:
+    """Test encoding detection and incremental decoding."""
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "utf-16-le", "cp1252", "utf-32"])
+    def test_encodings_round_trip(self, temp_dir, encoding):
+        """Test TXT resumes decode in every supported encoding."""
+        path = temp_dir / "resume.txt"
+        path.write_bytes(RESUME_TEXT.encode(encoding))
+
+        assert sniff_content_type(path) == "text/plain"
+        assert "".join(iter_text_chunks(path)) == RESUME_TEXT
+
+    def test_multibyte_characters_across_chunks(self, temp_dir):
+        """Test characters split across decode chunks are not corrupted."""
+        path = temp_dir / "resume.txt"
+        text = "é中" * 5000
+        path.write_bytes(text.encode("utf-8"))
+
+        chunks = list(iter_text_chunks(path, chunk_bytes=7))
+        assert "".join(chunks) == text
+        assert len(chunks) > 1
+
+    def test_empty_file(self, temp_dir):
+        """Test empty files decode to nothing."""
+        path = temp_dir / "empty.txt"
+        path.write_bytes(b"")
+        assert list(iter_text_chunks(path)) == []
+
+    def test_binary_is_not_text(self):
+        """Test NUL-heavy binary samples are not treated as text."""
+        assert detect_encoding(b"\x00\x01\x02\x00\xff\x00\x00\x10" * 100) is None
+
+    def test_parse_latin1_resume(self, temp_dir):
+        """Test parse_resume handles non-UTF-8 text files."""
+        path = temp_dir / "resume.txt"
+        path.write_bytes(RESUME_TEXT.encode("cp1252"))
+        resume = parse_resume(path)
+        assert resume.skills == ["Python", "Docker", "Kubernetes"]
+
+
+@pytest.mark.unit
+class TestSniffing:
+    """Test format detection by content rather than suffix."""
+
+    def test_pdf_with_wrong_suffix(self, temp_dir):
+        """Test a PDF named .txt is routed to the PDF extractor."""
+        from benchmarks.corpus import write_resume
+
+        pdf = write_resume(temp_dir / "resume.pdf", pages=1, skills=5)
+        disguised = temp_dir / "resume.txt"
+        disguised.write_bytes(pdf.read_bytes())
+
+        extractor = get_extractor(disguised)
+        assert extractor.name == "pdf"
+        assert extractor.cost == COST_HEAVY
+
+    def test_docx_named_doc(self, temp_dir):
+        """Test a DOCX saved with a .doc suffix parses as DOCX."""
+        from benchmarks.corpus import write_resume
+
+        docx_path = write_resume(temp_dir / "resume.docx", pages=1, skills=5)
+        renamed = temp_dir / "resume.doc"
+        renamed.write_bytes(docx_path.read_bytes())
+        assert get_extractor(renamed).name == "docx"
+
+    def test_legacy_doc_is_unsupported(self, temp_dir):
+        """Test OLE (legacy Word) files are rejected with a clear error."""
+        path = temp_dir / "resume.doc"
+        path.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 512)
+        with pytest.raises(ValueError, match="Unsupported resume format"):
+            get_extractor(path)
+
+    def test_plain_zip_is_unsupported(self, temp_dir):
+        """Test arbitrary zip archives are rejected."""
+        path = temp_dir / "resume.docx"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("notes.txt", "hello")
+        with pytest.raises(ValueError):
+            get_extractor(path)
+
+
+@pytest.mark.unit
+class TestDocumentFormats:
+    """Test the ODT, HTML and RTF extractors."""
+
+    def test_odt(self, temp_dir):
+        """Test ODT paragraphs and headings are extracted."""
+        path = temp_dir / "resume.odt"
+        content = (
+            '<?xml version="1.0"?>'
+            '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+            'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><office:body><office:text>'
+            '<text:h>Skills</text:h><text:p>Python, <text:span>Docker</text:span></text:p>'
+            '</office:text></office:body></office:document-content>'
+        )
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("mimetype", "application/vnd.oasis.opendocument.text")
+            archive.writestr("content.xml", content)
+
+        extractor = get_extractor(path)
+        assert extractor.name == "odt"
+        assert extractor.extract(path) == ["Skills", "Python, Docker"]
+
+    def test_odt_elements_are_detached(self, monkeypatch):
+        """Test ODT paragraphs are released as they end and nested ones are their own chunk."""
+        import io
+
+        roots = []
+        iterparse = extractors.ElementTree.iterparse
+
+        def recording_iterparse(source, events=None):
+            for event, element in iterparse(source, events=events):
+                if not roots:
+                    roots.append(element)
+                yield event, element
+
+        monkeypatch.setattr(extractors.ElementTree, "iterparse", recording_iterparse)
+        paragraphs = "".join(f"<text:p>line {i}</text:p>" for i in range(100))
+        xml = (
+            '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+            'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+            'xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"><office:body><office:text>'
+            '<text:p>Contact <draw:frame><draw:text-box><text:p>jordan@example.com</text:p></draw:text-box>'
+            f'</draw:frame>today</text:p><text:list><text:list-item>{paragraphs}</text:list-item></text:list>'
+            '</office:text></office:body></office:document-content>'
+        ).encode()
+
+        texts = list(iter_odf_paragraphs(io.BytesIO(xml)))
+        assert texts[:3] == ["jordan@example.com", "Contact today", "line 0"]
+        assert len(texts) == 102
+        assert len(roots[0]) == 0
+
+    def test_html(self, temp_dir):
+        """Test HTML exports keep visible text and block line breaks."""
+        path = temp_dir / "resume.html"
+        path.write_text(
+            "<!DOCTYPE html><html><head><title>CV</title><style>p{}</style></head>"
+            "<body><h1>Jordan</h1><p>Skills: Python, Docker</p><script>var x;</script>"
+            "<p>Caf&eacute; work experience</p></body></html>",
+            encoding="utf-8",
+        )
+        extractor = get_extractor(path)
+        assert extractor.name == "html"
+        text = extractor.extract(path)[0]
+        assert text.splitlines() == ["Jordan", "", "Skills: Python, Docker", "", "Café work experience"]
+
+    def test_rtf(self, temp_dir):
+        """Test RTF control words, escapes and destinations."""
+        rtf = (r"{\rtf1\ansi{\fonttbl{\f0 Arial;}}{\*\generator Writer;}"
+               r"\f0 Skills: Python\par Caf\'e9 \u8226? Docker\tab AWS\par}")
+        assert rtf_to_text(rtf) == "Skills: Python\nCafé • Docker\tAWS\n"
+
+        path = temp_dir / "resume.rtf"
+        path.write_text(rtf, encoding="ascii")
+        assert get_extractor(path).name == "rtf"
+
+
+@pytest.mark.unit
+class TestRegistry:
+    """Test adding formats without touching dispatch."""
+
+    def test_register_new_format(self, temp_dir, monkeypatch):
+        """Test a registered sniffer + extractor is used by parse_resume."""
+        monkeypatch.setattr(extractors, "_sniffers", list(extractors._sniffers))
+        monkeypatch.setattr(extractors, "_extractors", dict(extractors._extractors))
+
+        @register_sniffer
+        def sniff_markdown(head: bytes, path: Path) -> Optional[str]:
+            return "text/markdown" if head.startswith(b"# ") else None
+
+        @register_extractor
+        class MarkdownExtractor(ResumeExtractor):
+            name = "markdown"
+            content_types = ("text/markdown",)
+            cost = COST_LIGHT
+
+            def extract(self, path: Path) -> List[str]:
+                return [path.read_text(encoding="utf-8").replace("# ", "")]
+
+        path = temp_dir / "resume.md"
+        path.write_text("# Jordan\n\nSkills: Go, Rust\n", encoding="utf-8")
+
+        assert get_extractor(path).name == "markdown"
+        assert parse_resume(path).skills == ["Go", "Rust"]
+
+    def test_extractor_must_implement_extract(self):
+        """Test an extractor without extract() cannot be instantiated or registered."""
+        class Incomplete(ResumeExtractor):
+            name = "incomplete"
+            content_types = ("text/x-incomplete",)
+
+        with pytest.raises(TypeError):
+            register_extractor(Incomplete)
+
+
+@pytest.mark.unit
+class TestDocxStreaming:
+    """Test the streaming DOCX extractor."""
+
+    def test_tables_text_boxes_and_headers(self, temp_dir):
+        """Test text in headers, tables and text boxes is kept, in reading order, once."""
+        body = (
+            '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+            '<w:r><w:t>Jordan</w:t></w:r><w:r><w:tab/><w:t xml:space="preserve">Engineer</w:t></w:r></w:p>'
+            '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Skills: Python</w:t></w:r></w:p></w:tc>'
+            '<w:tc><w:p><w:r><w:t>Docker</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+            '<w:p><w:r><mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><w:txbxContent>'
+            '<w:p><w:r><w:t>Certified Kubernetes</w:t></w:r></w:p>'
+            '</w:txbxContent></w:drawing></mc:Choice><mc:Fallback><w:pict><w:txbxContent>'
+            '<w:p><w:r><w:t>Certified Kubernetes</w:t></w:r></w:p>'
+            '</w:txbxContent></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+            '<w:r><w:t>After box</w:t><w:br/><w:delText>deleted</w:delText><w:t>next line</w:t></w:r></w:p>'
+        )
+        path = _write_docx(temp_dir / "resume.docx", body, header="<w:p><w:r><w:t>jordan@example.com</w:t></w:r></w:p>")
+
+        assert get_extractor(path).extract(path) == [
+            "jordan@example.com",
+            "Jordan\tEngineer",
+            "Skills: Python",
+            "Docker",
+            "Certified Kubernetes",
+            "After box\nnext line",
+        ]
+
+    def test_matches_python_docx_on_corpus(self, temp_dir):
+        """Test body paragraphs agree with python-docx for plain documents."""
+        docx = pytest.importorskip("docx")
+        from benchmarks.corpus import write_resume
+
+        path = write_resume(temp_dir / "resume.docx", pages=3, skills=30)
+        expected = [paragraph.text for paragraph in docx.Document(str(path)).paragraphs]
+        assert get_extractor(path).extract(path) == expected
+
+    def test_elements_are_released(self):
+        """Test finished paragraphs are detached so memory stays bounded."""
+        import io
+
+        paragraphs = "".join(f"<w:p><w:r><w:t>line {i}</w:t></w:r></w:p>" for i in range(1000))
+        xml = f'<w:document xmlns:w="{W_NS}"><w:body>{paragraphs}</w:body></w:document>'.encode()
+        texts = list(iter_docx_paragraphs(io.BytesIO(xml)))
+        assert texts[0] == "line 0"
+        assert len(texts) == 1000
@@ -0,0 +1,254 @@
+"""
+Tests for the SQLite analysis history store and history endpoints.
+"""
+import json
+import time
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import history_store
+from history_store import HistoryStore
+
+
+def _payload(score, skills, missing=(), fixes=()):
+    return {
+        "linkedin": {"headline": "Engineer", "skills": list(skills), "certifications": []},
+        "resume": {"skills": list(skills) + list(missing)},
+        "gaps": {"skills_missing_from_linkedin": list(missing), "advanced_tech_themes": []},
+        "result": {"mode": "Get Hired", "profile_score": score, "immediate_fixes": list(fixes)},
+    }
+
+
+@pytest.fixture
+def store(temp_dir):
+    """History store in a temporary database, closed after the test."""
+    history = HistoryStore(temp_dir / "history.db", max_per_user=3, retention_days=30, maintenance_interval=3600)
+    history.start()
+    yield history
+    history.close()
+
+
+def _count(store, table):
+    return store._reader().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+@pytest.mark.unit
+class TestHistoryStore:
+    """Test storage, deduplication, queries and retention."""
+
+    def test_database_uses_wal(self, store):
+        """Test the database runs in WAL mode with incremental vacuum."""
+        reader = store._reader()
+        assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert reader.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # incremental
+
+    def test_latest_newest_first(self, store):
+        """Test latest() lists a user's analyses newest first, without other users'."""
+        for n in range(3):
+            store.save("u1", f"fp{n}", "v1", _payload(60 + n, ["Go"]), now=1000.0 + n)
+        store.save("u2", "fp0", "v1", _payload(10, ["Go"]), now=2000.0)
+        store.flush()
+
+        entries = store.latest("u1", limit=2)
+        assert [(entry.fingerprint, entry.profile_score) for entry in entries] == [("fp2", 62), ("fp1", 61)]
+        assert [entry.fingerprint for entry in store.latest("u2")] == ["fp0"]
+
+    def test_identical_inputs_are_deduplicated(self, store):
+        """Test re-analysing identical inputs updates one row and payloads are stored once."""
+        store.save("u1", "fp", "v1", _payload(70, ["Go"]), now=1000.0)
+        store.save("u1", "fp", "v1", _payload(70, ["Go"]), now=1100.0)
+        store.save("u2", "fp", "v1", _payload(70, ["Go"]), now=1200.0)
+        store.flush()
+
+        [entry] = store.latest("u1")
+        assert entry.times_analyzed == 2
+        assert (entry.created_at, entry.analyzed_at) == (1000.0, 1100.0)
+        assert _count(store, "blobs") == 1
+
+    def test_find_matches_pipeline_version(self, store):
+        """Test stored results are only returned for the version that produced them."""
+        payload = _payload(70, ["Go"])
+        store.save("u1", "fp", "v1", payload)
+        store.flush()
+
+        assert store.find("u1", "fp", "v1") == payload
+        assert store.find("u1", "fp", "v2") is None
+        assert store.find("u2", "fp", "v1") is None
+
+    def test_payloads_are_compressed(self, store):
+        """Test payloads are stored compressed."""
+        payload = _payload(70, [f"skill{n}" for n in range(200)])
+        store.save("u1", "fp", "v1", payload)
+        store.flush()
+
+        stored = store._reader().execute("SELECT LENGTH(data) FROM blobs").fetchone()[0]
+        assert stored < len(json.dumps(payload)) / 2
+
+    def test_diff_against_previous(self, store):
+        """Test the latest analysis is compared with the one before it."""
+        store.save("u1", "fp1", "v1", _payload(60, ["Go"], missing=["Rust", "SQL"], fixes=["Add skills"]), now=1000.0)
+        store.save("u1", "fp2", "v1", _payload(72, ["Go", "Rust"], missing=["SQL"], fixes=["Add skills"]), now=1100.0)
+        store.flush()
+
+        diff = store.diff("u1")
+        assert (diff.current.fingerprint, diff.previous.fingerprint) == ("fp2", "fp1")
+        assert diff.score_change == 12
+        assert diff.changes == {
+            "linkedin.skills": {"added": ["Rust"], "removed": []},
+            "gaps.skills_missing_from_linkedin": {"added": [], "removed": ["Rust"]},
+        }
+
+        first = store.diff("u1", diff.previous.id)
+        assert first.previous is None and first.changes == {}
+        assert store.diff("u2") is None
+        assert store.diff("u2", diff.current.id) is None  # other users' ids are not visible
+
+    def test_latest_payloads_one_per_user(self, store):
+        """Test latest_payloads() yields each user's newest analysis once."""
+        store.save("u1", "fp1", "v1", _payload(60, ["Go"]), now=1000.0)
+        store.save("u1", "fp2", "v1", _payload(70, ["Rust"]), now=1100.0)
+        store.save("u2", "fp1", "v1", _payload(50, ["SQL"]), now=900.0)
+        store.flush()
+
+        latest = dict(store.latest_payloads())
+        assert latest == {"u1": _payload(70, ["Rust"]), "u2": _payload(50, ["SQL"])}
+
+    def test_retention_and_vacuum(self, store):
+        """Test old and excess analyses and their orphaned payloads are removed."""
+        now = time.time()
+        store.save("u1", "old", "v1", _payload(10, ["Old"]), now=now - 31 * 86400)
+        for n in range(4):
+            store.save("u1", f"fp{n}", "v1", _payload(50 + n, [f"skill{n}"]), now=now - 10 + n)
+        store.flush()
+        assert _count(store, "analyses") == 5
+
+        store.run_maintenance()
+        store.flush()
+
+        assert [entry.fingerprint for entry in store.latest("u1", 10)] == ["fp3", "fp2", "fp1"]
+        assert _count(store, "blobs") == 3
+
+    def test_full_queue_drops_writes(self, temp_dir):
+        """Test a full write queue drops new writes instead of blocking the caller."""
+        history = HistoryStore(temp_dir / "history.db", queue_size=1)
+        history._writer = object()  # writer "running" but not consuming
+        try:
+            assert history.save("u1", "fp0", "v1", _payload(1, []))
+            assert not history.save("u1", "fp1", "v1", _payload(1, []))
+        finally:
+            history._writer = None
+            history.close()
+
+
+@pytest.mark.integration
+class TestHistoryEndpoints:
+    """Test storing analyses and serving identical inputs from history."""
+
+    def test_repeat_analysis_is_served_from_history(
+        self, monkeypatch, store, sample_linkedin_data, sample_resume_text
+    ):
+        """Test a signed-in user's repeated analysis skips the pipeline and is listed once."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module.Config, "HISTORY_ENABLED", True)
+        monkeypatch.setattr(history_store, "_store", store)
+        monkeypatch.setitem(app_module.app.dependency_overrides, app_module.verify_firebase_token, lambda: {"uid": "u1"})
+        client = TestClient(app_module.app)
+        request = {
+            "files": {"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+            "data": {"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+        }
+
+        first = client.post("/analyze", **request)
+        assert first.status_code == 200
+        store.flush()
+
+        def fail(*args):
+            raise AssertionError("pipeline re-ran for identical inputs")
+
+        monkeypatch.setattr(app_module, "_run_analysis", fail)
+        second = client.post("/analyze", **request)
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        store.flush()
+
+        listing = client.get("/history").json()["analyses"]
+        assert len(listing) == 1
+        assert listing[0]["times_analyzed"] == 2
+        assert listing[0]["profile_score"] == first.json()["profile_score"]
+
+        diff = client.get("/history/diff").json()
+        assert diff["previous"] is None
+
+    def test_database_reads_run_off_event_loop(self, monkeypatch, store, sample_linkedin_data, sample_resume_text):
+        """Test history lookups from every endpoint run in a worker thread, not on the event loop."""
+        import asyncio
+        import app as app_module
+
+        def off_loop(method):
+            def wrapper(*args, **kwargs):
+                with pytest.raises(RuntimeError):
+                    asyncio.get_running_loop()
+                calls.append(method.__name__)
+                return method(*args, **kwargs)
+            return wrapper
+
+        calls = []
+        for name in ("find", "latest", "diff"):
+            monkeypatch.setattr(store, name, off_loop(getattr(store, name)))
+        monkeypatch.setattr(app_module.Config, "HISTORY_ENABLED", True)
+        monkeypatch.setattr(history_store, "_store", store)
+        monkeypatch.setitem(app_module.app.dependency_overrides, app_module.verify_firebase_token, lambda: {"uid": "u1"})
+        client = TestClient(app_module.app)
+
+        response = client.post("/analyze", files={"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+                               data={"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)})
+        assert response.status_code == 200
+        store.flush()
+        assert client.get(f"/analyze/{response.headers['x-analysis-fingerprint']}").status_code == 200
+        assert client.get("/history").status_code == 200
+        assert client.get("/history/diff").status_code == 200
+        assert sorted(set(calls)) == ["diff", "find", "latest"]
+
+    def test_skill_index_rebuilt_from_history(self, monkeypatch, store):
+        """Test a restarted worker's search index holds each user's latest stored analysis."""
+        import app as app_module
+        from skill_index import SkillIndex
+
+        store.save("u1", "fp1", "v1", _payload(60, ["Go"], missing=["Rust"]), now=1000.0)
+        store.save("u1", "fp2", "v1", _payload(70, ["Go", "Rust"]), now=1100.0)
+        store.save("u2", "fp1", "v1", _payload(50, ["SQL"], missing=["Rust"]), now=1000.0)
+        store.flush()
+        monkeypatch.setattr(history_store, "_store", store)
+        monkeypatch.setattr(app_module, "skill_index", SkillIndex())
+
+        assert app_module._rebuild_skill_index() == 2
+        assert [hit.key for hit in app_module.skill_index.search("missing:rust").hits] == ["u2"]
+        assert [hit.profile_score for hit in app_module.skill_index.search("linkedin:rust").hits] == [70]
+
+    def test_history_requires_sign_in(self, monkeypatch, store):
+        """Test anonymous callers get 401."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module.Config, "HISTORY_ENABLED", True)
+        monkeypatch.setattr(history_store, "_store", store)
+        assert TestClient(app_module.app).get("/history").status_code == 401
+
+    def test_rejected_requests_do_not_open_store(self, monkeypatch, temp_dir):
+        """Test disabled history and anonymous callers never create the database."""
+        import app as app_module
+
+        monkeypatch.setattr(history_store, "_store", None)
+        monkeypatch.setattr(history_store.Config, "HISTORY_DB_PATH", temp_dir / "history.db")
+        client = TestClient(app_module.app)
+        for enabled, status in ((False, 404), (True, 401)):
+            monkeypatch.setattr(app_module.Config, "HISTORY_ENABLED", enabled)
+            assert client.get("/history").status_code == status
+            assert client.get("/history/diff").status_code == status
+        assert history_store._store is None
+        assert not (temp_dir / "history.db").exists()
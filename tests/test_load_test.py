@@ -0,0 +1,75 @@
+"""
+Tests for the /analyze load-test harness helpers.
+"""
+import os
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from benchmarks.load_test import LevelStats, _process_tree, _rss_mb, build_scenarios, find_knee
+
+
+def _level(concurrency, throughput, p95=100.0):
+    return {"concurrency": concurrency, "throughput_rps": throughput, "latency_ms": {"p95": p95}}
+
+
+@pytest.mark.unit
+class TestKnee:
+    """Test saturation knee detection."""
+
+    def test_knee_is_first_level_near_peak(self):
+        """Test the knee is the lowest concurrency within 95% of peak throughput."""
+        levels = [_level(1, 10), _level(2, 19), _level(4, 30), _level(8, 31), _level(16, 30.5)]
+        knee = find_knee(levels)
+        assert knee["concurrency"] == 4
+        assert knee["peak_concurrency"] == 8
+
+    def test_no_knee_without_successes(self):
+        """Test levels without completed requests yield no knee."""
+        assert find_knee([_level(1, 0.0)]) is None
+
+
+@pytest.mark.unit
+class TestLevelStats:
+    """Test per-level summaries."""
+
+    def test_summary_counts_errors_and_percentiles(self):
+        """Test error rate and latency percentiles."""
+        stats = LevelStats(concurrency=2, duration_s=2.0)
+        stats.latencies_ms = [float(i) for i in range(1, 101)]
+        stats.statuses.update({"200": 100, "429": 25})
+
+        summary = stats.summary()
+        assert summary["throughput_rps"] == 50.0
+        assert summary["error_rate"] == 0.2
+        assert summary["latency_ms"]["p50"] == 51.0
+        assert summary["latency_ms"]["max"] == 100.0
+
+    @pytest.mark.skipif(not os.path.isdir("/proc"), reason="requires /proc")
+    def test_rss_of_current_process(self):
+        """Test RSS and process tree lookups via /proc."""
+        assert _rss_mb(os.getpid()) > 0
+        assert os.getpid() in _process_tree(os.getpid())
+
+
+@pytest.mark.unit
+class TestScenarios:
+    """Test request payload generation."""
+
+    def test_build_scenarios(self, temp_dir):
+        """Test every scenario has a resume and screenshot variants cover 1-5 images."""
+        scenarios = build_scenarios({"text": 1, "pdf": 1, "vision": 1}, temp_dir)
+        names = [s.name for s in scenarios]
+        assert names[:2] == ["text", "pdf"]
+        assert names[2:] == [f"vision[{n}]" for n in range(1, 6)]
+        for scenario in scenarios:
+            assert scenario.files[0][0] == "resume"
+        assert len(scenarios[-1].files) == 6
+
+    def test_unknown_scenario(self, temp_dir):
+        """Test unknown scenario names are rejected."""
+        with pytest.raises(ValueError):
+            build_scenarios({"fax": 1}, temp_dir)
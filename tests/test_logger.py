@@ -0,0 +1,112 @@
+"""
+Tests for queued, structured logging.
+"""
+import json
+import logging
+import queue
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from logger import (
+    SAMPLED,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestContextFilter,
+    SamplingFilter,
+    request_id_var,
+    setup_logger,
+)
+
+
+def _record(msg="message %s", args=("x",), **extra):
+    record = logging.LogRecord("test", logging.INFO, "/src/pipeline.py", 42, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.unit
+class TestFilters:
+    """Test request context and sampling filters."""
+
+    def test_request_id_is_attached(self):
+        """Test records capture the current request ID."""
+        token = request_id_var.set("req-1")
+        try:
+            record = _record()
+            RequestContextFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+        assert record.request_id == "req-1"
+
+    def test_sampling_keeps_one_in_n_per_call_site(self):
+        """Test sampled records are thinned per call site; others pass."""
+        sampler = SamplingFilter(rate=0.25)
+        kept = [sampler.filter(_record(**SAMPLED)) for _ in range(8)]
+        assert kept == [True, False, False, False, True, False, False, False]
+        assert all(sampler.filter(_record()) for _ in range(3))
+
+    def test_sampling_rate_zero_drops_sampled(self):
+        """Test rate 0 drops every sampled record."""
+        assert SamplingFilter(rate=0.0).filter(_record(**SAMPLED)) is False
+
+
+@pytest.mark.unit
+class TestHandlerAndFormatter:
+    """Test the queue handler and JSON output."""
+
+    def test_queue_handler_defers_formatting(self):
+        """Test records are queued unformatted (args intact)."""
+        handler = NonBlockingQueueHandler(queue.Queue())
+        record = _record()
+        handler.emit(record)
+        queued = handler.queue.get_nowait()
+        assert queued.msg == "message %s"
+        assert queued.args == ("x",)
+
+    def test_full_queue_drops_without_blocking(self):
+        """Test a full queue drops records and counts them."""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.emit(_record())
+        handler.emit(_record())
+        assert handler.dropped == 1
+
+    def test_json_formatter(self):
+        """Test JSON records carry severity, message and request ID."""
+        record = _record(request_id="req-2", sampled_every=10)
+        data = json.loads(JsonFormatter().format(record))
+        assert data["severity"] == "INFO"
+        assert data["message"] == "message x"
+        assert data["request_id"] == "req-2"
+        assert data["sampled_every"] == 10
+
+    def test_setup_logger_uses_shared_queue_handler(self):
+        """Test module loggers share one non-blocking handler."""
+        first = setup_logger("test_logger_a")
+        second = setup_logger("test_logger_b")
+        assert isinstance(first.handlers[0], NonBlockingQueueHandler)
+        assert first.handlers[0] is second.handlers[0]
+
+
+@pytest.mark.integration
+class TestRequestIdMiddleware:
+    """Test request IDs on API responses."""
+
+    def test_generated_request_id(self):
+        """Test a request ID is generated and returned."""
+        from app import app
+
+        response = TestClient(app).get("/health")
+        assert len(response.headers["x-request-id"]) == 32
+
+    def test_incoming_request_id_is_reused(self):
+        """Test well-formed incoming IDs are echoed and malformed ones replaced."""
+        from app import app
+
+        client = TestClient(app)
+        assert client.get("/health", headers={"X-Request-ID": "abc-123"}).headers["x-request-id"] == "abc-123"
+        assert client.get("/health", headers={"X-Request-ID": "bad id\n"}).headers["x-request-id"] != "bad id\n"
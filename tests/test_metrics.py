@@ -0,0 +1,98 @@
+"""
+Tests for Prometheus metrics and the /metrics endpoint.
+"""
+import json
+import time
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+@pytest.mark.unit
+class TestMetricTypes:
+    """Test metric recording and exposition format."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram renders cumulative buckets, sum and count."""
+        registry = MetricsRegistry()
+        hist = registry.register(Histogram("test_seconds", "Test", ["stage"], buckets=(0.1, 1.0)))
+        hist.observe(0.05, stage="ocr")
+        hist.observe(0.5, stage="ocr")
+        hist.observe(5.0, stage="ocr")
+
+        text = registry.render()
+
+        assert 'test_seconds_bucket{stage="ocr",le="0.1"} 1' in text
+        assert 'test_seconds_bucket{stage="ocr",le="1"} 2' in text
+        assert 'test_seconds_bucket{stage="ocr",le="+Inf"} 3' in text
+        assert 'test_seconds_count{stage="ocr"} 3' in text
+        assert "# TYPE test_seconds histogram" in text
+
+    def test_counter_and_gauge(self):
+        """Test counters accumulate and gauges track in-progress work."""
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("test_errors_total", "Errors", ["type"]))
+        gauge = registry.register(Gauge("test_in_flight", "In flight"))
+
+        counter.inc(type="ValueError")
+        counter.inc(type="ValueError")
+        with gauge.track_in_progress():
+            assert gauge.value() == 1
+
+        assert counter.value(type="ValueError") == 2
+        assert gauge.value() == 0
+        assert 'test_errors_total{type="ValueError"} 2' in registry.render()
+
+    def test_label_values_are_escaped(self):
+        """Test quotes in label values don't break the exposition format."""
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("test_total", "Test", ["type"]))
+        counter.inc(type='bad"value')
+        assert 'test_total{type="bad\\"value"} 1' in registry.render()
+
+    def test_wrong_labels_rejected(self):
+        """Test recording with the wrong label set raises."""
+        hist = Histogram("test_seconds", "Test", ["backend"])
+        with pytest.raises(ValueError):
+            hist.observe(1.0)
+
+    def test_observe_overhead_is_microseconds(self):
+        """Test recording a sample is cheap relative to request time."""
+        hist = Histogram("test_seconds", "Test", ["backend"])
+        iterations = 10_000
+        start = time.perf_counter()
+        for _ in range(iterations):
+            hist.observe(0.2, backend="vision")
+        per_call = (time.perf_counter() - start) / iterations
+        assert per_call < 50e-6
+
+
+@pytest.mark.integration
+class TestMetricsEndpoint:
+    """Test /metrics endpoint."""
+
+    def test_metrics_after_analyze(self, sample_linkedin_data, sample_resume_text):
+        """Test per-stage histograms are populated by /analyze."""
+        from app import app
+
+        client = TestClient(app)
+        client.post(
+            "/analyze",
+            files={"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+            data={"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+        )
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'lsa_resume_parse_seconds_count{format="txt"}' in response.text
+        assert "lsa_dashboard_render_seconds_count" in response.text
+        assert "lsa_in_flight_requests" in response.text
+        assert "lsa_executor_queue_depth" in response.text
@@ -0,0 +1,207 @@
+"""
+Tests for the interchangeable OCR engines and the tesserocr engine pool.
+
+tesserocr needs libtesseract, so the pool is exercised against a stand-in
+module with the same API surface.
+"""
+import threading
+import time
+import types
+import pytest
+from pathlib import Path
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from PIL import Image
+
+import ocr_engine
+import roi_ocr
+from config import Config
+from ocr_engine import PytesseractEngine, TesserocrEnginePool, create_engine, get_engine
+
+
+class FakeResult:
+    """One word of a fake tesseract result iterator."""
+
+    def __init__(self, text, box, starts):
+        self.text, self.box, self.starts = text, box, starts
+
+    def IsAtBeginningOf(self, level):
+        return level in self.starts
+
+    def BoundingBox(self, level):
+        return self.box
+
+    def Confidence(self, level):
+        return 91.5
+
+    def GetUTF8Text(self, level):
+        return self.text
+
+
+class FakeApi:
+    """Stand-in for tesserocr.PyTessBaseAPI that records its use."""
+    created = []
+
+    def __init__(self, lang):
+        self.lang = lang
+        self.psm = None
+        self.image = None
+        self.busy = False
+        self.overlapped = False
+        self.ended = False
+        FakeApi.created.append(self)
+
+    def SetPageSegMode(self, psm):
+        self.psm = psm
+
+    def SetImage(self, image):
+        if self.busy:
+            self.overlapped = True
+        self.busy = True
+        self.image = image
+
+    def GetUTF8Text(self):
+        time.sleep(0.005)
+        self.busy = False
+        return f"text {self.image.size[0]} psm {self.psm}"
+
+    def Recognize(self):
+        self.busy = False
+
+    def GetIterator(self):
+        return [
+            FakeResult("Senior", (10, 10, 70, 22), {"block", "para", "line"}),
+            FakeResult("Engineer", (80, 11, 150, 22), set()),
+            FakeResult("Skills", (10, 100, 50, 112), {"line"}),
+        ]
+
+    def Clear(self):
+        self.image = None
+
+    def End(self):
+        self.ended = True
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    FakeApi.created = []
+    module = types.SimpleNamespace(
+        PyTessBaseAPI=FakeApi,
+        RIL=types.SimpleNamespace(BLOCK="block", PARA="para", TEXTLINE="line", WORD="word"),
+        iterate_level=lambda iterator, level: iter(iterator),
+    )
+    monkeypatch.setattr(ocr_engine, "tesserocr", module)
+    monkeypatch.setattr(ocr_engine, "HAS_TESSEROCR", True)
+    return module
+
+
+@pytest.mark.unit
+class TestTesserocrEnginePool:
+    """Test the warm engine pool lifecycle and results."""
+
+    def test_engines_created_once_and_reused(self, fake_tesserocr):
+        """Test models load once per engine, not per call."""
+        pool = TesserocrEnginePool(size=2, language="eng+deu")
+        pool.start()
+        pool.start()
+        for width in (10, 20, 30):
+            assert pool.image_to_string(Image.new("L", (width, 8)), psm=6) == f"text {width} psm 6"
+
+        assert len(FakeApi.created) == 2
+        assert {api.lang for api in FakeApi.created} == {"eng+deu"}
+        assert all(api.image is None for api in FakeApi.created)  # cleared after each call
+        assert pool.image_to_string(Image.new("L", (5, 5))) == "text 5 psm 3"
+
+        pool.close()
+        assert not pool.started
+        assert all(api.ended for api in FakeApi.created)
+
+    def test_concurrent_calls_never_share_an_engine(self, fake_tesserocr):
+        """Test each engine serves one call at a time under concurrency."""
+        pool = TesserocrEnginePool(size=2)
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda i: pool.image_to_string(Image.new("L", (i + 1, 4))), range(24)))
+
+        assert results == [f"text {i + 1} psm 3" for i in range(24)]
+        assert len(FakeApi.created) == 2  # started lazily, once
+        assert not any(api.overlapped for api in FakeApi.created)
+        pool.close()
+
+    def test_close_waits_for_engines_in_use(self, fake_tesserocr):
+        """Test close() never ends an engine mid-call and returned engines are not reused."""
+        pool = TesserocrEnginePool(size=2)
+        pool.start()
+        with pool._engine(None) as busy:
+            pool.close()
+            assert not busy.ended
+            assert sum(api.ended for api in FakeApi.created) == 1  # the idle one
+            with pytest.raises(RuntimeError, match="closed"):
+                pool.image_to_string(Image.new("L", (4, 4)))
+        assert busy.ended
+        assert not pool.started and not pool._idle
+
+        pool.start()
+        assert pool.image_to_string(Image.new("L", (4, 4))) == "text 4 psm 3"
+        assert busy not in pool._engines
+        pool.close()
+
+    def test_data_matches_pytesseract_layout(self, fake_tesserocr):
+        """Test image_to_data output groups into the same lines as pytesseract's."""
+        pool = TesserocrEnginePool(size=1)
+        data = pool.image_to_data(Image.new("L", (200, 200)), psm=11)
+
+        assert set(data) == set(ocr_engine.DATA_KEYS)
+        assert data["line_num"] == [1, 1, 2]
+        assert data["word_num"] == [1, 2, 1]
+        assert (data["left"][1], data["top"][1], data["width"][1], data["height"][1]) == (80, 11, 70, 11)
+        assert [line.text for line in roi_ocr.group_lines(data)] == ["Senior Engineer", "Skills"]
+        assert FakeApi.created[0].psm == 11
+        pool.close()
+
+
+@pytest.mark.unit
+class TestEngineSelection:
+    """Test Config.OCR_ENGINE selection and the process-wide engine."""
+
+    def test_select_by_config(self, fake_tesserocr, monkeypatch):
+        """Test the configured engine is built."""
+        monkeypatch.setattr(Config, "OCR_ENGINE", "tesserocr")
+        assert isinstance(create_engine(), TesserocrEnginePool)
+        assert isinstance(create_engine("pytesseract"), PytesseractEngine)
+
+    def test_falls_back_without_tesserocr(self, monkeypatch):
+        """Test a missing tesserocr falls back to pytesseract."""
+        monkeypatch.setattr(ocr_engine, "HAS_TESSEROCR", False)
+        assert isinstance(create_engine("tesserocr"), PytesseractEngine)
+
+    def test_unknown_engine(self):
+        """Test unknown engine names are rejected."""
+        with pytest.raises(ValueError, match="Unknown OCR engine"):
+            create_engine("easyocr")
+
+    def test_process_wide_engine(self, fake_tesserocr, monkeypatch):
+        """Test get_engine() starts one shared engine and close_engine() releases it."""
+        monkeypatch.setattr(Config, "OCR_ENGINE", "tesserocr")
+        ocr_engine.close_engine()
+        try:
+            engines = set()
+            threads = [threading.Thread(target=lambda: engines.add(id(get_engine()))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len(engines) == 1
+            assert get_engine().started
+        finally:
+            ocr_engine.close_engine()
+        assert all(api.ended for api in FakeApi.created)
+
+    def test_config_validation(self, monkeypatch):
+        """Test invalid engine settings are rejected."""
+        monkeypatch.setattr(Config, "OCR_ENGINE", "easyocr")
+        with pytest.raises(ValueError, match="OCR_ENGINE"):
+            Config.validate()
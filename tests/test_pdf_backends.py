@@ -0,0 +1,145 @@
+"""
+Tests for the pluggable PDF text backends and backend selection.
+"""
+import shutil
+import threading
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pdf_backends
+from benchmarks import corpus
+from benchmarks.bench_pdf_backends import line_ratio, word_f1
+from config import Config
+from pdf_backends import available_backends, extract_pdf, get_backend, probe_pdf, select_backend
+from pipeline import parse_resume
+
+
+@pytest.fixture
+def single_column_pdf(temp_dir):
+    return corpus.write_resume(temp_dir / "resume.pdf", pages=3, skills=30)
+
+
+@pytest.fixture
+def two_column_pdf(temp_dir):
+    return corpus.write_resume(temp_dir / "sidebar.pdf", pages=3, skills=30, columns=2)
+
+
+@pytest.fixture
+def scanned_pdf(temp_dir):
+    return corpus.write_resume(temp_dir / "scan.pdf", pages=4, skills=30, scanned=[1, 3])
+
+
+@pytest.mark.unit
+class TestBackends:
+    """Test every backend extracts the same text page by page."""
+
+    @pytest.mark.parametrize("name", available_backends())
+    def test_backends_agree_with_pdfplumber(self, single_column_pdf, name):
+        """Test each backend returns one chunk per page with the reference words."""
+        pages = get_backend(name).extract_pages(single_column_pdf)
+        reference = get_backend("pdfplumber").extract_pages(single_column_pdf)
+
+        assert len(pages) == 3
+        assert all("\r" not in page and "\f" not in page for page in pages)
+        assert word_f1("\n".join(pages), "\n".join(reference)) > 0.99
+
+    def test_unknown_backend(self):
+        """Test unknown backend names are rejected."""
+        with pytest.raises(ValueError, match="Unknown PDF backend"):
+            get_backend("pypdf")
+
+    def test_agreement_metrics(self):
+        """Test word F1 ignores order while line ratio does not."""
+        assert word_f1("a b c", "c b a") == 1.0
+        assert word_f1("a b", "c d") == 0.0
+        assert line_ratio("a\nb", "a\nb") == 1.0
+        assert line_ratio("a\nb", "b\na") < 1.0
+
+
+@pytest.mark.unit
+class TestSelection:
+    """Test feature-driven backend selection."""
+
+    def test_probe_detects_columns(self, single_column_pdf, two_column_pdf):
+        """Test the layout probe tells single- and two-column pages apart."""
+        assert probe_pdf(single_column_pdf) == pdf_backends.PdfFeatures(pages=3, multi_column=False)
+        assert probe_pdf(two_column_pdf).multi_column is True
+
+    def test_auto_prefers_fast_backend_for_simple_layout(self, single_column_pdf):
+        """Test simple documents use pdfium."""
+        backend, features = select_backend(single_column_pdf)
+        assert backend.name == "pdfium"
+        assert features.pages == 3
+
+    def test_auto_uses_layout_analysis_for_columns(self, two_column_pdf, monkeypatch):
+        """Test multi-column documents use pdfminer unless they are too long."""
+        assert select_backend(two_column_pdf)[0].name == "pdfminer"
+
+        monkeypatch.setattr(Config, "PDF_LAYOUT_MAX_PAGES", 2)
+        assert select_backend(two_column_pdf)[0].name == "pdfium"
+
+    def test_configured_backend_is_used(self, single_column_pdf, monkeypatch):
+        """Test a fixed PDF_BACKEND overrides auto selection and drives parse_resume."""
+        monkeypatch.setattr(Config, "PDF_BACKEND", "pdfplumber")
+        assert select_backend(single_column_pdf)[0] is get_backend("pdfplumber")
+        assert "Python" in " ".join(parse_resume(single_column_pdf).skills)
+
+
+@pytest.mark.unit
+class TestScannedPages:
+    """Test detection and OCR of pages without a text layer."""
+
+    @pytest.fixture
+    def fake_ocr(self, monkeypatch):
+        calls = []
+
+        def ocr_image(image):
+            calls.append((threading.get_ident(), image.size))
+            return f"OCR TEXT {len(calls)}"
+
+        monkeypatch.setattr(pdf_backends, "ocr_image", ocr_image)
+        return calls
+
+    def test_probe_finds_image_only_pages(self, scanned_pdf, single_column_pdf):
+        """Test image-only pages are flagged and text pages are not."""
+        assert probe_pdf(scanned_pdf).scanned_pages == [1, 3]
+        assert probe_pdf(single_column_pdf).scanned_pages == []
+
+    def test_ocr_pages_merged_in_order(self, scanned_pdf, fake_ocr):
+        """Test OCR runs off-thread at the configured DPI and pages keep their order."""
+        pages = extract_pdf(scanned_pdf)
+
+        assert len(pages) == 4
+        assert pages[0].startswith("Jordan Q. Example")
+        assert pages[1].startswith("OCR TEXT") and pages[3].startswith("OCR TEXT")
+        assert pages[2] and not pages[2].startswith("OCR TEXT")
+        assert {size for _, size in fake_ocr} == {(1700, 2200)}  # US Letter at 200 dpi
+        assert threading.get_ident() not in {ident for ident, _ in fake_ocr}
+
+    def test_ocr_page_cap(self, scanned_pdf, fake_ocr, monkeypatch):
+        """Test scanned pages beyond PDF_OCR_MAX_PAGES are left empty."""
+        monkeypatch.setattr(Config, "PDF_OCR_MAX_PAGES", 1)
+        pages = extract_pdf(scanned_pdf)
+        assert pages[1] == "OCR TEXT 1"
+        assert pages[3] == ""
+        assert len(fake_ocr) == 1
+
+    def test_ocr_failure_leaves_page_empty(self, scanned_pdf, monkeypatch):
+        """Test an OCR error does not fail the whole document."""
+        def broken(image):
+            raise RuntimeError("tesseract crashed")
+
+        monkeypatch.setattr(pdf_backends, "ocr_image", broken)
+        pages = extract_pdf(scanned_pdf)
+        assert pages[1] == "" and pages[3] == ""
+        assert pages[0]
+
+    @pytest.mark.skipif(shutil.which("tesseract") is None, reason="tesseract binary not installed")
+    def test_fully_scanned_resume_parses(self, temp_dir):
+        """Test a resume with no text layer still yields skills."""
+        path = corpus.write_resume(temp_dir / "scan.pdf", pages=1, skills=10, scanned=[0])
+        assert parse_resume(path).skills
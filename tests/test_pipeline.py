@@ -21,7 +21,6 @@ from pipeline import (
     _extract_list,
     _normalize_all,
     _detect_advanced_themes,
-    _calculate_profile_score,
 )
 
 
@@ -218,7 +217,7 @@ class TestStrategyGeneration:
         resume.certifications = ["AWS", "GCP"]
         
         gaps = generate_gap_analysis(linkedin, resume)
-        score = _calculate_profile_score(gaps, linkedin, resume)
+        score = generate_strategy("Get Hired", gaps, linkedin, resume).profile_score
         
         assert 0 <= score <= 100
         assert score > 50  # Should have decent score with this profile
@@ -0,0 +1,131 @@
+"""
+Tests for the shared normalized profile view and the optimizer tips using it.
+"""
+import dataclasses
+import json
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import rules
+from config import Config
+from linkedin_optimizer import (
+    get_about_section_optimization_tips,
+    get_completeness_assessment,
+    get_headline_optimization_tips,
+    get_keyword_optimization_tips,
+    get_skills_optimization_tips,
+)
+from pipeline import LinkedInProfile, ResumeData, generate_gap_analysis
+from profile_view import ProfileView
+
+
+def _view(headline="", about="", skills=(), resume_skills=()):
+    linkedin = LinkedInProfile(headline=headline, about=about, skills=list(skills), current_role="Engineer")
+    resume = ResumeData(skills=list(resume_skills))
+    return ProfileView.build(linkedin, resume, generate_gap_analysis(linkedin, resume))
+
+
+@pytest.mark.unit
+class TestProfileView:
+    """Test view construction and mention lookups."""
+
+    def test_view_is_immutable(self):
+        """Test a built view cannot be modified by a tip function."""
+        view = _view(skills=["Python"])
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            view.headline = "changed"
+        assert isinstance(view.linkedin_skills, tuple)
+
+    def test_dataclass_and_dict_inputs_match(self):
+        """Test dataclasses and their dict forms build the same view."""
+        linkedin = LinkedInProfile(headline="Go Engineer", about="About", skills=["Go"], certifications=["CKA"])
+        resume = ResumeData(skills=["Go", "Rust"], projects=["Compiler"])
+        assert ProfileView.build(linkedin, resume) == ProfileView.build(
+            dataclasses.asdict(linkedin), dataclasses.asdict(resume))
+
+    def test_single_word_mentions_match_whole_tokens(self):
+        """Test a one-word skill only matches a whole word of the text."""
+        view = _view(headline="Engineer at Google | Node.js, C++ and AI", about="Email me")
+        assert not view.in_headline("go")
+        assert view.in_headline("node.js")
+        assert view.in_headline("c++")
+        assert view.in_headline("ai")
+        assert not view.in_about("ai")
+
+    def test_multi_word_mentions_use_substring(self):
+        """Test multi-word skills are looked up as phrases."""
+        view = _view(about="Owned CI/CD pipelines on Cloud Run")
+        assert view.in_about("ci/cd")
+        assert view.in_about("cloud run")
+        assert not view.in_about("cloud functions")
+        assert view.in_profile("cloud run")
+
+    def test_resume_skills_not_on_linkedin(self):
+        """Test missing resume skills keep resume order and case."""
+        view = _view(skills=["python"], resume_skills=["Rust", "Python", "Go", "SQL"])
+        assert view.resume_skills_not_on_linkedin() == ("Rust", "Go", "SQL")
+        assert view.resume_skills_not_on_linkedin(limit=2) == ("Rust", "Go")
+
+
+@pytest.mark.unit
+class TestOptimizerTips:
+    """Test optimizer tips built from a view."""
+
+    def test_headline_tips(self):
+        """Test role, skills and value proposition tips."""
+        tips = get_headline_optimization_tips(_view(headline="Backend dev at Google", resume_skills=["Go", "Rust"]))
+        assert "Include your current role 'Engineer' in headline for searchability" in tips
+        assert "Add key skills to headline: Go, Rust" in tips
+        assert any(tip.startswith("Add a value proposition") for tip in tips)
+
+    def test_about_and_skills_tips(self):
+        """Test About and Skills tips use the view's skill sets."""
+        view = _view(about="Python and Go engineer", skills=["Python"], resume_skills=["Python", "Go", "Rust"])
+        about_tips = get_about_section_optimization_tips(view)
+        assert any(tip.startswith("Expand About section to 1,500+ characters (currently 22)") for tip in about_tips)
+        assert any(tip.startswith("Add a 'Key skills:'") for tip in about_tips)
+        assert get_skills_optimization_tips(view) == [
+            "Increase skills count from 1 to 50 (use all available slots)",
+            "Transfer skills from resume to LinkedIn: Go, Rust",
+        ]
+
+    def test_keyword_tips_default_to_resume_skills(self):
+        """Test keywords default to resume skills and are looked up across the profile."""
+        view = _view(headline="Python engineer", skills=["SQL"], resume_skills=["Python", "SQL", "Kafka"])
+        tips = get_keyword_optimization_tips(view)
+        assert tips[0] == "Add searchable keywords throughout profile: Kafka"
+        assert get_keyword_optimization_tips(view, ["Python"]) == []
+
+    def test_completeness(self):
+        """Test All-Star and beyond scores."""
+        view = _view(headline="Engineer", about="About me", skills=[f"s{i}" for i in range(5)])
+        assert get_completeness_assessment(view) == {
+            "all_star_score": 100, "beyond_score": 0, "is_all_star": True, "is_beyond": False,
+        }
+
+    def test_tips_match_whole_words_not_substrings(self):
+        """Test tips treat a one-word skill inside a longer word as missing (substring matching did not)."""
+        view = _view(headline="Engineer at Google | Node.js", about="Email me about Node.js",
+                     resume_skills=["Go", "AI", "Node.js"])
+        assert "Add key skills to headline: Go, AI" in get_headline_optimization_tips(view)
+        assert get_keyword_optimization_tips(view)[0] == "Add searchable keywords throughout profile: Go, AI"
+
+    def test_tips_come_from_rules_file(self, temp_dir, monkeypatch):
+        """Test section tips follow the thresholds and texts of the rules file."""
+        document = json.loads(Config.PROFILE_RULES_PATH.read_text(encoding="utf-8"))
+        document["thresholds"]["skills_optimal_count"] = 10
+        for rule in document["fixes"]["enhanced"]["rules"]:
+            if rule["id"] == "headline_value":
+                rule["text"] = "Say what you deliver"
+        path = temp_dir / "rules.json"
+        path.write_text(json.dumps(document), encoding="utf-8")
+        monkeypatch.setattr(Config, "PROFILE_RULES_PATH", path)
+        monkeypatch.setattr(rules, "_cached", None)
+
+        view = _view(headline="Engineer", skills=["Python"], resume_skills=["Python"])
+        assert get_skills_optimization_tips(view) == ["Increase skills count from 1 to 10 (use all available slots)"]
+        assert "Say what you deliver" in get_headline_optimization_tips(view)
@@ -0,0 +1,116 @@
+"""
+Tests for the on-demand sampling profiler and admin profile endpoints.
+"""
+import json
+import time
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from profiler import RequestProfiler
+
+
+def busy_wait(seconds: float) -> str:
+    """CPU-bound function for the sampler to catch."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return "done"
+
+
+@pytest.mark.unit
+class TestRequestProfiler:
+    """Test request selection, sampling and storage."""
+
+    def test_session_samples_running_function(self):
+        """Test samples attribute time to the running function."""
+        profiler = RequestProfiler(sample_rate=0.0, interval_ms=1, max_stored=5, output_dir=None)
+        session = profiler.select("test", forced=True)
+
+        assert session.run(busy_wait, 0.1) == "done"
+
+        assert session.sample_count > 0
+        assert "busy_wait (test_profiler.py:" in session.collapsed()
+
+    def test_sample_rate_selection(self):
+        """Test unforced requests follow the sample rate."""
+        never = RequestProfiler(sample_rate=0.0, interval_ms=1, max_stored=5, output_dir=None)
+        always = RequestProfiler(sample_rate=1.0, interval_ms=1, max_stored=5, output_dir=None)
+
+        assert never.select("test") is None
+        assert always.select("test") is not None
+
+    def test_store_is_bounded_and_written(self, temp_dir):
+        """Test only the newest profiles are kept and files are written."""
+        profiler = RequestProfiler(sample_rate=1.0, interval_ms=1, max_stored=2, output_dir=temp_dir)
+        sessions = [profiler.select("test") for _ in range(3)]
+        for session in sessions:
+            profiler.save(session)
+
+        assert profiler.get(sessions[0].profile_id) is None
+        assert [p["profile_id"] for p in profiler.list()] == [sessions[2].profile_id, sessions[1].profile_id]
+        assert (temp_dir / f"{sessions[2].profile_id}.folded").exists()
+
+
+@pytest.mark.integration
+class TestProfileEndpoints:
+    """Test admin-requested profiling through the API."""
+
+    def test_admin_can_profile_and_fetch_request(self, monkeypatch, sample_linkedin_data, sample_resume_text):
+        """Test X-Profile-Request captures a retrievable profile."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module.Config, "PROFILING_ENABLED", True)
+        monkeypatch.setattr(app_module.Config, "ADMIN_TOKEN", "secret")
+        monkeypatch.setattr(
+            app_module, "profiler",
+            RequestProfiler(sample_rate=0.0, interval_ms=1, max_stored=5, output_dir=None),
+        )
+        client = TestClient(app_module.app)
+
+        response = client.post(
+            "/analyze",
+            files={"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+            data={"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+            headers={"X-Profile-Request": "1", "X-Admin-Token": "secret"},
+        )
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        listing = client.get("/admin/profiles", headers={"X-Admin-Token": "secret"})
+        assert listing.json()["profiles"][0]["profile_id"] == profile_id
+
+        profile = client.get(f"/admin/profiles/{profile_id}", headers={"X-Admin-Token": "secret"})
+        assert profile.status_code == 200
+
+    def test_profile_header_ignored_without_admin_token(self, monkeypatch, sample_linkedin_data, sample_resume_text):
+        """Test non-admins cannot force profiling."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module.Config, "PROFILING_ENABLED", True)
+        monkeypatch.setattr(app_module.Config, "ADMIN_TOKEN", "secret")
+        client = TestClient(app_module.app)
+
+        response = client.post(
+            "/analyze",
+            files={"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+            data={"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+            headers={"X-Profile-Request": "1", "X-Admin-Token": "wrong"},
+        )
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+    def test_admin_endpoints_require_token(self, monkeypatch):
+        """Test profile endpoints reject missing or wrong tokens."""
+        import app as app_module
+
+        client = TestClient(app_module.app)
+        monkeypatch.setattr(app_module.Config, "ADMIN_TOKEN", "")
+        assert client.get("/admin/profiles").status_code == 403
+
+        monkeypatch.setattr(app_module.Config, "ADMIN_TOKEN", "secret")
+        assert client.get("/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 401
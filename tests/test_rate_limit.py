@@ -0,0 +1,187 @@
+"""
+Tests for /analyze admission control (rate limiting and OCR concurrency cap).
+"""
+import json
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rate_limit import (
+    ConcurrencyLimiter,
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimiter,
+    RateLimitExceeded,
+    load_backend,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FailingBackend(RateLimitBackend):
+    """Shared backend stand-in that is always unreachable."""
+
+    def acquire(self, key, rate, burst, cost=1.0):
+        raise ConnectionError("backend unreachable")
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test token bucket behaviour."""
+
+    def test_bucket_refills_over_time(self):
+        """Test tokens are replenished at the configured rate."""
+        clock = FakeClock()
+        backend = InMemoryRateLimitBackend(clock=clock)
+
+        assert backend.acquire("ip:1", rate=1.0, burst=2) == 0
+        assert backend.acquire("ip:1", rate=1.0, burst=2) == 0
+        assert backend.acquire("ip:1", rate=1.0, burst=2) == pytest.approx(1.0)
+
+        clock.now += 1.0
+        assert backend.acquire("ip:1", rate=1.0, burst=2) == 0
+
+    def test_keys_are_independent(self):
+        """Test one client's usage doesn't affect another."""
+        limiter = RateLimiter(per_minute=60, burst=1)
+        limiter.check("uid:a")
+        limiter.check("uid:b")
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            limiter.check("uid:a")
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.retry_after_header) >= 1
+
+    def test_cost_clamped_to_burst(self):
+        """Test requests costlier than the burst are still admissible."""
+        limiter = RateLimiter(per_minute=60, burst=5)
+        limiter.check("uid:a", cost=11)
+
+    def test_shared_backend_spans_instances(self):
+        """Test two limiters sharing a backend enforce one combined limit."""
+        shared = InMemoryRateLimitBackend()
+        instance_a = RateLimiter(per_minute=60, burst=2, backend=shared)
+        instance_b = RateLimiter(per_minute=60, burst=2, backend=shared)
+
+        instance_a.check("uid:a")
+        instance_b.check("uid:a")
+        with pytest.raises(RateLimitExceeded):
+            instance_a.check("uid:a")
+
+    def test_backend_failure_falls_back_to_local(self):
+        """Test an unreachable shared backend degrades to in-process limits."""
+        limiter = RateLimiter(per_minute=60, burst=1, backend=FailingBackend())
+        limiter.check("uid:a")
+        with pytest.raises(RateLimitExceeded):
+            limiter.check("uid:a")
+
+    def test_load_backend_from_path(self):
+        """Test shared backends load from 'module:attribute' paths."""
+        assert isinstance(load_backend("rate_limit:InMemoryRateLimitBackend"), InMemoryRateLimitBackend)
+        with pytest.raises(ValueError):
+            load_backend("rate_limit")
+
+
+@pytest.mark.unit
+class TestConcurrencyLimiter:
+    """Test the global OCR concurrency cap."""
+
+    def test_rejects_when_full(self):
+        """Test requests beyond the cap are rejected with 503."""
+        limiter = ConcurrencyLimiter(max_in_flight=1, retry_after=3)
+        with limiter.slot():
+            with pytest.raises(RateLimitExceeded) as exc_info:
+                with limiter.slot():
+                    pass
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.retry_after_header == "3"
+        assert limiter.in_flight == 0
+
+
+@pytest.mark.integration
+class TestAnalyzeAdmission:
+    """Test admission control on the /analyze endpoint."""
+
+    def test_rate_limited_request_gets_429(self, monkeypatch, sample_linkedin_data, sample_resume_text):
+        """Test clients over their limit receive 429 with Retry-After."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, "rate_limiter", RateLimiter(per_minute=1, burst=1))
+        client = TestClient(app_module.app)
+        data = {"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)}
+        files = {"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")}
+
+        assert client.post("/analyze", files=files, data=data).status_code == 200
+        response = client.post("/analyze", files=files, data=data)
+
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+
+    def test_ocr_busy_gets_503(self, monkeypatch, sample_resume_text):
+        """Test OCR requests beyond the global cap receive 503."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, "ocr_limiter", ConcurrencyLimiter(max_in_flight=0, retry_after=7))
+        client = TestClient(app_module.app)
+        files = [
+            ("resume", ("resume.txt", sample_resume_text.encode(), "text/plain")),
+            ("screenshots", ("shot.png", b"png-bytes", "image/png")),
+        ]
+
+        response = client.post("/analyze", files=files, data={"mode": "Get Hired"})
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "7"
+
+    def test_spoofed_forwarded_for_does_not_bypass_limit(self, monkeypatch, sample_linkedin_data, sample_resume_text):
+        """Test rotating client-written X-Forwarded-For entries keeps the same rate limit key."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, "rate_limiter", RateLimiter(per_minute=1, burst=1))
+        monkeypatch.setattr(app_module.Config, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)
+        client = TestClient(app_module.app)
+        data = {"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)}
+        files = {"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")}
+
+        # The trusted proxy appends the real client address on the right
+        first = client.post("/analyze", files=files, data=data, headers={"X-Forwarded-For": "1.1.1.1, 203.0.113.7"})
+        second = client.post("/analyze", files=files, data=data, headers={"X-Forwarded-For": "2.2.2.2, 203.0.113.7"})
+        assert (first.status_code, second.status_code) == (200, 429)
+
+
+@pytest.mark.unit
+class TestClientKey:
+    """Test the rate limit key of anonymous clients."""
+
+    def _request(self, forwarded_for):
+        from starlette.requests import Request
+
+        headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+        return Request({"type": "http", "headers": headers, "client": ("10.0.0.9", 5000)})
+
+    @pytest.mark.parametrize("trust, hops, forwarded_for, expected", [
+        (False, 1, "1.1.1.1", "ip:10.0.0.9"),  # header ignored by default
+        (True, 1, "1.1.1.1, 203.0.113.7", "ip:203.0.113.7"),
+        (True, 2, "1.1.1.1, 203.0.113.7, 10.1.0.1", "ip:203.0.113.7"),
+        (True, 2, "203.0.113.7", "ip:10.0.0.9"),  # fewer entries than trusted proxies
+        (True, 1, None, "ip:10.0.0.9"),
+    ])
+    def test_forwarded_for_entry_from_trusted_proxy(self, monkeypatch, trust, hops, forwarded_for, expected):
+        """Test the X-Forwarded-For entry written by the outermost trusted proxy is used, only when trusted."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module.Config, "RATE_LIMIT_TRUST_FORWARDED_FOR", trust)
+        monkeypatch.setattr(app_module.Config, "RATE_LIMIT_TRUSTED_PROXY_HOPS", hops)
+        assert app_module._client_key(self._request(forwarded_for), None) == expected
+        assert app_module._client_key(self._request(forwarded_for), {"uid": "u1"}) == "uid:u1"
@@ -0,0 +1,151 @@
+"""
+Tests for region-of-interest OCR of profile screenshots.
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from PIL import Image
+
+import pipeline
+import roi_ocr
+from roi_ocr import (
+    ABOUT,
+    CERTIFICATIONS,
+    EXPERIENCE,
+    HEADLINE,
+    SKILLS,
+    OcrLine,
+    Region,
+    find_regions,
+    group_lines,
+    list_items,
+    starts_with_name,
+)
+
+SIZE = (1000, 1200)
+
+
+def _line(text, top, left=40, height=20, width=300):
+    return OcrLine(text=text, left=left, top=top, right=left + width, bottom=top + height)
+
+
+# A desktop profile capture: nav bar, top card, sections and a right sidebar
+PROFILE_LINES = [
+    _line("Home My Network Jobs Messaging", 0, height=30, width=900),
+    _line("Jordan Example", 60, height=40),
+    _line("Senior Engineer | Cloud", 110),
+    _line("About", 200, height=28),
+    _line("I build platforms", 240),
+    _line("People also viewed", 200, left=720, width=250),
+    _line("Experience", 400, height=28),
+    _line("Staff Engineer", 440),
+    _line("Education", 700, height=28),
+    _line("Skills", 900, height=28),
+    _line("Python", 940),
+]
+
+
+@pytest.mark.unit
+class TestLayout:
+    """Test header detection and region boxes."""
+
+    def test_group_lines_scales_boxes(self):
+        """Test words are grouped per line, ordered, and mapped to full resolution."""
+        data = {
+            "text": ["Skills", "", "Cloud", "Senior", "Engineer"],
+            "conf": ["96", "-1", "90", "91", "93"],
+            "block_num": [2, 1, 1, 1, 1], "par_num": [1, 1, 1, 1, 1], "line_num": [1, 1, 1, 1, 1],
+            "left": [10, 0, 200, 10, 80], "top": [100, 0, 12, 10, 11],
+            "width": [40, 0, 40, 60, 70], "height": [12, 0, 10, 12, 11],
+        }
+        lines = group_lines(data, scale=0.5)
+        assert [line.text for line in lines] == ["Senior Engineer Cloud", "Skills"]
+        assert (lines[0].left, lines[0].top, lines[0].right, lines[0].bottom) == (20, 20, 480, 44)
+
+    def test_regions_for_profile_capture(self):
+        """Test sections span header to next header, skip nav bar, stop sections and sidebar."""
+        regions, last, found = find_regions(PROFILE_LINES, SIZE, carry=HEADLINE)
+
+        assert found and last == SKILLS
+        assert regions == [
+            Region(HEADLINE, (0, 30, 716, 200)),
+            Region(ABOUT, (36, 228, 716, 400)),
+            Region(EXPERIENCE, (36, 428, 716, 700)),
+            Region(SKILLS, (36, 928, 716, 1200)),
+        ]
+
+    def test_section_continues_across_captures(self):
+        """Test content above the first header belongs to the carried section."""
+        lines = [_line("Kubernetes", 0), _line("Licenses & certifications", 300), _line("AWS SAA", 340)]
+        regions, last, _ = find_regions(lines, SIZE, carry=SKILLS)
+        assert [region.section for region in regions] == [SKILLS, CERTIFICATIONS]
+        assert regions[0].box == (0, 0, 1000, 300)
+        assert last == CERTIFICATIONS
+
+        regions, last, found = find_regions([_line("more text", 0)], SIZE, carry=None)
+        assert (regions, last, found) == ([], None, False)
+
+    def test_long_lines_are_not_headers(self):
+        """Test content lines starting with a header word are not headers."""
+        regions, _, found = find_regions([_line("Skills gained at many jobs", 50)], SIZE, carry=None)
+        assert not found
+
+    def test_name_and_list_noise(self):
+        """Test name detection in the top card and metadata filtering in lists."""
+        assert starts_with_name(PROFILE_LINES, (0, 30, 716, 200))
+        assert not starts_with_name(PROFILE_LINES, (0, 100, 716, 400))
+        assert list_items(["Python, Go", "12 endorsements", "Show all 40 skills", "Issued Jan 2024", "CKA"]) == [
+            "Python", "Go", "CKA"
+        ]
+
+
+@pytest.mark.unit
+class TestProfileFromRegions:
+    """Test fields map directly from their regions."""
+
+    @pytest.fixture
+    def screenshot(self, temp_dir):
+        path = temp_dir / "profile.png"
+        Image.new("RGB", SIZE, "white").save(path)
+        return path
+
+    def test_fields_from_regions(self, screenshot, monkeypatch):
+        """Test each region is OCR'd once with its section mode and mapped to a field."""
+        texts = {
+            HEADLINE: "Jordan Example\nSenior Engineer | Cloud\nSan Francisco",
+            ABOUT: "I build platforms\nand automate things",
+            EXPERIENCE: "Staff Engineer\nTech Corp\nLed migration to Kubernetes clusters",
+            SKILLS: "Python\n12 endorsements\nDocker",
+        }
+        calls = []
+
+        def ocr_region(image, region):
+            calls.append((region.section, roi_ocr.SECTION_PSM[region.section]))
+            return texts[region.section]
+
+        monkeypatch.setattr(roi_ocr, "_layout_lines", lambda image: PROFILE_LINES)
+        monkeypatch.setattr(roi_ocr, "_ocr_region", ocr_region)
+        profile = pipeline.extract_linkedin_profile([screenshot])
+
+        assert calls == [(HEADLINE, 4), (ABOUT, 6), (EXPERIENCE, 4), (SKILLS, 4)]
+        assert profile.headline == "Senior Engineer | Cloud"
+        assert profile.about == "I build platforms and automate things"
+        assert profile.current_role == "Staff Engineer"
+        assert profile.skills == ["Python", "Docker"]
+        assert profile.activity_topics == ["Led migration to Kubernetes clusters"]
+
+    def test_falls_back_without_headers(self, screenshot, monkeypatch):
+        """Test screenshots without section headers use full-page OCR and no region OCR."""
+        regions = []
+        monkeypatch.setattr(roi_ocr, "_layout_lines", lambda image: [_line("random text", 10)])
+        monkeypatch.setattr(roi_ocr, "_ocr_region", lambda image, region: regions.append(region))
+        monkeypatch.setattr(pipeline.get_engine(), "image_to_string",
+                            lambda image, psm=None: "Headline\n\nSkills:\nGo, Rust")
+
+        profile = pipeline.extract_linkedin_profile([screenshot])
+        assert profile.skills == ["Go", "Rust"]
+        assert regions == []
@@ -0,0 +1,208 @@
+"""
+Tests for the declarative scoring and fix rules engine.
+"""
+import json
+import os
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import rules
+from config import Config
+from linkedin_optimizer import generate_enhanced_fixes
+from profile_view import ProfileView
+from pipeline import LinkedInProfile, ResumeData, generate_gap_analysis, generate_strategy, pipeline_version
+from rules import compile_rules, get_rule_set, load_rules
+
+
+def _profile(skills=6, about=150, certifications=1):
+    linkedin = LinkedInProfile(
+        headline="Software Engineer | Cloud Specialist",
+        about="A" * about,
+        current_role="Staff Engineer",
+        skills=["Python", "Docker", "Kubernetes", "AI", "Cloud Run", "CI/CD"][:skills],
+        certifications=["AWS"][:certifications],
+    )
+    resume = ResumeData(
+        skills=["Python", "Docker", "Kubernetes", "AI", "Cloud Run", "CI/CD", "Terraform"],
+        certifications=["AWS", "GCP"],
+    )
+    return linkedin, resume, generate_gap_analysis(linkedin, resume)
+
+
+def _document(**score):
+    return {
+        "version": 1,
+        "revision": "test",
+        "thresholds": {"few": 3, "headline_min_chars": 20, "about_min_chars": 100,
+                       "skills_min_count": 5, "skills_optimal_count": 50},
+        "score": {"baseline": 50, "rules": [
+            {"id": "skills", "feature": "linkedin_skills_count", "op": ">=", "value": "few", "points": 20},
+            {"id": "gap", "feature": "skills_missing_count", "per": -10, "min": -30},
+        ], **score},
+        "fixes": {"basic": {"max": 2, "rules": [
+            {"id": "add", "when": [{"feature": "skills_missing_count", "op": ">", "value": 0}],
+             "text": "Add {skills_missing:2} ({skills_missing_count} missing, want {few})"},
+        ]}, "standard": {"rules": []}, "enhanced": {"rules": []}},
+    }
+
+
+@pytest.mark.unit
+class TestScoring:
+    """Test the compiled score plan."""
+
+    def test_contributions_explain_score(self):
+        """Test each rule's points are reported and add up to the score."""
+        linkedin, resume, gaps = _profile()
+        rule_set = get_rule_set()
+        result = rule_set.score(rule_set.features(ProfileView.build(linkedin, resume, gaps)))
+
+        assert result.contributions["headline_present"] == 5
+        assert result.contributions["about_present"] == 10
+        assert result.contributions["skills_gap"] == -2  # 1 of 7 resume skills missing
+        assert result.contributions["certifications_gap"] == -3
+        assert result.total == min(100, result.baseline + sum(result.contributions.values()))
+
+        strategy = generate_strategy("Get Hired", gaps, linkedin, resume)
+        assert strategy.profile_score == result.total
+        assert strategy.score_breakdown == result.contributions
+
+    def test_score_is_clamped(self):
+        """Test totals stay within the configured range."""
+        linkedin, resume, gaps = _profile()
+        rule_set = compile_rules(_document(baseline=95, max=100))
+        features = rule_set.features(ProfileView.build(linkedin, resume, gaps))
+        assert rule_set.score(features).total == 100
+
+    def test_batch_matches_single(self):
+        """Test column-wise batch evaluation equals per-profile evaluation."""
+        rule_set = get_rule_set()
+        rows = [
+            rule_set.features(ProfileView.build(*_profile(skills=n, about=n * 40, certifications=n % 2)))
+            for n in range(7)
+        ]
+        batch = rule_set.score_batch(rows)
+
+        singles = [rule_set.score(row) for row in rows]
+        assert batch.totals == [result.total for result in singles]
+        for rule_id in rule_set.rule_ids:
+            assert batch.contributions[rule_id] == [result.contributions[rule_id] for result in singles]
+        assert rule_set.score_batch([]).totals == []
+
+
+@pytest.mark.unit
+class TestFixes:
+    """Test fix sets and templates."""
+
+    def test_templates_and_limits(self):
+        """Test list fields honour their item limit and thresholds are template fields."""
+        rule_set = compile_rules(_document())
+        features = rule_set.features(ProfileView.build(
+            {}, {"skills": ["Go", "Rust", "Zig"]}, {"skills_missing_from_linkedin": ["Go", "Rust", "Zig"]}))
+        assert rule_set.fixes("basic", features) == ["Add Go, Rust (3 missing, want 3)"]
+
+    def test_enhanced_group_limits(self):
+        """Test at most two headline fixes and six fixes in total."""
+        fixes = generate_enhanced_fixes(ProfileView.build(
+            {"headline": "", "about": "", "current_role": "Engineer", "skills": []},
+            {"skills": ["Python", "Go"]},
+            {"certifications_missing_from_linkedin": ["CKA", "AWS", "GCP", "PMP"]},
+        ))
+        assert fixes == [
+            "Create a compelling headline using formula: [Role] | [Key Expertise] | [Value Proposition]",
+            "Include your current role 'Engineer' in headline for searchability",
+            "Write an About section (1,500-2,000 characters) using structure: "
+            "Hook → Who You Are → Achievements → Skills → CTA",
+            "Add skills to LinkedIn Skills section (aim for 50 total)",
+            "Add certifications to LinkedIn: CKA, AWS, GCP",
+        ]
+
+
+@pytest.mark.unit
+class TestRuleFiles:
+    """Test rule file validation and reloading."""
+
+    @pytest.mark.parametrize("change, message", [
+        ({"version": 2}, "Unsupported rules version"),
+        ({"score": {"rules": [{"id": "x", "feature": "stars", "op": ">", "value": 1, "points": 1}]}}, "unknown feature"),
+        ({"score": {"rules": [{"id": "x", "feature": "about_chars", "op": "~", "value": 1, "points": 1}]}}, "unknown operator"),
+        ({"score": {"rules": [{"id": "x", "feature": "about_chars", "op": ">", "value": "many", "points": 1}]}},
+         "unknown threshold"),
+        ({"fixes": {"basic": {"rules": [{"id": "x", "text": "Add {stars}"}]}, "standard": {"rules": []},
+                    "enhanced": {"rules": []}}}, "unknown template field"),
+        ({"fixes": {"standard": {"rules": []}}}, "Missing required fix sets: \\['enhanced'\\]"),
+        ({"thresholds": {"few": 3}}, "Missing required thresholds"),
+    ])
+    def test_invalid_rules_rejected(self, change, message):
+        """Test mistakes in a rule file fail at compile time, not per request."""
+        with pytest.raises(ValueError, match=message):
+            compile_rules({**_document(), **change})
+
+    def test_default_rules_compile(self):
+        """Test the shipped rule file compiles with both fix sets."""
+        rule_set = load_rules(Config.PROFILE_RULES_PATH)
+        assert rule_set.fix_sets == ["enhanced", "standard"]
+        assert rule_set.bounds == (0, 100)
+
+    def test_reload_on_change(self, temp_dir, monkeypatch):
+        """Test edited rules apply without a restart and broken edits keep the old rules."""
+        path = temp_dir / "rules.json"
+        path.write_text(json.dumps(_document()), encoding="utf-8")
+        monkeypatch.setattr(Config, "PROFILE_RULES_PATH", path)
+        monkeypatch.setattr(rules, "_cached", None)
+        monkeypatch.setattr(rules, "RELOAD_CHECK_INTERVAL_S", 0)
+        assert get_rule_set().baseline == 50
+
+        path.write_text(json.dumps({**_document(baseline=60), "revision": "v2"}), encoding="utf-8")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert get_rule_set().revision == "v2"
+
+        path.write_text(json.dumps({**_document(), "version": 99}), encoding="utf-8")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert get_rule_set().revision == "v2"
+
+    def test_pipeline_version_tracks_rule_contents(self, temp_dir, monkeypatch):
+        """Test editing a rule without bumping the revision still changes the pipeline version."""
+        path = temp_dir / "rules.json"
+        path.write_text(json.dumps(_document()), encoding="utf-8")
+        monkeypatch.setattr(Config, "PROFILE_RULES_PATH", path)
+        monkeypatch.setattr(rules, "_cached", None)
+        monkeypatch.setattr(rules, "RELOAD_CHECK_INTERVAL_S", 0)
+        version = pipeline_version()
+
+        path.write_text(json.dumps(_document(baseline=60)), encoding="utf-8")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert get_rule_set().revision == compile_rules(_document()).revision
+        assert pipeline_version() != version
+
+        path.write_text(json.dumps(_document(), indent=2), encoding="utf-8")  # formatting only
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert pipeline_version() == version
+
+    def test_modification_time_checked_at_interval(self, temp_dir, monkeypatch):
+        """Test the rule file is not stat()ed again within the check interval."""
+        path = temp_dir / "rules.json"
+        path.write_text(json.dumps(_document()), encoding="utf-8")
+        monkeypatch.setattr(Config, "PROFILE_RULES_PATH", path)
+        monkeypatch.setattr(rules, "_cached", None)
+        monkeypatch.setattr(rules, "RELOAD_CHECK_INTERVAL_S", 3600)
+        get_rule_set()
+
+        path.write_text(json.dumps({**_document(), "revision": "v2"}), encoding="utf-8")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert get_rule_set().revision == "test"
+
+    def test_deleted_file_keeps_rules(self, temp_dir, monkeypatch):
+        """Test a rule file that disappears keeps the last good rules."""
+        path = temp_dir / "rules.json"
+        path.write_text(json.dumps(_document()), encoding="utf-8")
+        monkeypatch.setattr(Config, "PROFILE_RULES_PATH", path)
+        monkeypatch.setattr(rules, "_cached", None)
+        monkeypatch.setattr(rules, "RELOAD_CHECK_INTERVAL_S", 0)
+        get_rule_set()
+
+        path.unlink()
+        assert get_rule_set().revision == "test"
@@ -0,0 +1,221 @@
+"""
+Tests for the sandboxed parser worker pool.
+"""
+import json
+import os
+import time
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import sandbox
+from pipeline import ResumeData, parse_resume
+from profiler import RequestProfiler, active_profile
+from sandbox import SandboxLimitExceeded, SandboxPool, SandboxUnavailable
+from tracing import Tracer
+
+
+class ListExporter:
+    """Collects exported traces in memory."""
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+def hang(path):
+    """Stand-in for a parser stuck on a hostile file (runs in a worker)."""
+    time.sleep(60)
+
+
+@pytest.fixture
+def pool():
+    """Two-worker pool with short limits, closed after the test."""
+    workers = SandboxPool(size=2, memory_mb=1024, cpu_seconds=1, timeout=10, max_tasks=0)
+    workers.start()
+    yield workers
+    workers.close()
+
+
+def spin(seconds):
+    """CPU-bound task for the worker's sampler to catch."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return "done"
+
+
+def _wait_for_workers(pool, count):
+    deadline = time.monotonic() + 10
+    while pool._idle.qsize() < count and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+@pytest.mark.unit
+class TestSandboxPool:
+    """Test results, errors and limit enforcement in worker processes."""
+
+    def test_runs_in_worker_process(self, pool, temp_dir, sample_resume_text):
+        """Test tasks run in another process and return their results."""
+        resume_path = temp_dir / "resume.txt"
+        resume_path.write_text(sample_resume_text)
+
+        assert pool.run(os.getpid) != os.getpid()
+        resume = pool.run(parse_resume, resume_path)
+        assert isinstance(resume, ResumeData)
+        assert resume == parse_resume(resume_path)
+
+    def test_task_exceptions_are_reraised(self, pool, temp_dir):
+        """Test a task's own exception reaches the caller and the worker is kept."""
+        pid = pool.run(os.getpid)
+        with pytest.raises(FileNotFoundError):
+            pool.run(parse_resume, temp_dir / "missing.pdf")
+        with pytest.raises(ValueError):
+            pool.run(int, "not a number")
+        assert pool.run(os.getpid) == pid
+
+    def test_wall_clock_timeout_recycles_worker(self, pool):
+        """Test a task past its deadline fails fast and its worker is replaced."""
+        pid = pool.run(os.getpid)
+        start = time.monotonic()
+        with pytest.raises(SandboxLimitExceeded) as excinfo:
+            pool.run(time.sleep, 30, timeout=0.5)
+        assert excinfo.value.reason == "timeout"
+        assert time.monotonic() - start < 5
+
+        _wait_for_workers(pool, 2)
+        assert pool.size == len(pool._workers) == 2
+        pids = {pool.run(os.getpid) for _ in range(4)}
+        assert pid not in pids
+
+    def test_cpu_limit(self, pool):
+        """Test a task spinning past its CPU budget is killed."""
+        with pytest.raises(SandboxLimitExceeded) as excinfo:
+            pool.run(sum, range(10 ** 12))
+        assert excinfo.value.reason == "cpu"
+
+    def test_memory_limit(self, pool):
+        """Test a task allocating past the address-space limit is stopped."""
+        with pytest.raises(SandboxLimitExceeded) as excinfo:
+            pool.run(bytearray, 2 * 1024 ** 3)
+        assert excinfo.value.reason == "memory"
+        assert pool.run(len, "still serving") == 13
+
+    def test_crashed_worker(self, pool):
+        """Test a worker dying mid-task is reported and replaced."""
+        with pytest.raises(SandboxLimitExceeded) as excinfo:
+            pool.run(os._exit, 3)
+        assert excinfo.value.reason == "crashed"
+        _wait_for_workers(pool, 2)
+        assert len(pool._workers) == 2
+
+    def test_worker_retired_after_max_tasks(self):
+        """Test workers are replaced after max_tasks tasks."""
+        workers = SandboxPool(size=1, max_tasks=2, timeout=10)
+        try:
+            first = workers.run(os.getpid)
+            assert workers.run(os.getpid) == first
+            _wait_for_workers(workers, 1)
+            assert workers.run(os.getpid) != first
+        finally:
+            workers.close()
+
+    def test_checkout_times_out_when_all_busy(self):
+        """Test a caller gets SandboxUnavailable instead of waiting forever for a worker."""
+        workers = SandboxPool(size=1, timeout=10, acquire_timeout=0.3)
+        try:
+            workers.start()
+            busy = workers._idle.get()
+            start = time.monotonic()
+            with pytest.raises(SandboxUnavailable):
+                workers.run(os.getpid)
+            assert time.monotonic() - start < 2
+            workers._checkin(busy)
+            assert workers.run(os.getpid) == busy.process.pid
+        finally:
+            workers.close()
+
+    def test_failed_replacement_is_respawned_on_demand(self, pool):
+        """Test a worker whose replacement failed is started by the next caller."""
+        lost = pool._idle.get()
+        with pool._lock:
+            pool._workers.remove(lost)  # as _replace leaves it when spawning fails
+        lost.stop()
+        survivor = pool._idle.get()
+        try:
+            assert pool.run(os.getpid) not in (lost.process.pid, survivor.process.pid)
+            assert len(pool._workers) == 2
+        finally:
+            pool._checkin(survivor)
+
+    def test_worker_samples_join_callers_profile(self, monkeypatch, pool):
+        """Test a profiled caller gets the worker's stack samples under the sandbox root frame."""
+        monkeypatch.setattr(sandbox.Config, "PROFILING_ENABLED", True)
+        session = RequestProfiler(sample_rate=0.0, interval_ms=1, max_stored=5, output_dir=None).select(
+            "test", forced=True)
+
+        token = active_profile.set(session)
+        try:
+            assert pool.run(spin, 0.1) == "done"
+        finally:
+            active_profile.reset(token)
+        worker_stacks = [stack for stack in session.stacks if stack.startswith("sandbox-worker;")]
+        assert any("spin (test_sandbox.py:" in stack for stack in worker_stacks)
+
+        samples = session.sample_count
+        assert pool.run(spin, 0.05) == "done"  # unprofiled callers are not sampled
+        assert session.sample_count == samples
+
+    def test_spans_join_callers_trace(self, pool, temp_dir, sample_resume_text):
+        """Test spans opened in the worker are grafted into the caller's trace."""
+        resume_path = temp_dir / "resume.txt"
+        resume_path.write_text(sample_resume_text)
+        exporter = ListExporter()
+        tracer = Tracer(exporter=exporter, slow_threshold_ms=1e9, slow_log_path=temp_dir / "slow.jsonl")
+
+        with tracer.start_trace("request"):
+            pool.run(parse_resume, resume_path)
+
+        [parse_span] = exporter.traces[0].root.children
+        assert parse_span.name == "parse_resume"
+        assert parse_span.attributes["format"] == "txt"
+        assert parse_span.start_offset_ms >= 0
+        assert [child.name for child in parse_span.children][:1] == ["extract.skills"]
+
+    def test_run_sandboxed_inline_when_disabled(self, monkeypatch):
+        """Test SANDBOX_ENABLED=false runs the function in this process."""
+        monkeypatch.setattr(sandbox.Config, "SANDBOX_ENABLED", False)
+        assert sandbox.run_sandboxed(os.getpid) == os.getpid()
+
+
+@pytest.mark.integration
+class TestSandboxEndpoint:
+    """Test hostile uploads are rejected without affecting other requests."""
+
+    def test_stuck_parse_returns_422(self, monkeypatch, sample_linkedin_data, sample_resume_text):
+        """Test a resume whose parsing exceeds the deadline gets a 422, and the next request succeeds."""
+        import app as app_module
+
+        workers = SandboxPool(size=1, timeout=1)
+        monkeypatch.setattr(sandbox, "_sandbox", workers)
+        client = TestClient(app_module.app)
+        request = {
+            "files": {"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+            "data": {"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+        }
+        try:
+            with monkeypatch.context() as patch:
+                patch.setattr(app_module, "parse_resume", hang)
+                response = client.post("/analyze", **request)
+            assert response.status_code == 422
+            assert "longer than 1 s" in response.json()["detail"]
+
+            assert client.post("/analyze", **request).status_code == 200
+        finally:
+            workers.close()
@@ -0,0 +1,98 @@
+"""
+Tests for screenshot de-duplication and OCR text stitching.
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from PIL import Image
+
+import pipeline
+from benchmarks import corpus
+from screenshots import _longest_overlap, dedupe_screenshots, dhash, stitch_texts
+
+ABOUT = "I build cloud-native platforms and automate everything"
+
+
+@pytest.fixture
+def shots(temp_dir):
+    """Three distinct captures of profile text."""
+    return corpus.render_screenshots(corpus.linkedin_text(skills=120), temp_dir / "shots", lines_per_image=30)[:3]
+
+
+@pytest.mark.unit
+class TestDeduplication:
+    """Test near-duplicate screenshots are skipped before OCR."""
+
+    def test_hash_separates_text_pages(self, shots, temp_dir):
+        """Test re-encoded copies hash close and different captures far apart."""
+        copy = temp_dir / "copy.jpg"
+        Image.open(shots[0]).convert("RGB").save(copy, quality=70)
+
+        first = dhash(Image.open(shots[0]))
+        assert bin(first ^ dhash(Image.open(copy))).count("1") <= 10
+        assert all(bin(first ^ dhash(Image.open(p))).count("1") > 20 for p in shots[1:])
+
+    def test_duplicates_dropped_in_order(self, shots, temp_dir):
+        """Test repeated captures are removed and order is kept."""
+        copy = temp_dir / "copy.png"
+        copy.write_bytes(shots[0].read_bytes())
+        missing = temp_dir / "missing.png"
+
+        assert dedupe_screenshots([shots[0], shots[1], copy, missing, shots[2]]) == [
+            shots[0], shots[1], missing, shots[2]
+        ]
+        assert dedupe_screenshots([shots[0], copy], max_distance=-1) == [shots[0], copy]
+
+
+@pytest.mark.unit
+class TestStitching:
+    """Test overlapping OCR texts are merged once."""
+
+    def test_longest_overlap(self):
+        """Test the KMP suffix/prefix search, including self-overlapping runs."""
+        assert _longest_overlap(list("xabcab"), list("cabz")) == 3
+        assert _longest_overlap(list("aaa"), list("aaaa")) == 3
+        assert _longest_overlap(list("abc"), list("xyz")) == 0
+
+    def test_overlap_merged_with_edge_noise(self):
+        """Test cut-off edge lines are dropped and the overlap kept once."""
+        first = f"Jordan\nEngineer\n\nAbout\n{ABOUT}\nand mentor teams\n~~ cut off lin"
+        second = f"l1ne cut 0ff\n{ABOUT.upper()}.\nand mentor teams\n\nSkills\nPython, Docker"
+
+        assert stitch_texts([first, second]).splitlines() == [
+            "Jordan", "Engineer", "", "About", ABOUT, "and mentor teams", "", "Skills", "Python, Docker",
+        ]
+
+    def test_short_or_missing_overlap_appends(self):
+        """Test a lone shared heading is not treated as an overlap."""
+        assert stitch_texts(["Intro line\nSkills", "Skills\nPython"]) == "Intro line\nSkills\nSkills\nPython"
+        assert stitch_texts(["one", "two", ""]) == "one\ntwo"
+
+    def test_profile_sees_single_document(self, temp_dir, monkeypatch):
+        """Test duplicates are not OCR'd and the About section is not repeated."""
+        images = corpus.render_screenshots("Jordan\n\nAbout\n" + ABOUT, temp_dir / "a")
+        images += corpus.render_screenshots(ABOUT + "\n\nSkills\nPython, Docker\n", temp_dir / "b")
+        duplicate = temp_dir / "dup.png"
+        duplicate.write_bytes(images[1].read_bytes())
+        texts = {
+            images[0].name + "a": "Jordan\n\nAbout\n" + ABOUT,
+            images[1].name + "b": ABOUT + "\n\nSkills\nPython, Docker\n",
+        }
+        ocr_calls = []
+
+        def image_to_string(image, psm=None):
+            key = Path(image.filename).name + Path(image.filename).parent.name
+            ocr_calls.append(key)
+            return texts[key]
+
+        monkeypatch.setattr(pipeline.Config, "OCR_ROI_ENABLED", False)
+        monkeypatch.setattr(pipeline.get_engine(), "image_to_string", image_to_string)
+        profile = pipeline.extract_linkedin_profile([images[0], images[1], duplicate])
+
+        assert len(ocr_calls) == 2
+        assert profile.about == ABOUT
+        assert profile.skills == ["Python", "Docker"]
@@ -0,0 +1,147 @@
+"""
+Tests for single-flight coalescing of identical concurrent analyses.
+"""
+import asyncio
+import json
+import threading
+import time
+import pytest
+import httpx
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from single_flight import SingleFlight
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test sharing of in-flight computations."""
+
+    def test_concurrent_callers_share_one_computation(self):
+        """Test callers with the same key get one computation's result; other keys run separately."""
+        flights = SingleFlight()
+        calls = []
+
+        def compute(value):
+            async def run():
+                calls.append(value)
+                await asyncio.sleep(0.05)
+                return value
+            return run
+
+        async def main():
+            return await asyncio.gather(
+                flights.run("a", compute(1)),
+                flights.run("a", compute(2)),
+                flights.run("b", compute(3)),
+            )
+
+        assert asyncio.run(main()) == [(1, False), (1, True), (3, False)]
+        assert calls == [1, 3]
+        assert len(flights) == 0
+
+    def test_exception_is_shared(self):
+        """Test every caller sharing a computation gets its exception."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("bad resume")
+
+        async def main():
+            return await asyncio.gather(flights.run("a", fail), flights.run("a", fail), return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert [type(result) for result in results] == [ValueError, ValueError]
+
+    def test_finished_computation_is_not_reused(self):
+        """Test a caller arriving after the computation finished starts a new one."""
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return len(calls)
+
+        async def main():
+            return [await flights.run("a", compute), await flights.run("a", compute)]
+
+        assert asyncio.run(main()) == [(1, False), (2, False)]
+
+    def test_cancelled_leader_keeps_computation_for_followers(self):
+        """Test cancelling the first caller neither cancels the shared computation nor returns early."""
+        flights = SingleFlight()
+        finished = []
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+            return "result"
+
+        async def main():
+            leader = asyncio.ensure_future(flights.run("a", compute))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flights.run("a", compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            assert finished == [True]  # leader waited for the computation it started
+            return await follower
+
+        assert asyncio.run(main()) == ("result", True)
+
+
+@pytest.mark.integration
+class TestAnalyzeCoalescing:
+    """Test identical concurrent /analyze requests share one pipeline run."""
+
+    def _post(self, sample_linkedin_data, sample_resume_text, headers=None, mode="Get Hired"):
+        async def send(client):
+            return await client.post(
+                "/analyze",
+                files={"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+                data={"mode": mode, "linkedin_text": json.dumps(sample_linkedin_data)},
+                headers=headers,
+            )
+        return send
+
+    def test_identical_requests_share_one_analysis(self, monkeypatch, sample_linkedin_data, sample_resume_text):
+        """Test double-tapped requests run the pipeline once; other clients and inputs run their own."""
+        import app as app_module
+        from metrics import ANALYZE_COALESCED
+
+        runs = []
+        run_analysis = app_module._run_analysis
+        lock = threading.Lock()
+
+        def slow_analysis(*args):
+            with lock:
+                runs.append(args[0])
+            time.sleep(0.2)
+            return run_analysis(*args)
+
+        monkeypatch.setattr(app_module, "_run_analysis", slow_analysis)
+        monkeypatch.setattr(app_module.Config, "RATE_LIMIT_ENABLED", False)
+        monkeypatch.setattr(app_module.Config, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)  # clients told apart by proxy header
+        followers = ANALYZE_COALESCED.value(role="follower")
+
+        same = self._post(sample_linkedin_data, sample_resume_text, headers={"X-Forwarded-For": "10.0.0.1"})
+        other_client = self._post(sample_linkedin_data, sample_resume_text, headers={"X-Forwarded-For": "10.0.0.2"})
+        other_mode = self._post(sample_linkedin_data, sample_resume_text, headers={"X-Forwarded-For": "10.0.0.1"},
+                                mode="Grow Connections")
+
+        async def main():
+            transport = httpx.ASGITransport(app=app_module.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(same(client), same(client), same(client), other_client(client),
+                                            other_mode(client))
+
+        responses = asyncio.run(main())
+        assert [response.status_code for response in responses] == [200] * 5
+        assert responses[0].json() == responses[1].json() == responses[2].json()
+        assert sorted(runs) == ["Get Hired", "Get Hired", "Grow Connections"]
+        assert ANALYZE_COALESCED.value(role="follower") == followers + 2
@@ -0,0 +1,207 @@
+"""
+Tests for the recruiter search skill index.
+"""
+import json
+import random
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import skill_index
+from benchmarks import bench_skill_index
+from pipeline import GapAnalysis, LinkedInProfile, ResumeData
+from skill_index import QuerySyntaxError, SkillIndex, canonical_term, parse_query
+
+VOCABULARY = ["Python", "Go", "Kubernetes", "Terraform", "FastAPI", "Cloud Run", "SQL", "Rust"]
+
+
+def _add(index, key, resume, linkedin, score, themes=()):
+    missing = [skill for skill in resume if skill.lower() not in {s.lower() for s in linkedin}]
+    return index.add(
+        key,
+        LinkedInProfile(skills=list(linkedin)),
+        ResumeData(skills=list(resume)),
+        GapAnalysis(missing, [], [], list(themes)),
+        score,
+    )
+
+
+def _random_index(count, seed=7):
+    rng = random.Random(seed)
+    index = SkillIndex()
+    docs = {}
+    for n in range(count):
+        resume = rng.sample(VOCABULARY, rng.randint(0, 6))
+        linkedin = rng.sample(VOCABULARY, rng.randint(0, 4))
+        score = rng.randint(0, 100)
+        key = f"user{rng.randint(0, count // 2)}"  # some keys are re-indexed
+        doc_id = _add(index, key, resume, linkedin, score)
+        docs[key] = ({s.lower() for s in resume}, {s.lower() for s in linkedin}, score, doc_id)
+    return index, docs
+
+
+@pytest.mark.unit
+class TestQueryParsing:
+    """Test query syntax."""
+
+    def test_precedence_and_implicit_and(self):
+        """Test NOT binds tighter than AND, AND tighter than OR, and adjacency means AND."""
+        assert parse_query('resume:go missing:"Cloud  Run" OR NOT theme:llm') == ("or", [
+            ("and", [("term", "resume", "go"), ("term", "missing", "cloud run")]),
+            ("not", ("term", "theme", "llm")),
+        ])
+
+    def test_bare_term_searches_resume_and_linkedin(self):
+        """Test a term without a field expands to both skill fields."""
+        assert parse_query("(Kubernetes)") == ("or", [("term", "resume", "kubernetes"), ("term", "linkedin", "kubernetes")])
+
+    @pytest.mark.parametrize("query", ["", "   ", "salary:100", "resume:go AND", "(resume:go", "resume:go)", 'resume:""'])
+    def test_invalid_queries(self, query):
+        """Test malformed queries raise QuerySyntaxError."""
+        with pytest.raises(QuerySyntaxError):
+            parse_query(query)
+
+    def test_canonical_term(self):
+        """Test skills are lowercased with whitespace collapsed."""
+        assert canonical_term("  Machine \t Learning ") == "machine learning"
+
+
+@pytest.mark.unit
+class TestSearch:
+    """Test boolean matching and top-k ranking."""
+
+    def test_on_resume_but_not_linkedin(self):
+        """Test the recruiter query from the request."""
+        index = SkillIndex()
+        _add(index, "a", ["Kubernetes", "Terraform"], ["Python"], 60)
+        _add(index, "b", ["Kubernetes", "Terraform"], ["Kubernetes"], 90)
+        _add(index, "c", ["Kubernetes"], [], 80)
+
+        results = index.search("missing:kubernetes AND missing:terraform")
+        assert results.total == 1
+        assert [hit.key for hit in results.hits] == ["a"]
+        assert index.count("resume:kubernetes AND resume:terraform AND NOT linkedin:kubernetes") == 1
+
+    def test_matches_brute_force(self):
+        """Test totals and score-ranked top-k against a linear scan."""
+        index, docs = _random_index(400)
+        queries = {
+            "resume:go AND NOT linkedin:go": lambda r, l: "go" in r and "go" not in l,
+            'kubernetes OR "cloud run"': lambda r, l: bool({"kubernetes", "cloud run"} & (r | l)),
+            "NOT (resume:sql OR resume:rust)": lambda r, l: not {"sql", "rust"} & r,
+            "resume:python resume:fastapi": lambda r, l: {"python", "fastapi"} <= r,
+        }
+        for query, predicate in queries.items():
+            # Equal scores are ordered by insertion
+            expected = sorted(
+                (-score, doc_id, key)
+                for key, (resume, linkedin, score, doc_id) in docs.items() if predicate(resume, linkedin)
+            )
+            results = index.search(query, k=25)
+            assert results.total == len(expected), query
+            assert [hit.key for hit in results.hits] == [key for _, _, key in expected[:25]], query
+
+    def test_reindexing_replaces_document(self):
+        """Test a key indexed again only matches its latest record."""
+        index = SkillIndex()
+        _add(index, "a", ["Go"], [], 50)
+        _add(index, "a", ["Rust"], [], 70)
+        assert len(index) == 1
+        assert index.count("resume:go") == 0
+        assert [(hit.key, hit.profile_score) for hit in index.search("resume:rust").hits] == [("a", 70)]
+
+    def test_compaction_drops_dead_documents(self, monkeypatch):
+        """Test heavy re-indexing compacts the index and queries still match a linear scan."""
+        monkeypatch.setattr(skill_index, "COMPACT_MIN_DOCS", 16)
+        rng = random.Random(3)
+        index = SkillIndex()
+        docs = {}
+        for n in range(400):
+            resume = rng.sample(VOCABULARY, rng.randint(0, 6))
+            score = rng.randint(0, 100)
+            key = f"user{rng.randint(0, 50)}"
+            _add(index, key, resume, [], score)
+            docs[key] = ({s.lower() for s in resume}, score, n)
+        assert len(index._keys) <= 2 * len(index) + 1
+        assert len(index._doc_scores) == len(index._keys)
+
+        # Compaction keeps insertion order, which ranks equal scores
+        expected = sorted((-score, n, key) for key, (resume, score, n) in docs.items() if "go" in resume)
+        results = index.search("resume:go", k=25)
+        assert results.total == len(expected)
+        assert [hit.key for hit in results.hits] == [key for _, _, key in expected[:25]]
+
+        for _ in range(3):
+            _add(index, "user0", ["Zig"], [], 99)
+        assert [hit.key for hit in index.search("resume:zig").hits] == ["user0"]
+        assert index.search("resume:zig", rank="bm25").total == 1
+
+    def test_incremental_insert_extends_cached_bitmaps(self, monkeypatch):
+        """Test documents added after a query are found by the next one."""
+        monkeypatch.setattr(skill_index, "DENSE_RATIO", 1)  # cache every term bitmap
+        index = SkillIndex()
+        _add(index, "a", ["Go"], [], 50)
+        assert index.count("resume:go") == 1
+        _add(index, "b", ["Go"], [], 60)
+        _add(index, "c", ["Go", "Rust"], [], 40)
+        assert [hit.key for hit in index.search("resume:go").hits] == ["b", "a", "c"]
+
+    def test_bm25_prefers_rare_terms_and_short_profiles(self):
+        """Test BM25 ranks matches of rarer terms and shorter documents first."""
+        index = SkillIndex()
+        for n in range(10):
+            _add(index, f"common{n}", ["Python"], [], 50)
+        _add(index, "rare_long", ["Rust", "Python", "Go", "SQL", "Terraform"], [], 50)
+        _add(index, "rare_short", ["Rust"], [], 10)
+
+        hits = index.search("resume:rust OR resume:python", k=3, rank="bm25").hits
+        assert [hit.key for hit in hits] == ["rare_short", "rare_long", "common0"]
+        assert hits[0].score > hits[1].score > hits[2].score
+
+    def test_unknown_rank(self):
+        """Test an unknown ranking is rejected."""
+        with pytest.raises(ValueError):
+            SkillIndex().search("go", rank="recency")
+
+
+    def test_benchmark_runs(self):
+        """Test the search benchmark on a small synthetic index."""
+        report = bench_skill_index.run_benchmark(profiles=300, repeat=1, k=5)
+        assert len(report["queries"]) == len(bench_skill_index.QUERIES)
+        assert all(row["total"] >= 0 for row in report["queries"])
+
+
+@pytest.mark.integration
+class TestSearchEndpoint:
+    """Test indexing analyses and searching them through the admin API."""
+
+    def test_signed_in_analysis_is_searchable(self, monkeypatch, sample_linkedin_data, sample_resume_text):
+        """Test a signed-in user's analysis is indexed under their uid."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module.Config, "SEARCH_INDEX_ENABLED", True)
+        monkeypatch.setattr(app_module.Config, "ADMIN_TOKEN", "secret")
+        monkeypatch.setattr(app_module, "skill_index", SkillIndex())
+        monkeypatch.setitem(app_module.app.dependency_overrides, app_module.verify_firebase_token, lambda: {"uid": "u1"})
+        client = TestClient(app_module.app)
+
+        response = client.post(
+            "/analyze",
+            files={"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+            data={"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+        )
+        assert response.status_code == 200
+        skill = response.json()["gaps"]["skills_missing_from_linkedin"][0]
+
+        search = client.get("/admin/search", params={"q": f'missing:"{skill}"'}, headers={"X-Admin-Token": "secret"})
+        assert search.status_code == 200
+        assert search.json()["total"] == 1
+        assert search.json()["hits"][0]["key"] == "u1"
+
+        bad = client.get("/admin/search", params={"q": "salary:1"}, headers={"X-Admin-Token": "secret"})
+        assert bad.status_code == 400
+        assert client.get("/admin/search", params={"q": "go"}).status_code in (401, 403, 404)
@@ -0,0 +1,96 @@
+"""
+Unit tests for startup_report.py budget checking.
+"""
+import json
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config
+import startup_report
+from startup_report import check_budget, load_budget, format_report
+
+
+@pytest.mark.unit
+class TestStartupBudget:
+    """Test startup budget loading and checking."""
+
+    def test_default_budget_file_loads(self):
+        """Test the shipped budget file is valid."""
+        budget = load_budget(Config.STARTUP_BUDGET_PATH)
+        assert "request:first_health" in budget
+        assert all(limit > 0 for limit in budget.values())
+
+    def test_load_budget_missing_file(self, temp_dir):
+        """Test loading a non-existent budget file."""
+        with pytest.raises(FileNotFoundError):
+            load_budget(temp_dir / "missing.json")
+
+    def test_load_budget_invalid_value(self, temp_dir):
+        """Test budget values must be numbers."""
+        budget_path = temp_dir / "budget.json"
+        budget_path.write_text(json.dumps({"import:app": "fast"}))
+        with pytest.raises(ValueError):
+            load_budget(budget_path)
+
+    def test_check_budget_reports_violations(self):
+        """Test only exceeded, measured metrics are reported."""
+        results = {"import:app": 250.0, "import:config": 1.0, "request:first_analyze": None}
+        budget = {"import:app": 200.0, "import:config": 20.0, "request:first_analyze": 10.0}
+
+        violations = check_budget(results, budget)
+
+        assert violations == [("import:app", 250.0, 200.0)]
+
+    def test_format_report_marks_over_budget(self):
+        """Test report text flags metrics over budget."""
+        report = format_report({"import:app": 250.0, "init:firebase_init": 3.0}, {"import:app": 200.0})
+        assert "OVER" in report
+        assert "init:firebase_init" in report
+
+    def test_measure_reports_app_import_failure(self, monkeypatch):
+        """Test a failing app import is reported instead of crashing the measurement."""
+        real_import = startup_report.importlib.import_module
+
+        def import_module(name):
+            if name == "app":
+                raise ValueError("Invalid PORT: 0")
+            return real_import(name)
+
+        monkeypatch.setattr(startup_report, "IMPORT_CHAIN", ["config", "app"])
+        monkeypatch.setattr(startup_report.importlib, "import_module", import_module)
+        monkeypatch.delitem(sys.modules, "app", raising=False)
+
+        results, errors = startup_report._measure()
+        assert results["import:app"] is None
+        assert errors == {"app": "ValueError: Invalid PORT: 0"}
+        assert "request:first_analyze" not in results
+
+    def test_failed_first_request_fails_report(self, monkeypatch, temp_dir):
+        """Test a first request that does not return 200 fails the report despite the missing timing."""
+        results = {"import:app": 100.0, "request:first_analyze": None}
+        errors = {"firebase_admin": "ImportError: no module", "request:first_analyze": "HTTP 500: boom"}
+        monkeypatch.setattr(startup_report, "_run_measurement", lambda: (dict(results), dict(errors)))
+        budget_path = temp_dir / "budget.json"
+        budget_path.write_text(json.dumps({"import:app": 200.0, "request:first_analyze": 1000.0}))
+
+        assert startup_report.fatal_errors(errors) == {"request:first_analyze": "HTTP 500: boom"}
+        assert startup_report.cli(["--budget", str(budget_path), "--runs", "1"]) == 1
+
+        del errors["request:first_analyze"]
+        results["request:first_analyze"] = 50.0
+        assert startup_report.cli(["--budget", str(budget_path), "--runs", "1"]) == 0
+
+    def test_measure_runs_lifespan_and_requests(self, monkeypatch):
+        """Test a measurement starts the app's lifespan and times both first requests."""
+        import app as app_module
+
+        monkeypatch.setattr(app_module.Config, "SANDBOX_ENABLED", False)
+        monkeypatch.setattr(startup_report, "IMPORT_CHAIN", ["app"])
+        results, errors = startup_report._measure()
+        assert errors == {}
+        assert results["init:lifespan"] >= 0
+        assert results["request:first_health"] > 0 and results["request:first_analyze"] > 0
@@ -0,0 +1,147 @@
+"""
+Unit tests for the verified Firebase token cache.
+"""
+import asyncio
+import threading
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from token_cache import SigningKeyRefresher, VerifiedTokenCache
+
+
+class FakeClock:
+    """Manually advanced epoch clock."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestVerifiedTokenCache:
+    """Test token cache expiry and bounds."""
+
+    def test_entry_expires_at_token_exp(self):
+        """Test cached claims are served until the token's exp."""
+        clock = FakeClock()
+        cache = VerifiedTokenCache(max_size=10, revocation_interval=None, clock=clock)
+        cache.put("token-a", {"uid": "u1", "exp": clock.now + 60})
+
+        assert cache.get("token-a")["uid"] == "u1"
+        clock.now += 61
+        assert cache.get("token-a") is None
+
+    def test_tokens_without_exp_not_cached(self):
+        """Test claims lacking exp are never cached."""
+        cache = VerifiedTokenCache(max_size=10, revocation_interval=None)
+        cache.put("token-a", {"uid": "u1"})
+        assert cache.get("token-a") is None
+
+    def test_cache_is_bounded_lru(self):
+        """Test least recently used tokens are evicted first."""
+        clock = FakeClock()
+        cache = VerifiedTokenCache(max_size=2, revocation_interval=None, clock=clock)
+        cache.put("a", {"uid": "a", "exp": clock.now + 60})
+        cache.put("b", {"uid": "b", "exp": clock.now + 60})
+        cache.get("a")
+        cache.put("c", {"uid": "c", "exp": clock.now + 60})
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_revocation_interval_caps_entry_lifetime(self):
+        """Test revocation checks force re-verification within the interval."""
+        clock = FakeClock()
+        cache = VerifiedTokenCache(max_size=10, revocation_interval=30, clock=clock)
+        cache.put("token-a", {"uid": "u1", "exp": clock.now + 3600})
+
+        clock.now += 31
+        assert cache.get("token-a") is None
+
+    def test_raw_token_not_stored(self):
+        """Test cache keys are hashes, not raw tokens."""
+        cache = VerifiedTokenCache(max_size=10, revocation_interval=None)
+        cache.put("secret-token", {"uid": "u1", "exp": 9_999_999_999})
+        assert "secret-token" not in cache._entries
+
+
+@pytest.mark.unit
+class TestSigningKeyRefresher:
+    """Test background signing key refresh."""
+
+    def test_prefetches_on_start(self):
+        """Test keys are fetched as soon as the refresher starts."""
+        fetched = threading.Event()
+        refresher = SigningKeyRefresher(interval=3600, fetch=fetched.set)
+        refresher.start()
+        try:
+            assert fetched.wait(timeout=5)
+        finally:
+            refresher.stop()
+
+    def test_fetch_errors_do_not_stop_refresher(self):
+        """Test a failed fetch is retried on the next interval."""
+        calls = []
+        retried = threading.Event()
+
+        def flaky_fetch():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("network down")
+            retried.set()
+
+        refresher = SigningKeyRefresher(interval=0.01, fetch=flaky_fetch)
+        refresher.start()
+        try:
+            assert retried.wait(timeout=5)
+        finally:
+            refresher.stop()
+
+
+    def test_stops_when_prefetch_unsupported(self, monkeypatch):
+        """Test a firebase_admin without the verifier's request stops the refresher."""
+        firebase_auth = pytest.importorskip("firebase_admin.auth")
+        import token_cache
+
+        monkeypatch.setattr(firebase_auth, "_get_client", lambda app: object())
+        assert token_cache.fetch_signing_keys() is False
+
+        refresher = SigningKeyRefresher(interval=0.01, fetch=token_cache.fetch_signing_keys)
+        refresher.start()
+        refresher._thread.join(timeout=5)
+        assert not refresher._thread.is_alive()
+        refresher.stop()
+
+
+@pytest.mark.unit
+class TestVerifyFirebaseToken:
+    """Test verify_firebase_token uses the cache."""
+
+    def test_repeat_token_verified_once(self, monkeypatch):
+        """Test the same ID token is only verified by Firebase once."""
+        import app as app_module
+
+        calls = []
+
+        class FakeFirebaseAuth:
+            @staticmethod
+            def verify_id_token(token, check_revoked=False):
+                calls.append(token)
+                return {"uid": "user-1", "exp": 9_999_999_999}
+
+        monkeypatch.setattr(app_module.Config, "FIREBASE_ENABLED", True)
+        monkeypatch.setattr(app_module, "firebase_auth", FakeFirebaseAuth, raising=False)
+        monkeypatch.setattr(app_module, "token_cache", VerifiedTokenCache(max_size=10, revocation_interval=None))
+
+        for _ in range(3):
+            user = asyncio.run(app_module.verify_firebase_token("Bearer abc.def.ghi"))
+            assert user["uid"] == "user-1"
+
+        assert calls == ["abc.def.ghi"]
@@ -0,0 +1,174 @@
+"""
+Tests for request tracing spans and the slow-request log.
+"""
+import json
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tracing import (
+    NOOP_SPAN,
+    ConsoleSpanExporter,
+    FileSpanExporter,
+    Tracer,
+    current_span,
+    load_exporter,
+    span,
+    traced,
+)
+
+
+class ListExporter:
+    """Collects exported traces in memory."""
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+def _span_names(span_dict):
+    """Flatten a span tree into a list of names (pre-order)."""
+    names = [span_dict["name"]]
+    for child in span_dict.get("children", []):
+        names.extend(_span_names(child))
+    return names
+
+
+@pytest.mark.unit
+class TestSpans:
+    """Test span nesting and the no-op fallback."""
+
+    def test_spans_nest_under_trace(self, temp_dir):
+        """Test spans opened inside a trace form a tree with attributes."""
+        exporter = ListExporter()
+        tracer = Tracer(exporter=exporter, slow_threshold_ms=1e9, slow_log_path=temp_dir / "slow.jsonl")
+
+        @traced("decorated")
+        def work():
+            current_span().set(items=3)
+
+        with tracer.start_trace("request"):
+            with span("outer", bytes=10) as outer:
+                with span("inner"):
+                    work()
+                outer.set(chars=5)
+
+        trace = exporter.traces[0].to_dict()
+        assert _span_names(trace["root"]) == ["request", "outer", "inner", "decorated"]
+        outer = trace["root"]["children"][0]
+        assert outer["attributes"] == {"bytes": 10, "chars": 5}
+        assert outer["children"][0]["children"][0]["attributes"] == {"items": 3}
+        assert trace["root"]["duration_ms"] >= outer["duration_ms"]
+
+    def test_span_outside_trace_is_noop(self):
+        """Test spans record nothing when no trace is active."""
+        with span("orphan", bytes=1) as s:
+            s.set(chars=2)
+        assert s is NOOP_SPAN
+        assert current_span() is NOOP_SPAN
+        assert NOOP_SPAN.attributes == {}
+        assert NOOP_SPAN.children == []
+
+    def test_span_records_error(self, temp_dir):
+        """Test failing spans record the exception type."""
+        exporter = ListExporter()
+        tracer = Tracer(exporter=exporter, slow_threshold_ms=1e9, slow_log_path=temp_dir / "slow.jsonl")
+
+        with pytest.raises(ValueError):
+            with tracer.start_trace("request"):
+                with span("failing"):
+                    raise ValueError("bad input")
+
+        root = exporter.traces[0].root
+        assert root.error == "ValueError"
+        assert root.children[0].error == "ValueError"
+
+
+@pytest.mark.unit
+class TestExporters:
+    """Test exporter loading and the slow-request log."""
+
+    def test_load_exporter(self, temp_dir):
+        """Test exporter specs resolve to exporters."""
+        assert load_exporter("") is None
+        assert isinstance(load_exporter("console"), ConsoleSpanExporter)
+        assert isinstance(load_exporter("file"), FileSpanExporter)
+        assert isinstance(load_exporter("tracing:ConsoleSpanExporter"), ConsoleSpanExporter)
+        with pytest.raises(ValueError):
+            load_exporter("not-a-spec")
+        with pytest.raises(ValueError):
+            load_exporter("json:JSONDecoder")
+
+    def test_slow_requests_are_logged(self, temp_dir):
+        """Test traces over the threshold are appended to the slow log."""
+        slow_log = temp_dir / "slow.jsonl"
+        tracer = Tracer(exporter=FileSpanExporter(temp_dir / "traces.jsonl"),
+                        slow_threshold_ms=0, slow_log_path=slow_log)
+
+        with tracer.start_trace("request") as trace:
+            trace.fingerprint = "abc123"
+            with span("stage"):
+                pass
+
+        record = json.loads(slow_log.read_text().strip())
+        assert record["fingerprint"] == "abc123"
+        assert _span_names(record["root"]) == ["request", "stage"]
+        assert (temp_dir / "traces.jsonl").exists()
+
+    def test_fast_requests_are_not_logged(self, temp_dir):
+        """Test traces under the threshold skip the slow log."""
+        slow_log = temp_dir / "slow.jsonl"
+        tracer = Tracer(exporter=ListExporter(), slow_threshold_ms=1e9, slow_log_path=slow_log)
+
+        with tracer.start_trace("request"):
+            pass
+
+        assert not slow_log.exists()
+
+    def test_exporter_failure_does_not_raise(self, temp_dir):
+        """Test broken exporters never fail the request."""
+        class BrokenExporter:
+            def export(self, trace):
+                raise OSError("disk full")
+
+        tracer = Tracer(exporter=BrokenExporter(), slow_threshold_ms=1e9, slow_log_path=temp_dir / "slow.jsonl")
+        with tracer.start_trace("request"):
+            pass
+
+
+@pytest.mark.integration
+class TestAnalyzeTracing:
+    """Test /analyze produces a full span tree without content."""
+
+    def test_analyze_trace_breakdown(self, monkeypatch, temp_dir, sample_linkedin_data, sample_resume_text):
+        """Test a slow /analyze request logs its stages and fingerprint only."""
+        import app as app_module
+
+        slow_log = temp_dir / "slow.jsonl"
+        monkeypatch.setattr(app_module, "tracer", Tracer(
+            exporter=ListExporter(), slow_threshold_ms=0, slow_log_path=slow_log))
+        client = TestClient(app_module.app)
+
+        response = client.post(
+            "/analyze",
+            files={"resume": ("resume.txt", sample_resume_text.encode(), "text/plain")},
+            data={"mode": "Get Hired", "linkedin_text": json.dumps(sample_linkedin_data)},
+        )
+        assert response.status_code == 200
+
+        raw = slow_log.read_text()
+        record = json.loads(raw.strip())
+        names = _span_names(record["root"])
+        for stage in ("upload", "parse_resume", "gap_analysis", "strategy", "render"):
+            assert stage in names
+        assert len(record["fingerprint"]) == 16
+
+        # Sizes only - no profile or resume content
+        assert "Tech Corp" not in raw
+        assert "Python" not in raw
@@ -0,0 +1,99 @@
+"""
+Tests for the pooled Cloud Vision client, using the local stand-in server.
+"""
+import pytest
+from pathlib import Path
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from google.cloud import vision
+
+from benchmarks.vision_stub import start_stub_server
+from vision_client import VisionClientPool
+
+
+@pytest.fixture
+def stub_endpoint():
+    """Start a stand-in Vision gRPC server for the test."""
+    server, port, handler = start_stub_server(text="Skills\nPython, Docker")
+    yield f"localhost:{port}", handler
+    server.stop(None)
+
+
+@pytest.mark.unit
+class TestVisionClientPool:
+    """Test VisionClientPool lifecycle and sharing."""
+
+    def test_round_robin_reuses_clients(self, stub_endpoint):
+        """Test clients are created once and handed out round-robin."""
+        endpoint, _ = stub_endpoint
+        pool = VisionClientPool(size=2, endpoint=endpoint, insecure=True)
+        pool.start()
+        try:
+            clients = [pool.get() for _ in range(4)]
+            assert clients[0] is clients[2]
+            assert clients[1] is clients[3]
+            assert clients[0] is not clients[1]
+        finally:
+            pool.close()
+        assert not pool.started
+
+    def test_get_starts_pool_lazily(self, stub_endpoint):
+        """Test get() starts an unstarted pool."""
+        endpoint, _ = stub_endpoint
+        pool = VisionClientPool(size=1, endpoint=endpoint, insecure=True)
+        assert not pool.started
+        pool.get()
+        assert pool.started
+        pool.close()
+
+    def test_get_after_close_fails(self, stub_endpoint):
+        """Test get() does not reopen a closed pool; only start() does."""
+        endpoint, _ = stub_endpoint
+        pool = VisionClientPool(size=1, endpoint=endpoint, insecure=True)
+        pool.start()
+        pool.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.get()
+        assert not pool.started
+
+        pool.start()
+        assert pool.get() is not None
+        pool.close()
+
+    def test_get_racing_close_fails(self, stub_endpoint, monkeypatch):
+        """Test a get() whose pool is closed between starting and picking a client fails."""
+        endpoint, _ = stub_endpoint
+        pool = VisionClientPool(size=1, endpoint=endpoint, insecure=True)
+        start = pool._start
+
+        def start_then_close(reopen):
+            start(reopen)
+            pool.close()  # close() wins the race
+
+        monkeypatch.setattr(pool, "_start", start_then_close)
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.get()
+        assert not pool.started
+
+    def test_concurrent_requests_share_pool(self, stub_endpoint):
+        """Test concurrent OCR calls through shared clients all succeed."""
+        endpoint, handler = stub_endpoint
+        pool = VisionClientPool(size=2, endpoint=endpoint, insecure=True)
+        pool.start()
+
+        def call(_):
+            response = pool.get().document_text_detection(image=vision.Image(content=b"png"))
+            return response.full_text_annotation.text
+
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                texts = list(executor.map(call, range(32)))
+        finally:
+            pool.close()
+
+        assert texts == ["Skills\nPython, Docker"] * 32
+        assert handler.calls == 32
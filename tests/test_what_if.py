@@ -0,0 +1,138 @@
+"""
+Tests for what-if score simulation and fix ranking.
+"""
+import copy
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from pipeline import (
+    LinkedInProfile,
+    ResumeData,
+    format_dashboard,
+    generate_gap_analysis,
+    generate_strategy,
+)
+from profile_view import ProfileView
+from rules import get_rule_set
+from what_if import ABOUT, CERTIFICATIONS, HEADLINE, PROJECTS, SKILLS, best_plan, candidate_fixes, rank_fixes
+
+SKILL_NAMES = [f"skill{i}" for i in range(12)]
+
+
+def _inputs():
+    linkedin = LinkedInProfile(headline="", about="Engineer", skills=SKILL_NAMES[:2], certifications=[])
+    resume = ResumeData(
+        skills=SKILL_NAMES,
+        projects=["Built a data platform for analytics", "Shipped a mobile banking app"],
+        certifications=["AWS SAA", "CKA"],
+    )
+    return linkedin, resume
+
+
+def _view(linkedin, resume):
+    return ProfileView.build(linkedin, resume, generate_gap_analysis(linkedin, resume))
+
+
+def _score(linkedin, resume):
+    rule_set = get_rule_set()
+    return rule_set.score(rule_set.features(_view(linkedin, resume))).total
+
+
+def _apply(candidate, linkedin, gaps):
+    """Make the change a candidate describes on a copy of the profile."""
+    linkedin = copy.deepcopy(linkedin)
+    if candidate.kind == SKILLS:
+        linkedin.skills += gaps.skills_missing_from_linkedin[:candidate.amount]
+    elif candidate.kind == CERTIFICATIONS:
+        linkedin.certifications += gaps.certifications_missing_from_linkedin[:candidate.amount]
+    elif candidate.kind == PROJECTS:
+        linkedin.activity_topics += gaps.projects_missing_from_linkedin[:candidate.amount]
+    elif candidate.kind == ABOUT:
+        linkedin.about += "." * (candidate.amount - len(linkedin.about))
+    elif candidate.kind == HEADLINE:
+        linkedin.headline += "." * (candidate.amount - len(linkedin.headline))
+    return linkedin
+
+
+@pytest.mark.unit
+class TestSimulation:
+    """Test simulated deltas against re-running the analysis."""
+
+    def test_candidates_cover_each_kind(self):
+        """Test skills, certifications, projects, About and headline candidates are generated."""
+        linkedin, resume = _inputs()
+        rule_set = get_rule_set()
+        candidates = candidate_fixes(rule_set, rule_set.features(_view(linkedin, resume)))
+
+        kinds = {candidate.kind for candidate in candidates}
+        assert kinds == {SKILLS, CERTIFICATIONS, PROJECTS, ABOUT, HEADLINE}
+        assert [c.amount for c in candidates if c.kind == SKILLS] == list(range(1, 11))
+        assert [c.amount for c in candidates if c.kind == ABOUT] == [101, 1500]
+
+    def test_deltas_are_exact(self):
+        """Test every candidate's points equal the score change of actually making it."""
+        linkedin, resume = _inputs()
+        gaps = generate_gap_analysis(linkedin, resume)
+        rule_set = get_rule_set()
+        features = rule_set.features(ProfileView.build(linkedin, resume, gaps))
+        base = rule_set.score(features)
+        candidates = candidate_fixes(rule_set, features)
+        rank_fixes(rule_set, features, base, candidates)
+
+        for candidate in candidates:
+            changed = _apply(candidate, linkedin, gaps)
+            actual = _score(changed, resume)
+            assert candidate.points == actual - base.total, candidate.description
+
+    def test_ranking_by_points_per_effort(self):
+        """Test only gaining fixes are ranked, best return per effort first."""
+        linkedin, resume = _inputs()
+        rule_set = get_rule_set()
+        ranked = rank_fixes(rule_set, rule_set.features(_view(linkedin, resume)))
+
+        assert ranked and all(fix.points > 0 for fix in ranked)
+        ratios = [fix.points_per_effort for fix in ranked]
+        assert ratios == sorted(ratios, reverse=True)
+
+    def test_plan_projection_is_exact(self):
+        """Test the combined plan's projected score equals applying all its fixes."""
+        linkedin, resume = _inputs()
+        gaps = generate_gap_analysis(linkedin, resume)
+        rule_set = get_rule_set()
+        plan = best_plan(rule_set, rule_set.features(ProfileView.build(linkedin, resume, gaps)))
+
+        assert len({fix.kind for fix in plan.fixes}) == len(plan.fixes)
+        changed = linkedin
+        for fix in plan.fixes:
+            changed = _apply(fix, changed, gaps)
+        assert plan.projected_score == _score(changed, resume)
+        assert plan.points > 0
+
+
+@pytest.mark.unit
+class TestDashboardImpact:
+    """Test the dashboard reports simulated impact."""
+
+    def test_dashboard_uses_projection(self):
+        """Test the impact line states the simulated scores instead of a fixed estimate."""
+        linkedin, resume = _inputs()
+        strategy = generate_strategy("Get Hired", generate_gap_analysis(linkedin, resume), linkedin, resume)
+        report = format_dashboard(strategy)
+
+        plan = strategy.fix_plan
+        assert "20-30 points" not in report
+        assert f"from {plan.score} to {plan.projected_score} (+{plan.points} points)" in report
+        assert f"- {plan.fixes[0].description}: **+{plan.fixes[0].points}**" in report
+
+    def test_dashboard_without_gains(self):
+        """Test a profile with nothing left to gain says so."""
+        linkedin = LinkedInProfile(headline="Engineer", about="A" * 200, skills=SKILL_NAMES, certifications=["CKA"])
+        resume = ResumeData(skills=SKILL_NAMES, certifications=["CKA"])
+        strategy = generate_strategy("Get Hired", generate_gap_analysis(linkedin, resume), linkedin, resume)
+
+        assert strategy.fix_plan.fixes == []
+        assert "would raise your profile score further" in format_dashboard(strategy)